@@ -0,0 +1,49 @@
+"""Compare the time to save an assistant run as the conversation grows,
+rewriting the whole memory column vs appending only the new messages.
+
+python cookbook/benchmarks/assistant_storage.py
+"""
+
+from tempfile import TemporaryDirectory
+from typing import List
+
+from phi.assistant import Assistant
+from phi.llm.base import LLM
+from phi.llm.message import Message
+from phi.storage.assistant.sqllite import SqlAssistantStorage
+from phi.utils.timer import Timer
+
+NUM_TURNS = 200
+REPORT_EVERY = 50
+
+
+class EchoLLM(LLM):
+    model: str = "echo"
+
+    def get_assistant_message(self, messages: List[Message]) -> Message:
+        return Message(role="assistant", content=f"You said: {messages[-1].get_content_string()} " + "x" * 500)
+
+
+def run(db_file: str, append_messages: bool) -> None:
+    storage = SqlAssistantStorage(table_name="assistant_runs", db_file=db_file, append_messages=append_messages)
+    storage.create()
+    assistant = Assistant(llm=EchoLLM(), storage=storage, add_chat_history_to_messages=True, num_history_messages=6)
+    assistant.create_run()
+
+    print(f"append_messages={append_messages}")
+    for turn in range(1, NUM_TURNS + 1):
+        assistant.run(f"Message {turn}", stream=False)
+        if turn % REPORT_EVERY == 0:
+            # Time reading and saving the run, as done at the start and end of every turn
+            timer = Timer()
+            timer.start()
+            assistant.read_from_storage()
+            assistant.write_to_storage()
+            timer.stop()
+            print(f"  turn {turn}: {timer.elapsed * 1000:.2f}ms to read and save the run")
+
+
+if __name__ == "__main__":
+    with TemporaryDirectory() as tmp_dir:
+        run(db_file=f"{tmp_dir}/rewrite.db", append_messages=False)
+        run(db_file=f"{tmp_dir}/append.db", append_messages=True)
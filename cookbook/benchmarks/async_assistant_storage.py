@@ -0,0 +1,121 @@
+"""Run 200 assistants concurrently with Assistant.arun() and measure how long the event loop is blocked.
+
+Compares storage calls made with the sync methods, which block the event loop while the database is read and
+written, with the async methods of AsyncAssistantStorage.
+
+python cookbook/benchmarks/async_assistant_storage.py
+
+Set PG_DB_URL (for example postgresql+psycopg://ai:ai@localhost:5532/ai) to run against PostgreSQL instead of SQLite.
+"""
+
+import asyncio
+import logging
+from os import getenv
+from tempfile import TemporaryDirectory
+from typing import List, Optional
+
+from phi.assistant import Assistant, AssistantRun
+from phi.assistant.run import AssistantRunEntry
+from phi.llm.base import LLM
+from phi.llm.message import Message
+from phi.storage.assistant import AssistantStorage
+from phi.utils.log import logger
+from phi.utils.timer import Timer
+
+NUM_RUNS = 200
+LLM_LATENCY = 0.05
+
+
+class SlowEchoLLM(LLM):
+    """Waits LLM_LATENCY seconds, like a request to an LLM API, then echoes the message."""
+
+    model: str = "echo"
+
+    async def aget_assistant_message(self, messages: List[Message]) -> Message:
+        await asyncio.sleep(LLM_LATENCY)
+        return Message(role="assistant", content=f"You said: {messages[-1].get_content_string()}")
+
+
+class SyncOnlyStorage(AssistantStorage):
+    """Exposes only the sync methods of a storage, so Assistant.arun() calls them on the event loop."""
+
+    def __init__(self, storage: AssistantStorage):
+        self.storage = storage
+        self.append_messages = storage.append_messages
+
+    def create(self) -> None:
+        self.storage.create()
+
+    def read(self, run_id: str) -> Optional[AssistantRun]:
+        return self.storage.read(run_id)
+
+    def get_all_run_ids(self, user_id: Optional[str] = None) -> List[str]:
+        return self.storage.get_all_run_ids(user_id)
+
+    def get_all_runs(self, user_id: Optional[str] = None) -> List[AssistantRun]:
+        return self.storage.get_all_runs(user_id)
+
+    def upsert(self, row: AssistantRun) -> Optional[AssistantRun]:
+        return self.storage.upsert(row)
+
+    def append(self, row: AssistantRun, entries: List[AssistantRunEntry]) -> None:
+        self.storage.append(row, entries)
+
+    def read_entries(self, run_id: str, kind: str, last_n: Optional[int] = None) -> List[AssistantRunEntry]:
+        return self.storage.read_entries(run_id, kind, last_n)
+
+    def delete(self) -> None:
+        self.storage.delete()
+
+
+def get_storage(tmp_dir: str, name: str) -> AssistantStorage:
+    pg_db_url = getenv("PG_DB_URL")
+    storage: AssistantStorage
+    if pg_db_url is not None:
+        from phi.storage.assistant.postgres import PgAssistantStorage
+
+        storage = PgAssistantStorage(table_name=f"benchmark_{name}", db_url=pg_db_url)
+        storage.delete()
+    else:
+        from phi.storage.assistant.sqllite import SqlAssistantStorage
+
+        storage = SqlAssistantStorage(table_name="assistant_runs", db_file=f"{tmp_dir}/{name}.db")
+    storage.create()
+    return storage
+
+
+async def measure_loop_lag(stop: asyncio.Event, lags: List[float]) -> None:
+    """Records how late a 1ms sleep wakes up, which is the time the event loop was blocked."""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(0.001)
+        lags.append(loop.time() - start - 0.001)
+
+
+async def run(storage: AssistantStorage, label: str) -> None:
+    assistants = [Assistant(llm=SlowEchoLLM(), storage=storage, run_id=f"run_{i}") for i in range(NUM_RUNS)]
+
+    stop = asyncio.Event()
+    lags: List[float] = []
+    lag_task = asyncio.create_task(measure_loop_lag(stop, lags))
+    timer = Timer()
+    timer.start()
+    # Each run reads the run from storage, calls the LLM and saves the run
+    await asyncio.gather(*[assistant.arun(f"Message {i}", stream=False) for i, assistant in enumerate(assistants)])
+    timer.stop()
+    stop.set()
+    await lag_task
+
+    print(f"{label}:")
+    print(f"  {NUM_RUNS} concurrent runs: {timer.elapsed * 1000:.0f}ms")
+    print(f"  event loop blocked for up to {max(lags) * 1000:.1f}ms at a time")
+
+
+if __name__ == "__main__":
+    # Skip the "MemoryDb not provided" warning printed by every run
+    logger.setLevel(logging.ERROR)
+    print(f"Simulated LLM latency: {LLM_LATENCY * 1000:.0f}ms")
+    with TemporaryDirectory() as tmp_dir:
+        asyncio.run(run(SyncOnlyStorage(get_storage(tmp_dir, "sync")), label="sync storage methods"))
+        asyncio.run(run(get_storage(tmp_dir, "async"), label="async storage methods"))
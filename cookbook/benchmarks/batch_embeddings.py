@@ -0,0 +1,95 @@
+"""Embed 500 chunks against a local stub of the OpenAI embeddings API that takes 20ms per request.
+
+Compares one request per chunk (Document.embed) with Embedder.embed_documents(), which sends batches of chunks
+and keeps several batches in flight.
+
+python cookbook/benchmarks/batch_embeddings.py
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+from phi.document import Document
+from phi.embedder.openai import OpenAIEmbedder
+from phi.utils.timer import Timer
+
+NUM_CHUNKS = 500
+DIMENSIONS = 8
+REQUEST_LATENCY = 0.02
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    requests_received = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        self.server.requests_received += 1  # type: ignore
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        texts = body["input"] if isinstance(body["input"], list) else [body["input"]]
+        time.sleep(REQUEST_LATENCY)
+        response = json.dumps(
+            {
+                "object": "list",
+                "model": body["model"],
+                "data": [
+                    {"object": "embedding", "index": i, "embedding": [float(len(text))] * DIMENSIONS}
+                    for i, text in enumerate(texts)
+                ],
+                "usage": {"prompt_tokens": 10 * len(texts), "total_tokens": 10 * len(texts)},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+def get_documents() -> List[Document]:
+    return [Document(content=f"Chunk {i} " + "lorem ipsum " * 50) for i in range(NUM_CHUNKS)]
+
+
+def main():
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+    embedder = OpenAIEmbedder(model="stub", api_key="stub", base_url=base_url, dimensions=DIMENSIONS, batch_size=100)
+    print(f"{NUM_CHUNKS} chunks, {REQUEST_LATENCY * 1000:.0f}ms per request")
+
+    documents = get_documents()
+    timer = Timer()
+    timer.start()
+    for document in documents:
+        document.embed(embedder=embedder)
+    timer.stop()
+    print(f"one request per chunk: {server.requests_received} requests, {timer.elapsed:.2f}s")
+
+    for max_concurrent_batches in (1, 4):
+        embedder.max_concurrent_batches = max_concurrent_batches
+        server.requests_received = 0
+        batched_documents = get_documents()
+        timer = Timer()
+        timer.start()
+        embedder.embed_documents(batched_documents)
+        timer.stop()
+        assert [d.embedding for d in batched_documents] == [d.embedding for d in documents]
+        total_tokens = sum(d.usage["total_tokens"] for d in batched_documents if d.usage is not None)
+        print(
+            f"batches of {embedder.batch_size}, {max_concurrent_batches} in flight: "
+            f"{server.requests_received} requests, {timer.elapsed:.2f}s, {total_tokens} tokens"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
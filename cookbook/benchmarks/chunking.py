@@ -0,0 +1,129 @@
+"""MB/s chunking 20MB of generated text and markdown with the chunker Reader used before phi.document.chunking
+vs FixedSizeChunking, which makes the same chunks and is the default, and RecursiveChunking with and without overlap.
+
+python cookbook/benchmarks/chunking.py
+"""
+
+import re
+from typing import Callable, Dict, List
+
+from phi.document import Document
+from phi.document.chunking import FixedSizeChunking, RecursiveChunking
+from phi.utils.timer import Timer
+
+SIZE = 20 * 1024 * 1024
+CHUNK_SIZE = 3000
+WORDS = "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod tempor incididunt ut labore".split()
+
+
+def legacy_clean_text(text: str) -> str:
+    """Reader.clean_text() before phi.document.chunking"""
+    cleaned_text = re.sub(r"\n+", "\n", text)
+    cleaned_text = re.sub(r"\s+", " ", cleaned_text)
+    cleaned_text = re.sub(r"\t+", "\t", cleaned_text)
+    cleaned_text = re.sub(r"\r+", "\r", cleaned_text)
+    cleaned_text = re.sub(r"\f+", "\f", cleaned_text)
+    cleaned_text = re.sub(r"\v+", "\v", cleaned_text)
+    return cleaned_text
+
+
+def legacy_chunk(document: Document, chunk_size: int = CHUNK_SIZE) -> List[Document]:
+    """Reader.chunk_document() before phi.document.chunking"""
+    cleaned_content = legacy_clean_text(document.content)
+    content_length = len(cleaned_content)
+    chunked_documents: List[Document] = []
+    chunk_number = 1
+    start = 0
+    while start < content_length:
+        end = start + chunk_size
+        if end < content_length:
+            while end > start and cleaned_content[end] not in [" ", "\n", "\r", "\t"]:
+                end -= 1
+        if end == start:
+            end = start + chunk_size
+        if end > content_length:
+            end = content_length
+        chunk = cleaned_content[start:end]
+        meta_data = document.meta_data.copy()
+        meta_data["chunk"] = chunk_number
+        meta_data["chunk_size"] = len(chunk)
+        chunked_documents.append(
+            Document(id=f"{document.name}_{chunk_number}", name=document.name, meta_data=meta_data, content=chunk)
+        )
+        chunk_number += 1
+        start = end
+    return chunked_documents
+
+
+def sentence(i: int) -> str:
+    return " ".join(WORDS[(i + j) % len(WORDS)] for j in range(8 + i % 12)).capitalize() + "."
+
+
+def generate_text(size: int) -> str:
+    paragraphs: List[str] = []
+    length = 0
+    i = 0
+    while length < size:
+        paragraph = " ".join(sentence(i + j) for j in range(3 + i % 6))
+        paragraphs.append(paragraph)
+        length += len(paragraph) + 2
+        i += 1
+    return "\n\n".join(paragraphs)
+
+
+def generate_markdown(size: int) -> str:
+    sections: List[str] = []
+    length = 0
+    i = 0
+    while length < size:
+        section = "\n".join(
+            [
+                f"## Section {i}",
+                "",
+                " ".join(sentence(i + j) for j in range(4)),
+                "",
+                *[f"- {sentence(i + j)}" for j in range(i % 5 + 1)],
+                "",
+                "```python",
+                f"def function_{i}(x):",
+                f"    return x * {i}",
+                "```",
+                "",
+                f"| key | value |\n| --- | --- |\n| {WORDS[i % len(WORDS)]} | {i} |",
+            ]
+        )
+        sections.append(section)
+        length += len(section) + 2
+        i += 1
+    return "\n\n".join(sections)
+
+
+def main() -> None:
+    inputs: Dict[str, str] = {"text": generate_text(SIZE), "markdown": generate_markdown(SIZE)}
+    chunkers: Dict[str, Callable[[Document], List[Document]]] = {
+        "legacy": legacy_chunk,
+        "fixed size (default)": lambda document: list(FixedSizeChunking(chunk_size=CHUNK_SIZE).chunk(document)),
+        "recursive": lambda document: list(RecursiveChunking(chunk_size=CHUNK_SIZE).chunk(document)),
+        "recursive, 300 overlap": lambda document: list(
+            RecursiveChunking(chunk_size=CHUNK_SIZE, chunk_overlap=300).chunk(document)
+        ),
+    }
+
+    print(f"Chunking {SIZE // (1024 * 1024)}MB inputs in chunks of {CHUNK_SIZE} characters")
+    print(f"{'input':<10} {'chunker':<24} {'time (s)':>9} {'MB/s':>7} {'chunks':>8}")
+    for input_name, content in inputs.items():
+        document = Document(name=input_name, content=content)
+        megabytes = len(content.encode()) / (1024 * 1024)
+        for chunker_name, chunker in chunkers.items():
+            timer = Timer()
+            timer.start()
+            chunks = chunker(document)
+            timer.stop()
+            print(
+                f"{input_name:<10} {chunker_name:<24} {timer.elapsed:>9.2f} {megabytes / timer.elapsed:>7.1f} "
+                f"{len(chunks):>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Chunking throughput and retrieval hit rate of the chunking strategies on a generated corpus of 40 product guides
+in markdown: an overview, a pricing table, an install code block, a warranty and a troubleshooting section.
+
+Each guide has 4 facts with a question about it. A question is a hit when one of the top k chunks retrieved for it
+contains the answer, in the chunk or in its sentence window. Chunks and questions are embedded with a local
+bag-of-words embedder, so the numbers compare the chunks rather than an embedding model.
+
+python cookbook/benchmarks/chunking_strategies.py
+"""
+
+import random
+import re
+from typing import Dict, List, Optional, Tuple
+from zlib import crc32
+
+import numpy as np
+
+from phi.document import Document
+from phi.document.chunking import (
+    ChunkingStrategy,
+    MarkdownChunking,
+    ParagraphChunking,
+    RecursiveChunking,
+    SemanticChunking,
+    SentenceWindowChunking,
+)
+from phi.embedder.base import Embedder
+from phi.utils.timer import Timer
+
+NUM_GUIDES = 40
+CHUNK_SIZE = 1000
+# Number of copies of the corpus chunked to measure throughput
+THROUGHPUT_COPIES = 10
+TOP_K = (1, 2, 4)
+
+FILLER = [
+    "The team ships updates every few weeks and keeps the release notes on the website.",
+    "Most customers start with the default settings and adjust them once the workload grows.",
+    "The dashboard shows the status of every device, job and user in a single view.",
+    "Logs are kept for thirty days and can be exported to any storage service.",
+    "Support is available by email and chat during business hours in every region.",
+    "Configuration files are written in YAML and validated when the service starts.",
+    "The service scales horizontally, so adding nodes increases the throughput.",
+    "Backups run every night and can be restored from the settings page.",
+    "Access is managed with roles, and every change is recorded in the audit log.",
+    "Performance depends on the network, the size of the data and the number of users.",
+    "Updates are installed automatically unless the administrator disables them.",
+    "The documentation covers the common tasks, and the forum answers the rest.",
+]
+SYLLABLES = ["zor", "blax", "quin", "tera", "vox", "mir", "dal", "pex", "lum", "rho", "sil", "tak", "ven", "gri"]
+COMPONENTS = ["scheduler", "sync agent", "license server", "cache daemon", "gateway", "indexer", "sensor hub"]
+
+
+class BagOfWordsEmbedder(Embedder):
+    """Hashes the words of a text to dimensions, with sublinear term frequency"""
+
+    dimensions: int = 1024
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        return self.embed(texts).tolist(), None
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        embeddings = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in re.findall(r"[a-z0-9$=.]+", text.lower()):
+                embeddings[row, crc32(word.strip(".").encode()) % self.dimensions] += 1
+        embeddings = np.log1p(embeddings)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return embeddings / norms
+
+
+def filler(rng: random.Random, sentences: int) -> str:
+    return " ".join(rng.choice(FILLER) for _ in range(sentences))
+
+
+def generate_guides() -> Tuple[List[Document], List[Tuple[str, str]]]:
+    """Returns the guides, and the questions about them with their answers"""
+    rng = random.Random(7)
+    guides: List[Document] = []
+    questions: List[Tuple[str, str]] = []
+    names = set()
+    while len(names) < NUM_GUIDES:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(3)).capitalize())
+    for name in sorted(names):
+        slug = name.lower()
+        basic, pro = rng.randint(5, 40), rng.randint(50, 400)
+        version = f"{rng.randint(1, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 9)}"
+        months = rng.randint(7, 60)
+        code = f"E{rng.randint(100, 999)}"
+        component = rng.choice(COMPONENTS)
+        content = "\n".join(
+            [
+                f"# {name}",
+                "",
+                "## Overview",
+                "",
+                f"{name} is a service for teams. {filler(rng, 6)}",
+                "",
+                filler(rng, 5),
+                "",
+                "## Pricing",
+                "",
+                "| Plan | Price |",
+                "| --- | --- |",
+                f"| Basic | ${basic} per month |",
+                f"| Pro | ${pro} per month |",
+                "",
+                filler(rng, 3),
+                "",
+                "## Installation",
+                "",
+                f"Install {name} with pip. {filler(rng, 2)}",
+                "",
+                "```bash",
+                f"pip install {slug}=={version}",
+                f"{slug} init --config {slug}.yaml",
+                "```",
+                "",
+                "## Warranty",
+                "",
+                f"{filler(rng, 4)} The warranty of {name} lasts {months} months. {filler(rng, 4)}",
+                "",
+                "## Troubleshooting",
+                "",
+                f"{filler(rng, 5)} If {name} shows error code {code}, restart the {component}. {filler(rng, 5)}",
+            ]
+        )
+        guides.append(Document(name=slug, content=content))
+        questions += [
+            (f"How much does the Pro plan of {name} cost per month?", f"| Pro | ${pro} per month |"),
+            (f"Which version of {name} do I install with pip?", f"{slug}=={version}"),
+            (f"How long is the warranty of {name}?", f"{name} lasts {months} months"),
+            (f"What should I do when {name} shows error code {code}?", f"{code}, restart the {component}"),
+        ]
+    return guides, questions
+
+
+def hit_rates(chunks: List[Document], questions: List[Tuple[str, str]], embedder: BagOfWordsEmbedder) -> List[float]:
+    chunk_embeddings = embedder.embed([chunk.content for chunk in chunks])
+    question_embeddings = embedder.embed([question for question, _ in questions])
+    ranking = np.argsort(-(question_embeddings @ chunk_embeddings.T), axis=1)
+    seen = [chunk.content + "\n" + chunk.meta_data.get("window", "") for chunk in chunks]
+    return [
+        sum(any(answer in seen[i] for i in ranking[q, :k]) for q, (_, answer) in enumerate(questions)) / len(questions)
+        for k in TOP_K
+    ]
+
+
+def main() -> None:
+    guides, questions = generate_guides()
+    embedder = BagOfWordsEmbedder()
+    strategies: Dict[str, ChunkingStrategy] = {
+        "recursive": RecursiveChunking(chunk_size=CHUNK_SIZE),
+        "markdown": MarkdownChunking(chunk_size=CHUNK_SIZE),
+        "paragraph": ParagraphChunking(chunk_size=CHUNK_SIZE),
+        "sentence window": SentenceWindowChunking(window_size=2, chunk_size=CHUNK_SIZE),
+        "semantic": SemanticChunking(embedder=embedder, chunk_size=CHUNK_SIZE),
+    }
+    corpus_size = sum(len(guide.content.encode()) for guide in guides)
+    print(f"{NUM_GUIDES} guides, {len(questions)} questions, chunk_size {CHUNK_SIZE}")
+    print(
+        f"{'strategy':<16} {'MB/s':>7} {'chunks':>7} {'avg chars':>9} "
+        + " ".join(f"{f'hit@{k}':>6}" for k in TOP_K)
+        + f" {'chars@2':>8}"
+    )
+    for name, strategy in strategies.items():
+        timer = Timer()
+        timer.start()
+        for _ in range(THROUGHPUT_COPIES):
+            chunks = strategy.chunk_all(guides)
+        timer.stop()
+        megabytes_per_second = THROUGHPUT_COPIES * corpus_size / (1024 * 1024) / timer.elapsed
+
+        # Characters given to the assistant per chunk, including the sentence windows, and with num_documents=2
+        returned = sum(len(chunk.content) + len(chunk.meta_data.get("window", "")) for chunk in chunks)
+        print(
+            f"{name:<16} {megabytes_per_second:>7.1f} {len(chunks):>7} {returned / len(chunks):>9.0f} "
+            + " ".join(f"{rate:>6.2f}" for rate in hit_rates(chunks, questions, embedder))
+            + f" {2 * returned / len(chunks):>8.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Re-embed the same 2,000 chunks and repeat the same query, with and without an embedding cache.
+
+The embedder is a fake that takes 20ms per request, like a call to an embeddings API.
+
+python cookbook/benchmarks/embedding_cache.py
+"""
+
+import time
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional, Tuple
+
+from phi.document import Document
+from phi.embedder.base import Embedder
+from phi.embedder.cache.sqlite import SqlEmbeddingCache
+from phi.embedder.cached import CachedEmbedder
+from phi.utils.timer import Timer
+
+NUM_CHUNKS = 2000
+NUM_QUERIES = 100
+REQUEST_LATENCY = 0.02
+
+
+class FakeEmbedder(Embedder):
+    model: str = "fake"
+    dimensions: int = 256
+    requests: int = 0
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        embeddings, usage = self.get_batch_embeddings_and_usage([text])
+        return embeddings[0], usage
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        self.requests += 1
+        time.sleep(REQUEST_LATENCY)
+        return [[float(len(text))] * self.dimensions for text in texts], {"total_tokens": 100 * len(texts)}
+
+
+def load(embedder: Embedder, label: str) -> None:
+    documents = [Document(content=f"Chunk {i} " + "lorem ipsum " * 50) for i in range(NUM_CHUNKS)]
+    timer = Timer()
+    timer.start()
+    embedder.embed_documents(documents)
+    for _ in range(NUM_QUERIES):
+        embedder.get_embedding("What is the refund policy?")
+    timer.stop()
+    tokens = sum(d.usage["total_tokens"] for d in documents if d.usage is not None)
+    print(f"  {label}: {timer.elapsed:.2f}s, {tokens} tokens embedded")
+
+
+if __name__ == "__main__":
+    print(f"{NUM_CHUNKS} chunks and {NUM_QUERIES} identical queries, {REQUEST_LATENCY * 1000:.0f}ms per request")
+
+    fake = FakeEmbedder()
+    print("no cache:")
+    load(fake, "first load")
+    load(fake, "second load")
+    print(f"  requests: {fake.requests}")
+
+    with TemporaryDirectory() as tmp_dir:
+        fake = FakeEmbedder()
+        cached = CachedEmbedder(embedder=fake, cache=SqlEmbeddingCache(db_file=f"{tmp_dir}/cache.db"))
+        print("sqlite cache:")
+        load(cached, "first load")
+        load(cached, "second load")
+        # A new process with the same cache file, like a nightly re-index
+        restarted = CachedEmbedder(embedder=fake, cache=SqlEmbeddingCache(db_file=f"{tmp_dir}/cache.db"))
+        load(restarted, "after restart")
+        print(f"  requests: {fake.requests}, hits: {cached.hits + restarted.hits}, misses: {cached.misses}")
@@ -0,0 +1,136 @@
+"""Time to re-sync a knowledge base of 50,000 text files after 1% of the files changed, 0.2% were added and 0.2% were
+removed: reading every file again like load() without a manifest vs loading only the changed files with a manifest.
+
+Both re-syncs start from the same NumpyDb collection, opened before the timer. Without a manifest the chunks of changed
+and removed files are never deleted, so the collection keeps returning their old contents.
+
+python cookbook/benchmarks/incremental_load.py
+"""
+
+import logging
+import random
+import shutil
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional, Set, Tuple
+from zlib import crc32
+
+import numpy as np
+
+from phi.document.chunking import RecursiveChunking
+from phi.document.reader.text import TextReader
+from phi.embedder.base import Embedder
+from phi.knowledge.text import TextKnowledgeBase
+from phi.utils.log import logger
+from phi.utils.timer import Timer
+from phi.vectordb.base import get_content_hash
+from phi.vectordb.numpydb import NumpyDb
+
+NUM_FILES = 50_000
+CHANGED = 0.01
+ADDED = 0.002
+REMOVED = 0.002
+PARAGRAPHS_PER_FILE = 4
+CHUNK_SIZE = 500
+
+WORDS = ["invoice", "shipment", "refund", "warehouse", "carrier", "customer", "order", "label", "return", "pallet"]
+
+
+class HashEmbedder(Embedder):
+    """Seeds random vectors with the crc32 of the text, so embedding costs nothing next to reading"""
+
+    dimensions: int = 64
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_batch_embeddings_and_usage([text])[0][0], None
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        embeddings = [
+            np.random.default_rng(crc32(text.encode())).standard_normal(self.dimensions, dtype=np.float32)
+            for text in texts
+        ]
+        return np.asarray(embeddings).tolist(), None
+
+
+def write_file(path: Path, number: int, version: int, rng: random.Random) -> None:
+    paragraphs = [
+        f"Document {number} section {i} version {version}. " + " ".join(rng.choice(WORDS) for _ in range(60))
+        for i in range(PARAGRAPHS_PER_FILE)
+    ]
+    path.write_text("\n\n".join(paragraphs))
+
+
+def get_expected_hashes(docs: Path, reader: TextReader) -> Set[str]:
+    """Content hashes of the chunks of the files as they are now"""
+    return {get_content_hash(chunk) for path in docs.glob("*.txt") for chunk in reader.read(path)}
+
+
+def get_live_hashes(vector_db: NumpyDb) -> Set[str]:
+    assert vector_db._tombstones is not None
+    return {
+        content_hash for row, content_hash in enumerate(vector_db._content_hashes) if not vector_db._tombstones[row]
+    }
+
+
+def new_knowledge_base(docs: Path, db: Path, manifest_file: Optional[Path]) -> TextKnowledgeBase:
+    return TextKnowledgeBase(
+        path=docs,
+        reader=TextReader(chunking_strategy=RecursiveChunking(chunk_size=CHUNK_SIZE)),
+        vector_db=NumpyDb(collection="benchmark", path=str(db), embedder=HashEmbedder()),
+        manifest_file=manifest_file,
+        optimize_on=None,
+    )
+
+
+def main() -> None:
+    # TextReader logs every file it reads
+    logger.setLevel(logging.WARNING)
+    rng = random.Random(3)
+    with TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        docs = root / "docs"
+        docs.mkdir()
+        for number in range(NUM_FILES):
+            write_file(docs / f"doc_{number}.txt", number, 0, rng)
+
+        timer = Timer()
+        timer.start()
+        new_knowledge_base(docs, root / "db", root / "db" / "manifest.json").load(recreate=True)
+        timer.stop()
+        print(f"Loaded {NUM_FILES} files in {timer.elapsed:.1f}s")
+        shutil.copytree(root / "db", root / "db_full")
+
+        numbers = rng.sample(range(NUM_FILES), int(NUM_FILES * (CHANGED + REMOVED)))
+        changed, removed = numbers[: int(NUM_FILES * CHANGED)], numbers[int(NUM_FILES * CHANGED) :]
+        for number in changed:
+            write_file(docs / f"doc_{number}.txt", number, 1, rng)
+        for number in removed:
+            (docs / f"doc_{number}.txt").unlink()
+        for number in range(NUM_FILES, NUM_FILES + int(NUM_FILES * ADDED)):
+            write_file(docs / f"doc_{number}.txt", number, 0, rng)
+        print(f"Changed {len(changed)}, removed {len(removed)} and added {int(NUM_FILES * ADDED)} files")
+
+        expected = get_expected_hashes(docs, TextReader(chunking_strategy=RecursiveChunking(chunk_size=CHUNK_SIZE)))
+        print(f"{'re-sync':<28} {'time (s)':>9} {'files/s':>9} {'stale chunks':>13} {'missing chunks':>15}")
+        runs = [
+            ("read every file", new_knowledge_base(docs, root / "db_full", None)),
+            ("manifest", new_knowledge_base(docs, root / "db", root / "db" / "manifest.json")),
+        ]
+        for label, knowledge_base in runs:
+            assert isinstance(knowledge_base.vector_db, NumpyDb)
+            # NumpyDb reads the rows of the collection when it is opened, which both re-syncs do first
+            knowledge_base.vector_db.create()
+            timer = Timer()
+            timer.start()
+            knowledge_base.load()
+            timer.stop()
+            live = get_live_hashes(knowledge_base.vector_db)
+            num_files = NUM_FILES * (1 + ADDED - REMOVED)
+            print(
+                f"{label:<28} {timer.elapsed:>9.2f} {num_files / timer.elapsed:>9.0f} "
+                f"{len(live - expected):>13} {len(expected - live):>15}"
+            )
+
+
+if __name__ == "__main__":
+    main()
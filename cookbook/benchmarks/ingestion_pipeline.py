@@ -0,0 +1,98 @@
+"""Time to load 40 sources of 100 chunks into NumpyDb, with the sources read, embedded and written one after another
+vs with the ingestion pipeline, where reading, embedding and writing overlap.
+
+The reader sleeps 100ms per source (parsing a file or fetching a url) and the embedder 50ms per request,
+so the numbers show how the stages overlap rather than the speed of a real reader or embedding API.
+
+python cookbook/benchmarks/ingestion_pipeline.py
+"""
+
+import time
+from tempfile import TemporaryDirectory
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from phi.document import Document
+from phi.embedder.base import Embedder
+from phi.knowledge.base import AssistantKnowledge
+from phi.knowledge.pipeline import IngestionPipeline
+from phi.utils.timer import Timer
+from phi.vectordb.numpydb import NumpyDb
+
+NUM_SOURCES = 40
+CHUNKS_PER_SOURCE = 100
+READ_LATENCY = 0.1
+EMBED_LATENCY = 0.05
+
+
+class SlowEmbedder(Embedder):
+    dimensions: int = 256
+    batch_size: int = 100
+    max_concurrent_batches: int = 1
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        embeddings, usage = self.get_batch_embeddings_and_usage([text])
+        return embeddings[0], usage
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        time.sleep(EMBED_LATENCY)
+        rng = np.random.default_rng(len(texts))
+        return rng.standard_normal((len(texts), self.dimensions), dtype=np.float32).tolist(), None
+
+
+class SlowKnowledgeBase(AssistantKnowledge):
+    def get_sources(self) -> Iterator[int]:
+        yield from range(NUM_SOURCES)
+
+    def read_source(self, source: int) -> List[Document]:
+        time.sleep(READ_LATENCY)
+        return [
+            Document(name=f"source_{source}", content=f"Source {source} chunk {i} " + "lorem ipsum " * 40)
+            for i in range(CHUNKS_PER_SOURCE)
+        ]
+
+
+def load_serially(knowledge_base: AssistantKnowledge) -> None:
+    """The loop AssistantKnowledge.load() used before the ingestion pipeline"""
+    assert knowledge_base.vector_db is not None
+    knowledge_base.vector_db.create()
+    for document_list in knowledge_base.document_lists:
+        documents_to_load = knowledge_base.vector_db.filter_existing_documents(document_list)
+        knowledge_base.vector_db.insert(documents=documents_to_load)
+
+
+def main() -> None:
+    print(f"Loading {NUM_SOURCES} sources x {CHUNKS_PER_SOURCE} chunks")
+    print(f"{'load':<42} {'time (s)':>9} {'chunks/s':>9}")
+    runs = [("serial", None)] + [
+        (f"pipeline ({read} read, {embed} embed workers)", IngestionPipeline(read_workers=read, embed_workers=embed))
+        for read, embed in ((1, 1), (4, 2), (8, 4))
+    ]
+    for label, pipeline in runs:
+        with TemporaryDirectory() as path:
+            knowledge_base = SlowKnowledgeBase(
+                vector_db=NumpyDb(collection="benchmark", path=path, embedder=SlowEmbedder()),
+                ingestion_pipeline=pipeline,
+                optimize_on=None,
+            )
+            timer = Timer()
+            timer.start()
+            if pipeline is None:
+                load_serially(knowledge_base)
+            else:
+                metrics = knowledge_base.load_sources(
+                    sources=knowledge_base.get_sources(), read_source=knowledge_base.read_source
+                )
+            timer.stop()
+            print(f"{label:<42} {timer.elapsed:>9.2f} {NUM_SOURCES * CHUNKS_PER_SOURCE / timer.elapsed:>9.0f}")
+            if pipeline is not None and metrics is not None:
+                for stage in metrics.stages:
+                    print(f"    {stage}")
+
+
+if __name__ == "__main__":
+    main()
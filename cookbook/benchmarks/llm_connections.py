@@ -0,0 +1,100 @@
+"""Count the connections opened for a 10-turn tool-calling conversation against a local stub server.
+
+Run with and without shared clients to compare:
+
+python cookbook/benchmarks/llm_connections.py
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from phi.llm.message import Message
+from phi.llm.openai import OpenAIChat
+from phi.utils.clients import clear_shared_clients
+from phi.utils.timer import Timer
+
+NUM_TURNS = 10
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    connections_opened = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # setup() is called once per TCP connection, not once per request
+        self.server.connections_opened += 1  # type: ignore
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        num_tool_results = len([m for m in body["messages"] if m["role"] == "tool"])
+        message = {"role": "assistant", "content": None}
+        if num_tool_results < NUM_TURNS - 1:
+            message["tool_calls"] = [
+                {
+                    "id": f"call_{num_tool_results}",
+                    "type": "function",
+                    "function": {"name": "get_counter", "arguments": json.dumps({"turn": num_tool_results})},
+                }
+            ]
+        else:
+            message["content"] = "done"
+        response = json.dumps(
+            {
+                "id": "chatcmpl-stub",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{"index": 0, "message": message, "finish_reason": "stop"}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response)
+
+
+def get_counter(turn: int) -> str:
+    """Returns the current turn."""
+    return str(turn)
+
+
+def run_conversation(base_url: str, use_shared_client: bool) -> None:
+    llm = OpenAIChat(
+        model="stub", api_key="stub", base_url=base_url, use_shared_client=use_shared_client, function_call_limit=100
+    )
+    llm.add_tool(get_counter)
+    llm.response(messages=[Message(role="user", content="Count to ten")])
+
+
+def main():
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    for use_shared_client in (False, True):
+        clear_shared_clients()
+        server.connections_opened = 0
+        timer = Timer()
+        timer.start()
+        run_conversation(base_url=base_url, use_shared_client=use_shared_client)
+        timer.stop()
+        print(
+            f"use_shared_client={use_shared_client}: "
+            f"{server.connections_opened} connections for {NUM_TURNS} turns in {timer.elapsed:.4f}s"
+        )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
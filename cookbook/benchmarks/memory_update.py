@@ -0,0 +1,122 @@
+"""Latency of 20 user turns of an Assistant with create_memories=True, updating the memory in the run vs on the
+background memory worker, and the number of classifier calls.
+
+The LLM replies after 200ms and the memory classifier after 500ms. Turns are sent back to back, so the background
+worker classifies the messages sent while it was busy in one batch.
+
+python cookbook/benchmarks/memory_update.py
+"""
+
+import time
+from typing import Any, List, Optional
+
+from phi.assistant import Assistant
+from phi.llm.base import LLM
+from phi.llm.message import Message
+from phi.memory.assistant import AssistantMemory
+from phi.memory.classifier import MemoryClassifier
+from phi.memory.db import MemoryDb
+from phi.memory.manager import MemoryManager
+from phi.memory.memory import Memory
+from phi.memory.row import MemoryRow
+from phi.memory.worker import MemoryUpdateWorker
+from phi.utils.timer import Timer
+
+NUM_TURNS = 20
+RESPONSE_LATENCY = 0.2
+CLASSIFIER_LATENCY = 0.5
+
+
+class SleepingLLM(LLM):
+    model: str = "sleeping"
+    latency: float = RESPONSE_LATENCY
+    reply: str = "Noted"
+    calls: int = 0
+
+    def response(self, messages: List[Message]) -> str:
+        time.sleep(self.latency)
+        self.calls += 1
+        return self.reply
+
+
+class ListMemoryDb(MemoryDb):
+    def __init__(self) -> None:
+        self.rows: List[MemoryRow] = []
+
+    def create_table(self) -> None:
+        pass
+
+    def memory_exists(self, memory: MemoryRow) -> bool:
+        return False
+
+    def read_memories(
+        self, user_id: Optional[str] = None, limit: Optional[int] = None, sort: Optional[str] = None
+    ) -> List[MemoryRow]:
+        rows = [row for row in self.rows if row.user_id == user_id][::-1]
+        return rows[:limit] if limit else rows
+
+    def upsert_memory(self, memory: MemoryRow) -> Optional[MemoryRow]:
+        self.rows.append(memory)
+        return memory
+
+    def delete_memory(self, id: str) -> None:
+        pass
+
+    def delete_table(self) -> None:
+        pass
+
+    def table_exists(self) -> bool:
+        return True
+
+    def clear_table(self) -> bool:
+        return True
+
+
+class StoringMemoryManager(MemoryManager):
+    """Stores the messages as a memory without a call to the LLM"""
+
+    def run(self, message: Optional[str] = None, **kwargs: Any) -> str:
+        assert self.db is not None
+        self.db.upsert_memory(MemoryRow(user_id=self.user_id, memory=Memory(memory=str(message)).to_dict()))
+        return "Memory added successfully"
+
+
+def main() -> None:
+    print(
+        f"{'memory update':<12} {'mean turn (s)':>14} {'max turn (s)':>13} {'total (s)':>10} {'classifier calls':>17}"
+    )
+    for background in (False, True):
+        db = ListMemoryDb()
+        classifier_llm = SleepingLLM(latency=CLASSIFIER_LATENCY, reply="yes")
+        assistant = Assistant(
+            llm=SleepingLLM(),
+            user_id="benchmark",
+            create_memories=True,
+            update_memory_in_background=background,
+            memory=AssistantMemory(
+                db=db,
+                user_id="benchmark",
+                classifier=MemoryClassifier(llm=classifier_llm),
+                manager=StoringMemoryManager(user_id="benchmark", db=db),
+                worker=MemoryUpdateWorker(),
+            ),
+        )
+        turns: List[float] = []
+        total = Timer()
+        total.start()
+        for turn in range(NUM_TURNS):
+            timer = Timer()
+            timer.start()
+            assistant.run(f"Fact number {turn} about me", stream=False)
+            timer.stop()
+            turns.append(timer.elapsed)
+        assistant.flush_memory()
+        total.stop()
+        print(
+            f"{'background' if background else 'in the run':<12} {sum(turns) / len(turns):>14.3f} "
+            f"{max(turns):>13.3f} {total.elapsed:>10.2f} {classifier_llm.calls:>17}"
+        )
+
+
+if __name__ == "__main__":
+    main()
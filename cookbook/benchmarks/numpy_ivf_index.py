@@ -0,0 +1,88 @@
+"""Recall@10 and search latency of NumpyDb with an IVF index, for different numbers of probes.
+
+The embeddings are clustered random vectors, so results depend on the data.
+Run it on your own collection's embeddings to pick index.lists and index.probes.
+
+python cookbook/benchmarks/numpy_ivf_index.py
+"""
+
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from phi.document import Document
+from phi.embedder.base import Embedder
+from phi.utils.timer import Timer
+from phi.vectordb.numpydb import Ivfflat, NumpyDb
+
+NUM_CHUNKS = 200_000
+NUM_CLUSTERS = 2_000
+NUM_QUERIES = 100
+DIMENSIONS = 256
+LIMIT = 10
+
+rng = np.random.default_rng(0)
+centers = rng.standard_normal((NUM_CLUSTERS, DIMENSIONS), dtype=np.float32)
+data = centers[rng.integers(NUM_CLUSTERS, size=NUM_CHUNKS)] + rng.standard_normal(
+    (NUM_CHUNKS, DIMENSIONS), dtype=np.float32
+)
+queries = data[rng.integers(NUM_CHUNKS, size=NUM_QUERIES)] + rng.standard_normal(
+    (NUM_QUERIES, DIMENSIONS), dtype=np.float32
+)
+
+
+class DatasetEmbedder(Embedder):
+    """Returns the row of the dataset named by the text, "Chunk {i}"."""
+
+    dimensions: int = DIMENSIONS
+    batch_size: int = 10_000
+    max_concurrent_batches: int = 1
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        embeddings, usage = self.get_batch_embeddings_and_usage([text])
+        return embeddings[0], usage
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        return data[[int(text.split()[1]) for text in texts]].tolist(), None
+
+
+def search(vector_db: NumpyDb) -> Tuple[List[List[str]], float]:
+    """Returns the ids found for each query and the median latency in ms."""
+    results = []
+    latencies = []
+    for query in queries:
+        timer = Timer()
+        timer.start()
+        documents = vector_db.search_by_embedding(query.tolist(), limit=LIMIT)
+        timer.stop()
+        results.append([document.id or "" for document in documents])
+        latencies.append(timer.elapsed * 1000)
+    return results, float(np.median(latencies))
+
+
+if __name__ == "__main__":
+    with TemporaryDirectory() as tmp_dir:
+        vector_db = NumpyDb(collection="bench", path=tmp_dir, embedder=DatasetEmbedder(), index=Ivfflat())
+        vector_db.create()
+        vector_db.insert([Document(id=str(i), content=f"Chunk {i}") for i in range(NUM_CHUNKS)])
+
+        exact, exact_latency = search(vector_db)
+        print(f"{NUM_CHUNKS} chunks, {DIMENSIONS} dimensions, {NUM_QUERIES} queries")
+        print(f"  exact search: p50 {exact_latency:.1f}ms")
+
+        timer = Timer()
+        timer.start()
+        vector_db.optimize()
+        timer.stop()
+        assert vector_db.index is not None
+        print(f"  built {vector_db.index.get_num_lists(NUM_CHUNKS)} lists in {timer.elapsed:.1f}s")
+
+        for probes in (1, 5, 10, 20, 50):
+            vector_db.index.probes = probes
+            found, latency = search(vector_db)
+            recall = np.mean([len(set(e) & set(f)) / len(e) for e, f in zip(exact, found)])
+            print(f"  probes={probes}: recall@{LIMIT} {recall:.3f}, p50 {latency:.1f}ms")
@@ -0,0 +1,87 @@
+"""Insert time, size on disk and search latency of the embedded NumpyDb vector store,
+compared with LanceDb when `lancedb` is installed.
+
+The embedder is a fake that returns random vectors, so only the vector db is measured.
+
+python cookbook/benchmarks/numpy_vector_store.py
+"""
+
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from phi.document import Document
+from phi.embedder.base import Embedder
+from phi.utils.timer import Timer
+from phi.vectordb.base import VectorDb
+from phi.vectordb.numpydb import NumpyDb
+
+NUM_CHUNKS = 100_000
+NUM_QUERIES = 200
+DIMENSIONS = 384
+
+
+class RandomEmbedder(Embedder):
+    dimensions: int = DIMENSIONS
+    batch_size: int = 10_000
+    max_concurrent_batches: int = 1
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        embeddings, usage = self.get_batch_embeddings_and_usage([text])
+        return embeddings[0], usage
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        rng = np.random.default_rng(len(texts))
+        return rng.standard_normal((len(texts), self.dimensions), dtype=np.float32).tolist(), None
+
+
+def get_size(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / 1024 / 1024
+
+
+def run(vector_db: VectorDb, path: Path, label: str) -> None:
+    documents = [
+        Document(content=f"Chunk {i} " + "lorem ipsum " * 20, meta_data={"page": i % 100}) for i in range(NUM_CHUNKS)
+    ]
+    timer = Timer()
+    timer.start()
+    vector_db.create()
+    vector_db.insert(documents)
+    timer.stop()
+
+    latencies = []
+    for i in range(NUM_QUERIES):
+        query_timer = Timer()
+        query_timer.start()
+        vector_db.search(f"Query {i}", limit=5)
+        query_timer.stop()
+        latencies.append(query_timer.elapsed * 1000)
+
+    print(
+        f"  {label}: insert {NUM_CHUNKS / timer.elapsed:,.0f} rows/s, {get_size(path):.0f}MB on disk, "
+        f"search p50 {np.percentile(latencies, 50):.1f}ms p95 {np.percentile(latencies, 95):.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    print(f"{NUM_CHUNKS} chunks, {DIMENSIONS} dimensions, {NUM_QUERIES} queries")
+    for dtype in ("float32", "float16", "int8"):
+        with TemporaryDirectory() as tmp_dir:
+            run(
+                NumpyDb(collection="bench", path=tmp_dir, embedder=RandomEmbedder(), dtype=dtype),
+                Path(tmp_dir),
+                f"NumpyDb {dtype}",
+            )
+
+    try:
+        from phi.vectordb.lancedb import LanceDb
+    except ImportError:
+        print("  LanceDb: skipped, `lancedb` not installed")
+    else:
+        with TemporaryDirectory() as tmp_dir:
+            run(LanceDb(embedder=RandomEmbedder(), uri=tmp_dir, table_name="bench"), Path(tmp_dir), "LanceDb")
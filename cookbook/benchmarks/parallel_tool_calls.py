@@ -0,0 +1,54 @@
+"""Compare running 5 independent I/O-bound tool calls one by one and in parallel.
+
+python cookbook/benchmarks/parallel_tool_calls.py
+"""
+
+import asyncio
+import time
+
+from phi.llm.base import LLM
+from phi.tools.function import FunctionCall
+from phi.utils.timer import Timer
+
+NUM_CALLS = 5
+CALL_LATENCY = 0.5
+
+
+def get_stock_price(symbol: str) -> str:
+    """Returns the stock price for a symbol."""
+    time.sleep(CALL_LATENCY)
+    return f"{symbol}: 100"
+
+
+async def search_news(query: str) -> str:
+    """Searches the news for a query."""
+    await asyncio.sleep(CALL_LATENCY)
+    return f"No news for {query}"
+
+
+def run_turn(max_parallel_tool_calls: int) -> float:
+    llm = LLM(model="fake", max_parallel_tool_calls=max_parallel_tool_calls)
+    llm.add_tool(get_stock_price)
+    llm.add_tool(search_news)
+    assert llm.functions is not None
+
+    function_calls = [
+        FunctionCall(
+            function=llm.functions["get_stock_price"] if i % 2 == 0 else llm.functions["search_news"],
+            arguments={"symbol": f"S{i}"} if i % 2 == 0 else {"query": f"Q{i}"},
+            call_id=f"call_{i}",
+        )
+        for i in range(NUM_CALLS)
+    ]
+    timer = Timer()
+    timer.start()
+    results = llm.run_function_calls(function_calls)
+    timer.stop()
+    assert [r.tool_call_id for r in results] == [f"call_{i}" for i in range(NUM_CALLS)]
+    return timer.elapsed
+
+
+if __name__ == "__main__":
+    print(f"{NUM_CALLS} tool calls, {CALL_LATENCY}s each")
+    for max_parallel_tool_calls in (1, NUM_CALLS):
+        print(f"max_parallel_tool_calls={max_parallel_tool_calls}: {run_turn(max_parallel_tool_calls):.4f}s")
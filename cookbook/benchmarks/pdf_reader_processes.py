@@ -0,0 +1,98 @@
+"""Pages/sec reading a generated corpus of 20 PDFs x 200 pages with PDFReader,
+extracting the pages in the calling thread vs in 2, 4, ... processes up to the number of cores.
+
+The files are read by the 4 read workers of the ingestion pipeline, which share the reader processes.
+Needs `pypdf`.
+
+python cookbook/benchmarks/pdf_reader_processes.py
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import List, Optional
+
+from phi.document.reader.pdf import PDFReader
+from phi.utils.timer import Timer
+
+NUM_FILES = 20
+PAGES_PER_FILE = 200
+LINES_PER_PAGE = 40
+READ_WORKERS = 4
+
+
+def write_pdf(path: Path, pages: List[List[str]]) -> None:
+    """Writes a PDF with a page of Helvetica text lines per list of lines"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_numbers = []
+    for lines in pages:
+        text = "".join(f"({line}) Tj T* " for line in lines)
+        stream = f"BT /F1 10 Tf 12 TL 50 780 Td {text}ET".encode()
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> "
+            b"/Contents %d 0 R >>" % (len(objects))
+        )
+        page_numbers.append(len(objects))
+    kids = " ".join(f"{number} 0 R" for number in page_numbers)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_numbers)} >>".encode()
+
+    pdf = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(pdf))
+        pdf += b"%d 0 obj\n%s\nendobj\n" % (number, obj)
+    xref_offset = len(pdf)
+    pdf += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    pdf += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    pdf += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+    path.write_bytes(bytes(pdf))
+
+
+def read_corpus(files: List[Path], num_processes: Optional[int]) -> float:
+    reader = PDFReader(chunk=False, num_processes=num_processes)
+    timer = Timer()
+    timer.start()
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        num_pages = sum(len(documents) for documents in executor.map(lambda file: reader.read(pdf=file), files))
+    timer.stop()
+    reader.shutdown()
+    assert num_pages == NUM_FILES * PAGES_PER_FILE
+    return timer.elapsed
+
+
+def main() -> None:
+    cores = os.cpu_count() or 1
+    with TemporaryDirectory() as directory:
+        files = []
+        for file_number in range(NUM_FILES):
+            path = Path(directory).joinpath(f"report_{file_number}.pdf")
+            write_pdf(
+                path,
+                [
+                    [
+                        f"Report {file_number} page {page} line {line}: lorem ipsum dolor sit amet"
+                        for line in range(LINES_PER_PAGE)
+                    ]
+                    for page in range(PAGES_PER_FILE)
+                ],
+            )
+            files.append(path)
+
+        print(f"Reading {NUM_FILES} PDFs x {PAGES_PER_FILE} pages on {cores} cores")
+        print(f"{'processes':<12} {'time (s)':>9} {'pages/s':>9} {'speedup':>8}")
+        baseline = read_corpus(files, num_processes=None)
+        print(f"{'none':<12} {baseline:>9.2f} {NUM_FILES * PAGES_PER_FILE / baseline:>9.0f} {1:>8.2f}")
+        num_processes = 2
+        while num_processes <= max(2, cores):
+            elapsed = read_corpus(files, num_processes=num_processes)
+            print(
+                f"{num_processes:<12} {elapsed:>9.2f} {NUM_FILES * PAGES_PER_FILE / elapsed:>9.0f} "
+                f"{baseline / elapsed:>8.2f}"
+            )
+            num_processes *= 2
+
+
+if __name__ == "__main__":
+    main()
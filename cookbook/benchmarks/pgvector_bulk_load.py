@@ -0,0 +1,73 @@
+"""Load 100k synthetic chunks into PgVector2 and report rows/sec for each write path.
+
+Needs a local PostgreSQL with pgvector, started with ./cookbook/run_pgvector.sh
+
+python cookbook/benchmarks/pgvector_bulk_load.py
+"""
+
+import random
+from os import getenv
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from phi.document import Document
+from phi.embedder.base import Embedder
+from phi.knowledge.base import AssistantKnowledge
+from phi.utils.timer import Timer
+from phi.vectordb.pgvector import PgVector2
+
+db_url = getenv("PG_DB_URL", "postgresql+psycopg://ai:ai@localhost:5532/ai")
+
+NUM_ROWS = 100_000
+DOCUMENTS_PER_LIST = 1000
+DIMENSIONS = 256
+
+
+class FakeEmbedder(Embedder):
+    """Returns random vectors instantly, so only the database writes are measured."""
+
+    dimensions: int = DIMENSIONS
+
+    def get_embedding(self, text: str) -> List[float]:
+        return [random.random() for _ in range(self.dimensions)]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return self.get_embedding(text), None
+
+
+class SyntheticKnowledgeBase(AssistantKnowledge):
+    num_rows: int = NUM_ROWS
+
+    @property
+    def document_lists(self) -> Iterator[List[Document]]:
+        # Documents are created one list at a time, never all at once
+        for start in range(0, self.num_rows, DOCUMENTS_PER_LIST):
+            yield [
+                Document(name="synthetic", content=f"Chunk {i}: " + "lorem ipsum dolor sit amet " * 20)
+                for i in range(start, min(start + DOCUMENTS_PER_LIST, self.num_rows))
+            ]
+
+
+def run(label: str, num_rows: int, use_copy: bool = False, upsert: bool = False, batch_size: int = 500) -> None:
+    vector_db = PgVector2(collection="benchmark_bulk_load", db_url=db_url, embedder=FakeEmbedder(), use_copy=use_copy)
+    if not upsert:
+        vector_db.delete()
+    vector_db.create()
+    knowledge_base = SyntheticKnowledgeBase(vector_db=vector_db, num_rows=num_rows)
+
+    timer = Timer()
+    timer.start()
+    for documents in knowledge_base.document_lists:
+        if upsert:
+            vector_db.upsert(documents, batch_size=batch_size)
+        else:
+            vector_db.insert(documents, batch_size=batch_size)
+    timer.stop()
+    print(f"{label}: {num_rows} rows in {timer.elapsed:.1f}s, {num_rows / timer.elapsed:,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    # One INSERT and commit per row, as insert() worked before, on a smaller sample
+    run("INSERT one row per statement", num_rows=NUM_ROWS // 20, batch_size=1)
+    run("INSERT 500 rows per statement", num_rows=NUM_ROWS)
+    run("INSERT ... ON CONFLICT 500 rows per statement (updates the rows above)", num_rows=NUM_ROWS, upsert=True)
+    run("COPY FROM STDIN (FORMAT BINARY)", num_rows=NUM_ROWS, use_copy=True)
@@ -0,0 +1,78 @@
+"""Search latency and result size with and without returning embeddings,
+for 1536 and 3072 dimensional vectors.
+
+Runs against NumpyDb. Set PG_DB_URL (for example postgresql+psycopg://ai:ai@localhost:5532/ai)
+to also run against PgVector2, where the embeddings are sent over the wire.
+
+python cookbook/benchmarks/search_projection.py
+"""
+
+from os import getenv
+from tempfile import TemporaryDirectory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from phi.document import Document
+from phi.embedder.base import Embedder
+from phi.utils.timer import Timer
+from phi.vectordb.base import VectorDb
+
+NUM_CHUNKS = 10_000
+NUM_QUERIES = 100
+LIMIT = 10
+
+
+class RandomEmbedder(Embedder):
+    batch_size: int = 5_000
+    max_concurrent_batches: int = 1
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        embeddings, usage = self.get_batch_embeddings_and_usage([text])
+        return embeddings[0], usage
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        rng = np.random.default_rng(len(texts))
+        return rng.standard_normal((len(texts), self.dimensions), dtype=np.float32).tolist(), None
+
+
+def run(vector_db: VectorDb, label: str) -> None:
+    vector_db.create()
+    vector_db.insert([Document(content=f"Chunk {i} " + "lorem ipsum " * 40) for i in range(NUM_CHUNKS)])
+    for return_embeddings in (True, False):
+        latencies = []
+        result_bytes = 0
+        for i in range(NUM_QUERIES):
+            timer = Timer()
+            timer.start()
+            documents = vector_db.search(f"Query {i}", limit=LIMIT, return_embeddings=return_embeddings)
+            timer.stop()
+            latencies.append(timer.elapsed * 1000)
+            result_bytes += sum(len(document.model_dump_json(exclude={"embedder"})) for document in documents)
+        print(
+            f"  {label} return_embeddings={return_embeddings}: p50 {np.median(latencies):.2f}ms, "
+            f"{result_bytes / NUM_QUERIES / 1024:.0f}KB per query"
+        )
+    vector_db.delete()
+
+
+if __name__ == "__main__":
+    from phi.vectordb.numpydb import NumpyDb
+
+    print(f"{NUM_CHUNKS} chunks, {NUM_QUERIES} queries, {LIMIT} results per query")
+    for dimensions in (1536, 3072):
+        embedder = RandomEmbedder(dimensions=dimensions)
+        with TemporaryDirectory() as tmp_dir:
+            run(NumpyDb(collection="bench", path=tmp_dir, embedder=embedder), f"NumpyDb {dimensions}d")
+
+        pg_db_url = getenv("PG_DB_URL")
+        if pg_db_url is not None:
+            from phi.vectordb.pgvector import PgVector2
+
+            run(
+                PgVector2(collection=f"bench_projection_{dimensions}", db_url=pg_db_url, embedder=embedder),
+                f"PgVector2 {dimensions}d",
+            )
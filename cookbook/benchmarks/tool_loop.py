@@ -0,0 +1,81 @@
+"""Run a 50-round tool-calling conversation against a fake LLM.
+
+Compares the iterative tool loop in LLM.response() with the previous recursive pattern, where every round
+called response() again and re-logged the whole conversation.
+
+python cookbook/benchmarks/tool_loop.py
+"""
+
+import inspect
+import logging
+from typing import List
+
+from phi.llm.base import LLM
+from phi.llm.message import Message
+from phi.utils.log import logger
+from phi.utils.timer import Timer
+
+NUM_ROUNDS = 50
+
+
+def get_time() -> str:
+    """Returns the current time."""
+    return f"stack depth: {len(inspect.stack(0))}"
+
+
+class FakeLLM(LLM):
+    """Asks for a tool call until NUM_ROUNDS tool rounds have run, then answers."""
+
+    model: str = "fake"
+    function_call_limit: int = NUM_ROUNDS + 1
+
+    def get_assistant_message(self, messages: List[Message]) -> Message:
+        tool_rounds = sum(1 for m in messages if m.role == "tool")
+        if tool_rounds < NUM_ROUNDS:
+            tool_call = {"id": f"call_{tool_rounds}", "type": "function", "function": {"name": "get_time"}}
+            return Message(role="assistant", tool_calls=[tool_call])
+        return Message(role="assistant", content="Done")
+
+
+class RecursiveFakeLLM(FakeLLM):
+    """The tool loop as providers implemented it before: log everything, run tools, recurse."""
+
+    def response(self, messages: List[Message]) -> str:
+        for m in messages:
+            m.log()
+        assistant_message = self.get_assistant_message(messages)
+        messages.append(assistant_message)
+        assistant_message.log()
+        if assistant_message.tool_calls is not None:
+            function_calls = self.get_function_calls_to_run(assistant_message, messages)
+            messages.extend(self.run_function_calls(function_calls))
+            return self.response(messages=messages)
+        return assistant_message.get_content_string()
+
+
+def run(llm: LLM) -> None:
+    llm.add_tool(get_time)
+    messages = [Message(role="user", content="What time is it?")]
+    timer = Timer()
+    timer.start()
+    llm.response(messages=messages)
+    timer.stop()
+
+    tool_messages = [m for m in messages if m.role == "tool"]
+    assert len(tool_messages) == NUM_ROUNDS
+    print(f"{llm.__class__.__name__}:")
+    print(f"  time per round: {timer.elapsed / NUM_ROUNDS * 1000:.3f}ms")
+    print(f"  first round {tool_messages[0].content}, last round {tool_messages[-1].content}")
+
+
+if __name__ == "__main__":
+    print(f"{NUM_ROUNDS} tool rounds")
+    run(RecursiveFakeLLM())
+    run(FakeLLM())
+
+    # Format debug logs without printing them
+    print(f"\n{NUM_ROUNDS} tool rounds with debug logging")
+    logger.handlers = [logging.NullHandler()]
+    logger.setLevel(logging.DEBUG)
+    run(RecursiveFakeLLM())
+    run(FakeLLM())
@@ -0,0 +1,179 @@
+"""Pages/sec crawling a local fixture site of 1000 pages with WebsiteReader, fetching one page at a time with
+httpx.get like the crawler before WebsiteCrawl (without its 1-3s sleep between pages) vs concurrently,
+and crawling the site again with conditional requests.
+
+The site is served by http.server on localhost with 20ms of latency per request. It has a robots.txt disallowing
+/private/, a sitemap index, and pages with an ETag that link to 3 child pages each.
+
+python cookbook/benchmarks/website_crawler.py
+"""
+
+import logging
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse
+
+import httpx
+from bs4 import BeautifulSoup
+
+from phi.document.reader.website import WebsiteReader
+from phi.utils.timer import Timer
+
+NUM_PAGES = 1000
+LATENCY = 0.02
+MAX_DEPTH = 10
+
+
+class FixtureSite(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests: Dict[str, int] = {}
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def send(self, status: int, body: bytes = b"", content_type: str = "text/html", etag: str = "") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        time.sleep(LATENCY)
+        base = f"http://{self.headers['Host']}"
+        path = urlparse(self.path).path
+        kind = "page" if path.startswith("/page/") else path
+        FixtureSite.requests[kind] = FixtureSite.requests.get(kind, 0) + 1
+
+        if path == "/robots.txt":
+            self.send(200, f"User-agent: *\nDisallow: /private/\nSitemap: {base}/sitemap.xml\n".encode(), "text/plain")
+        elif path == "/sitemap.xml":
+            sitemaps = "".join(f"<sitemap><loc>{base}/sitemap-{i}.xml</loc></sitemap>" for i in range(2))
+            self.send(200, f"<sitemapindex>{sitemaps}</sitemapindex>".encode(), "application/xml")
+        elif path.startswith("/sitemap-"):
+            part = int(path[len("/sitemap-") : -len(".xml")])
+            urls = "".join(f"<url><loc>{base}/page/{i}</loc></url>" for i in range(part, NUM_PAGES, 2))
+            self.send(200, f"<urlset>{urls}</urlset>".encode(), "application/xml")
+        elif path.startswith("/page/") and int(path[len("/page/") :]) < NUM_PAGES:
+            page = int(path[len("/page/") :])
+            etag = f'"page-{page}-v1"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send(304, etag=etag)
+                return
+            children = range(3 * page + 1, min(3 * page + 4, NUM_PAGES))
+            links = "".join(f'<a href="/page/{child}">Page {child}</a>' for child in children)
+            body = (
+                f"<html><body><nav>{links}<a href='/private/{page}'>Private</a><a href='/page/0#top'>Home</a>"
+                f"<a href='mailto:team@example.com'>Mail</a></nav><article><h1>Page {page}</h1>"
+                + f"<p>Page {page} of the fixture site. " * 20
+                + "</p></article></body></html>"
+            )
+            self.send(200, body.encode(), etag=etag)
+        else:
+            self.send(404)
+
+
+def legacy_crawl(url: str, max_depth: int, max_links: int) -> Dict[str, str]:
+    """WebsiteReader.crawl() before WebsiteCrawl, without the 1-3s sleep between pages"""
+    reader = WebsiteReader()
+    num_links = 0
+    crawler_result: Dict[str, str] = {}
+    primary_domain = reader._get_primary_domain(url)
+    visited: Set[str] = set()
+    urls_to_crawl: List[Tuple[str, int]] = [(url, 1)]
+    while urls_to_crawl:
+        current_url, current_depth = urls_to_crawl.pop(0)
+        if (
+            current_url in visited
+            or not urlparse(current_url).netloc.endswith(primary_domain)
+            or current_depth > max_depth
+            or num_links >= max_links
+        ):
+            continue
+        visited.add(current_url)
+        try:
+            response = httpx.get(current_url, timeout=10)
+            soup = BeautifulSoup(response.content, "html.parser")
+            main_content = reader._extract_main_content(soup)
+            if main_content:
+                crawler_result[current_url] = main_content
+                num_links += 1
+            for link in soup.find_all("a", href=True):
+                full_url = urljoin(current_url, link["href"])
+                parsed_url = urlparse(full_url)
+                if parsed_url.netloc.endswith(primary_domain) and not any(
+                    parsed_url.path.endswith(ext) for ext in [".pdf", ".jpg", ".png"]
+                ):
+                    if full_url not in visited and (full_url, current_depth + 1) not in urls_to_crawl:
+                        urls_to_crawl.append((full_url, current_depth + 1))
+        except Exception:
+            pass
+    return crawler_result
+
+
+def new_reader(max_concurrency: int, requests_per_second: Optional[float] = None) -> WebsiteReader:
+    return WebsiteReader(
+        max_depth=MAX_DEPTH,
+        max_links=NUM_PAGES,
+        chunk=False,
+        max_concurrency=max_concurrency,
+        max_concurrency_per_host=max_concurrency,
+        requests_per_second=requests_per_second,
+    )
+
+
+def main() -> None:
+    # The legacy crawler parses the bytes of the responses, bs4 logs a warning for each page without a charset
+    logging.getLogger("bs4").setLevel(logging.ERROR)
+    server = ThreadingHTTPServer(("localhost", 0), FixtureSite)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://localhost:{server.server_address[1]}/page/0"
+
+    print(f"Crawling {NUM_PAGES} pages with {int(LATENCY * 1000)}ms latency per request")
+    print(f"{'crawl':<44} {'time (s)':>9} {'pages':>6} {'pages/s':>8} {'first (s)':>10} {'requests':>9}")
+    runs = [
+        ("one page at a time (legacy, no sleeps)", None),
+        ("concurrent, 10 requests", new_reader(max_concurrency=10)),
+        ("concurrent, 32 requests", new_reader(max_concurrency=32)),
+        ("concurrent, 32 requests, 100 requests/s", new_reader(max_concurrency=32, requests_per_second=100)),
+    ]
+    for label, run_reader in runs:
+        FixtureSite.requests = {}
+        timer = Timer()
+        timer.start()
+        first_page = ""
+        if run_reader is None:
+            num_pages = len(legacy_crawl(url, max_depth=MAX_DEPTH, max_links=NUM_PAGES))
+        else:
+            num_pages = 0
+            for _ in run_reader.iter_documents(url):
+                if num_pages == 0:
+                    first_page = f"{timer.elapsed:.2f}"
+                num_pages += 1
+        timer.stop()
+        print(
+            f"{label:<44} {timer.elapsed:>9.2f} {num_pages:>6} {num_pages / timer.elapsed:>8.0f} "
+            f"{first_page:>10} {sum(FixtureSite.requests.values()):>9}"
+        )
+
+    # The pages were not modified, so the second crawl gets a 304 for each page and yields them from the page cache
+    recrawl_reader = runs[2][1]
+    assert recrawl_reader is not None
+    FixtureSite.requests = {}
+    timer = Timer()
+    timer.start()
+    num_pages = len(recrawl_reader.read(url))
+    timer.stop()
+    print(
+        f"{'crawl again, conditional requests':<44} {timer.elapsed:>9.2f} {num_pages:>6} "
+        f"{'':>8} {'':>10} {sum(FixtureSite.requests.values()):>9}"
+    )
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import asyncio
 import json
 from os import getenv
 from uuid import uuid4
@@ -15,25 +16,27 @@ from typing import (
     Literal,
     cast,
     AsyncIterator,
+    Tuple,
 )
 
 from pydantic import BaseModel, ConfigDict, field_validator, Field, ValidationError
 
 from phi.document import Document
-from phi.assistant.run import AssistantRun
+from phi.assistant.run import AssistantRun, AssistantRunEntry
 from phi.knowledge.base import AssistantKnowledge
 from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.llm.references import References  # noqa: F401
 from phi.memory.assistant import AssistantMemory, MemoryRetrieval, Memory  # noqa: F401
 from phi.prompt.template import PromptTemplate
-from phi.storage.assistant import AssistantStorage
+from phi.storage.assistant import AssistantStorage, AsyncAssistantStorage
 from phi.utils.format_str import remove_indent
 from phi.tools import Tool, Toolkit, Function
 from phi.utils.log import logger, set_log_level_to_debug
 from phi.utils.message import get_text_from_message
 from phi.utils.merge_dict import merge_dictionaries
 from phi.utils.timer import Timer
+from phi.vectordb.filters import Filters
 
 
 class Assistant(BaseModel):
@@ -62,7 +65,7 @@ class Assistant(BaseModel):
     user_data: Optional[Dict[str, Any]] = None
 
     # -*- Assistant Memory
-    memory: AssistantMemory = AssistantMemory()
+    memory: AssistantMemory = Field(default_factory=AssistantMemory)
     # add_chat_history_to_messages=true_adds_the_chat_history_to_the_messages_sent_to_the_llm.
     add_chat_history_to_messages: bool = False
     # add_chat_history_to_prompt=True adds the formatted chat history to the user prompt.
@@ -73,11 +76,17 @@ class Assistant(BaseModel):
     create_memories: bool = False
     # Update memory after each run
     update_memory_after_run: bool = True
+    # Update memory on a background thread, so the run returns as soon as the response is done.
+    # Call flush_memory() to wait for the updates, e.g. before reading the memories back.
+    update_memory_in_background: bool = True
 
     # -*- Assistant Knowledge Base
     knowledge_base: Optional[AssistantKnowledge] = None
     # Enable RAG by adding references from the knowledge base to the prompt.
     add_references_to_prompt: bool = False
+    # Only search documents matching these meta_data filters, e.g. {"user_id": "..."}.
+    # Applies to the references and the search_knowledge_base tool, see phi.vectordb.filters
+    knowledge_filters: Optional[Filters] = None
 
     # -*- Assistant Storage
     storage: Optional[AssistantStorage] = None
@@ -323,12 +332,13 @@ class Assistant(BaseModel):
         if self.run_id is not None:
             self.llm.run_id = self.run_id
 
-    def load_memory(self) -> None:
+    def load_memory(self, query: Optional[str] = None) -> None:
+        """Loads the memories of the user, with semantic retrieval the memories most similar to the query"""
         if self.memory is not None:
             if self.user_id is not None:
                 self.memory.user_id = self.user_id
 
-            self.memory.load_memory()
+            self.memory.load_memory(query=query)
         if self.user_id is not None:
             logger.debug(f"Loaded memory for user: {self.user_id}")
         else:
@@ -337,13 +347,19 @@ class Assistant(BaseModel):
     def to_database_row(self) -> AssistantRun:
         """Create a AssistantRun for the current Assistant (to save to the database)"""
 
+        memory = self.memory.to_dict()
+        if self.storage is not None and self.storage.append_messages:
+            # chat_history, llm_messages and references are appended to the storage separately
+            for kind in ("chat_history", "llm_messages", "references"):
+                memory.pop(kind, None)
+
         return AssistantRun(
             name=self.name,
             run_id=self.run_id,
             run_name=self.run_name,
             user_id=self.user_id,
             llm=self.llm.to_dict() if self.llm is not None else None,
-            memory=self.memory.to_dict(),
+            memory=memory,
             assistant_data=self.assistant_data,
             run_data=self.run_data,
             user_data=self.user_data,
@@ -443,15 +459,102 @@ class Assistant(BaseModel):
             if self.db_row is not None:
                 logger.debug(f"-*- Loading run: {self.db_row.run_id}")
                 self.from_database_row(row=self.db_row)
+                if self.storage.append_messages:
+                    # Only load the messages needed for the next run, the rest are read on demand
+                    self.read_memory_entries_from_storage(kind="chat_history", last_n=self.num_history_messages)
+                    self.memory.llm_messages = []
+                    self.memory.references = []
+                    self.memory.mark_entries_saved()
                 logger.debug(f"-*- Loaded run: {self.run_id}")
         self.load_memory()
         return self.db_row
 
+    def read_memory_entries_from_storage(self, kind: str, last_n: Optional[int] = None) -> None:
+        """Load chat_history, llm_messages or references from storage that appends messages.
+
+        :param kind: One of chat_history, llm_messages or references.
+        :param last_n: The number of entries to load from the end. If None, loads all entries.
+        """
+
+        if self.storage is None or not self.storage.append_messages or self.run_id is None:
+            return
+
+        entries = self.storage.read_entries(run_id=self.run_id, kind=kind, last_n=last_n)
+        try:
+            self.memory.load_saved_entries(kind=kind, entries=[e.data for e in entries])
+        except Exception as e:
+            logger.warning(f"Failed to load assistant {kind}: {e}")
+
+    def get_unsaved_run_entries(self, row: AssistantRun) -> List[AssistantRunEntry]:
+        return [
+            AssistantRunEntry(run_id=row.run_id, kind=kind, data=data)
+            for kind, data in self.memory.get_unsaved_entries()
+        ]
+
     def write_to_storage(self) -> Optional[AssistantRun]:
         """Save the AssistantRun to the storage"""
 
         if self.storage is not None:
-            self.db_row = self.storage.upsert(row=self.to_database_row())
+            if self.storage.append_messages:
+                # Append only the new messages and skip reading the run back
+                row = self.to_database_row()
+                self.storage.append(row=row, entries=self.get_unsaved_run_entries(row=row))
+                self.memory.mark_entries_saved()
+                self.db_row = row
+            else:
+                self.db_row = self.storage.upsert(row=self.to_database_row())
+        return self.db_row
+
+    async def aread_from_storage(self) -> Optional[AssistantRun]:
+        """Load the AssistantRun from storage without blocking the event loop"""
+
+        if not isinstance(self.storage, AsyncAssistantStorage):
+            return self.read_from_storage()
+
+        if self.run_id is not None:
+            self.db_row = await self.storage.aread(run_id=self.run_id)
+            if self.db_row is not None:
+                logger.debug(f"-*- Loading run: {self.db_row.run_id}")
+                self.from_database_row(row=self.db_row)
+                if self.storage.append_messages:
+                    # Only load the messages needed for the next run, the rest are read on demand
+                    await self.aread_memory_entries_from_storage(kind="chat_history", last_n=self.num_history_messages)
+                    self.memory.llm_messages = []
+                    self.memory.references = []
+                    self.memory.mark_entries_saved()
+                logger.debug(f"-*- Loaded run: {self.run_id}")
+        self.load_memory()
+        return self.db_row
+
+    async def aread_memory_entries_from_storage(self, kind: str, last_n: Optional[int] = None) -> None:
+        """Async version of read_memory_entries_from_storage()"""
+
+        if not isinstance(self.storage, AsyncAssistantStorage):
+            return self.read_memory_entries_from_storage(kind=kind, last_n=last_n)
+
+        if not self.storage.append_messages or self.run_id is None:
+            return
+
+        entries = await self.storage.aread_entries(run_id=self.run_id, kind=kind, last_n=last_n)
+        try:
+            self.memory.load_saved_entries(kind=kind, entries=[e.data for e in entries])
+        except Exception as e:
+            logger.warning(f"Failed to load assistant {kind}: {e}")
+
+    async def awrite_to_storage(self) -> Optional[AssistantRun]:
+        """Save the AssistantRun to the storage without blocking the event loop"""
+
+        if not isinstance(self.storage, AsyncAssistantStorage):
+            return self.write_to_storage()
+
+        if self.storage.append_messages:
+            # Append only the new messages and skip reading the run back
+            row = self.to_database_row()
+            await self.storage.aappend(row=row, entries=self.get_unsaved_run_entries(row=row))
+            self.memory.mark_entries_saved()
+            self.db_row = row
+        else:
+            self.db_row = await self.storage.aupsert(row=self.to_database_row())
         return self.db_row
 
     def add_introduction(self, introduction: str) -> None:
@@ -671,12 +774,13 @@ class Assistant(BaseModel):
 
         # Then add memories to the system prompt
         if self.create_memories:
-            if self.memory.memories and len(self.memory.memories) > 0:
+            memories = self.memory.get_memories_within_limit()
+            if len(memories) > 0:
                 system_prompt_lines.append(
                     "\nYou have access to memory from previous interactions with the user that you can use:"
                 )
                 system_prompt_lines.append("<memory_from_previous_interactions>")
-                system_prompt_lines.append("\n".join([f"- {memory.memory}" for memory in self.memory.memories]))
+                system_prompt_lines.append("\n".join([f"- {memory.memory}" for memory in memories]))
                 system_prompt_lines.append("</memory_from_previous_interactions>")
                 system_prompt_lines.append(
                     "Note: this information is from previous interactions and may be updated in this conversation. "
@@ -710,23 +814,35 @@ class Assistant(BaseModel):
     def get_references_from_knowledge_base(self, query: str, num_documents: Optional[int] = None) -> Optional[str]:
         """Return a list of references from the knowledge base"""
 
+        return self.get_references_and_retrieval(query=query, num_documents=num_documents)[0]
+
+    def get_references_and_retrieval(
+        self, query: str, num_documents: Optional[int] = None
+    ) -> Tuple[Optional[str], Optional[Dict[str, Dict[str, Any]]]]:
+        """Return a list of references from the knowledge base,
+        and the limit, number of results and time of each search for a hybrid search.
+        """
+
         if self.references_function is not None:
             reference_kwargs = {"assistant": self, "query": query, "num_documents": num_documents}
-            return remove_indent(self.references_function(**reference_kwargs))
+            return remove_indent(self.references_function(**reference_kwargs)), None
 
         if self.knowledge_base is None:
-            return None
+            return None, None
 
-        relevant_docs: List[Document] = self.knowledge_base.search(query=query, num_documents=num_documents)
+        relevant_docs: List[Document]
+        relevant_docs, retrieval = self.knowledge_base.search_with_retrieval(
+            query=query, num_documents=num_documents, filters=self.knowledge_filters
+        )
         if len(relevant_docs) == 0:
-            return None
+            return None, retrieval
 
         if self.references_format == "yaml":
             import yaml
 
-            return yaml.dump([doc.to_dict() for doc in relevant_docs])
+            return yaml.dump([doc.to_dict() for doc in relevant_docs]), retrieval
 
-        return json.dumps([doc.to_dict() for doc in relevant_docs], indent=2)
+        return json.dumps([doc.to_dict() for doc in relevant_docs], indent=2), retrieval
 
     def get_formatted_chat_history(self) -> Optional[str]:
         """Returns a formatted chat history to add to the user prompt"""
@@ -822,6 +938,10 @@ class Assistant(BaseModel):
         # Update the LLM (set defaults, add tools, etc.)
         self.update_llm()
 
+        # Load the memories most similar to the message for the system prompt
+        if self.create_memories and self.memory.retrieval == MemoryRetrieval.semantic and isinstance(message, str):
+            self.load_memory(query=message)
+
         # -*- Prepare the List of messages sent to the LLM
         llm_messages: List[Message] = []
 
@@ -863,10 +983,13 @@ class Assistant(BaseModel):
             if self.add_references_to_prompt and message and isinstance(message, str):
                 reference_timer = Timer()
                 reference_timer.start()
-                user_prompt_references = self.get_references_from_knowledge_base(query=message)
+                user_prompt_references, retrieval = self.get_references_and_retrieval(query=message)
                 reference_timer.stop()
                 references = References(
-                    query=message, references=user_prompt_references, time=round(reference_timer.elapsed, 4)
+                    query=message,
+                    references=user_prompt_references,
+                    time=round(reference_timer.elapsed, 4),
+                    retrieval=retrieval,
                 )
                 logger.debug(f"Time to get references: {reference_timer.elapsed:.4f}s")
             # Add chat history to the user prompt
@@ -902,7 +1025,7 @@ class Assistant(BaseModel):
             self.memory.add_chat_message(message=user_message)
             # Update the memory with the user message if needed
             if self.create_memories and self.update_memory_after_run:
-                self.memory.update_memory(input=user_message.get_content_string())
+                self.update_memory_after_message(user_message)
 
         # Build the LLM response message to add to the memory - this is added to the chat_history
         llm_response_message = Message(role="assistant", content=llm_response)
@@ -1013,11 +1136,15 @@ class Assistant(BaseModel):
     ) -> AsyncIterator[str]:
         logger.debug(f"*********** Run Start: {self.run_id} ***********")
         # Load run from storage
-        self.read_from_storage()
+        await self.aread_from_storage()
 
         # Update the LLM (set defaults, add tools, etc.)
         self.update_llm()
 
+        # Load the memories most similar to the message for the system prompt, on a thread as it embeds the message
+        if self.create_memories and self.memory.retrieval == MemoryRetrieval.semantic and isinstance(message, str):
+            await asyncio.to_thread(self.load_memory, query=message)
+
         # -*- Prepare the List of messages sent to the LLM
         llm_messages: List[Message] = []
 
@@ -1060,10 +1187,13 @@ class Assistant(BaseModel):
             if self.add_references_to_prompt and message and isinstance(message, str):
                 reference_timer = Timer()
                 reference_timer.start()
-                user_prompt_references = self.get_references_from_knowledge_base(query=message)
+                user_prompt_references, retrieval = self.get_references_and_retrieval(query=message)
                 reference_timer.stop()
                 references = References(
-                    query=message, references=user_prompt_references, time=round(reference_timer.elapsed, 4)
+                    query=message,
+                    references=user_prompt_references,
+                    time=round(reference_timer.elapsed, 4),
+                    retrieval=retrieval,
                 )
                 logger.debug(f"Time to get references: {reference_timer.elapsed:.4f}s")
             # Add chat history to the user prompt
@@ -1099,8 +1229,8 @@ class Assistant(BaseModel):
         if user_message is not None:
             self.memory.add_chat_message(message=user_message)
             # Update the memory with the user message if needed
-            if self.update_memory_after_run:
-                self.memory.update_memory(input=user_message.get_content_string())
+            if self.create_memories and self.update_memory_after_run:
+                self.update_memory_after_message(user_message)
 
         # Build the LLM response message to add to the memory - this is added to the chat_history
         llm_response_message = Message(role="assistant", content=llm_response)
@@ -1118,7 +1248,7 @@ class Assistant(BaseModel):
         self.output = llm_response
 
         # -*- Save run to storage
-        self.write_to_storage()
+        await self.awrite_to_storage()
 
         # -*- Send run event for monitoring
         # Response type for this run
@@ -1291,6 +1421,7 @@ class Assistant(BaseModel):
             - To get the first chat, use num_chats=None and pick the first message.
         """
         history: List[Dict[str, Any]] = []
+        self.read_memory_entries_from_storage(kind="chat_history")
         all_chats = self.memory.get_chats()
         if len(all_chats) == 0:
             return ""
@@ -1318,6 +1449,7 @@ class Assistant(BaseModel):
             - To get the last tool call, use num_calls=1.
             - To get all tool calls, use num_calls=None.
         """
+        self.read_memory_entries_from_storage(kind="llm_messages")
         tool_calls = self.memory.get_tool_calls(num_calls)
         if len(tool_calls) == 0:
             return ""
@@ -1335,9 +1467,11 @@ class Assistant(BaseModel):
         """
         reference_timer = Timer()
         reference_timer.start()
-        references = self.get_references_from_knowledge_base(query=query)
+        references, retrieval = self.get_references_and_retrieval(query=query)
         reference_timer.stop()
-        _ref = References(query=query, references=references, time=round(reference_timer.elapsed, 4))
+        _ref = References(
+            query=query, references=references, time=round(reference_timer.elapsed, 4), retrieval=retrieval
+        )
         self.memory.add_references(references=_ref)
         return references or ""
 
@@ -1366,6 +1500,19 @@ class Assistant(BaseModel):
         )
         return "Successfully added to knowledge base"
 
+    def update_memory_after_message(self, user_message: Message) -> None:
+        """Updates the memory with a user message, on the memory worker if update_memory_in_background is True"""
+        if self.update_memory_in_background:
+            self.memory.update_memory_in_background(input=user_message.get_content_string())
+        else:
+            self.memory.update_memory(input=user_message.get_content_string())
+
+    def flush_memory(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the memory updates of this assistant running in the background are done.
+        Returns False if the timeout expired first.
+        """
+        return self.memory.flush(timeout=timeout)
+
     def update_memory(self, task: str) -> str:
         """Use this function to update the Assistant's memory. Describe the task in detail.
 
@@ -44,3 +44,20 @@ class AssistantRun(BaseModel):
         _dict["created_at"] = self.created_at.isoformat() if self.created_at else None
         _dict["updated_at"] = self.updated_at.isoformat() if self.updated_at else None
         return _dict
+
+
+class AssistantRunEntry(BaseModel):
+    """A chat message, llm message or reference appended to an Assistant Run in the database"""
+
+    # Run UUID
+    run_id: str
+    # Sequence number of this entry, increases with every entry appended to the storage
+    seq: Optional[int] = None
+    # Memory list this entry belongs to: chat_history, llm_messages or references
+    kind: str
+    # The entry as a dictionary
+    data: Dict[str, Any]
+    # The timestamp of when this entry was created
+    created_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
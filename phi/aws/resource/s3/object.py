@@ -21,6 +21,9 @@ class S3Object(AwsResource):
     bucket_name: str
     # The Object’s key identifier. This must be set.
     name: str = Field(..., alias="key")
+    # The ETag and size in bytes of the object, set when listed with S3Bucket.get_objects()
+    e_tag: Optional[str] = None
+    size: Optional[int] = None
 
     @property
     def uri(self) -> str:
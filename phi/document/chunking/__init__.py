@@ -0,0 +1,8 @@
+from phi.document.chunking.base import ChunkingStrategy
+from phi.document.chunking.clean import clean_text
+from phi.document.chunking.fixed import FixedSizeChunking, collapse_whitespace
+from phi.document.chunking.markdown import MarkdownChunking
+from phi.document.chunking.paragraph import ParagraphChunking
+from phi.document.chunking.recursive import RecursiveChunking
+from phi.document.chunking.semantic import SemanticChunking
+from phi.document.chunking.sentence import SentenceWindowChunking, split_sentences
@@ -0,0 +1,35 @@
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+from phi.document.base import Document
+
+
+class ChunkingStrategy(BaseModel):
+    """Base class for splitting a document into smaller documents"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    def chunk(self, document: Document) -> Iterator[Document]:
+        """Yields the chunks of the document"""
+        raise NotImplementedError
+
+    def chunk_all(self, documents: List[Document]) -> List[Document]:
+        chunks: List[Document] = []
+        for document in documents:
+            chunks.extend(self.chunk(document))
+        return chunks
+
+    def create_chunk(
+        self, document: Document, content: str, chunk_number: int, meta_data: Optional[Dict[str, Any]] = None
+    ) -> Document:
+        """Returns a chunk of the document, numbered from 1, with the meta_data of the document and of the chunk"""
+        meta_data = {**document.meta_data, **meta_data} if meta_data else document.meta_data.copy()
+        meta_data["chunk"] = chunk_number
+        meta_data["chunk_size"] = len(content)
+        chunk_id = None
+        if document.id:
+            chunk_id = f"{document.id}_{chunk_number}"
+        elif document.name:
+            chunk_id = f"{document.name}_{chunk_number}"
+        return Document(id=chunk_id, name=document.name, meta_data=meta_data, content=content)
@@ -0,0 +1,25 @@
+from typing import List
+
+
+def clean_text(text: str) -> str:
+    """Normalizes whitespace in a single pass over the lines of the text:
+    runs of spaces, tabs, form feeds and vertical tabs become a space, lines are stripped,
+    and 1 blank line or more between two lines becomes a single blank line, so paragraphs can still be split on.
+
+    The lines and words are split with str.split(), which runs in C, instead of matching every space with a regex.
+    """
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+    cleaned: List[str] = []
+    blank_line = False
+    for line in text.split("\n"):
+        words = line.split()
+        if not words:
+            blank_line = True
+            continue
+        if len(cleaned) > 0:
+            cleaned.append("\n\n" if blank_line else "\n")
+        cleaned.append(" ".join(words))
+        blank_line = False
+    return "".join(cleaned)
@@ -0,0 +1,44 @@
+from typing import Iterator
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+
+
+def collapse_whitespace(text: str) -> str:
+    """Replaces each run of whitespace, newlines included, with a single space"""
+    collapsed = " ".join(text.split())
+    if not collapsed:
+        return " " if text else ""
+    # A run of whitespace at the start or the end of the text also becomes a space
+    if text[0].isspace():
+        collapsed = " " + collapsed
+    if text[-1].isspace():
+        collapsed = collapsed + " "
+    return collapsed
+
+
+class FixedSizeChunking(ChunkingStrategy):
+    """Collapses the whitespace of the text, then splits it into chunks of up to chunk_size characters,
+    ending each chunk at the last space that fits. The default strategy of the readers.
+
+    The chunks are the same as the readers produced before phi.document.chunking, so collections loaded then
+    keep the same content hashes. Use RecursiveChunking to keep paragraphs and lines together.
+    """
+
+    chunk_size: int = 3000
+
+    def chunk(self, document: Document) -> Iterator[Document]:
+        text = collapse_whitespace(document.content)
+        text_length = len(text)
+        chunk_number = 1
+        start = 0
+        while start < text_length:
+            end = start + self.chunk_size
+            if end < text_length:
+                # End the chunk at the last space after its first character, so a word is not split in half
+                space = text.rfind(" ", start + 1, end + 1)
+                end = space if space != -1 else start + self.chunk_size
+            end = min(end, text_length)
+            yield self.create_chunk(document, text[start:end], chunk_number)
+            chunk_number += 1
+            start = end
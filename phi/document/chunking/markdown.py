@@ -0,0 +1,100 @@
+import re
+from typing import Iterator, List, Tuple
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+from phi.document.chunking.recursive import RecursiveChunking
+
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.*?)[\s#]*$")
+FENCE_PATTERN = re.compile(r"^\s*(`{3,}|~{3,})")
+
+
+class MarkdownChunking(ChunkingStrategy):
+    """Splits markdown into sections at its headings, then makes chunks of up to chunk_size of the blocks of each
+    section: paragraphs, lists, tables and code blocks. A chunk never spans two sections, and a table or code block
+    is only split when it is larger than chunk_size, on its lines.
+
+    The headings of a chunk are added to meta_data["headings"], and with include_headings the headings above the
+    chunk are written at its start, so a chunk from the middle of a section is still found by its headings.
+    """
+
+    chunk_size: int = 3000
+    include_headings: bool = True
+
+    def chunk(self, document: Document) -> Iterator[Document]:
+        chunk_number = 1
+        for headings, body in self.get_sections(document.content):
+            for content in self.merge_blocks(body):
+                if self.include_headings and len(headings) > 0:
+                    content = "\n".join(f"{'#' * level} {title}" for level, title in headings) + "\n\n" + content
+                yield self.create_chunk(
+                    document, content, chunk_number, meta_data={"headings": [title for _, title in headings]}
+                )
+                chunk_number += 1
+
+    def get_sections(self, text: str) -> Iterator[Tuple[List[Tuple[int, str]], List[str]]]:
+        """Yields the headings and the blocks of each section, skipping sections with no text below the heading"""
+        headings: List[Tuple[int, str]] = []
+        blocks: List[str] = []
+        block: List[str] = []
+        # The fence that opened the current code block
+        fence = ""
+
+        for line in text.replace("\r\n", "\n").split("\n"):
+            line = line.rstrip()
+            if fence:
+                block.append(line)
+                if line.lstrip().startswith(fence):
+                    blocks.append("\n".join(block))
+                    block = []
+                    fence = ""
+                continue
+
+            fence_match = FENCE_PATTERN.match(line)
+            heading_match = HEADING_PATTERN.match(line) if fence_match is None else None
+            # Tables and code blocks are blocks of their own, even without blank lines around them
+            starts_block = (
+                fence_match is not None
+                or heading_match is not None
+                or not line
+                or (line.startswith("|") != (len(block) > 0 and block[-1].startswith("|")))
+            )
+            if starts_block and len(block) > 0:
+                blocks.append("\n".join(block))
+                block = []
+
+            if heading_match is not None:
+                if len(blocks) > 0:
+                    yield headings, blocks
+                    blocks = []
+                level = len(heading_match.group(1))
+                headings = [heading for heading in headings if heading[0] < level] + [(level, heading_match.group(2))]
+            elif fence_match is not None:
+                fence = fence_match.group(1)
+                block.append(line)
+            elif line:
+                block.append(line)
+
+        if len(block) > 0:
+            blocks.append("\n".join(block))
+        if len(blocks) > 0:
+            yield headings, blocks
+
+    def merge_blocks(self, blocks: List[str]) -> Iterator[str]:
+        """Joins consecutive blocks into chunks of up to chunk_size, splitting the blocks that are larger"""
+        splitter = RecursiveChunking(chunk_size=self.chunk_size, separators=["\n", ". ", " "], clean=False)
+        chunk: List[str] = []
+        chunk_length = 0
+        for block in blocks:
+            if len(chunk) > 0 and chunk_length + 2 + len(block) > self.chunk_size:
+                yield "\n\n".join(chunk)
+                chunk = []
+                chunk_length = 0
+            if len(block) > self.chunk_size:
+                for start, end in splitter.merge(splitter.split(block, 0, len(block), 0)):
+                    yield block[start:end].strip("\n")
+                continue
+            chunk_length += len(block) + (2 if len(chunk) > 0 else 0)
+            chunk.append(block)
+        if len(chunk) > 0:
+            yield "\n\n".join(chunk)
@@ -0,0 +1,50 @@
+from typing import Iterator, Optional, Tuple
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+from phi.document.chunking.clean import clean_text
+from phi.document.chunking.recursive import RecursiveChunking
+
+
+class ParagraphChunking(ChunkingStrategy):
+    """Makes a chunk of each paragraph, the text between blank lines.
+    Paragraphs shorter than min_chunk_size, like headings or captions, are joined with the paragraphs after them,
+    and paragraphs longer than chunk_size are split on lines, sentences and words.
+    """
+
+    chunk_size: int = 3000
+    min_chunk_size: int = 200
+    clean: bool = True
+
+    def chunk(self, document: Document) -> Iterator[Document]:
+        text = clean_text(document.content) if self.clean else document.content
+        chunk_number = 1
+        for start, end in self.get_spans(text):
+            content = text[start:end].strip()
+            if content:
+                yield self.create_chunk(document, content, chunk_number)
+                chunk_number += 1
+
+    def get_spans(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yields the start and end of each chunk"""
+        splitter = RecursiveChunking(chunk_size=self.chunk_size, separators=["\n", ". ", " "], clean=False)
+        # Start of the short paragraphs waiting to be joined with the next paragraph
+        pending: Optional[int] = None
+        start = 0
+        while start < len(text):
+            found = text.find("\n\n", start)
+            end = len(text) if found == -1 else found
+            chunk_start = start if pending is None else pending
+            if end - chunk_start > self.chunk_size:
+                if pending is not None:
+                    yield pending, start
+                    pending = None
+                yield from splitter.merge(splitter.split(text, start, end, 0))
+            elif end - chunk_start < self.min_chunk_size:
+                pending = chunk_start
+            else:
+                yield chunk_start, end
+                pending = None
+            start = end + 2
+        if pending is not None:
+            yield pending, len(text)
@@ -0,0 +1,89 @@
+from collections import deque
+from typing import Callable, Deque, Iterator, List, Optional, Tuple
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+from phi.document.chunking.clean import clean_text
+
+# The start, end and length of a piece of text
+Piece = Tuple[int, int, int]
+
+
+class RecursiveChunking(ChunkingStrategy):
+    """Splits the text on the first separator it contains, and the pieces that are still larger than chunk_size
+    on the next separators, then merges consecutive pieces into chunks of up to chunk_size.
+    Pieces are offsets into the text, so only the chunks are copied.
+    """
+
+    chunk_size: int = 3000
+    # Size of the text repeated from the end of the previous chunk at the start of the next chunk
+    chunk_overlap: int = 0
+    # Separators to split on, tried in order, so larger units (paragraphs, lines) are kept together first
+    separators: List[str] = ["\n\n", "\n", ". ", " "]
+    # Measures the size of a text, the number of characters by default.
+    # Use get_tiktoken_length() from phi.document.chunking.tokenizer to size chunks in tokens.
+    length_function: Optional[Callable[[str], int]] = None
+    # Normalize the whitespace of the text before splitting, see phi.document.chunking.clean
+    clean: bool = True
+
+    def chunk(self, document: Document) -> Iterator[Document]:
+        if self.chunk_overlap >= self.chunk_size:
+            raise ValueError(
+                f"chunk_overlap ({self.chunk_overlap}) must be smaller than chunk_size ({self.chunk_size})"
+            )
+
+        text = clean_text(document.content) if self.clean else document.content
+        chunk_number = 1
+        for start, end in self.merge(self.split(text, 0, len(text), 0)):
+            content = text[start:end].strip()
+            if content:
+                yield self.create_chunk(document, content, chunk_number)
+                chunk_number += 1
+
+    def get_length(self, text: str, start: int, end: int) -> int:
+        if self.length_function is None:
+            return end - start
+        return self.length_function(text[start:end])
+
+    def split(self, text: str, start: int, end: int, separator_index: int) -> Iterator[Piece]:
+        """Yields pieces of text[start:end] that fit in chunk_size, each separator stays at the end of its piece"""
+        length = self.get_length(text, start, end)
+        if length <= self.chunk_size:
+            yield start, end, length
+            return
+
+        for index in range(separator_index, len(self.separators)):
+            separator = self.separators[index]
+            if not separator or text.find(separator, start, end) == -1:
+                continue
+            piece_start = start
+            while piece_start < end:
+                found = text.find(separator, piece_start, end)
+                piece_end = end if found == -1 else found + len(separator)
+                yield from self.split(text, piece_start, piece_end, index + 1)
+                piece_start = piece_end
+            return
+
+        # None of the separators are in the text, split it every chunk_size characters
+        for piece_start in range(start, end, self.chunk_size):
+            piece_end = min(piece_start + self.chunk_size, end)
+            yield piece_start, piece_end, self.get_length(text, piece_start, piece_end)
+
+    def merge(self, pieces: Iterator[Piece]) -> Iterator[Tuple[int, int]]:
+        """Yields the start and end of each chunk, merging pieces until the next one does not fit.
+        The next chunk starts with the last pieces of the chunk that fit in chunk_overlap.
+        """
+        chunk: Deque[Piece] = deque()
+        chunk_length = 0
+        for piece in pieces:
+            piece_length = piece[2]
+            if len(chunk) > 0 and chunk_length + piece_length > self.chunk_size:
+                yield chunk[0][0], chunk[-1][1]
+                while len(chunk) > 0 and (
+                    chunk_length > self.chunk_overlap or chunk_length + piece_length > self.chunk_size
+                ):
+                    chunk_length -= chunk.popleft()[2]
+            chunk.append(piece)
+            chunk_length += piece_length
+        if len(chunk) > 0:
+            yield chunk[0][0], chunk[-1][1]
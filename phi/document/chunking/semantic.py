@@ -0,0 +1,79 @@
+from typing import Iterator, List, Optional, Tuple
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+from phi.document.chunking.clean import clean_text
+from phi.document.chunking.sentence import split_sentences
+from phi.embedder import Embedder
+
+
+class SemanticChunking(ChunkingStrategy):
+    """Starts a new chunk where the topic of the text changes: each sentence is embedded with the buffer_size
+    sentences around it, and the text is split between the sentences whose embeddings are further apart than
+    breakpoint_percentile percent of the consecutive sentences of the document.
+
+    The sentences of a document are embedded in batches with embedder.get_embeddings(),
+    so chunking costs about one embedding request per batch_size sentences.
+    """
+
+    # Defaults to OpenAIEmbedder
+    embedder: Optional[Embedder] = None
+    # Number of sentences before and after a sentence embedded with it, to smooth out short sentences
+    buffer_size: int = 1
+    breakpoint_percentile: float = 95
+    # Chunks are split on sentences when larger than chunk_size characters
+    chunk_size: int = 3000
+    clean: bool = True
+
+    def get_embedder(self) -> Embedder:
+        if self.embedder is None:
+            from phi.embedder.openai import OpenAIEmbedder
+
+            self.embedder = OpenAIEmbedder()
+        return self.embedder
+
+    def chunk(self, document: Document) -> Iterator[Document]:
+        text = clean_text(document.content) if self.clean else document.content
+        sentences = split_sentences(text, max_length=self.chunk_size)
+        chunk_number = 1
+        for first, last in self.get_groups(text, sentences):
+            # Split groups larger than chunk_size between sentences
+            start = first
+            for index in range(first + 1, last + 1):
+                if sentences[index][1] - sentences[start][0] > self.chunk_size:
+                    yield self.create_chunk(document, text[sentences[start][0] : sentences[index - 1][1]], chunk_number)
+                    chunk_number += 1
+                    start = index
+            yield self.create_chunk(document, text[sentences[start][0] : sentences[last][1]], chunk_number)
+            chunk_number += 1
+
+    def get_groups(self, text: str, sentences: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        """Returns the first and last sentence of each group of sentences on the same topic"""
+        if len(sentences) <= 2:
+            return [(0, len(sentences) - 1)] if len(sentences) > 0 else []
+
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("`numpy` not installed")
+
+        last = len(sentences) - 1
+        windows = [
+            text[sentences[max(0, i - self.buffer_size)][0] : sentences[min(last, i + self.buffer_size)][1]]
+            for i in range(len(sentences))
+        ]
+        embeddings = np.asarray(self.get_embedder().get_embeddings(windows), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1)
+        norms[norms == 0] = 1
+        embeddings /= norms[:, None]
+        # Cosine distance between each sentence and the next
+        distances = 1 - np.einsum("ij,ij->i", embeddings[:-1], embeddings[1:])
+        threshold = np.percentile(distances, self.breakpoint_percentile)
+
+        groups: List[Tuple[int, int]] = []
+        first = 0
+        for index in np.flatnonzero(distances > threshold).tolist():
+            groups.append((first, index))
+            first = index + 1
+        groups.append((first, last))
+        return groups
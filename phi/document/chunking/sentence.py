@@ -0,0 +1,66 @@
+import re
+from typing import Iterator, List, Tuple
+
+from phi.document.base import Document
+from phi.document.chunking.base import ChunkingStrategy
+from phi.document.chunking.clean import clean_text
+
+# The whitespace after a sentence ending with ., ! or ?, optionally followed by a closing quote or bracket,
+# and line breaks, so headings and list items are sentences of their own
+SENTENCE_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?])[\"')\]]*\s+|\s*\n\s*")
+
+
+def split_sentences(text: str, max_length: int = 0) -> List[Tuple[int, int]]:
+    """Returns the start and end of each sentence of the text.
+    With max_length, longer sentences are split on spaces, or every max_length characters.
+    """
+    sentences: List[Tuple[int, int]] = []
+    start = 0
+    for match in SENTENCE_BOUNDARY_PATTERN.finditer(text):
+        end = match.start() + len(match.group().rstrip())
+        if end > start:
+            sentences.extend(split_long_sentence(text, start, end, max_length))
+        start = match.end()
+    if start < len(text):
+        sentences.extend(split_long_sentence(text, start, len(text), max_length))
+    return sentences
+
+
+def split_long_sentence(text: str, start: int, end: int, max_length: int) -> Iterator[Tuple[int, int]]:
+    while max_length > 0 and end - start > max_length:
+        split = text.rfind(" ", start + 1, start + max_length + 1)
+        if split == -1:
+            split = start + max_length
+        yield start, split
+        start = split + 1 if text[split] == " " else split
+    yield start, end
+
+
+class SentenceWindowChunking(ChunkingStrategy):
+    """Makes a chunk of each sentence, or of sentences_per_chunk sentences, so the embedding of a chunk matches
+    questions about that sentence, and adds the window_size sentences around it to meta_data["window"],
+    which is returned with the chunk to give the assistant the context of the sentence.
+    """
+
+    # Number of sentences in each chunk
+    sentences_per_chunk: int = 1
+    # Number of sentences before and after the chunk in its window
+    window_size: int = 3
+    # Sentences longer than chunk_size characters are split
+    chunk_size: int = 3000
+    clean: bool = True
+
+    def chunk(self, document: Document) -> Iterator[Document]:
+        text = clean_text(document.content) if self.clean else document.content
+        sentences = split_sentences(text, max_length=self.chunk_size)
+        step = max(1, self.sentences_per_chunk)
+        for chunk_number, first in enumerate(range(0, len(sentences), step), start=1):
+            last = min(first + step, len(sentences)) - 1
+            window_first = max(0, first - self.window_size)
+            window_last = min(len(sentences) - 1, last + self.window_size)
+            yield self.create_chunk(
+                document,
+                text[sentences[first][0] : sentences[last][1]],
+                chunk_number,
+                meta_data={"window": text[sentences[window_first][0] : sentences[window_last][1]]},
+            )
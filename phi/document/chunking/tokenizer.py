@@ -0,0 +1,18 @@
+from typing import Callable
+
+
+def get_tiktoken_length(encoding_name: str = "cl100k_base") -> Callable[[str], int]:
+    """Returns a function that counts the tokens of a text with a tiktoken encoding,
+    to size chunks in tokens with RecursiveChunking(length_function=get_tiktoken_length()).
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        raise ImportError("`tiktoken` not installed")
+
+    encoding = tiktoken.get_encoding(encoding_name)
+
+    def tiktoken_length(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return tiktoken_length
@@ -1,15 +1,151 @@
+import atexit
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from math import ceil
 from pathlib import Path
-from typing import List, Union, IO, Any
+from threading import Lock
+from typing import List, Union, IO, Any, Iterator, Optional, Tuple
 
 from phi.document.base import Document
 from phi.document.reader.base import Reader
 from phi.utils.log import logger
 
+# Guards the creation of the process pool of a reader, which may be shared by the threads reading files
+_executor_lock = Lock()
+# One OCR engine per process, created on first use
+_ocr_engine: Any = None
 
-class PDFReader(Reader):
+
+def get_ocr_engine() -> Any:
+    global _ocr_engine
+    if _ocr_engine is None:
+        try:
+            import rapidocr_onnxruntime as rapidocr
+        except ImportError:
+            raise ImportError("`rapidocr_onnxruntime` not installed")
+        _ocr_engine = rapidocr.RapidOCR()
+    return _ocr_engine
+
+
+def extract_page_text(page: Any, ocr: bool = False) -> str:
+    """Returns the text of a page, followed by the text of its images when ocr is True"""
+    if not ocr:
+        return page.extract_text()
+
+    page_text = page.extract_text() or ""
+    images_text_list: List[str] = []
+    for image_object in page.images:
+        # Perform OCR on the image
+        ocr_result, elapse = get_ocr_engine()(image_object.data)
+
+        # Extract text from OCR result
+        if ocr_result:
+            images_text_list += [item[1] for item in ocr_result]
+
+    images_text = "\n".join(images_text_list)
+    return page_text + "\n" + images_text
+
+
+def extract_page_texts(pdf: Union[str, bytes], start: int, end: int, ocr: bool = False) -> List[str]:
+    """Returns the texts of pages start to end of a PDF file or bytes, runs in the reader processes"""
+    from pypdf import PdfReader as DocumentReader
+
+    doc_reader = DocumentReader(BytesIO(pdf) if isinstance(pdf, bytes) else pdf)
+    return [extract_page_text(doc_reader.pages[page_index], ocr=ocr) for page_index in range(start, end)]
+
+
+class BasePDFReader(Reader):
+    """Extracts the pages of a PDF in the calling thread, or in a pool of processes with num_processes."""
+
+    # Number of processes that extract the pages of a PDF, None to extract the pages in the calling thread.
+    # The processes are shared by the files read at the same time, e.g. by the read workers of the ingestion pipeline,
+    # so a knowledge base of many PDFs is parsed on num_processes cores.
+    num_processes: Optional[int] = None
+    # Minimum number of pages extracted by a process at a time. A file is split in at most num_processes page ranges,
+    # as each process opens the file again to extract its range.
+    pages_per_task: int = 16
+    # Extract the text of the page images with OCR
+    ocr: bool = False
+
+    _executor: Optional[ProcessPoolExecutor] = None
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        with _executor_lock:
+            if self._executor is None:
+                logger.debug(f"Starting {self.num_processes} PDF reader processes")
+                # The pool is started from the threads reading files, forking a process with running threads
+                # can deadlock on locks held by the other threads, so the processes are spawned.
+                # Scripts using num_processes must guard their entry point with `if __name__ == "__main__":`
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.num_processes, mp_context=multiprocessing.get_context("spawn")
+                )
+                atexit.register(self.shutdown)
+            return self._executor
+
+    def shutdown(self) -> None:
+        """Stops the reader processes, they are started again on the next read"""
+        with _executor_lock:
+            if self._executor is not None:
+                logger.debug("Stopping PDF reader processes")
+                self._executor.shutdown()
+                self._executor = None
+                atexit.unregister(self.shutdown)
+
+    def get_page_texts(self, pdf: Union[str, Path, bytes, IO[Any]]) -> Iterator[str]:
+        """Yields the text of each page in page order.
+        With num_processes, ranges of pages are extracted in parallel by the reader processes.
+        """
+        from pypdf import PdfReader as DocumentReader
+
+        if self.num_processes is None or self.num_processes <= 1:
+            doc_reader = DocumentReader(BytesIO(pdf) if isinstance(pdf, bytes) else pdf)
+            for page in doc_reader.pages:
+                yield extract_page_text(page, ocr=self.ocr)
+            return
+
+        # Files are sent to the processes as a path, other objects as bytes
+        _pdf: Union[str, bytes]
+        if isinstance(pdf, (str, Path)):
+            _pdf = str(pdf)
+        elif isinstance(pdf, bytes):
+            _pdf = pdf
+        else:
+            _pdf = pdf.read()
+        num_pages = len(DocumentReader(BytesIO(_pdf) if isinstance(_pdf, bytes) else _pdf).pages)
+        range_size = max(self.pages_per_task, ceil(num_pages / self.num_processes))
+        page_ranges: List[Tuple[int, int]] = [
+            (start, min(start + range_size, num_pages)) for start in range(0, num_pages, range_size)
+        ]
+        futures = [
+            self.get_executor().submit(extract_page_texts, _pdf, start, end, self.ocr) for start, end in page_ranges
+        ]
+        for future in futures:
+            yield from future.result()
+
+    def iter_pdf_documents(self, pdf: Union[str, Path, bytes, IO[Any]], doc_name: str) -> Iterator[Document]:
+        """Yields a document per page, or the chunks of each page if chunk is True, in page order"""
+        for page_number, page_text in enumerate(self.get_page_texts(pdf), start=1):
+            document = Document(
+                name=doc_name,
+                id=f"{doc_name}_{page_number}",
+                meta_data={"page": page_number},
+                content=page_text,
+            )
+            if self.chunk:
+                yield from self.get_chunking_strategy().chunk(document)
+            else:
+                yield document
+
+
+class PDFReader(BasePDFReader):
     """Reader for PDF files"""
 
     def read(self, pdf: Union[str, Path, IO[Any]]) -> List[Document]:
+        return list(self.iter_documents(pdf))
+
+    def iter_documents(self, pdf: Union[str, Path, IO[Any]]) -> Iterator[Document]:
+        """Yields the documents of the PDF as its pages are extracted"""
         if not pdf:
             raise ValueError("No pdf provided")
 
@@ -28,34 +164,20 @@ class PDFReader(Reader):
             doc_name = "pdf"
 
         logger.info(f"Reading: {doc_name}")
-        doc_reader = DocumentReader(pdf)
+        yield from self.iter_pdf_documents(pdf, doc_name)
 
-        documents = [
-            Document(
-                name=doc_name,
-                id=f"{doc_name}_{page_number}",
-                meta_data={"page": page_number},
-                content=page.extract_text(),
-            )
-            for page_number, page in enumerate(doc_reader.pages, start=1)
-        ]
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
-        return documents
 
-
-class PDFUrlReader(Reader):
+class PDFUrlReader(BasePDFReader):
     """Reader for PDF files from URL"""
 
     def read(self, url: str) -> List[Document]:
+        return list(self.iter_documents(url))
+
+    def iter_documents(self, url: str) -> Iterator[Document]:
+        """Yields the documents of the PDF as its pages are extracted"""
         if not url:
             raise ValueError("No url provided")
 
-        from io import BytesIO
-
         try:
             import httpx
         except ImportError:
@@ -70,34 +192,24 @@ class PDFUrlReader(Reader):
         response = httpx.get(url)
 
         doc_name = url.split("/")[-1].split(".")[0].replace("/", "_").replace(" ", "_")
-        doc_reader = DocumentReader(BytesIO(response.content))
+        yield from self.iter_pdf_documents(response.content, doc_name)
 
-        documents = [
-            Document(
-                name=doc_name,
-                id=f"{doc_name}_{page_number}",
-                meta_data={"page": page_number},
-                content=page.extract_text(),
-            )
-            for page_number, page in enumerate(doc_reader.pages, start=1)
-        ]
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
-        return documents
 
-
-class PDFImageReader(Reader):
+class PDFImageReader(BasePDFReader):
     """Reader for PDF files with text and images extraction"""
 
+    ocr: bool = True
+
     def read(self, pdf: Union[str, Path, IO[Any]]) -> List[Document]:
+        return list(self.iter_documents(pdf))
+
+    def iter_documents(self, pdf: Union[str, Path, IO[Any]]) -> Iterator[Document]:
+        """Yields the documents of the PDF as its pages are extracted"""
         if not pdf:
             raise ValueError("No pdf provided")
 
         try:
-            import rapidocr_onnxruntime as rapidocr
+            import rapidocr_onnxruntime as rapidocr  # noqa: F401
             from pypdf import PdfReader as DocumentReader  # noqa: F401
         except ImportError:
             raise ImportError("`pypdf` or `rapidocr_onnxruntime` not installed")
@@ -112,60 +224,26 @@ class PDFImageReader(Reader):
             doc_name = "pdf"
 
         logger.info(f"Reading: {doc_name}")
-        doc_reader = DocumentReader(pdf)
-
-        # Initialize RapidOCR
-        ocr = rapidocr.RapidOCR()
-
-        documents = []
-        for page_number, page in enumerate(doc_reader.pages, start=1):
-            page_text = page.extract_text() or ""
-            images_text_list: List = []
-
-            for image_object in page.images:
-                image_data = image_object.data
-
-                # Perform OCR on the image
-                ocr_result, elapse = ocr(image_data)
-
-                # Extract text from OCR result
-                if ocr_result:
-                    images_text_list += [item[1] for item in ocr_result]
-
-            images_text: str = "\n".join(images_text_list)
-            content = page_text + "\n" + images_text
-
-            documents.append(
-                Document(
-                    name=doc_name,
-                    id=f"{doc_name}_{page_number}",
-                    meta_data={"page": page_number},
-                    content=content,
-                )
-            )
-
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
-
-        return documents
+        yield from self.iter_pdf_documents(pdf, doc_name)
 
 
-class PDFUrlImageReader(Reader):
+class PDFUrlImageReader(BasePDFReader):
     """Reader for PDF files from URL with text and images extraction"""
 
+    ocr: bool = True
+
     def read(self, url: str) -> List[Document]:
+        return list(self.iter_documents(url))
+
+    def iter_documents(self, url: str) -> Iterator[Document]:
+        """Yields the documents of the PDF as its pages are extracted"""
         if not url:
             raise ValueError("No url provided")
 
-        from io import BytesIO
-
         try:
             import httpx
-            from pypdf import PdfReader as DocumentReader
-            import rapidocr_onnxruntime as rapidocr
+            from pypdf import PdfReader as DocumentReader  # noqa: F401
+            import rapidocr_onnxruntime as rapidocr  # noqa: F401
         except ImportError:
             raise ImportError("`httpx`, `pypdf` or `rapidocr_onnxruntime` not installed")
 
@@ -174,46 +252,4 @@ class PDFUrlImageReader(Reader):
         response = httpx.get(url)
 
         doc_name = url.split("/")[-1].split(".")[0].replace(" ", "_")
-        doc_reader = DocumentReader(BytesIO(response.content))
-
-        # Initialize RapidOCR
-        ocr = rapidocr.RapidOCR()
-
-        # Process each page of the PDF
-        documents = []
-        for page_number, page in enumerate(doc_reader.pages, start=1):
-            page_text = page.extract_text() or ""
-            images_text_list = []
-
-            # Extract and process images
-            for image_object in page.images:
-                image_data = image_object.data
-
-                # Perform OCR on the image
-                ocr_result, elapse = ocr(image_data)
-
-                # Extract text from OCR result
-                if ocr_result:
-                    images_text_list += [item[1] for item in ocr_result]
-
-            images_text = "\n".join(images_text_list)
-            content = page_text + "\n" + images_text
-
-            # Append the document
-            documents.append(
-                Document(
-                    name=doc_name,
-                    id=f"{doc_name}_{page_number}",
-                    meta_data={"page": page_number},
-                    content=content,
-                )
-            )
-
-        # Optionally chunk documents
-        if self.chunk:
-            chunked_documents = []
-            for document in documents:
-                chunked_documents.extend(self.chunk_document(document))
-            return chunked_documents
-
-        return documents
+        yield from self.iter_pdf_documents(response.content, doc_name)
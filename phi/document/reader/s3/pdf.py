@@ -1,17 +1,19 @@
-from typing import List
+from typing import Iterator, List
 
 from phi.document.base import Document
-from phi.document.reader.base import Reader
+from phi.document.reader.pdf import BasePDFReader
 from phi.aws.resource.s3.object import S3Object
 from phi.utils.log import logger
 
 
-class S3PDFReader(Reader):
+class S3PDFReader(BasePDFReader):
     """Reader for PDF files on S3"""
 
     def read(self, s3_object: S3Object) -> List[Document]:
-        from io import BytesIO
+        return list(self.iter_documents(s3_object))
 
+    def iter_documents(self, s3_object: S3Object) -> Iterator[Document]:
+        """Yields the documents of the PDF as its pages are extracted"""
         if not s3_object:
             raise ValueError("No s3_object provided")
 
@@ -26,21 +28,6 @@ class S3PDFReader(Reader):
             object_resource = s3_object.get_resource()
             object_body = object_resource.get()["Body"]
             doc_name = s3_object.name.split("/")[-1].split(".")[0].replace("/", "_").replace(" ", "_")
-            doc_reader = DocumentReader(BytesIO(object_body.read()))
-            documents = [
-                Document(
-                    name=doc_name,
-                    id=f"{doc_name}_{page_number}",
-                    meta_data={"page": page_number},
-                    content=page.extract_text(),
-                )
-                for page_number, page in enumerate(doc_reader.pages, start=1)
-            ]
-            if self.chunk:
-                chunked_documents = []
-                for document in documents:
-                    chunked_documents.extend(self.chunk_document(document))
-                return chunked_documents
-            return documents
+            yield from self.iter_pdf_documents(object_body.read(), doc_name)
         except Exception:
             raise
@@ -1,7 +1,14 @@
-import time
-import random
-from typing import Set, Dict, List, Tuple
-from urllib.parse import urljoin, urlparse
+import asyncio
+from collections import deque
+from queue import Full, Queue
+from threading import Event, Thread
+from time import monotonic
+from typing import Any, AsyncIterator, Deque, Dict, Generator, Iterator, List, Optional, Set, Tuple, TypeVar
+from urllib.parse import urldefrag, urljoin, urlparse
+from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
+
+from pydantic import PrivateAttr
 
 from phi.document.base import Document
 from phi.document.reader.base import Reader
@@ -14,25 +21,38 @@ try:
 except ImportError:
     raise ImportError("The `bs4` package is not installed. Please install it via `pip install beautifulsoup4`.")
 
+T = TypeVar("T")
+
 
 class WebsiteReader(Reader):
-    """Reader for Websites"""
+    """Reader for Websites
+
+    Pages are crawled concurrently with a pooled httpx.AsyncClient, breadth first from the url, up to max_depth links
+    away and max_links pages with content. Each host gets at most max_concurrency_per_host requests at a time and
+    requests_per_second, and robots.txt is followed. Documents are yielded as pages arrive with iter_documents().
+    """
 
     max_depth: int = 3
     max_links: int = 10
 
-    _visited: Set[str] = set()
-    _urls_to_crawl: List[Tuple[str, int]] = []
-
-    def delay(self, min_seconds=1, max_seconds=3):
-        """
-        Introduce a random delay.
+    # Number of pages fetched at the same time
+    max_concurrency: int = 10
+    # Number of pages fetched from the same host at the same time
+    max_concurrency_per_host: int = 4
+    # Requests per second sent to the same host, None for no limit. A larger Crawl-delay in robots.txt is respected.
+    requests_per_second: Optional[float] = 10
+    # Skip the pages that robots.txt disallows for the user_agent
+    respect_robots_txt: bool = True
+    # Also crawl the pages in the sitemaps listed in robots.txt, or in /sitemap.xml, as links of the url
+    use_sitemap: bool = True
+    user_agent: str = "phidata"
+    # Seconds to wait for a page
+    timeout: float = 10
 
-        :param min_seconds: Minimum number of seconds to delay. Default is 1.
-        :param max_seconds: Maximum number of seconds to delay. Default is 3.
-        """
-        sleep_time = random.uniform(min_seconds, max_seconds)
-        time.sleep(sleep_time)
+    # ETag, Last-Modified, content and links of the pages crawled before, the ETag and Last-Modified are sent in
+    # conditional requests when the pages are crawled again. Pages that were not modified are not downloaded or parsed,
+    # their content and links are read from this cache, so every read still returns all the pages.
+    _page_cache: Dict[str, Dict[str, Any]] = PrivateAttr(default_factory=dict)
 
     def _get_primary_domain(self, url: str) -> str:
         """
@@ -65,6 +85,32 @@ class WebsiteReader(Reader):
 
         return ""
 
+    def parse_page(self, url: str, html: str) -> Tuple[str, List[str]]:
+        """
+        Returns the main content of a page and the urls it links to. Runs in a thread, so parsing a page does not
+        hold up the pages being fetched.
+
+        :param url: The URL of the page.
+        :param html: The HTML of the page.
+        :return: The main content and the absolute URLs of the links.
+        """
+        soup = BeautifulSoup(html, "html.parser")
+        links = [urljoin(url, str(link["href"])) for link in soup.find_all("a", href=True)]
+        return self._extract_main_content(soup), links
+
+    async def async_crawl(self, url: str, starting_depth: int = 1) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Crawls a website and yields each URL and the main content extracted from it, as the pages are fetched.
+
+        Note:
+        The function focuses on extracting the main content by prioritizing content inside common HTML tags
+        like `<article>`, `<main>`, and `<div>` with class names such as "content", "main-content", etc.
+        The crawler will also respect the `max_depth` attribute of the WebsiteReader class, ensuring it does not
+        crawl deeper than the specified depth.
+        """
+        async for page in WebsiteCrawl(reader=self, url=url, starting_depth=starting_depth).run():
+            yield page
+
     def crawl(self, url: str, starting_depth: int = 1) -> Dict[str, str]:
         """
         Crawls a website and returns a dictionary of URLs and their corresponding content.
@@ -76,95 +122,330 @@ class WebsiteReader(Reader):
         Returns:
         - Dict[str, str]: A dictionary where each key is a URL and the corresponding value is the main
                           content extracted from that URL.
-
-        Note:
-        The function focuses on extracting the main content by prioritizing content inside common HTML tags
-        like `<article>`, `<main>`, and `<div>` with class names such as "content", "main-content", etc.
-        The crawler will also respect the `max_depth` attribute of the WebCrawler class, ensuring it does not
-        crawl deeper than the specified depth.
         """
-        num_links = 0
-        crawler_result: Dict[str, str] = {}
-        primary_domain = self._get_primary_domain(url)
-        # Add starting URL with its depth to the global list
-        self._urls_to_crawl.append((url, starting_depth))
-        while self._urls_to_crawl:
-            # Unpack URL and depth from the global list
-            current_url, current_depth = self._urls_to_crawl.pop(0)
-
-            # Skip if
-            # - URL is already visited
-            # - does not end with the primary domain,
-            # - exceeds max depth
-            # - exceeds max links
-            if (
-                current_url in self._visited
-                or not urlparse(current_url).netloc.endswith(primary_domain)
-                or current_depth > self.max_depth
-                or num_links >= self.max_links
-            ):
-                continue
-
-            self._visited.add(current_url)
-            self.delay()
+        return dict(iterate_async(self.async_crawl(url, starting_depth=starting_depth)))
 
-            try:
-                logger.debug(f"Crawling: {current_url}")
-                response = httpx.get(current_url, timeout=10)
-                soup = BeautifulSoup(response.content, "html.parser")
-
-                # Extract main content
-                main_content = self._extract_main_content(soup)
-                if main_content:
-                    crawler_result[current_url] = main_content
-                    num_links += 1
-
-                # Add found URLs to the global list, with incremented depth
-                for link in soup.find_all("a", href=True):
-                    full_url = urljoin(current_url, link["href"])
-                    parsed_url = urlparse(full_url)
-                    if parsed_url.netloc.endswith(primary_domain) and not any(
-                        parsed_url.path.endswith(ext) for ext in [".pdf", ".jpg", ".png"]
-                    ):
-                        if full_url not in self._visited and (full_url, current_depth + 1) not in self._urls_to_crawl:
-                            self._urls_to_crawl.append((full_url, current_depth + 1))
-
-            except Exception as e:
-                logger.debug(f"Failed to crawl: {current_url}: {e}")
-                pass
+    async def async_iter_documents(self, url: str) -> AsyncIterator[Document]:
+        """Yields the documents of a website, or their chunks if chunk is True, as the pages are fetched"""
+        logger.debug(f"Reading: {url}")
+        async for crawled_url, crawled_content in self.async_crawl(url):
+            document = Document(name=url, id=crawled_url, meta_data={"url": crawled_url}, content=crawled_content)
+            if self.chunk:
+                for chunk in self.get_chunking_strategy().chunk(document):
+                    yield chunk
+            else:
+                yield document
 
-        return crawler_result
+    def iter_documents(self, url: str) -> Iterator[Document]:
+        """Yields the documents of a website as the pages are fetched, e.g. to stream them into the ingestion pipeline.
+        The crawl runs in an event loop of its own, so it is paused while the caller handles a document.
+        """
+        yield from iterate_async(self.async_iter_documents(url))
 
     def read(self, url: str) -> List[Document]:
         """
         Reads a website and returns a list of documents.
 
-        This function first converts the website into a dictionary of URLs and their corresponding content.
-        Then iterates through the dictionary and returns chunks of content.
-
         :param url: The URL of the website to read.
         :return: A list of documents.
         """
+        return list(self.iter_documents(url))
 
-        logger.debug(f"Reading: {url}")
-        crawler_result = self.crawl(url)
-        documents = []
-        for crawled_url, crawled_content in crawler_result.items():
-            if self.chunk:
-                documents.extend(
-                    self.chunk_document(
-                        Document(
-                            name=url, id=str(crawled_url), meta_data={"url": str(crawled_url)}, content=crawled_content
-                        )
-                    )
-                )
-            else:
-                documents.append(
-                    Document(
-                        name=url,
-                        id=str(crawled_url),
-                        meta_data={"url": str(crawled_url)},
-                        content=crawled_content,
-                    )
-                )
-        return documents
+    async def async_read(self, url: str) -> List[Document]:
+        """Reads a website in the running event loop and returns a list of documents."""
+        return [document async for document in self.async_iter_documents(url)]
+
+
+class HostLimits:
+    """The concurrency and rate limits and the robots.txt rules of a host"""
+
+    def __init__(self, max_concurrency: int, requests_per_second: Optional[float]):
+        self.semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        # Seconds between two requests to the host
+        self.interval: float = 1 / requests_per_second if requests_per_second else 0
+        self.next_request_time: float = 0
+        self.robots: Optional[RobotFileParser] = None
+        self.robots_loaded: bool = False
+        self.robots_lock = asyncio.Lock()
+
+    async def wait_turn(self) -> None:
+        """Waits for the next request slot of the host, slots are interval seconds apart"""
+        if self.interval <= 0:
+            return
+        now = monotonic()
+        start = max(now, self.next_request_time)
+        self.next_request_time = start + self.interval
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class WebsiteCrawl:
+    """The frontier, client and host limits of one WebsiteReader crawl"""
+
+    def __init__(self, reader: WebsiteReader, url: str, starting_depth: int = 1):
+        self.reader: WebsiteReader = reader
+        self.url: str = urldefrag(url)[0]
+        self.starting_depth: int = starting_depth
+        self.primary_domain: str = reader._get_primary_domain(url)
+
+        # URLs to crawl with their depth, and every URL added, so a URL is crawled once
+        self.frontier: Deque[Tuple[str, int]] = deque()
+        self.seen: Set[str] = set()
+        self.hosts: Dict[str, HostLimits] = {}
+        self.in_flight: int = 0
+        self.num_pages: int = 0
+        self.done: bool = False
+
+    async def run(self) -> AsyncIterator[Tuple[str, str]]:
+        num_workers = max(1, self.reader.max_concurrency)
+        # Set when the frontier or the number of pages in flight changes
+        self.changed = asyncio.Event()
+        # Pages waiting to be yielded, the workers wait when the caller is slower than the crawl
+        self.results: asyncio.Queue = asyncio.Queue(maxsize=2 * num_workers)
+
+        async with httpx.AsyncClient(
+            headers={"User-Agent": self.reader.user_agent},
+            limits=httpx.Limits(max_connections=num_workers, max_keepalive_connections=num_workers),
+            timeout=self.reader.timeout,
+            follow_redirects=True,
+        ) as client:
+            self.client = client
+            # The url is crawled first, so it is among the pages even when max_links is reached by other pages
+            if self.add(self.url, self.starting_depth):
+                await self.crawl_next()
+            if self.reader.use_sitemap and not self.done:
+                await self.add_sitemap_pages()
+
+            workers = [asyncio.create_task(self.work()) for _ in range(num_workers)]
+            finish = asyncio.create_task(self.finish(workers))
+            try:
+                while True:
+                    page = await self.results.get()
+                    if page is None:
+                        break
+                    yield page
+            finally:
+                self.done = True
+                for task in workers + [finish]:
+                    task.cancel()
+                await asyncio.gather(*workers, finish, return_exceptions=True)
+
+    async def finish(self, workers: List["asyncio.Task[None]"]) -> None:
+        await asyncio.gather(*workers)
+        await self.results.put(None)
+
+    def add(self, url: str, depth: int) -> bool:
+        """Adds a URL to the frontier if it is on the website, within max_depth and not added before"""
+        url = urldefrag(url)[0]
+        parsed_url = urlparse(url)
+        if (
+            depth > self.reader.max_depth
+            or url in self.seen
+            or parsed_url.scheme not in ("http", "https")
+            or not parsed_url.netloc.endswith(self.primary_domain)
+            or any(parsed_url.path.endswith(ext) for ext in [".pdf", ".jpg", ".png"])
+        ):
+            return False
+        self.seen.add(url)
+        self.frontier.append((url, depth))
+        self.changed.set()
+        return True
+
+    async def work(self) -> None:
+        while not self.done:
+            if len(self.frontier) == 0:
+                if self.in_flight == 0:
+                    # Nothing left to crawl and no page in flight to add links
+                    return
+                self.changed.clear()
+                await self.changed.wait()
+                continue
+            await self.crawl_next()
+
+    async def crawl_next(self) -> None:
+        url, depth = self.frontier.popleft()
+        self.in_flight += 1
+        try:
+            await self.crawl_page(url, depth)
+        except Exception as e:
+            logger.debug(f"Failed to crawl: {url}: {e}")
+        finally:
+            self.in_flight -= 1
+            self.changed.set()
+
+    async def crawl_page(self, url: str, depth: int) -> None:
+        host = await self.get_host(url)
+        if host.robots is not None and not host.robots.can_fetch(self.reader.user_agent, url):
+            logger.debug(f"Skipping: {url}, disallowed by robots.txt")
+            return
+
+        page_cache = self.reader._page_cache
+        cached = page_cache.get(url)
+        headers: Dict[str, str] = {}
+        if cached is not None:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        logger.debug(f"Crawling: {url}")
+        async with host.semaphore:
+            await host.wait_turn()
+            response = await self.client.get(url, headers=headers)
+
+        if response.status_code == 304 and cached is not None:
+            logger.debug(f"Not modified: {url}")
+            content, links = cached["content"], cached["links"]
+        else:
+            response.raise_for_status()
+            if "html" not in response.headers.get("content-type", "text/html"):
+                return
+            content, links = await asyncio.to_thread(self.reader.parse_page, url, response.text)
+            etag, last_modified = response.headers.get("etag"), response.headers.get("last-modified")
+            if etag or last_modified:
+                page_cache[url] = {"etag": etag, "last_modified": last_modified, "content": content, "links": links}
+
+        for link in links:
+            self.add(link, depth + 1)
+        if content and self.num_pages < self.reader.max_links:
+            self.num_pages += 1
+            if self.num_pages >= self.reader.max_links:
+                self.done = True
+                self.changed.set()
+            await self.results.put((url, content))
+
+    async def get_host(self, url: str) -> HostLimits:
+        """Returns the limits of the host of the URL, reading its robots.txt the first time"""
+        parsed_url = urlparse(url)
+        host = self.hosts.get(parsed_url.netloc)
+        if host is None:
+            host = HostLimits(self.reader.max_concurrency_per_host, self.reader.requests_per_second)
+            self.hosts[parsed_url.netloc] = host
+        if self.reader.respect_robots_txt and not host.robots_loaded:
+            async with host.robots_lock:
+                if not host.robots_loaded:
+                    await self.load_robots(f"{parsed_url.scheme}://{parsed_url.netloc}/robots.txt", host)
+                    host.robots_loaded = True
+        return host
+
+    async def load_robots(self, robots_url: str, host: HostLimits) -> None:
+        try:
+            response = await self.client.get(robots_url)
+        except Exception as e:
+            logger.debug(f"Failed to read {robots_url}: {e}")
+            return
+        robots = RobotFileParser(robots_url)
+        if response.status_code in (401, 403):
+            robots.parse(["User-agent: *", "Disallow: /"])
+        elif response.status_code >= 400:
+            return
+        else:
+            robots.parse(response.text.splitlines())
+        host.robots = robots
+        crawl_delay = robots.crawl_delay(self.reader.user_agent)
+        if crawl_delay is not None:
+            host.interval = max(host.interval, float(crawl_delay))
+
+    async def add_sitemap_pages(self, max_sitemaps: int = 50) -> None:
+        """Adds the pages in the sitemaps of the website as links of the url, following sitemap indexes"""
+        parsed_url = urlparse(self.url)
+        host = await self.get_host(self.url)
+        sitemaps = deque((host.robots.site_maps() if host.robots is not None else None) or [])
+        if len(sitemaps) == 0:
+            sitemaps.append(f"{parsed_url.scheme}://{parsed_url.netloc}/sitemap.xml")
+
+        read_sitemaps: Set[str] = set()
+        while len(sitemaps) > 0 and len(read_sitemaps) < max_sitemaps:
+            sitemap_url = sitemaps.popleft()
+            if sitemap_url in read_sitemaps:
+                continue
+            read_sitemaps.add(sitemap_url)
+            try:
+                response = await self.client.get(sitemap_url)
+                if response.status_code != 200:
+                    continue
+                root = ElementTree.fromstring(response.content)
+            except Exception as e:
+                logger.debug(f"Failed to read sitemap: {sitemap_url}: {e}")
+                continue
+
+            is_index = root.tag.endswith("sitemapindex")
+            for element in root.iter():
+                if element.tag.endswith("loc") and element.text:
+                    if is_index:
+                        sitemaps.append(element.text.strip())
+                    else:
+                        self.add(element.text.strip(), self.starting_depth + 1)
+
+
+def iterate_async(async_iterator: AsyncIterator[T]) -> Iterator[T]:
+    """Iterates over an async iterator from sync code, running it in a new event loop until each item is ready.
+    When the calling thread already runs an event loop, e.g. in Jupyter or an async web handler, the iterator runs
+    in the event loop of a helper thread and the calling thread waits for each item.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        yield from _iterate_in_new_loop(async_iterator)
+        return
+    yield from _iterate_in_thread(async_iterator)
+
+
+def _iterate_in_new_loop(async_iterator: AsyncIterator[T]) -> Generator[T, None, None]:
+    loop = asyncio.new_event_loop()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(async_iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        aclose = getattr(async_iterator, "aclose", None)
+        if aclose is not None:
+            loop.run_until_complete(aclose())
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.run_until_complete(loop.shutdown_default_executor())
+        loop.close()
+
+
+def _iterate_in_thread(async_iterator: AsyncIterator[T]) -> Iterator[T]:
+    # Holds one item at a time, so the iterator runs ahead of the caller by one item as in _iterate_in_new_loop.
+    # The thread puts (True, item) for each item, (False, exception) if the iterator raises and (False, None) at the end
+    items: "Queue[Tuple[bool, Any]]" = Queue(maxsize=1)
+    stop = Event()
+
+    def put(item: Tuple[bool, Any]) -> bool:
+        while not stop.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except Full:
+                continue
+        return False
+
+    def run() -> None:
+        iterator = _iterate_in_new_loop(async_iterator)
+        try:
+            for item in iterator:
+                if not put((True, item)):
+                    return
+            put((False, None))
+        except BaseException as e:
+            put((False, e))
+        finally:
+            # Closes the async iterator in the loop of this thread
+            iterator.close()
+
+    thread = Thread(target=run, name="phi-iterate-async", daemon=True)
+    thread.start()
+    try:
+        while True:
+            is_item, value = items.get()
+            if not is_item:
+                if value is not None:
+                    raise value
+                return
+            yield value
+    finally:
+        stop.set()
+        thread.join()
@@ -1,12 +1,22 @@
-from typing import Optional, Dict, List, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Tuple, Any, TYPE_CHECKING
 
 from pydantic import BaseModel, ConfigDict
 
+if TYPE_CHECKING:
+    from phi.document import Document
+
 
 class Embedder(BaseModel):
     """Base class for managing embedders"""
 
     dimensions: int = 1536
+    # Maximum number of texts sent in one embedding request
+    batch_size: int = 100
+    # Maximum number of (estimated) tokens sent in one embedding request
+    max_batch_tokens: Optional[int] = None
+    # Maximum number of embedding requests in flight at the same time
+    max_concurrent_batches: int = 4
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -15,3 +25,117 @@ class Embedder(BaseModel):
 
     def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
         raise NotImplementedError
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        """Embed one batch of texts. Embedders that support multiple inputs per request override this."""
+
+        embeddings: List[List[float]] = []
+        usages: List[Optional[Dict]] = []
+        for text in texts:
+            embedding, usage = self.get_embedding_and_usage(text)
+            embeddings.append(embedding)
+            usages.append(usage)
+        return embeddings, merge_usage(usages)
+
+    def estimate_tokens(self, text: str) -> int:
+        """Rough token count used to respect max_batch_tokens, about 4 characters per token."""
+        return len(text) // 4 + 1
+
+    def get_batches(self, texts: List[str]) -> List[List[str]]:
+        """Split texts into batches of at most batch_size texts and max_batch_tokens tokens."""
+
+        batches: List[List[str]] = []
+        batch: List[str] = []
+        batch_tokens = 0
+        for text in texts:
+            tokens = self.estimate_tokens(text) if self.max_batch_tokens is not None else 0
+            if len(batch) > 0 and (
+                len(batch) >= self.batch_size
+                or (self.max_batch_tokens is not None and batch_tokens + tokens > self.max_batch_tokens)
+            ):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+        if len(batch) > 0:
+            batches.append(batch)
+        return batches
+
+    def _get_embeddings_and_usage(self, texts: List[str]) -> List[Tuple[List[List[float]], Optional[Dict]]]:
+        batches = self.get_batches(texts)
+        if len(batches) <= 1 or self.max_concurrent_batches <= 1:
+            return [self.get_batch_embeddings_and_usage(batch) for batch in batches]
+
+        max_workers = min(self.max_concurrent_batches, len(batches))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="phi-embed") as executor:
+            return list(executor.map(self.get_batch_embeddings_and_usage, batches))
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of texts using as few requests as possible.
+        Returns the embeddings in the same order as the texts.
+        """
+        return self.get_embeddings_and_usage(texts)[0]
+
+    def get_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        embeddings: List[List[float]] = []
+        usages: List[Optional[Dict]] = []
+        for batch_embeddings, batch_usage in self._get_embeddings_and_usage(texts):
+            embeddings.extend(batch_embeddings)
+            usages.append(batch_usage)
+        return embeddings, merge_usage(usages)
+
+    def embed_documents(self, documents: List["Document"]) -> None:
+        """Embed documents in batches, setting the embedding and usage of each document.
+        The usage of a batch is split between its documents by their estimated tokens.
+        """
+
+        texts = [document.content for document in documents]
+        start = 0
+        for batch_embeddings, batch_usage in self._get_embeddings_and_usage(texts):
+            batch_documents = documents[start : start + len(batch_embeddings)]
+            weights = [self.estimate_tokens(document.content) for document in batch_documents]
+            for document, embedding, usage in zip(batch_documents, batch_embeddings, split_usage(batch_usage, weights)):
+                document.embedding = embedding
+                document.usage = usage
+            start += len(batch_embeddings)
+
+
+def merge_usage(usages: List[Optional[Dict]]) -> Optional[Dict]:
+    """Sums the numeric values of usage dicts."""
+
+    merged: Optional[Dict[str, Any]] = None
+    for usage in usages:
+        if usage is None:
+            continue
+        if merged is None:
+            merged = {}
+        for key, value in usage.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[key] = merged.get(key, 0) + value
+            elif key not in merged:
+                merged[key] = value
+    return merged
+
+
+def split_usage(usage: Optional[Dict], weights: List[int]) -> List[Optional[Dict]]:
+    """Splits the integer values of a usage dict proportionally to weights, so the parts sum to the total."""
+
+    if usage is None or len(weights) == 0:
+        return [None] * len(weights)
+    if len(weights) == 1:
+        return [usage]
+
+    total_weight = sum(weights) or len(weights)
+    parts: List[Dict[str, Any]] = [{} for _ in weights]
+    for key, value in usage.items():
+        if isinstance(value, int) and not isinstance(value, bool):
+            remaining = value
+            for i, weight in enumerate(weights):
+                share = remaining if i == len(weights) - 1 else value * weight // total_weight
+                parts[i][key] = share
+                remaining -= share
+        else:
+            for part in parts:
+                part[key] = value
+    return [part for part in parts]
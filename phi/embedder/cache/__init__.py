@@ -0,0 +1,2 @@
+from phi.embedder.cache.base import EmbeddingCache
+from phi.embedder.cache.memory import InMemoryEmbeddingCache
@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from array import array
+from typing import Dict, List
+
+
+class EmbeddingCache(ABC):
+    """Base class for embedding caches, mapping a cache key to an embedding."""
+
+    @abstractmethod
+    def create(self) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Returns the cached embeddings for the keys that are in the cache."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, embeddings: Dict[str, List[float]]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+
+def encode_embedding(embedding: List[float]) -> bytes:
+    """Packs an embedding as float64 bytes, which round-trips exactly and is about 3x smaller than JSON."""
+    return array("d", embedding).tobytes()
+
+
+def decode_embedding(data: bytes) -> List[float]:
+    embedding = array("d")
+    embedding.frombytes(data)
+    return embedding.tolist()
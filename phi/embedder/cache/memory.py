@@ -0,0 +1,45 @@
+from collections import OrderedDict
+from threading import Lock
+from typing import Dict, List
+
+from phi.embedder.cache.base import EmbeddingCache
+
+
+class InMemoryEmbeddingCache(EmbeddingCache):
+    def __init__(self, max_size: int = 10_000):
+        """
+        This class provides an in-memory embedding cache that evicts the least recently used embeddings.
+
+        :param max_size: The maximum number of embeddings to keep.
+        """
+        self.max_size: int = max_size
+        self._embeddings: OrderedDict[str, List[float]] = OrderedDict()
+        self._lock = Lock()
+
+    def create(self) -> None:
+        pass
+
+    def get(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                embedding = self._embeddings.get(key)
+                if embedding is not None:
+                    self._embeddings.move_to_end(key)
+                    found[key] = embedding
+        return found
+
+    def set(self, embeddings: Dict[str, List[float]]) -> None:
+        with self._lock:
+            for key, embedding in embeddings.items():
+                self._embeddings[key] = embedding
+                self._embeddings.move_to_end(key)
+            while len(self._embeddings) > self.max_size:
+                self._embeddings.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._embeddings.clear()
+
+    def __len__(self) -> int:
+        return len(self._embeddings)
@@ -0,0 +1,123 @@
+from typing import Dict, List, Optional
+
+try:
+    from sqlalchemy.dialects import postgresql
+    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.inspection import inspect
+    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.schema import MetaData, Table, Column
+    from sqlalchemy.sql.expression import text, select, delete
+    from sqlalchemy.types import DateTime, String
+except ImportError:
+    raise ImportError("`sqlalchemy` not installed")
+
+from phi.embedder.cache.base import EmbeddingCache, encode_embedding, decode_embedding
+from phi.utils.log import logger
+
+# Keep the number of bind parameters in a statement well under the driver limit
+READ_BATCH_SIZE = 5000
+
+
+class PgEmbeddingCache(EmbeddingCache):
+    def __init__(
+        self,
+        table_name: str = "embedding_cache",
+        schema: Optional[str] = "ai",
+        db_url: Optional[str] = None,
+        db_engine: Optional[Engine] = None,
+    ):
+        """
+        This class provides an embedding cache stored in a postgres table.
+
+        The following order is used to determine the database connection:
+            1. Use the db_engine if provided
+            2. Use the db_url to create the engine
+
+        Args:
+            table_name (str): The name of the table to store embeddings. Defaults to "embedding_cache".
+            schema (Optional[str]): The schema to store the table in. Defaults to "ai".
+            db_url (Optional[str]): The database URL to connect to. Defaults to None.
+            db_engine (Optional[Engine]): The database engine to use. Defaults to None.
+        """
+        _engine: Optional[Engine] = db_engine
+        if _engine is None and db_url is not None:
+            _engine = create_engine(db_url)
+
+        if _engine is None:
+            raise ValueError("Must provide either db_url or db_engine")
+
+        self.table_name: str = table_name
+        self.schema: Optional[str] = schema
+        self.db_url: Optional[str] = db_url
+        self.db_engine: Engine = _engine
+        self.metadata: MetaData = MetaData(schema=self.schema)
+        self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+        self.table: Table = self.get_table()
+        self._table_created: bool = False
+
+    def get_table(self) -> Table:
+        return Table(
+            self.table_name,
+            self.metadata,
+            # Cache key: embedder, model, dimensions and content hash
+            Column("key", String, primary_key=True),
+            # The embedding packed as float64 bytes
+            Column("embedding", postgresql.BYTEA, nullable=False),
+            Column("created_at", DateTime(timezone=True), server_default=text("now()")),
+            extend_existing=True,
+        )
+
+    def table_exists(self) -> bool:
+        logger.debug(f"Checking if table exists: {self.table.name}")
+        try:
+            return inspect(self.db_engine).has_table(self.table.name, schema=self.schema)
+        except Exception as e:
+            logger.error(e)
+            return False
+
+    def create(self) -> None:
+        if self._table_created:
+            return
+        if not self.table_exists():
+            if self.schema is not None:
+                with self.Session() as sess, sess.begin():
+                    logger.debug(f"Creating schema: {self.schema}")
+                    sess.execute(text(f"create schema if not exists {self.schema};"))
+            logger.debug(f"Creating table: {self.table_name}")
+            self.table.create(self.db_engine, checkfirst=True)
+        self._table_created = True
+
+    def get(self, keys: List[str]) -> Dict[str, List[float]]:
+        if len(keys) == 0:
+            return {}
+        self.create()
+        found: Dict[str, List[float]] = {}
+        with self.Session() as sess, sess.begin():
+            for i in range(0, len(keys), READ_BATCH_SIZE):
+                stmt = select(self.table.c.key, self.table.c.embedding).where(
+                    self.table.c.key.in_(keys[i : i + READ_BATCH_SIZE])
+                )
+                for row in sess.execute(stmt):
+                    found[row.key] = decode_embedding(row.embedding)
+        return found
+
+    def set(self, embeddings: Dict[str, List[float]]) -> None:
+        if len(embeddings) == 0:
+            return
+        self.create()
+        stmt = postgresql.insert(self.table).on_conflict_do_nothing(index_elements=["key"])
+        with self.Session() as sess, sess.begin():
+            sess.execute(
+                stmt, [{"key": key, "embedding": encode_embedding(value)} for key, value in embeddings.items()]
+            )
+
+    def clear(self) -> None:
+        if self.table_exists():
+            with self.Session() as sess, sess.begin():
+                sess.execute(delete(self.table))
+
+    def delete(self) -> None:
+        if self.table_exists():
+            logger.debug(f"Deleting table: {self.table_name}")
+            self.table.drop(self.db_engine)
+        self._table_created = False
@@ -0,0 +1,120 @@
+from typing import Dict, List, Optional
+
+try:
+    from sqlalchemy.dialects import sqlite
+    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.inspection import inspect
+    from sqlalchemy.orm import Session, sessionmaker
+    from sqlalchemy.schema import MetaData, Table, Column
+    from sqlalchemy.sql.expression import select, delete
+    from sqlalchemy.types import LargeBinary, String
+except ImportError:
+    raise ImportError("`sqlalchemy` not installed")
+
+from phi.embedder.cache.base import EmbeddingCache, encode_embedding, decode_embedding
+from phi.utils.dttm import current_datetime
+from phi.utils.log import logger
+
+# SQLite limits the number of variables in a statement
+READ_BATCH_SIZE = 500
+
+
+class SqlEmbeddingCache(EmbeddingCache):
+    def __init__(
+        self,
+        table_name: str = "embedding_cache",
+        db_url: Optional[str] = None,
+        db_file: Optional[str] = None,
+        db_engine: Optional[Engine] = None,
+    ):
+        """
+        This class provides an embedding cache stored in a sqlite database.
+
+        The following order is used to determine the database connection:
+            1. Use the db_engine if provided
+            2. Use the db_url
+            3. Use the db_file
+            4. Create a new in-memory database
+
+        :param table_name: The name of the table to store embeddings.
+        :param db_url: The database URL to connect to.
+        :param db_file: The database file to connect to.
+        :param db_engine: The database engine to use.
+        """
+        _engine: Optional[Engine] = db_engine
+        if _engine is None and db_url is not None:
+            _engine = create_engine(db_url)
+        elif _engine is None and db_file is not None:
+            _engine = create_engine(f"sqlite:///{db_file}")
+        elif _engine is None:
+            _engine = create_engine("sqlite://")
+
+        self.table_name: str = table_name
+        self.db_url: Optional[str] = db_url
+        self.db_engine: Engine = _engine
+        self.metadata: MetaData = MetaData()
+        self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+        self.table: Table = self.get_table()
+        self._table_created: bool = False
+
+    def get_table(self) -> Table:
+        return Table(
+            self.table_name,
+            self.metadata,
+            # Cache key: embedder, model, dimensions and content hash
+            Column("key", String, primary_key=True),
+            # The embedding packed as float64 bytes
+            Column("embedding", LargeBinary, nullable=False),
+            # The timestamp of when this embedding was cached.
+            Column("created_at", sqlite.DATETIME, default=current_datetime),
+            extend_existing=True,
+        )
+
+    def table_exists(self) -> bool:
+        logger.debug(f"Checking if table exists: {self.table.name}")
+        try:
+            return inspect(self.db_engine).has_table(self.table.name)
+        except Exception as e:
+            logger.error(e)
+            return False
+
+    def create(self) -> None:
+        if not self._table_created:
+            logger.debug(f"Creating table if not exists: {self.table.name}")
+            self.table.create(self.db_engine, checkfirst=True)
+            self._table_created = True
+
+    def get(self, keys: List[str]) -> Dict[str, List[float]]:
+        if len(keys) == 0:
+            return {}
+        self.create()
+        found: Dict[str, List[float]] = {}
+        with self.Session() as sess:
+            for i in range(0, len(keys), READ_BATCH_SIZE):
+                stmt = select(self.table.c.key, self.table.c.embedding).where(
+                    self.table.c.key.in_(keys[i : i + READ_BATCH_SIZE])
+                )
+                for row in sess.execute(stmt):
+                    found[row.key] = decode_embedding(row.embedding)
+        return found
+
+    def set(self, embeddings: Dict[str, List[float]]) -> None:
+        if len(embeddings) == 0:
+            return
+        self.create()
+        stmt = sqlite.insert(self.table).on_conflict_do_nothing(index_elements=["key"])
+        with self.Session() as sess, sess.begin():
+            sess.execute(
+                stmt, [{"key": key, "embedding": encode_embedding(value)} for key, value in embeddings.items()]
+            )
+
+    def clear(self) -> None:
+        if self.table_exists():
+            with self.Session() as sess, sess.begin():
+                sess.execute(delete(self.table))
+
+    def delete(self) -> None:
+        if self.table_exists():
+            logger.debug(f"Deleting table: {self.table_name}")
+            self.table.drop(self.db_engine)
+        self._table_created = False
@@ -0,0 +1,103 @@
+from hashlib import md5
+from typing import Optional, Dict, List, Tuple, TYPE_CHECKING
+
+from pydantic import Field, model_validator
+
+from phi.embedder.base import Embedder
+from phi.embedder.cache import EmbeddingCache, InMemoryEmbeddingCache
+
+if TYPE_CHECKING:
+    from phi.document import Document
+
+
+class CachedEmbedder(Embedder):
+    """Wraps an embedder and caches embeddings by embedder, model, dimensions and content hash.
+
+    Embeddings read from the cache have no usage, as no request was made for them.
+    """
+
+    # The embedder used for texts that are not in the cache
+    embedder: Embedder
+    # Where embeddings are cached: InMemoryEmbeddingCache, SqlEmbeddingCache or PgEmbeddingCache
+    cache: EmbeddingCache = Field(default_factory=InMemoryEmbeddingCache)
+    # Number of texts read from the cache and embedded by the embedder
+    hits: int = 0
+    misses: int = 0
+
+    @model_validator(mode="after")
+    def set_dimensions(self) -> "CachedEmbedder":
+        self.dimensions = self.embedder.dimensions
+        return self
+
+    def get_cache_key(self, text: str) -> str:
+        model = getattr(self.embedder, "model", None)
+        content_hash = md5(text.encode()).hexdigest()
+        return f"{self.embedder.__class__.__name__}:{model}:{self.embedder.dimensions}:{content_hash}"
+
+    def get_embedding(self, text: str) -> List[float]:
+        return self.get_embedding_and_usage(text)[0]
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        key = self.get_cache_key(text)
+        cached = self.cache.get([key]).get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached, None
+
+        self.misses += 1
+        embedding, usage = self.embedder.get_embedding_and_usage(text)
+        if embedding:
+            self.cache.set({key: embedding})
+        return embedding, usage
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        return self.get_embeddings_and_usage(texts)
+
+    def get_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        keys = [self.get_cache_key(text) for text in texts]
+        cached = self.cache.get(list(set(keys)))
+
+        # Embed each missing text once, even if it appears more than once
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in cached and key not in missing:
+                missing[key] = text
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+
+        usage: Optional[Dict] = None
+        if len(missing) > 0:
+            new_embeddings, usage = self.embedder.get_embeddings_and_usage(list(missing.values()))
+            embedded = dict(zip(missing.keys(), new_embeddings))
+            self.cache.set({key: embedding for key, embedding in embedded.items() if embedding})
+            cached.update(embedded)
+        return [cached.get(key, []) for key in keys], usage
+
+    def embed_documents(self, documents: List["Document"]) -> None:
+        keys = [self.get_cache_key(document.content) for document in documents]
+        cached = self.cache.get(list(set(keys)))
+
+        # Embed the first document for each missing key, using the batching of the wrapped embedder
+        to_embed: Dict[str, "Document"] = {}
+        for key, document in zip(keys, documents):
+            if key not in cached and key not in to_embed:
+                to_embed[key] = document
+        self.misses += len(to_embed)
+        self.hits += len(documents) - len(to_embed)
+
+        if len(to_embed) > 0:
+            self.embedder.embed_documents(list(to_embed.values()))
+            self.cache.set({key: document.embedding for key, document in to_embed.items() if document.embedding})
+
+        for key, document in zip(keys, documents):
+            if key in cached:
+                document.embedding = cached[key]
+                document.usage = None
+            elif to_embed[key] is not document:
+                document.embedding = to_embed[key].embedding
+                document.usage = None
+
+    def clear_cache(self) -> None:
+        self.cache.clear()
+        self.hits = 0
+        self.misses = 0
@@ -1,6 +1,7 @@
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 
 from phi.embedder.base import Embedder
+from phi.utils.clients import get_shared_client
 from phi.utils.log import logger
 
 try:
@@ -21,6 +22,8 @@ class MistralEmbedder(Embedder):
     max_retries: Optional[int] = None
     timeout: Optional[int] = None
     client_params: Optional[Dict[str, Any]] = None
+    # If True, reuse a process-wide client (and its connection pool) for this configuration.
+    use_shared_client: bool = True
     # -*- Provide the MistralClient manually
     mistral_client: Optional[MistralClient] = None
 
@@ -40,9 +43,11 @@ class MistralEmbedder(Embedder):
             _client_params["timeout"] = self.timeout
         if self.client_params:
             _client_params.update(self.client_params)
+        if self.use_shared_client:
+            return get_shared_client(provider="mistral", factory=MistralClient, client_params=_client_params)
         return MistralClient(**_client_params)
 
-    def _response(self, text: str) -> EmbeddingResponse:
+    def _response(self, text: Union[str, List[str]]) -> EmbeddingResponse:
         _request_params: Dict[str, Any] = {
             "input": text,
             "model": self.model,
@@ -65,3 +70,10 @@ class MistralEmbedder(Embedder):
         embedding = response.data[0].embedding
         usage = response.usage
         return embedding, usage.model_dump()
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        response: EmbeddingResponse = self._response(text=texts)
+
+        embeddings = [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
+        usage = response.usage
+        return embeddings, usage.model_dump() if usage is not None else None
@@ -1,6 +1,7 @@
 from typing import Optional, Dict, List, Tuple, Any
 
 from phi.embedder.base import Embedder
+from phi.utils.clients import get_shared_client
 from phi.utils.log import logger
 
 try:
@@ -17,6 +18,8 @@ class OllamaEmbedder(Embedder):
     timeout: Optional[Any] = None
     options: Optional[Any] = None
     client_kwargs: Optional[Dict[str, Any]] = None
+    # If True, reuse a process-wide client (and its connection pool) for this configuration.
+    use_shared_client: bool = True
     ollama_client: Optional[OllamaClient] = None
 
     @property
@@ -31,6 +34,8 @@ class OllamaEmbedder(Embedder):
             _ollama_params["timeout"] = self.timeout
         if self.client_kwargs:
             _ollama_params.update(self.client_kwargs)
+        if self.use_shared_client:
+            return get_shared_client(provider="ollama", factory=OllamaClient, client_params=_ollama_params)
         return OllamaClient(**_ollama_params)
 
     def _response(self, text: str) -> Dict[str, Any]:
@@ -60,3 +65,21 @@ class OllamaEmbedder(Embedder):
         except Exception as e:
             logger.warning(e)
         return embedding, usage
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        # Ollama clients before 0.3 only embed one prompt per request
+        if not hasattr(self.client, "embed"):
+            return super().get_batch_embeddings_and_usage(texts)
+
+        kwargs: Dict[str, Any] = {}
+        if self.options is not None:
+            kwargs["options"] = self.options
+        try:
+            response = self.client.embed(input=texts, model=self.model, **kwargs)
+            embeddings = response.get("embeddings", []) if response is not None else []
+            if len(embeddings) == len(texts):
+                return embeddings, None
+            logger.warning(f"Expected {len(texts)} embeddings, got {len(embeddings)}")
+        except Exception as e:
+            logger.warning(e)
+        return [[] for _ in texts], None
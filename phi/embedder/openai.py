@@ -1,7 +1,8 @@
-from typing import Optional, Dict, List, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any, Union
 from typing_extensions import Literal
 
 from phi.embedder.base import Embedder
+from phi.utils.clients import get_shared_client, get_shared_http_client
 from phi.utils.log import logger
 
 try:
@@ -21,6 +22,11 @@ class OpenAIEmbedder(Embedder):
     base_url: Optional[str] = None
     request_params: Optional[Dict[str, Any]] = None
     client_params: Optional[Dict[str, Any]] = None
+    # If True, reuse a process-wide client (and its connection pool) for this configuration.
+    use_shared_client: bool = True
+    # OpenAI accepts up to 2048 inputs and 300k tokens per request
+    batch_size: int = 1000
+    max_batch_tokens: Optional[int] = 250_000
     openai_client: Optional[OpenAIClient] = None
 
     @property
@@ -35,11 +41,15 @@ class OpenAIEmbedder(Embedder):
             _client_params["organization"] = self.organization
         if self.base_url:
             _client_params["base_url"] = self.base_url
+        if self.use_shared_client:
+            _client_params["http_client"] = get_shared_http_client(provider="openai")
         if self.client_params:
             _client_params.update(self.client_params)
+        if self.use_shared_client:
+            return get_shared_client(provider="openai", factory=OpenAIClient, client_params=_client_params)
         return OpenAIClient(**_client_params)
 
-    def _response(self, text: str) -> CreateEmbeddingResponse:
+    def _response(self, text: Union[str, List[str]]) -> CreateEmbeddingResponse:
         _request_params: Dict[str, Any] = {
             "input": text,
             "model": self.model,
@@ -67,3 +77,10 @@ class OpenAIEmbedder(Embedder):
         embedding = response.data[0].embedding
         usage = response.usage
         return embedding, usage.model_dump()
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        response: CreateEmbeddingResponse = self._response(text=texts)
+
+        embeddings = [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
+        usage = response.usage
+        return embeddings, usage.model_dump() if usage is not None else None
@@ -1,6 +1,7 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from phi.embedder.base import Embedder
+from phi.utils.clients import get_shared_client
 from phi.utils.log import logger
 
 try:
@@ -19,6 +20,11 @@ class VoyageAIEmbedder(Embedder):
     max_retries: Optional[int] = None
     timeout: Optional[float] = None
     client_params: Optional[Dict[str, Any]] = None
+    # If True, reuse a process-wide client for this configuration.
+    use_shared_client: bool = True
+    # VoyageAI accepts up to 128 inputs per request and 120k to 320k tokens depending on the model
+    batch_size: int = 128
+    max_batch_tokens: Optional[int] = 120_000
     voyage_client: Optional[Client] = None
 
     @property
@@ -35,11 +41,13 @@ class VoyageAIEmbedder(Embedder):
             _client_params["timeout"] = self.timeout
         if self.client_params:
             _client_params.update(self.client_params)
+        if self.use_shared_client:
+            return get_shared_client(provider="voyageai", factory=Client, client_params=_client_params)
         return Client(**_client_params)
 
-    def _response(self, text: str) -> EmbeddingsObject:
+    def _response(self, text: Union[str, List[str]]) -> EmbeddingsObject:
         _request_params: Dict[str, Any] = {
-            "texts": [text],
+            "texts": [text] if isinstance(text, str) else text,
             "model": self.model,
         }
         if self.request_params:
@@ -60,3 +68,9 @@ class VoyageAIEmbedder(Embedder):
         embedding = response.embeddings[0]
         usage = {"total_tokens": response.total_tokens}
         return embedding, usage
+
+    def get_batch_embeddings_and_usage(self, texts: List[str]) -> Tuple[List[List[float]], Optional[Dict]]:
+        response: EmbeddingsObject = self._response(text=texts)
+
+        usage = {"total_tokens": response.total_tokens}
+        return response.embeddings, usage
@@ -9,14 +9,9 @@ class ArxivKnowledgeBase(AssistantKnowledge):
     queries: List[str] = []
     reader: ArxivReader = ArxivReader()
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over urls and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
+    def get_sources(self) -> Iterator[str]:
+        """Yields the search queries"""
+        yield from self.queries
 
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
-
-        for _query in self.queries:
-            yield self.reader.read(query=_query)
+    def read_source(self, source: str) -> List[Document]:
+        return self.reader.read(query=source)
@@ -1,11 +1,22 @@
-from typing import List, Optional, Iterator, Dict, Any
+import json
+from concurrent.futures import ThreadPoolExecutor
+from hashlib import md5
+from pathlib import Path
+from time import time
+from typing import List, Optional, Iterable, Iterator, Dict, Any, Tuple, Callable, Set, Union
 
 from pydantic import BaseModel, ConfigDict
 
 from phi.document import Document
 from phi.document.reader.base import Reader
+from phi.knowledge.cache import SearchCache, CachedSearch
+from phi.knowledge.manifest import ManifestUpdate, SourceManifest, SourceRecord, get_file_fingerprint, get_file_hash
+from phi.knowledge.pipeline import IngestionPipeline, PipelineMetrics
 from phi.vectordb import VectorDb
+from phi.vectordb.base import get_content_hash
+from phi.vectordb.filters import Filters, to_filter_expr
 from phi.utils.log import logger
+from phi.utils.timer import Timer
 
 
 class AssistantKnowledge(BaseModel):
@@ -19,6 +30,26 @@ class AssistantKnowledge(BaseModel):
     num_documents: int = 2
     # Number of documents to optimize the vector db on
     optimize_on: Optional[int] = 1000
+    # Reads, embeds and writes the documents in load(), see phi.knowledge.pipeline
+    ingestion_pipeline: Optional[IngestionPipeline] = None
+    # Json file recording each source loaded, e.g. a file or an s3 object, with its fingerprint and chunks,
+    # kept next to the collection. With a manifest, load() only reads the sources that are new or changed,
+    # deletes the chunks they no longer have, and deletes the chunks of removed sources. See phi.knowledge.manifest
+    manifest_file: Optional[Union[str, Path]] = None
+    # Run a keyword search next to the vector search and fuse the results with reciprocal rank fusion.
+    # Finds exact identifiers like error codes or SKUs that embeddings miss. Needs vector_db.keyword_search().
+    hybrid_search: bool = False
+    # Number of documents fetched by the vector and keyword searches before fusion, defaults to 4 * num_documents
+    vector_search_limit: Optional[int] = None
+    keyword_search_limit: Optional[int] = None
+    # Constant k in the reciprocal rank fusion score 1 / (k + rank)
+    rrf_k: int = 60
+    # Cache for search results, invalidated when documents are loaded or the knowledge base is cleared
+    search_cache: Optional[SearchCache] = None
+    search_cache_hits: int = 0
+    search_cache_misses: int = 0
+    # Seconds of searching saved by cache hits
+    search_cache_saved_time: float = 0
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
@@ -27,21 +58,210 @@ class AssistantKnowledge(BaseModel):
         """Iterator that yields lists of documents in the knowledge base
         Each object yielded by the iterator is a list of documents.
         """
+        for source in self.get_sources():
+            yield list(self.read_source(source))
+
+    def get_sources(self) -> Iterator[Any]:
+        """Yields the sources of the knowledge base, e.g. file paths or urls.
+        Knowledge bases that implement get_sources() and read_source() are read in parallel by load(),
+        knowledge bases that only implement document_lists are read one document list at a time.
+        """
+        raise NotImplementedError
+
+    def read_source(self, source: Any) -> Iterable[Document]:
+        """Returns the documents of a source, called from multiple threads by load().
+        A generator streams the documents of a large source to the vector db as they are read.
+        """
         raise NotImplementedError
 
-    def search(self, query: str, num_documents: Optional[int] = None) -> List[Document]:
-        """Returns relevant documents matching the query"""
+    def get_source_key(self, source: Any) -> Optional[str]:
+        """Identifies a source in the ingestion pipeline checkpoint file and the manifest."""
+        return str(source)
+
+    def get_source_fingerprint(self, source: Any) -> Optional[Dict[str, Any]]:
+        """Returns properties of a source that change when it changes, compared with the manifest by load():
+        the mtime and size of a file. Sources without a fingerprint are read on every load.
+        """
+        if isinstance(source, Path):
+            return get_file_fingerprint(source)
+        return None
+
+    def get_source_content_hash(self, source: Any) -> Optional[str]:
+        """Returns a hash of the contents of a source whose fingerprint changed,
+        so a file touched without changes is not read again.
+        """
+        if isinstance(source, Path):
+            return get_file_hash(source)
+        return None
+
+    def get_sources_and_reader(
+        self,
+    ) -> Tuple[Iterator[Any], Callable[[Any], Iterable[Document]], Callable[[Any], Optional[str]]]:
+        """Returns the sources, a function that reads a source and a function that returns the key of a source.
+        Knowledge bases without get_sources() use their document lists as sources, which are not checkpointed.
+        """
+        try:
+            return self.get_sources(), self.read_source, self.get_source_key
+        except NotImplementedError:
+            return iter(self.document_lists), lambda document_list: document_list, lambda document_list: None
+
+    def search(
+        self,
+        query: str,
+        num_documents: Optional[int] = None,
+        return_embeddings: bool = False,
+        filters: Optional[Filters] = None,
+    ) -> List[Document]:
+        """Returns relevant documents matching the query.
+        Set return_embeddings to also return the embedding of each document,
+        and filters to only return documents with matching meta_data, see phi.vectordb.filters.
+        """
+        return self.search_with_retrieval(
+            query=query, num_documents=num_documents, return_embeddings=return_embeddings, filters=filters
+        )[0]
+
+    def search_with_retrieval(
+        self,
+        query: str,
+        num_documents: Optional[int] = None,
+        return_embeddings: bool = False,
+        filters: Optional[Filters] = None,
+    ) -> Tuple[List[Document], Optional[Dict[str, Dict[str, Any]]]]:
+        """Returns relevant documents matching the query, and how they were retrieved:
+        the limit, number of results and time of each search for a hybrid search, and the cache statistics.
+        """
+        _num_documents = num_documents or self.num_documents
+        if self.search_cache is None:
+            return self.get_search_results(
+                query=query, num_documents=_num_documents, return_embeddings=return_embeddings, filters=filters
+            )
+
+        key = self.get_search_cache_key(
+            query=query, num_documents=_num_documents, return_embeddings=return_embeddings, filters=filters
+        )
+        cached = self.search_cache.get(key)
+        if cached is not None:
+            self.search_cache_hits += 1
+            self.search_cache_saved_time += cached.time
+            logger.debug(f"Search cache hit for query: {query}")
+            documents = [document.model_copy() for document in cached.documents]
+            return documents, self.get_search_cache_retrieval(cached.retrieval, hit=True)
+
+        self.search_cache_misses += 1
+        timer = Timer()
+        timer.start()
+        documents, retrieval = self.get_search_results(
+            query=query, num_documents=_num_documents, return_embeddings=return_embeddings, filters=filters
+        )
+        timer.stop()
+        # Empty results are not cached, they are also returned when the search fails
+        if len(documents) > 0:
+            self.search_cache.set(key, CachedSearch(documents=documents, retrieval=retrieval, time=timer.elapsed))
+        return documents, self.get_search_cache_retrieval(retrieval, hit=False)
+
+    def get_search_results(
+        self, query: str, num_documents: int, return_embeddings: bool = False, filters: Optional[Filters] = None
+    ) -> Tuple[List[Document], Optional[Dict[str, Dict[str, Any]]]]:
         try:
             if self.vector_db is None:
                 logger.warning("No vector db provided")
-                return []
-
-            _num_documents = num_documents or self.num_documents
-            logger.debug(f"Getting {_num_documents} relevant documents for query: {query}")
-            return self.vector_db.search(query=query, limit=_num_documents)
+                return [], None
+
+            logger.debug(f"Getting {num_documents} relevant documents for query: {query}")
+            if self.hybrid_search:
+                return self.get_hybrid_search_results(
+                    query=query, num_documents=num_documents, return_embeddings=return_embeddings, filters=filters
+                )
+            documents = self.vector_db.search(
+                query=query, limit=num_documents, filters=filters, return_embeddings=return_embeddings
+            )
+            return documents, None
         except Exception as e:
             logger.error(f"Error searching for documents: {e}")
-            return []
+            return [], None
+
+    def get_search_cache_namespace(self) -> str:
+        """Identifies the collection of the vector db in the search cache."""
+        if self.vector_db is None:
+            return "none"
+        collection = getattr(self.vector_db, "collection", None) or getattr(self.vector_db, "table_name", None)
+        return f"{self.vector_db.__class__.__name__}.{collection}"
+
+    def get_search_cache_key(
+        self, query: str, num_documents: int, return_embeddings: bool = False, filters: Optional[Filters] = None
+    ) -> str:
+        """The key is the collection, its generation and a hash of the normalized query and search options,
+        so "What is X?" and "what is x" share an entry.
+        """
+        assert self.search_cache is not None
+        namespace = self.get_search_cache_namespace()
+        normalized_query = " ".join(query.lower().split()).rstrip("?!. ")
+        options: List[Any] = [normalized_query, num_documents, return_embeddings, self.hybrid_search]
+        if filters is not None:
+            options.append(to_filter_expr(filters).model_dump())
+        if self.hybrid_search:
+            options.extend([self.vector_search_limit, self.keyword_search_limit, self.rrf_k])
+        options_hash = md5(json.dumps(options).encode()).hexdigest()
+        return f"{namespace}:{self.search_cache.get_generation(namespace)}:{options_hash}"
+
+    def get_search_cache_retrieval(
+        self, retrieval: Optional[Dict[str, Dict[str, Any]]], hit: bool
+    ) -> Dict[str, Dict[str, Any]]:
+        lookups = self.search_cache_hits + self.search_cache_misses
+        return {
+            **(retrieval or {}),
+            "cache": {
+                "hit": hit,
+                "hit_ratio": round(self.search_cache_hits / lookups, 4) if lookups > 0 else 0,
+                "saved_time": round(self.search_cache_saved_time, 4),
+            },
+        }
+
+    def invalidate_search_cache(self) -> None:
+        """Bumps the generation of the collection, so later searches do not return results cached before."""
+        if self.search_cache is not None:
+            self.search_cache.bump_generation(self.get_search_cache_namespace())
+
+    def get_hybrid_search_results(
+        self, query: str, num_documents: int, return_embeddings: bool = False, filters: Optional[Filters] = None
+    ) -> Tuple[List[Document], Dict[str, Dict[str, Any]]]:
+        """Runs the vector and keyword searches concurrently and fuses their rankings with reciprocal rank fusion."""
+        assert self.vector_db is not None
+        vector_db = self.vector_db
+        vector_limit = self.vector_search_limit or 4 * num_documents
+        keyword_limit = self.keyword_search_limit or 4 * num_documents
+
+        def timed(leg: str, limit: int) -> Tuple[List[Document], float]:
+            timer = Timer()
+            timer.start()
+            try:
+                if leg == "vector":
+                    documents = vector_db.search(
+                        query=query, limit=limit, filters=filters, return_embeddings=return_embeddings
+                    )
+                else:
+                    documents = vector_db.keyword_search(
+                        query=query, limit=limit, filters=filters, return_embeddings=return_embeddings
+                    )
+            except NotImplementedError:
+                logger.warning(f"{vector_db.__class__.__name__} does not support keyword search, using vector search")
+                documents = []
+            timer.stop()
+            return documents, timer.elapsed
+
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="phi-search") as executor:
+            vector_future = executor.submit(timed, "vector", vector_limit)
+            keyword_future = executor.submit(timed, "keyword", keyword_limit)
+            vector_documents, vector_time = vector_future.result()
+            keyword_documents, keyword_time = keyword_future.result()
+
+        documents = reciprocal_rank_fusion([vector_documents, keyword_documents], k=self.rrf_k)[:num_documents]
+        retrieval = {
+            "vector": {"limit": vector_limit, "results": len(vector_documents), "time": round(vector_time, 4)},
+            "keyword": {"limit": keyword_limit, "results": len(keyword_documents), "time": round(keyword_time, 4)},
+        }
+        logger.debug(f"Hybrid search: {retrieval}")
+        return documents, retrieval
 
     def load(self, recreate: bool = False, upsert: bool = False, skip_existing: bool = True) -> None:
         """Load the knowledge base to the vector db
@@ -64,26 +284,174 @@ class AssistantKnowledge(BaseModel):
         self.vector_db.create()
 
         logger.info("Loading knowledge base")
-        num_documents = 0
-        for document_list in self.document_lists:
-            documents_to_load = document_list
-            # Upsert documents if upsert is True and vector db supports upsert
-            if upsert and self.vector_db.upsert_available():
-                self.vector_db.upsert(documents=documents_to_load)
-            # Insert documents
+        sources, read_source, get_source_key = self.get_sources_and_reader()
+        try:
+            if self.manifest_file is not None:
+                self.load_changed_sources(
+                    sources=sources,
+                    read_source=read_source,
+                    get_source_key=get_source_key,
+                    upsert=upsert,
+                    skip_existing=skip_existing,
+                    recreate=recreate,
+                )
             else:
-                # Filter out documents which already exist in the vector db
-                if skip_existing:
-                    documents_to_load = [
-                        document for document in document_list if not self.vector_db.doc_exists(document)
-                    ]
-                self.vector_db.insert(documents=documents_to_load)
-            num_documents += len(documents_to_load)
-            logger.info(f"Added {len(documents_to_load)} documents to knowledge base")
-
-        if self.optimize_on is not None and num_documents > self.optimize_on:
+                self.load_sources(
+                    sources=sources,
+                    read_source=read_source,
+                    get_source_key=get_source_key,
+                    upsert=upsert,
+                    skip_existing=skip_existing,
+                )
+        finally:
+            self.shutdown_readers()
+
+    def shutdown_readers(self) -> None:
+        """Releases the resources of the readers after a load, e.g. the processes of a PDFReader"""
+        if self.reader is not None:
+            self.reader.shutdown()
+
+    def load_changed_sources(
+        self,
+        sources: Iterator[Any],
+        read_source: Callable[[Any], Iterable[Document]],
+        get_source_key: Callable[[Any], Optional[str]],
+        upsert: bool = False,
+        skip_existing: bool = True,
+        recreate: bool = False,
+    ) -> Optional[PipelineMetrics]:
+        """Loads the sources that are new or changed since the manifest_file was written,
+        then tombstones the sources that were removed and deletes their chunks.
+
+        A source is unchanged when it has the fingerprint in the manifest, or the same content hash.
+        A chunk is deleted by its content hash once no source in the manifest has it. The previous chunks of the
+        sources that changed are deleted before the sources are loaded, as their new chunks reuse the ids.
+        Sources without a key are loaded on every load and are not recorded.
+        """
+        if self.vector_db is None or self.manifest_file is None:
+            logger.warning("No vector db or manifest file provided")
+            return None
+
+        update = ManifestUpdate(SourceManifest() if recreate else SourceManifest.read(self.manifest_file))
+        listed: Set[str] = set()
+        # Content hashes of the documents read from each source, recorded once the source is written
+        chunks: Dict[str, List[str]] = {}
+
+        def get_changed_sources() -> Iterator[Tuple[Optional[str], Any, Any, Any]]:
+            for source in sources:
+                key = get_source_key(source)
+                if key is None:
+                    yield None, None, None, source
+                    continue
+                listed.add(key)
+                fingerprint = self.get_source_fingerprint(source)
+                if update.has_fingerprint(key, fingerprint):
+                    continue
+                content_hash = self.get_source_content_hash(source)
+                if update.has_content(key, fingerprint, content_hash):
+                    continue
+                yield key, fingerprint, content_hash, source
+
+        def read_changed_source(item: Tuple[Optional[str], Any, Any, Any]) -> Iterator[Document]:
+            key, _, _, source = item
+            content_hashes: List[str] = []
+            for document in read_source(source):
+                content_hashes.append(get_content_hash(document))
+                yield document
+            if key is not None:
+                chunks[key] = content_hashes
+
+        def complete_source(item: Tuple[Optional[str], Any, Any, Any]) -> None:
+            key, fingerprint, content_hash, _ = item
+            if key is not None:
+                record = SourceRecord(
+                    fingerprint=fingerprint, content_hash=content_hash, chunks=chunks.pop(key, []), loaded_at=time()
+                )
+                update.set_chunks(key, record)
+
+        changed_sources = list(get_changed_sources())
+        # Deleted before any source is read, so no document of this load is skipped as existing
+        # because of a chunk that is deleted
+        for key, _, _, _ in changed_sources:
+            if key is not None:
+                update.supersede(key)
+        deleted = self.delete_chunks(update.pop_stale_chunks())
+        try:
+            metrics = self.load_sources(
+                sources=iter(changed_sources),
+                read_source=read_changed_source,
+                get_source_key=lambda item: item[0],
+                upsert=upsert,
+                skip_existing=skip_existing,
+                on_source_complete=complete_source,
+            )
+            # Sources are only removed once all sources were listed, after a load that did not fail
+            for key, record in list(update.manifest.sources.items()):
+                if record.deleted_at is None and key not in listed:
+                    logger.debug(f"Removing {key}")
+                    update.remove(key)
+        finally:
+            deleted += self.delete_chunks(update.pop_stale_chunks())
+            update.manifest.write(self.manifest_file)
+
+        logger.info(
+            f"{update.unchanged} sources unchanged, {update.loaded} new or changed, {update.removed} removed, "
+            f"{deleted} chunks deleted"
+        )
+        return metrics
+
+    def delete_chunks(self, content_hashes: List[str]) -> int:
+        """Deletes the documents with these content hashes from the vector db"""
+        if self.vector_db is None or len(content_hashes) == 0:
+            return 0
+        try:
+            deleted = self.vector_db.delete_by_content_hash(content_hashes)
+        except NotImplementedError:
+            logger.warning(
+                f"{self.vector_db.__class__.__name__} does not support deleting documents, "
+                f"{len(content_hashes)} chunks of changed or removed sources are kept"
+            )
+            return 0
+        self.invalidate_search_cache()
+        return deleted
+
+    def load_sources(
+        self,
+        sources: Iterator[Any],
+        read_source: Callable[[Any], Iterable[Document]],
+        get_source_key: Optional[Callable[[Any], Optional[str]]] = None,
+        upsert: bool = False,
+        skip_existing: bool = True,
+        on_source_complete: Optional[Callable[[Any], None]] = None,
+    ) -> Optional[PipelineMetrics]:
+        """Loads the sources to the vector db with the ingestion pipeline, then optimizes the vector db."""
+        if self.vector_db is None:
+            logger.warning("No vector db provided")
+            return None
+
+        pipeline = self.ingestion_pipeline or IngestionPipeline()
+        try:
+            metrics = pipeline.run(
+                vector_db=self.vector_db,
+                sources=sources,
+                read_source=read_source,
+                get_source_key=get_source_key or self.get_source_key,
+                upsert=upsert,
+                skip_existing=skip_existing,
+                on_source_complete=on_source_complete,
+            )
+        finally:
+            # Documents written before a failure are searchable too
+            self.invalidate_search_cache()
+
+        logger.info(f"Loaded {metrics.documents} documents from {metrics.sources} sources in {round(metrics.time, 2)}s")
+        for stage in metrics.stages:
+            logger.debug(str(stage))
+
+        if self.optimize_on is not None and metrics.documents > self.optimize_on:
             logger.info("Optimizing Vector DB")
             self.vector_db.optimize()
+        return metrics
 
     def load_documents(self, documents: List[Document], upsert: bool = False, skip_existing: bool = True) -> None:
         """Load documents to the knowledge base
@@ -105,19 +473,17 @@ class AssistantKnowledge(BaseModel):
         # Upsert documents if upsert is True
         if upsert and self.vector_db.upsert_available():
             self.vector_db.upsert(documents=documents)
+            self.invalidate_search_cache()
             logger.info(f"Loaded {len(documents)} documents to knowledge base")
             return
 
         # Filter out documents which already exist in the vector db
-        documents_to_load = (
-            [document for document in documents if not self.vector_db.doc_exists(document)]
-            if skip_existing
-            else documents
-        )
+        documents_to_load = self.vector_db.filter_existing_documents(documents) if skip_existing else documents
 
         # Insert documents
         if len(documents_to_load) > 0:
             self.vector_db.insert(documents=documents_to_load)
+            self.invalidate_search_cache()
             logger.info(f"Loaded {len(documents_to_load)} documents to knowledge base")
         else:
             logger.info("No new documents to load")
@@ -175,4 +541,20 @@ class AssistantKnowledge(BaseModel):
             logger.warning("No vector db available")
             return True
 
-        return self.vector_db.clear()
+        cleared = self.vector_db.clear()
+        self.invalidate_search_cache()
+        return cleared
+
+
+def reciprocal_rank_fusion(rankings: List[List[Document]], k: int = 60) -> List[Document]:
+    """Merges ranked lists of documents, scoring each document by the sum of 1 / (k + rank) over the lists.
+    Documents are matched by their content hash.
+    """
+    scores: Dict[str, float] = {}
+    documents: Dict[str, Document] = {}
+    for ranking in rankings:
+        for rank, document in enumerate(ranking, start=1):
+            content_hash = get_content_hash(document)
+            scores[content_hash] = scores.get(content_hash, 0) + 1 / (k + rank)
+            documents.setdefault(content_hash, document)
+    return [documents[content_hash] for content_hash in sorted(scores, key=lambda h: scores[h], reverse=True)]
@@ -0,0 +1,2 @@
+from phi.knowledge.cache.base import SearchCache, CachedSearch
+from phi.knowledge.cache.memory import InMemorySearchCache
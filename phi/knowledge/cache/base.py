@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Any
+
+from pydantic import BaseModel
+
+from phi.document import Document
+
+
+class CachedSearch(BaseModel):
+    """The results of a knowledge base search"""
+
+    documents: List[Document]
+    # The limit, number of results and time of each search, for a hybrid search
+    retrieval: Optional[Dict[str, Dict[str, Any]]] = None
+    # Seconds it took to search, saved by every cache hit
+    time: float = 0
+
+
+class SearchCache(ABC):
+    """Base class for knowledge base search caches.
+
+    Keys are "{namespace}:{generation}:{hash}", where the namespace identifies the collection and the generation
+    is a counter bumped when documents are loaded, which makes the entries of older generations unreachable.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedSearch]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def set(self, key: str, value: CachedSearch) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_generation(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def bump_generation(self, namespace: str) -> int:
+        raise NotImplementedError
+
+    @abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
@@ -0,0 +1,62 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Optional, Dict, Tuple
+
+from phi.knowledge.cache.base import SearchCache, CachedSearch
+
+
+class InMemorySearchCache(SearchCache):
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = 3600):
+        """
+        This class provides an in-memory search cache that evicts the least recently used
+        and expired search results.
+
+        :param max_size: The maximum number of search results to keep.
+        :param ttl: Seconds a search result stays valid, None to keep results until evicted or invalidated.
+        """
+        self.max_size: int = max_size
+        self.ttl: Optional[float] = ttl
+        self._entries: OrderedDict[str, Tuple[float, CachedSearch]] = OrderedDict()
+        self._generations: Dict[str, int] = {}
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[CachedSearch]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: CachedSearch) -> None:
+        expires_at = monotonic() + self.ttl if self.ttl is not None else float("inf")
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_generation(self, namespace: str) -> int:
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace: str) -> int:
+        with self._lock:
+            generation = self._generations.get(namespace, 0) + 1
+            self._generations[namespace] = generation
+            # Keys start with the namespace, entries of older generations can not be reached anymore
+            for key in [key for key in self._entries if key.startswith(f"{namespace}:")]:
+                del self._entries[key]
+            return generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,4 +1,4 @@
-from typing import List, Iterator
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from phi.document import Document
 from phi.knowledge.base import AssistantKnowledge
@@ -8,15 +8,33 @@ from phi.utils.log import logger
 class CombinedKnowledgeBase(AssistantKnowledge):
     sources: List[AssistantKnowledge] = []
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over knowledge bases and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
-
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
+    def get_sources(self) -> Iterator[Tuple[int, Any, Callable, Callable]]:
+        """Yields the sources of each knowledge base with the number of the knowledge base,
+        and the functions that read the source and return its key.
         """
+        for kb_number, kb in enumerate(self.sources):
+            logger.debug(f"Loading documents from {kb.__class__.__name__}")
+            sources, read_source, get_source_key = kb.get_sources_and_reader()
+            for source in sources:
+                yield kb_number, source, read_source, get_source_key
+
+    def read_source(self, source: Tuple[int, Any, Callable, Callable]) -> Iterable[Document]:
+        _, kb_source, read_source, _ = source
+        return read_source(kb_source)
+
+    def get_source_key(self, source: Tuple[int, Any, Callable, Callable]) -> Optional[str]:
+        kb_number, kb_source, _, get_source_key = source
+        key = get_source_key(kb_source)
+        return f"{kb_number}:{key}" if key is not None else None
 
+    def shutdown_readers(self) -> None:
         for kb in self.sources:
-            logger.debug(f"Loading documents from {kb.__class__.__name__}")
-            yield from kb.document_lists
+            kb.shutdown_readers()
+
+    def get_source_fingerprint(self, source: Tuple[int, Any, Callable, Callable]) -> Optional[Dict[str, Any]]:
+        kb_number, kb_source, _, _ = source
+        return self.sources[kb_number].get_source_fingerprint(kb_source)
+
+    def get_source_content_hash(self, source: Tuple[int, Any, Callable, Callable]) -> Optional[str]:
+        kb_number, kb_source, _, _ = source
+        return self.sources[kb_number].get_source_content_hash(kb_source)
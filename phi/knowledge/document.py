@@ -2,19 +2,18 @@ from typing import List, Iterator
 
 from phi.document import Document
 from phi.knowledge.base import AssistantKnowledge
+from phi.vectordb.base import get_content_hash
 
 
 class DocumentKnowledgeBase(AssistantKnowledge):
     documents: List[Document]
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over documents and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
+    def get_sources(self) -> Iterator[Document]:
+        """Yields the documents"""
+        yield from self.documents
 
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
+    def read_source(self, source: Document) -> List[Document]:
+        return [source]
 
-        for _document in self.documents:
-            yield [_document]
+    def get_source_key(self, source: Document) -> str:
+        return get_content_hash(source)
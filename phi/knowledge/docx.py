@@ -11,20 +11,17 @@ class DocxKnowledgeBase(AssistantKnowledge):
     formats: List[str] = [".doc", ".docx"]
     reader: DocxReader = DocxReader()
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over doc/docx files and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
-
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
+    def get_sources(self) -> Iterator[Path]:
+        """Yields the doc/docx files in the path"""
 
         _file_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _file_path.exists() and _file_path.is_dir():
             for _file in _file_path.glob("**/*"):
                 if _file.suffix in self.formats:
-                    yield self.reader.read(path=_file)
+                    yield _file
         elif _file_path.exists() and _file_path.is_file() and _file_path.suffix in self.formats:
-            yield self.reader.read(path=_file_path)
+            yield _file_path
+
+    def read_source(self, source: Path) -> List[Document]:
+        return self.reader.read(path=source)
@@ -10,19 +10,15 @@ class JSONKnowledgeBase(AssistantKnowledge):
     path: Union[str, Path]
     reader: JSONReader = JSONReader()
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over Json files and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
-
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
+    def get_sources(self) -> Iterator[Path]:
+        """Yields the Json files in the path"""
 
         _json_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _json_path.exists() and _json_path.is_dir():
-            for _pdf in _json_path.glob("*.json"):
-                yield self.reader.read(path=_pdf)
+            yield from _json_path.glob("*.json")
         elif _json_path.exists() and _json_path.is_file() and _json_path.suffix == ".json":
-            yield self.reader.read(path=_json_path)
+            yield _json_path
+
+    def read_source(self, source: Path) -> List[Document]:
+        return self.reader.read(path=source)
@@ -1,7 +1,8 @@
-from typing import List, Optional, Callable, Any
+from typing import List, Optional, Callable, Any, Dict, Tuple
 
 from phi.document import Document
 from phi.knowledge.base import AssistantKnowledge
+from phi.vectordb.filters import Filters
 from phi.utils.log import logger
 
 
@@ -13,8 +14,16 @@ class LangChainKnowledgeBase(AssistantKnowledge):
 
     retriever: Optional[Any] = None
 
-    def search(self, query: str, num_documents: Optional[int] = None) -> List[Document]:
-        """Returns relevant documents matching the query"""
+    def search(
+        self,
+        query: str,
+        num_documents: Optional[int] = None,
+        return_embeddings: bool = False,
+        filters: Optional[Filters] = None,
+    ) -> List[Document]:
+        """Returns relevant documents matching the query.
+        return_embeddings and filters are not used, configure filters with search_kwargs.
+        """
 
         try:
             from langchain_core.vectorstores import VectorStoreRetriever
@@ -50,6 +59,15 @@ class LangChainKnowledgeBase(AssistantKnowledge):
             )
         return documents
 
+    def search_with_retrieval(
+        self,
+        query: str,
+        num_documents: Optional[int] = None,
+        return_embeddings: bool = False,
+        filters: Optional[Filters] = None,
+    ) -> Tuple[List[Document], Optional[Dict[str, Dict[str, Any]]]]:
+        return self.search(query=query, num_documents=num_documents, return_embeddings=return_embeddings), None
+
     def load(self, recreate: bool = False, upsert: bool = True, skip_existing: bool = True) -> None:
         if self.loader is None:
             logger.error("No loader provided for LangChainKnowledgeBase")
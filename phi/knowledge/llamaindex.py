@@ -1,7 +1,8 @@
-from typing import List, Optional, Callable
+from typing import List, Optional, Callable, Any, Dict, Tuple
 
 from phi.document import Document
 from phi.knowledge.base import AssistantKnowledge
+from phi.vectordb.filters import Filters
 from phi.utils.log import logger
 
 try:
@@ -17,13 +18,21 @@ class LlamaIndexKnowledgeBase(AssistantKnowledge):
     retriever: BaseRetriever
     loader: Optional[Callable] = None
 
-    def search(self, query: str, num_documents: Optional[int] = None) -> List[Document]:
+    def search(
+        self,
+        query: str,
+        num_documents: Optional[int] = None,
+        return_embeddings: bool = False,
+        filters: Optional[Filters] = None,
+    ) -> List[Document]:
         """
         Returns relevant documents matching the query.
 
         Args:
             query (str): The query string to search for.
             num_documents (Optional[int]): The maximum number of documents to return. Defaults to None.
+            return_embeddings (bool): Not used, embeddings are not returned by the retriever.
+            filters (Optional[Filters]): Not used, configure filters on the retriever.
 
         Returns:
             List[Document]: A list of relevant documents matching the query.
@@ -46,6 +55,15 @@ class LlamaIndexKnowledgeBase(AssistantKnowledge):
             )
         return documents
 
+    def search_with_retrieval(
+        self,
+        query: str,
+        num_documents: Optional[int] = None,
+        return_embeddings: bool = False,
+        filters: Optional[Filters] = None,
+    ) -> Tuple[List[Document], Optional[Dict[str, Dict[str, Any]]]]:
+        return self.search(query=query, num_documents=num_documents, return_embeddings=return_embeddings), None
+
     def load(self, recreate: bool = False, upsert: bool = True, skip_existing: bool = True) -> None:
         if self.loader is None:
             logger.error("No loader provided for LlamaIndexKnowledgeBase")
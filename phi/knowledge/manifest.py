@@ -0,0 +1,166 @@
+import os
+from hashlib import md5
+from pathlib import Path
+from threading import Lock
+from time import time
+from typing import Any, Dict, List, Optional, Set, Union
+
+from pydantic import BaseModel
+
+from phi.utils.log import logger
+
+
+class SourceRecord(BaseModel):
+    """A source loaded to the vector db, e.g. a file or an s3 object"""
+
+    # Cheap to read properties of the source that change when it changes,
+    # e.g. the mtime and size of a file or the ETag and size of an s3 object
+    fingerprint: Optional[Dict[str, Any]] = None
+    # md5 of the contents of the source, so a source touched without changes is not read again
+    content_hash: Optional[str] = None
+    # Content hashes of the documents read from the source, which identify its chunks in the vector db
+    chunks: List[str] = []
+    loaded_at: float = 0
+    # Set when the source is removed, its chunks are deleted from the vector db
+    deleted_at: Optional[float] = None
+
+
+class SourceManifest(BaseModel):
+    """The sources of a knowledge base loaded to the vector db, by source key.
+    Saved as json next to the collection, see AssistantKnowledge.manifest_file.
+    """
+
+    sources: Dict[str, SourceRecord] = {}
+
+    @classmethod
+    def read(cls, path: Union[str, Path]) -> "SourceManifest":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        return cls.model_validate_json(path.read_bytes())
+
+    def write(self, path: Union[str, Path]) -> None:
+        """Writes the manifest to a temporary file and renames it, so a failed write keeps the previous manifest"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        tmp_path.write_text(self.model_dump_json())
+        os.replace(tmp_path, path)
+        logger.debug(f"Saved manifest of {len(self.sources)} sources to {path}")
+
+    def get_chunk_counts(self) -> Dict[str, int]:
+        """Returns the number of sources that are not removed with each chunk"""
+        counts: Dict[str, int] = {}
+        for record in self.sources.values():
+            if record.deleted_at is None:
+                for content_hash in set(record.chunks):
+                    counts[content_hash] = counts.get(content_hash, 0) + 1
+        return counts
+
+
+class ManifestUpdate:
+    """Updates a SourceManifest during a load: records the chunks of the sources loaded and removed,
+    and keeps the number of sources with each chunk, so a chunk is only deleted when no source has it.
+    Sources are completed from the threads of the ingestion pipeline.
+    """
+
+    def __init__(self, manifest: SourceManifest):
+        self.manifest: SourceManifest = manifest
+        self.chunk_counts: Dict[str, int] = manifest.get_chunk_counts()
+        # Chunks of the sources that changed or were removed, deleted when no source has them
+        self.superseded: Set[str] = set()
+        self.lock = Lock()
+        self.unchanged: int = 0
+        self.loaded: int = 0
+        self.removed: int = 0
+
+    def get_record(self, key: str) -> Optional[SourceRecord]:
+        record = self.manifest.sources.get(key)
+        return record if record is not None and record.deleted_at is None else None
+
+    def has_fingerprint(self, key: str, fingerprint: Optional[Dict[str, Any]]) -> bool:
+        """Returns True if the source was loaded with this fingerprint"""
+        with self.lock:
+            record = self.get_record(key)
+            unchanged = record is not None and fingerprint is not None and record.fingerprint == fingerprint
+            self.unchanged += int(unchanged)
+            return unchanged
+
+    def has_content(self, key: str, fingerprint: Optional[Dict[str, Any]], content_hash: Optional[str]) -> bool:
+        """Returns True if the source was loaded with these contents, and updates the fingerprint of the source,
+        e.g. of a file touched without changes
+        """
+        with self.lock:
+            record = self.get_record(key)
+            unchanged = record is not None and content_hash is not None and record.content_hash == content_hash
+            if unchanged:
+                record.fingerprint = fingerprint  # type: ignore
+            self.unchanged += int(unchanged)
+            return unchanged
+
+    def set_chunks(self, key: str, record: SourceRecord) -> None:
+        """Records the source with its new chunks, its previous chunks are superseded"""
+        with self.lock:
+            previous = self.get_record(key)
+            if previous is not None:
+                self.release_chunks(previous)
+            for content_hash in set(record.chunks):
+                self.chunk_counts[content_hash] = self.chunk_counts.get(content_hash, 0) + 1
+            self.manifest.sources[key] = record
+            self.loaded += 1
+
+    def supersede(self, key: str) -> None:
+        """Releases the chunks of a source that changed before it is loaded again, so the chunks no other source has
+        can be deleted before its new chunks are written with the same ids
+        """
+        with self.lock:
+            record = self.get_record(key)
+            if record is None:
+                return
+            self.release_chunks(record)
+            record.chunks = []
+
+    def remove(self, key: str) -> None:
+        """Tombstones a source that was removed, its chunks are superseded"""
+        with self.lock:
+            record = self.get_record(key)
+            if record is None:
+                return
+            self.release_chunks(record)
+            record.chunks = []
+            record.deleted_at = time()
+            self.removed += 1
+
+    def release_chunks(self, record: SourceRecord) -> None:
+        for content_hash in set(record.chunks):
+            self.chunk_counts[content_hash] -= 1
+            if self.chunk_counts[content_hash] == 0:
+                del self.chunk_counts[content_hash]
+                self.superseded.add(content_hash)
+
+    def pop_stale_chunks(self) -> List[str]:
+        """Returns the superseded chunks that no source has, and forgets them"""
+        with self.lock:
+            stale = [content_hash for content_hash in self.superseded if content_hash not in self.chunk_counts]
+            self.superseded = set()
+        return stale
+
+
+def get_file_fingerprint(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def get_file_hash(path: Path, block_size: int = 1024 * 1024) -> Optional[str]:
+    """Returns the md5 of the contents of a file, reading it in blocks"""
+    try:
+        with path.open("rb") as f:
+            file_hash = md5()
+            for block in iter(lambda: f.read(block_size), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+    except OSError:
+        return None
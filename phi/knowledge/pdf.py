@@ -10,36 +10,29 @@ class PDFKnowledgeBase(AssistantKnowledge):
     path: Union[str, Path]
     reader: Union[PDFReader, PDFImageReader] = PDFReader()
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over PDFs and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
-
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
+    def get_sources(self) -> Iterator[Path]:
+        """Yields the PDF files in the path"""
 
         _pdf_path: Path = Path(self.path) if isinstance(self.path, str) else self.path
 
         if _pdf_path.exists() and _pdf_path.is_dir():
-            for _pdf in _pdf_path.glob("**/*.pdf"):
-                yield self.reader.read(pdf=_pdf)
+            yield from _pdf_path.glob("**/*.pdf")
         elif _pdf_path.exists() and _pdf_path.is_file() and _pdf_path.suffix == ".pdf":
-            yield self.reader.read(pdf=_pdf_path)
+            yield _pdf_path
+
+    def read_source(self, source: Path) -> Iterator[Document]:
+        """Yields the documents of a file as its pages are extracted, so they are loaded while the file is read"""
+        return self.reader.iter_documents(pdf=source)
 
 
 class PDFUrlKnowledgeBase(AssistantKnowledge):
     urls: List[str] = []
     reader: Union[PDFUrlReader, PDFUrlImageReader] = PDFUrlReader()
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over PDF urls and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
-
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
+    def get_sources(self) -> Iterator[str]:
+        """Yields the PDF urls"""
+        yield from self.urls
 
-        for url in self.urls:
-            yield self.reader.read(url=url)
+    def read_source(self, source: str) -> Iterator[Document]:
+        """Yields the documents of a url as its pages are extracted, so they are loaded while the file is read"""
+        return self.reader.iter_documents(url=source)
@@ -0,0 +1,362 @@
+import json
+from pathlib import Path
+from queue import Queue
+from threading import Lock, Thread
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+
+from pydantic import BaseModel
+
+from phi.document import Document
+from phi.vectordb import VectorDb
+from phi.vectordb.base import get_content_hash
+from phi.utils.log import logger
+
+# A batch of documents and the number of the source it was read from
+Batch = Tuple[int, List[Document]]
+
+
+class StageMetrics(BaseModel):
+    name: str
+    workers: int
+    batches: int = 0
+    documents: int = 0
+    # Seconds spent working, summed over the workers of the stage
+    time: float = 0
+    # Seconds spent waiting for the next stage to take a batch, high when the next stage is the bottleneck
+    blocked_time: float = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name}: {self.documents} documents in {self.batches} batches, "
+            f"{round(self.time, 2)}s working, {round(self.blocked_time, 2)}s blocked ({self.workers} workers)"
+        )
+
+
+class PipelineMetrics(BaseModel):
+    stages: List[StageMetrics] = []
+    # Number of sources read and written
+    sources: int = 0
+    # Number of sources skipped because the checkpoint has them as loaded
+    skipped_sources: int = 0
+    time: float = 0
+
+    @property
+    def documents(self) -> int:
+        """Number of documents written"""
+        return self.stages[-1].documents if len(self.stages) > 0 else 0
+
+
+class IngestionPipeline(BaseModel):
+    """Loads sources to a vector db in stages: read -> dedupe -> embed -> write.
+
+    Each stage runs on its own threads and passes batches of documents to the next stage through a bounded queue,
+    so reading a slow source overlaps with embedding and writing, and a slow stage holds back the stages before it
+    instead of buffering every document in memory:
+        - read: read_workers threads, each reads one source at a time and batches its documents as they are read.
+        - dedupe: one thread, drops documents already in the vector db or already seen in this load.
+        - embed: embed_workers threads, embeds the batches with the vector db embedder.
+        - write: one thread, inserts or upserts the batches, so the vector db has a single writer.
+
+    With a checkpoint_file, the key of each source is appended to the file once all its documents are written.
+    A load that fails can be run again and skips the sources in the checkpoint.
+    The file is removed when a load completes.
+    """
+
+    read_workers: int = 4
+    embed_workers: int = 2
+    # Number of documents embedded and written at a time
+    batch_size: int = 100
+    # Number of batches each queue holds before the stage feeding it waits
+    queue_size: int = 8
+    checkpoint_file: Optional[Union[str, Path]] = None
+
+    def run(
+        self,
+        vector_db: VectorDb,
+        sources: Iterable[Any],
+        read_source: Callable[[Any], Iterable[Document]],
+        get_source_key: Callable[[Any], Optional[str]] = str,
+        upsert: bool = False,
+        skip_existing: bool = True,
+        on_source_complete: Optional[Callable[[Any], None]] = None,
+    ) -> PipelineMetrics:
+        """Reads, embeds and writes the documents of the sources to the vector db.
+
+        Args:
+            vector_db (VectorDb): The vector db to write to.
+            sources (Iterable[Any]): The sources to load, e.g. file paths or urls.
+            read_source (Callable): Returns the documents of a source, called from the read threads.
+                Documents are batched as the iterable yields them, so a generator streams its documents to the
+                next stages before the whole source is read.
+            get_source_key (Callable): Identifies a source in the checkpoint file, None to not checkpoint the source.
+            upsert (bool): If True, upserts documents to the vector db. Defaults to False.
+            skip_existing (bool): If True, skips documents which already exist in the vector db when inserting.
+            on_source_complete (Callable): Called with each source once all its documents are written.
+
+        Returns:
+            PipelineMetrics: The number of documents, batches and time of each stage.
+        """
+        return IngestionRun(
+            pipeline=self,
+            vector_db=vector_db,
+            read_source=read_source,
+            get_source_key=get_source_key,
+            upsert=upsert and vector_db.upsert_available(),
+            skip_existing=skip_existing,
+            on_source_complete=on_source_complete,
+        ).run(sources)
+
+
+class IngestionRun:
+    """The queues, threads and state of one IngestionPipeline.run()"""
+
+    def __init__(
+        self,
+        pipeline: IngestionPipeline,
+        vector_db: VectorDb,
+        read_source: Callable[[Any], Iterable[Document]],
+        get_source_key: Callable[[Any], Optional[str]],
+        upsert: bool,
+        skip_existing: bool,
+        on_source_complete: Optional[Callable[[Any], None]] = None,
+    ):
+        self.pipeline: IngestionPipeline = pipeline
+        self.vector_db: VectorDb = vector_db
+        self.read_source: Callable[[Any], Iterable[Document]] = read_source
+        self.get_source_key: Callable[[Any], Optional[str]] = get_source_key
+        self.upsert: bool = upsert
+        self.skip_existing: bool = skip_existing
+        self.on_source_complete: Optional[Callable[[Any], None]] = on_source_complete
+
+        read_workers = max(1, pipeline.read_workers)
+        embed_workers = max(1, pipeline.embed_workers)
+        self.read = StageMetrics(name="read", workers=read_workers)
+        self.dedupe = StageMetrics(name="dedupe", workers=1)
+        self.embed = StageMetrics(name="embed", workers=embed_workers)
+        self.write = StageMetrics(name="write", workers=1)
+        self.metrics = PipelineMetrics(stages=[self.read, self.dedupe, self.embed, self.write])
+
+        # None is put on a queue once for each worker of the next stage to stop it
+        self.read_queue: Queue = Queue(maxsize=2 * read_workers)
+        self.dedupe_queue: Queue = Queue(maxsize=pipeline.queue_size)
+        self.embed_queue: Queue = Queue(maxsize=pipeline.queue_size)
+        self.write_queue: Queue = Queue(maxsize=pipeline.queue_size)
+
+        self.lock = Lock()
+        self.error: Optional[Exception] = None
+        self.stopped_workers: Dict[str, int] = {}
+        # Number of batches of each source that are not written yet, the checkpoint key of each source,
+        # and the sources being loaded when on_source_complete is set
+        self.pending_batches: Dict[int, int] = {}
+        self.source_keys: Dict[int, Optional[str]] = {}
+        self.sources: Dict[int, Any] = {}
+        self.checkpoint_file: Optional[Path] = (
+            Path(pipeline.checkpoint_file) if pipeline.checkpoint_file is not None else None
+        )
+        # Content hashes of the documents in this load
+        self.seen_hashes: Set[str] = set()
+
+    def run(self, sources: Iterable[Any]) -> PipelineMetrics:
+        start = perf_counter()
+        threads = [
+            Thread(
+                target=self.work,
+                args=(self.read, self.read_queue, self.dedupe_queue, self.read_batches, 1),
+                name=f"phi-ingest-read-{i}",
+                daemon=True,
+            )
+            for i in range(self.read.workers)
+        ]
+        threads.append(
+            Thread(
+                target=self.work,
+                args=(self.dedupe, self.dedupe_queue, self.embed_queue, self.dedupe_batch, self.embed.workers),
+                name="phi-ingest-dedupe",
+                daemon=True,
+            )
+        )
+        threads.extend(
+            Thread(
+                target=self.work,
+                args=(self.embed, self.embed_queue, self.write_queue, self.embed_batch, 1),
+                name=f"phi-ingest-embed-{i}",
+                daemon=True,
+            )
+            for i in range(self.embed.workers)
+        )
+        threads.append(
+            Thread(
+                target=self.work,
+                args=(self.write, self.write_queue, None, self.write_batch, 0),
+                name="phi-ingest-write",
+                daemon=True,
+            )
+        )
+        for thread in threads:
+            thread.start()
+
+        try:
+            self.feed(sources)
+        except Exception as e:
+            self.fail(e)
+        finally:
+            for _ in range(self.read.workers):
+                self.read_queue.put(None)
+            for thread in threads:
+                thread.join()
+
+        self.metrics.time = perf_counter() - start
+        if self.error is not None:
+            if self.checkpoint_file is not None:
+                logger.info(f"Loaded sources are saved in {self.checkpoint_file}, load again to resume")
+            raise self.error
+        if self.checkpoint_file is not None and self.checkpoint_file.exists():
+            self.checkpoint_file.unlink()
+        return self.metrics
+
+    def feed(self, sources: Iterable[Any]) -> None:
+        """Puts the sources on the read queue, skipping the sources in the checkpoint."""
+        loaded = self.read_checkpoint()
+        for source_number, source in enumerate(sources):
+            if self.error is not None:
+                return
+            key = self.get_source_key(source) if self.checkpoint_file is not None else None
+            if key is not None and key in loaded:
+                logger.debug(f"Skipping {key}, it was loaded before")
+                self.metrics.skipped_sources += 1
+                continue
+            with self.lock:
+                self.source_keys[source_number] = key
+                if self.on_source_complete is not None:
+                    self.sources[source_number] = source
+            self.read_queue.put((source_number, source))
+
+    def work(
+        self,
+        stage: StageMetrics,
+        inbox: Queue,
+        outbox: Optional[Queue],
+        process: Callable[[Any], Iterable[Batch]],
+        next_workers: int,
+    ) -> None:
+        """Processes items from the inbox until stopped, then stops the next stage once every worker has stopped.
+        Each batch is passed to the next stage as soon as process() yields it.
+        After a failure the remaining items are taken from the inbox without processing, so no stage stays blocked.
+        """
+        while True:
+            item = inbox.get()
+            if item is None:
+                break
+            if self.error is not None:
+                continue
+
+            start = perf_counter()
+            blocked_time = 0.0
+            try:
+                for batch in process(item):
+                    with self.lock:
+                        stage.batches += 1
+                        stage.documents += len(batch[1])
+                    if outbox is not None:
+                        put_start = perf_counter()
+                        outbox.put(batch)
+                        blocked_time += perf_counter() - put_start
+            except Exception as e:
+                logger.error(f"Error in the {stage.name} stage: {e}")
+                self.fail(e)
+            with self.lock:
+                stage.time += perf_counter() - start - blocked_time
+                stage.blocked_time += blocked_time
+
+        with self.lock:
+            self.stopped_workers[stage.name] = self.stopped_workers.get(stage.name, 0) + 1
+            last_worker = self.stopped_workers[stage.name] == stage.workers
+        if last_worker and outbox is not None:
+            for _ in range(next_workers):
+                outbox.put(None)
+
+    def fail(self, error: Exception) -> None:
+        with self.lock:
+            if self.error is None:
+                self.error = error
+
+    def read_batches(self, item: Tuple[int, Any]) -> Iterator[Batch]:
+        source_number, source = item
+        batch_size = max(1, self.pipeline.batch_size)
+        # The read counts as a pending batch until it ends, so the source is not completed while it is being read
+        with self.lock:
+            self.pending_batches[source_number] = 1
+        documents: List[Document] = []
+        for document in self.read_source(source):
+            documents.append(document)
+            if len(documents) >= batch_size:
+                with self.lock:
+                    self.pending_batches[source_number] += 1
+                yield source_number, documents
+                documents = []
+        if len(documents) > 0:
+            with self.lock:
+                self.pending_batches[source_number] += 1
+            yield source_number, documents
+        self.release_batch(source_number)
+
+    def dedupe_batch(self, batch: Batch) -> List[Batch]:
+        source_number, documents = batch
+        if not self.upsert and self.skip_existing and len(documents) > 0:
+            new_documents = []
+            for document in self.vector_db.filter_existing_documents(documents):
+                content_hash = get_content_hash(document)
+                if content_hash not in self.seen_hashes:
+                    self.seen_hashes.add(content_hash)
+                    new_documents.append(document)
+            documents = new_documents
+        # Empty batches are passed on, so the write stage can tell when every batch of a source is written
+        return [(source_number, documents)]
+
+    def embed_batch(self, batch: Batch) -> List[Batch]:
+        self.vector_db.embed_documents(batch[1])
+        return [batch]
+
+    def write_batch(self, batch: Batch) -> List[Batch]:
+        source_number, documents = batch
+        if len(documents) > 0:
+            if self.upsert:
+                self.vector_db.upsert(documents=documents)
+            else:
+                self.vector_db.insert(documents=documents)
+            logger.debug(f"Added {len(documents)} documents to knowledge base")
+
+        self.release_batch(source_number)
+        return [batch]
+
+    def release_batch(self, source_number: int) -> None:
+        """Completes the source once it is read and all its batches are written"""
+        with self.lock:
+            self.pending_batches[source_number] -= 1
+            source_written = self.pending_batches[source_number] == 0
+        if source_written:
+            self.complete_source(source_number)
+
+    def complete_source(self, source_number: int) -> None:
+        with self.lock:
+            self.metrics.sources += 1
+            key = self.source_keys.pop(source_number, None)
+            source = self.sources.pop(source_number, None)
+            self.pending_batches.pop(source_number, None)
+            if self.checkpoint_file is not None and key is not None:
+                self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
+                with self.checkpoint_file.open("a") as f:
+                    f.write(json.dumps(key) + "\n")
+        if self.on_source_complete is not None:
+            self.on_source_complete(source)
+
+    def read_checkpoint(self) -> Set[str]:
+        if self.checkpoint_file is None or not self.checkpoint_file.exists():
+            return set()
+        loaded = set()
+        for line in self.checkpoint_file.read_text().splitlines():
+            if line.strip():
+                loaded.add(json.loads(line))
+        logger.info(f"Resuming from {self.checkpoint_file}: {len(loaded)} sources were loaded before")
+        return loaded
@@ -1,6 +1,5 @@
-from typing import List, Iterator, Optional
+from typing import Any, Dict, List, Optional
 
-from phi.document import Document
 from phi.aws.resource.s3.bucket import S3Bucket
 from phi.aws.resource.s3.object import S3Object
 from phi.knowledge.base import AssistantKnowledge
@@ -19,9 +18,17 @@ class S3KnowledgeBase(AssistantKnowledge):
     # Ignored if object or key is provided
     prefix: Optional[str] = None
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        raise NotImplementedError
+    def get_source_key(self, source: S3Object) -> str:
+        return source.uri
+
+    def get_source_fingerprint(self, source: S3Object) -> Optional[Dict[str, Any]]:
+        """The ETag and size of the object, listed with the objects of the bucket,
+        or read from the object when it is given by key.
+        """
+        if source.e_tag is None:
+            resource = source.get_resource()
+            return {"e_tag": resource.e_tag, "size": resource.content_length}
+        return {"e_tag": source.e_tag, "size": source.size}
 
     @property
     def s3_objects(self) -> List[S3Object]:
@@ -1,6 +1,7 @@
-from typing import List, Iterator
+from typing import Iterator
 
 from phi.document import Document
+from phi.aws.resource.s3.object import S3Object
 from phi.document.reader.s3.pdf import S3PDFReader
 from phi.knowledge.s3.base import S3KnowledgeBase
 
@@ -8,14 +9,12 @@ from phi.knowledge.s3.base import S3KnowledgeBase
 class S3PDFKnowledgeBase(S3KnowledgeBase):
     reader: S3PDFReader = S3PDFReader()
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over PDFs in a s3 bucket and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
-
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
+    def get_sources(self) -> Iterator[S3Object]:
+        """Yields the PDFs in the s3 bucket"""
         for s3_object in self.s3_objects:
             if s3_object.name.endswith(".pdf"):
-                yield self.reader.read(s3_object=s3_object)
+                yield s3_object
+
+    def read_source(self, source: S3Object) -> Iterator[Document]:
+        """Yields the documents of a PDF as its pages are extracted, so they are loaded while the file is read"""
+        return self.reader.iter_documents(s3_object=source)
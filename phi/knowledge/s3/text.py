@@ -1,6 +1,7 @@
 from typing import List, Iterator
 
 from phi.document import Document
+from phi.aws.resource.s3.object import S3Object
 from phi.document.reader.s3.text import S3TextReader
 from phi.knowledge.s3.base import S3KnowledgeBase
 
@@ -9,15 +10,11 @@ class S3TextKnowledgeBase(S3KnowledgeBase):
     formats: List[str] = [".doc", ".docx"]
     reader: S3TextReader = S3TextReader()
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over text files in a s3 bucket and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
-
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
-
+    def get_sources(self) -> Iterator[S3Object]:
+        """Yields the text files in the s3 bucket"""
         for s3_object in self.s3_objects:
             if s3_object.name.endswith(tuple(self.formats)):
-                yield self.reader.read(s3_object=s3_object)
+                yield s3_object
+
+    def read_source(self, source: S3Object) -> List[Document]:
+        return self.reader.read(s3_object=source)
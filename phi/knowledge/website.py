@@ -22,17 +22,14 @@ class WebsiteKnowledgeBase(AssistantKnowledge):
             self.reader = WebsiteReader(max_depth=self.max_depth, max_links=self.max_links)
         return self  # type: ignore
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over urls and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
-
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
-        if self.reader is not None:
-            for _url in self.urls:
-                yield self.reader.read(url=_url)
+    def get_sources(self) -> Iterator[str]:
+        """Yields the urls to crawl"""
+        yield from self.urls
+
+    def read_source(self, source: str) -> Iterator[Document]:
+        """Crawls a url, yielding its documents as the pages are fetched so they are loaded while the crawl runs"""
+        assert self.reader is not None
+        return self.reader.iter_documents(url=source)
 
     def load(self, recreate: bool = False, upsert: bool = True, skip_existing: bool = True) -> None:
         """Load the website contents to the vector db"""
@@ -53,28 +50,16 @@ class WebsiteKnowledgeBase(AssistantKnowledge):
         self.vector_db.create()
 
         logger.info("Loading knowledge base")
-        num_documents = 0
 
         # Given that the crawler needs to parse the URL before existence can be checked
         # We check if the website url exists in the vector db if recreate is False
         urls_to_read = self.urls.copy()
         if not recreate:
-            for url in urls_to_read:
+            for url in self.urls:
                 logger.debug(f"Checking if {url} exists in the vector db")
                 if self.vector_db.name_exists(name=url):
                     logger.debug(f"Skipping {url} as it exists in the vector db")
                     urls_to_read.remove(url)
 
-        for url in urls_to_read:
-            document_list = self.reader.read(url=url)
-            # Filter out documents which already exist in the vector db
-            if not recreate:
-                document_list = [document for document in document_list if not self.vector_db.doc_exists(document)]
-
-            self.vector_db.insert(documents=document_list)
-            num_documents += len(document_list)
-            logger.info(f"Loaded {num_documents} documents to knowledge base")
-
-        if self.optimize_on is not None and num_documents > self.optimize_on:
-            logger.debug("Optimizing Vector DB")
-            self.vector_db.optimize()
+        # Filter out documents which already exist in the vector db if recreate is False
+        self.load_sources(sources=iter(urls_to_read), read_source=self.read_source, skip_existing=not recreate)
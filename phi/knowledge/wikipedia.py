@@ -12,20 +12,15 @@ except ImportError:
 class WikipediaKnowledgeBase(AssistantKnowledge):
     topics: List[str] = []
 
-    @property
-    def document_lists(self) -> Iterator[List[Document]]:
-        """Iterate over urls and yield lists of documents.
-        Each object yielded by the iterator is a list of documents.
+    def get_sources(self) -> Iterator[str]:
+        """Yields the topics"""
+        yield from self.topics
 
-        Returns:
-            Iterator[List[Document]]: Iterator yielding list of documents
-        """
-
-        for topic in self.topics:
-            yield [
-                Document(
-                    name=topic,
-                    meta_data={"topic": topic},
-                    content=wikipedia.summary(topic),
-                )
-            ]
+    def read_source(self, source: str) -> List[Document]:
+        return [
+            Document(
+                name=source,
+                meta_data={"topic": source},
+                content=wikipedia.summary(source),
+            )
+        ]
@@ -1,15 +1,14 @@
 import json
 from textwrap import dedent
-from typing import Optional, List, Iterator, Dict, Any
+from typing import Optional, List, Iterator, Dict, Any, Union
 
 
 from phi.llm.base import LLM
 from phi.llm.message import Message
-from phi.tools.function import FunctionCall
+from phi.utils.clients import get_shared_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import (
-    get_function_call_for_tool_call,
     extract_tool_from_xml,
     remove_function_calls_from_string,
 )
@@ -25,6 +24,8 @@ except ImportError:
 class Claude(LLM):
     name: str = "claude"
     model: str = "claude-3-opus-20240229"
+    # Tool calls are parsed from the response text, so tool results are sent back as user messages
+    tool_message_role: str = "user"
     # -*- Request parameters
     max_tokens: Optional[int] = 1024
     temperature: Optional[float] = None
@@ -35,6 +36,8 @@ class Claude(LLM):
     # -*- Client parameters
     api_key: Optional[str] = None
     client_params: Optional[Dict[str, Any]] = None
+    # If True, reuse a process-wide client (and its connection pool) for this configuration.
+    use_shared_client: bool = True
     # -*- Provide the client manually
     anthropic_client: Optional[AnthropicClient] = None
 
@@ -46,6 +49,10 @@ class Claude(LLM):
         _client_params: Dict[str, Any] = {}
         if self.api_key:
             _client_params["api_key"] = self.api_key
+        if self.client_params:
+            _client_params.update(self.client_params)
+        if self.use_shared_client:
+            return get_shared_client(provider="anthropic", factory=AnthropicClient, client_params=_client_params)
         return AnthropicClient(**_client_params)
 
     @property
@@ -102,12 +109,7 @@ class Claude(LLM):
             **api_kwargs,
         )
 
-    def response(self, messages: List[Message]) -> str:
-        logger.debug("---------- Claude Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
-
+    def get_assistant_message(self, messages: List[Message]) -> Message:
         response_timer = Timer()
         response_timer.start()
         response: AnthropicMessage = self.invoke(messages=messages)
@@ -166,62 +168,9 @@ class Claude(LLM):
             self.metrics["response_times"] = []
         self.metrics["response_times"].append(response_timer.elapsed)
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function call
-        if assistant_message.tool_calls is not None and self.run_tools:
-            # Remove the tool call from the response content
-            final_response = remove_function_calls_from_string(assistant_message.content)  # type: ignore
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    final_response += f" - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    final_response += "Running:"
-                    for _f in function_calls_to_run:
-                        final_response += f"\n - {_f.get_call_str()}"
-                    final_response += "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run, role="user")
-            if len(function_call_results) > 0:
-                fc_responses = "<function_results>"
-
-                for _fc_message in function_call_results:
-                    fc_responses += "<result>"
-                    fc_responses += "<tool_name>" + _fc_message.tool_call_name + "</tool_name>"  # type: ignore
-                    fc_responses += "<stdout>" + _fc_message.content + "</stdout>"  # type: ignore
-                    fc_responses += "</result>"
-                fc_responses += "</function_results>"
-
-                messages.append(Message(role="user", content=fc_responses))
-
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages)
-            return final_response
-        logger.debug("---------- Claude Response End ----------")
-        # -*- Return content if no function calls are present
-        if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
-
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
-        logger.debug("---------- Claude Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        return assistant_message
 
+    def get_assistant_message_stream(self, messages: List[Message]) -> Iterator[Union[str, Message]]:
         assistant_message_content = ""
         tool_calls_counter = 0
         response_is_tool_call = False
@@ -322,49 +271,26 @@ class Claude(LLM):
             self.metrics["response_times"] = []
         self.metrics["response_times"].append(response_timer.elapsed)
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function call
-        if assistant_message.tool_calls is not None and self.run_tools:
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    yield f"- Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    yield "Running:"
-                    for _f in function_calls_to_run:
-                        yield f"\n - {_f.get_call_str()}"
-                    yield "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run, role="user")
-            # Add results of the function calls to the messages
-            if len(function_call_results) > 0:
-                fc_responses = "<function_results>"
-
-                for _fc_message in function_call_results:
-                    fc_responses += "<result>"
-                    fc_responses += "<tool_name>" + _fc_message.tool_call_name + "</tool_name>"  # type: ignore
-                    fc_responses += "<stdout>" + _fc_message.content + "</stdout>"  # type: ignore
-                    fc_responses += "</result>"
-                fc_responses += "</function_results>"
-
-                messages.append(Message(role="user", content=fc_responses))
-
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
-        logger.debug("---------- Claude Response End ----------")
+        yield assistant_message
+
+    def get_response_before_tool_calls(self, assistant_message: Message) -> str:
+        # Show the content of the response without the tool calls
+        return remove_function_calls_from_string(assistant_message.get_content_string())
+
+    def add_function_call_results(
+        self, messages: List[Message], assistant_message: Message, function_call_results: List[Message]
+    ) -> None:
+        if len(function_call_results) > 0:
+            fc_responses = "<function_results>"
+
+            for _fc_message in function_call_results:
+                fc_responses += "<result>"
+                fc_responses += "<tool_name>" + _fc_message.tool_call_name + "</tool_name>"  # type: ignore
+                fc_responses += "<stdout>" + _fc_message.get_content_string() + "</stdout>"
+                fc_responses += "</result>"
+            fc_responses += "</function_results>"
+
+            messages.append(Message(role="user", content=fc_responses))
 
     def get_tool_call_prompt(self) -> Optional[str]:
         if self.functions is not None and len(self.functions) > 0:
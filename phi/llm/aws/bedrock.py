@@ -1,5 +1,5 @@
 import json
-from typing import Optional, List, Iterator, Dict, Any
+from typing import Optional, List, Iterator, Dict, Any, Union
 
 from phi.aws.api_client import AwsApiClient
 from phi.llm.base import LLM
@@ -137,12 +137,7 @@ class AwsBedrock(LLM):
     def parse_response_delta(self, response: Dict[str, Any]) -> Optional[str]:
         raise NotImplementedError("Please use a subclass of AwsBedrock")
 
-    def response(self, messages: List[Message]) -> str:
-        logger.debug("---------- Bedrock Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
-
+    def get_assistant_message(self, messages: List[Message]) -> Message:
         response_timer = Timer()
         response_timer.start()
         response: Dict[str, Any] = self.invoke(body=self.get_request_body(messages))
@@ -182,16 +177,9 @@ class AwsBedrock(LLM):
             else:
                 self.metrics["total_tokens"] += total_tokens
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        logger.debug("---------- Bedrock Response End ----------")
-        # -*- Return content
-        return assistant_message.get_content_string()
+        return assistant_message
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
-        logger.debug("---------- Bedrock Response Start ----------")
+    def get_assistant_message_stream(self, messages: List[Message]) -> Iterator[Union[str, Message]]:
 
         assistant_message_content = ""
         completion_tokens = 0
@@ -242,7 +230,4 @@ class AwsBedrock(LLM):
         else:
             self.metrics["total_tokens"] += total_tokens
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-        logger.debug("---------- Bedrock Response End ----------")
+        yield assistant_message
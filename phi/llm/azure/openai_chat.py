@@ -1,5 +1,6 @@
 from os import getenv
 from typing import Optional, Dict, Any
+from phi.utils.clients import get_shared_client, get_shared_http_client
 from phi.utils.log import logger
 from phi.llm.openai.like import OpenAILike
 
@@ -46,7 +47,11 @@ class AzureOpenAIChat(OpenAILike):
             _client_params["azure_ad_token_provider"] = self.azure_ad_token_provider
         if self.http_client:
             _client_params["http_client"] = self.http_client
+        elif self.use_shared_client:
+            _client_params["http_client"] = get_shared_http_client(provider="azure")
         if self.client_params:
             _client_params.update(self.client_params)
 
+        if self.use_shared_client:
+            return get_shared_client(provider="azure", factory=AzureOpenAIClient, client_params=_client_params)
         return AzureOpenAIClient(**_client_params)
@@ -1,4 +1,7 @@
-from typing import List, Iterator, Optional, Dict, Any, Callable, Union
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Iterator, AsyncIterator, Optional, Dict, Any, Callable, Union
 
 from pydantic import BaseModel, ConfigDict
 
@@ -6,6 +9,7 @@ from phi.llm.message import Message
 from phi.tools import Tool, Toolkit
 from phi.tools.function import Function, FunctionCall
 from phi.utils.timer import Timer
+from phi.utils.tools import get_function_call_for_tool_call
 from phi.utils.log import logger
 
 
@@ -34,6 +38,9 @@ class LLM(BaseModel):
     run_tools: bool = True
     # If True, shows function calls in the response.
     show_tool_calls: Optional[bool] = None
+    # Role of the messages containing tool results.
+    # Providers without native tool support send tool results back as "user" messages.
+    tool_message_role: str = "tool"
 
     # -*- Functions available to the LLM to call -*-
     # Functions extracted from the tools.
@@ -43,6 +50,12 @@ class LLM(BaseModel):
     function_call_limit: int = 10
     # Function call stack.
     function_call_stack: Optional[List[FunctionCall]] = None
+    # Maximum number of tool calls from a single LLM response to run concurrently.
+    # Sync functions run in a thread pool, async functions are run together using asyncio.gather, both limited
+    # to max_parallel_tool_calls at the same time.
+    # Results are always returned in the order the tool calls were made.
+    # 1 runs the tool calls one after another.
+    max_parallel_tool_calls: int = 1
 
     system_prompt: Optional[str] = None
     instructions: Optional[List[str]] = None
@@ -68,17 +81,212 @@ class LLM(BaseModel):
     async def ainvoke_stream(self, *args, **kwargs) -> Any:
         raise NotImplementedError
 
-    def response(self, messages: List[Message]) -> str:
+    # -*- Hooks used by the tool call loop
+    # Providers implement these to plug into response(), aresponse(), response_stream() and aresponse_stream().
+
+    def get_assistant_message(self, messages: List[Message]) -> Message:
+        """Invokes the LLM and returns the assistant message, with tool_calls parsed and metrics updated."""
         raise NotImplementedError
 
-    async def aresponse(self, messages: List[Message]) -> str:
+    async def aget_assistant_message(self, messages: List[Message]) -> Message:
+        """Async version of get_assistant_message()."""
         raise NotImplementedError
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+    def get_assistant_message_stream(self, messages: List[Message]) -> Iterator[Union[str, Message]]:
+        """Invokes the LLM in streaming mode.
+        Yields the content to show the user, followed by the assistant message as the last item.
+        """
         raise NotImplementedError
 
-    async def aresponse_stream(self, messages: List[Message]) -> Any:
+    async def aget_assistant_message_stream(self, messages: List[Message]) -> AsyncIterator[Union[str, Message]]:
+        """Async version of get_assistant_message_stream()."""
         raise NotImplementedError
+        yield  # pragma: no cover
+
+    def get_response_before_tool_calls(self, assistant_message: Message) -> str:
+        """Returns the text added to the response before the tool calls in assistant_message are run.
+        Empty by default, as the content of a message with tool calls is usually not shown.
+        """
+        return ""
+
+    def add_function_call_results(
+        self, messages: List[Message], assistant_message: Message, function_call_results: List[Message]
+    ) -> None:
+        """Adds the results of the function calls to the messages sent to the LLM in the next iteration."""
+        if len(function_call_results) > 0:
+            messages.extend(function_call_results)
+
+    # -*- Tool call loop
+
+    def log_messages(self, messages: List[Message]) -> None:
+        # Only format messages when debug logging is enabled
+        if logger.isEnabledFor(logging.DEBUG):
+            for m in messages:
+                m.log()
+
+    def should_run_tools(self, assistant_message: Message) -> bool:
+        return self.run_tools and assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0
+
+    def get_function_calls_to_run(self, assistant_message: Message, messages: List[Message]) -> List[FunctionCall]:
+        """Parses the tool calls in the assistant message.
+        Tool calls that cannot be parsed get an error message added to messages instead.
+        """
+        function_calls_to_run: List[FunctionCall] = []
+        if assistant_message.tool_calls is None:
+            return function_calls_to_run
+
+        for tool_call in assistant_message.tool_calls:
+            _tool_call_id = tool_call.get("id")
+            _function_call = get_function_call_for_tool_call(tool_call, self.functions)
+            if _function_call is None:
+                messages.append(
+                    Message(
+                        role=self.tool_message_role,
+                        tool_call_id=_tool_call_id,
+                        content="Could not find function to call.",
+                    )
+                )
+                continue
+            if _function_call.error is not None:
+                messages.append(
+                    Message(role=self.tool_message_role, tool_call_id=_tool_call_id, content=_function_call.error)
+                )
+                continue
+            function_calls_to_run.append(_function_call)
+        return function_calls_to_run
+
+    def get_tool_calls_str(self, function_calls: List[FunctionCall]) -> str:
+        """Returns the tool calls to show in the response when show_tool_calls is True."""
+        if len(function_calls) == 1:
+            return f"\n - Running: {function_calls[0].get_call_str()}\n\n"
+        elif len(function_calls) > 1:
+            tool_calls_str = "\nRunning:"
+            for _f in function_calls:
+                tool_calls_str += f"\n - {_f.get_call_str()}"
+            return tool_calls_str + "\n\n"
+        return ""
+
+    def run_tool_calls(self, assistant_message: Message, messages: List[Message]) -> Iterator[str]:
+        """Runs the tool calls in the assistant message and adds the results to messages.
+        Yields the tool calls to show in the response before they are run.
+        """
+        function_calls_to_run = self.get_function_calls_to_run(assistant_message, messages)
+        if self.show_tool_calls and len(function_calls_to_run) > 0:
+            yield self.get_tool_calls_str(function_calls_to_run)
+        function_call_results = self.run_function_calls(function_calls_to_run, role=self.tool_message_role)
+        self.add_function_call_results(messages, assistant_message, function_call_results)
+
+    async def arun_tool_calls(self, assistant_message: Message, messages: List[Message]) -> AsyncIterator[str]:
+        """Async version of run_tool_calls()."""
+        function_calls_to_run = self.get_function_calls_to_run(assistant_message, messages)
+        if self.show_tool_calls and len(function_calls_to_run) > 0:
+            yield self.get_tool_calls_str(function_calls_to_run)
+        function_call_results = await self.arun_function_calls(function_calls_to_run, role=self.tool_message_role)
+        self.add_function_call_results(messages, assistant_message, function_call_results)
+
+    def get_final_response(self, assistant_message: Optional[Message]) -> str:
+        if assistant_message is not None and assistant_message.content is not None:
+            return assistant_message.get_content_string()
+        return "Something went wrong, please try again."
+
+    def response(self, messages: List[Message]) -> str:
+        """Gets a response from the LLM, running tool calls until the LLM responds without any."""
+        logger.debug(f"---------- {self.name} Response Start ----------")
+        self.log_messages(messages)
+
+        final_response = ""
+        while True:
+            assistant_message = self.get_assistant_message(messages)
+            messages.append(assistant_message)
+            self.log_messages([assistant_message])
+            if not self.should_run_tools(assistant_message):
+                break
+
+            # -*- Run tool calls and get a new response using their results
+            num_messages = len(messages)
+            final_response += self.get_response_before_tool_calls(assistant_message)
+            for tool_calls_str in self.run_tool_calls(assistant_message, messages):
+                final_response += tool_calls_str
+            self.log_messages(messages[num_messages:])
+
+        logger.debug(f"---------- {self.name} Response End ----------")
+        return final_response + self.get_final_response(assistant_message)
+
+    async def aresponse(self, messages: List[Message]) -> str:
+        """Async version of response()."""
+        logger.debug(f"---------- {self.name} Async Response Start ----------")
+        self.log_messages(messages)
+
+        final_response = ""
+        while True:
+            assistant_message = await self.aget_assistant_message(messages)
+            messages.append(assistant_message)
+            self.log_messages([assistant_message])
+            if not self.should_run_tools(assistant_message):
+                break
+
+            # -*- Run tool calls and get a new response using their results
+            num_messages = len(messages)
+            final_response += self.get_response_before_tool_calls(assistant_message)
+            async for tool_calls_str in self.arun_tool_calls(assistant_message, messages):
+                final_response += tool_calls_str
+            self.log_messages(messages[num_messages:])
+
+        logger.debug(f"---------- {self.name} Async Response End ----------")
+        return final_response + self.get_final_response(assistant_message)
+
+    def response_stream(self, messages: List[Message]) -> Iterator[str]:
+        """Streams a response from the LLM, running tool calls until the LLM responds without any."""
+        logger.debug(f"---------- {self.name} Response Start ----------")
+        self.log_messages(messages)
+
+        while True:
+            assistant_message: Optional[Message] = None
+            for item in self.get_assistant_message_stream(messages):
+                if isinstance(item, Message):
+                    assistant_message = item
+                else:
+                    yield item
+            if assistant_message is None:
+                break
+            messages.append(assistant_message)
+            self.log_messages([assistant_message])
+            if not self.should_run_tools(assistant_message):
+                break
+
+            # -*- Run tool calls and stream a new response using their results
+            num_messages = len(messages)
+            yield from self.run_tool_calls(assistant_message, messages)
+            self.log_messages(messages[num_messages:])
+
+        logger.debug(f"---------- {self.name} Response End ----------")
+
+    async def aresponse_stream(self, messages: List[Message]) -> Any:
+        """Async version of response_stream()."""
+        logger.debug(f"---------- {self.name} Async Response Start ----------")
+        self.log_messages(messages)
+
+        while True:
+            assistant_message: Optional[Message] = None
+            async for item in self.aget_assistant_message_stream(messages):
+                if isinstance(item, Message):
+                    assistant_message = item
+                else:
+                    yield item
+            if assistant_message is None:
+                break
+            messages.append(assistant_message)
+            self.log_messages([assistant_message])
+            if not self.should_run_tools(assistant_message):
+                break
+
+            # -*- Run tool calls and stream a new response using their results
+            num_messages = len(messages)
+            async for tool_calls_str in self.arun_tool_calls(assistant_message, messages):
+                yield tool_calls_str
+            self.log_messages(messages[num_messages:])
+
+        logger.debug(f"---------- {self.name} Async Response End ----------")
 
     def generate(self, messages: List[Message]) -> Dict:
         raise NotImplementedError
@@ -91,6 +299,7 @@ class LLM(BaseModel):
         if self.functions:
             _dict["functions"] = {k: v.to_dict() for k, v in self.functions.items()}
             _dict["function_call_limit"] = self.function_call_limit
+            _dict["max_parallel_tool_calls"] = self.max_parallel_tool_calls
         return _dict
 
     def get_tools_for_api(self) -> Optional[List[Dict[str, Any]]]:
@@ -151,36 +360,122 @@ class LLM(BaseModel):
         # This is triggered when the function call limit is reached.
         self.tool_choice = "none"
 
+    def get_function_calls_within_limit(self, function_calls: List[FunctionCall]) -> List[FunctionCall]:
+        """Returns the function calls that can run before the function call limit is reached.
+        At least one function call is always returned, matching the behaviour of running them one by one.
+        """
+        if self.function_call_stack is None:
+            self.function_call_stack = []
+        num_calls_remaining = max(self.function_call_limit - len(self.function_call_stack), 1)
+        return function_calls[:num_calls_remaining]
+
+    def run_function_call(self, function_call: FunctionCall) -> float:
+        """Runs a function call and returns the time it took."""
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        function_call.execute()
+        _function_call_timer.stop()
+        return _function_call_timer.elapsed
+
+    async def arun_function_call(self, function_call: FunctionCall) -> float:
+        """Runs a function call using FunctionCall.aexecute() and returns the time it took."""
+        _function_call_timer = Timer()
+        _function_call_timer.start()
+        await function_call.aexecute()
+        _function_call_timer.stop()
+        return _function_call_timer.elapsed
+
+    def run_function_calls_concurrently(self, function_calls: List[FunctionCall]) -> List[float]:
+        """Runs function calls concurrently and returns the time each call took, in the order of function_calls.
+
+        Sync functions run in a thread pool of size max_parallel_tool_calls.
+        Async functions are run together on a worker thread using asyncio.gather, at most max_parallel_tool_calls
+        at the same time.
+        """
+        _timings: List[float] = [0.0] * len(function_calls)
+        sync_calls = [(i, fc) for i, fc in enumerate(function_calls) if not fc.function.is_async]
+        async_calls = [(i, fc) for i, fc in enumerate(function_calls) if fc.function.is_async]
+
+        async def _gather_async_calls() -> List[float]:
+            semaphore = asyncio.Semaphore(max(self.max_parallel_tool_calls, 1))
+
+            async def _run(function_call: FunctionCall) -> float:
+                async with semaphore:
+                    return await self.arun_function_call(function_call)
+
+            return await asyncio.gather(*[_run(fc) for _, fc in async_calls])
+
+        max_workers = max(min(self.max_parallel_tool_calls, len(sync_calls) + (1 if async_calls else 0)), 1)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="phi-tool") as executor:
+            # asyncio.run() cannot be called from a running event loop, so the coroutines get their own thread
+            async_future = executor.submit(asyncio.run, _gather_async_calls()) if async_calls else None
+            sync_futures = [(i, executor.submit(self.run_function_call, fc)) for i, fc in sync_calls]
+            for i, future in sync_futures:
+                _timings[i] = future.result()
+            if async_future is not None:
+                for (i, _), elapsed in zip(async_calls, async_future.result()):
+                    _timings[i] = elapsed
+        return _timings
+
+    async def arun_function_calls_concurrently(self, function_calls: List[FunctionCall]) -> List[float]:
+        """Runs function calls concurrently on the running event loop and returns the time each call took,
+        in the order of function_calls. At most max_parallel_tool_calls run at the same time.
+        """
+        semaphore = asyncio.Semaphore(max(self.max_parallel_tool_calls, 1))
+
+        async def _run(function_call: FunctionCall) -> float:
+            async with semaphore:
+                return await self.arun_function_call(function_call)
+
+        return list(await asyncio.gather(*[_run(function_call) for function_call in function_calls]))
+
     def run_function_calls(self, function_calls: List[FunctionCall], role: str = "tool") -> List[Message]:
+        # -*- Run function calls
+        function_calls = self.get_function_calls_within_limit(function_calls)
+        if self.max_parallel_tool_calls > 1 and len(function_calls) > 1:
+            function_call_times = self.run_function_calls_concurrently(function_calls)
+        else:
+            function_call_times = [self.run_function_call(function_call) for function_call in function_calls]
+        return self.get_function_call_results(function_calls, function_call_times, role=role)
+
+    async def arun_function_calls(self, function_calls: List[FunctionCall], role: str = "tool") -> List[Message]:
+        """Runs function calls without blocking the event loop.
+        Async functions are awaited and sync functions are run in the shared tool executor.
+        """
+        function_calls = self.get_function_calls_within_limit(function_calls)
+        if self.max_parallel_tool_calls > 1 and len(function_calls) > 1:
+            function_call_times = await self.arun_function_calls_concurrently(function_calls)
+        else:
+            function_call_times = [await self.arun_function_call(function_call) for function_call in function_calls]
+        return self.get_function_call_results(function_calls, function_call_times, role=role)
+
+    def get_function_call_results(
+        self, function_calls: List[FunctionCall], function_call_times: List[float], role: str = "tool"
+    ) -> List[Message]:
+        """Creates the messages for function calls that have been run and updates the metrics and call stack."""
         function_call_results: List[Message] = []
-        for function_call in function_calls:
-            if self.function_call_stack is None:
-                self.function_call_stack = []
-
-            # -*- Run function call
-            _function_call_timer = Timer()
-            _function_call_timer.start()
-            function_call.execute()
-            _function_call_timer.stop()
+        if self.function_call_stack is None:
+            self.function_call_stack = []
+
+        for function_call, elapsed in zip(function_calls, function_call_times):
             _function_call_result = Message(
                 role=role,
                 content=function_call.result,
                 tool_call_id=function_call.call_id,
                 tool_call_name=function_call.function.name,
-                metrics={"time": _function_call_timer.elapsed},
+                metrics={"time": elapsed},
             )
             if "tool_call_times" not in self.metrics:
                 self.metrics["tool_call_times"] = {}
             if function_call.function.name not in self.metrics["tool_call_times"]:
                 self.metrics["tool_call_times"][function_call.function.name] = []
-            self.metrics["tool_call_times"][function_call.function.name].append(_function_call_timer.elapsed)
+            self.metrics["tool_call_times"][function_call.function.name].append(elapsed)
             function_call_results.append(_function_call_result)
             self.function_call_stack.append(function_call)
 
-            # -*- Check function call limit
-            if len(self.function_call_stack) >= self.function_call_limit:
-                self.deactivate_function_calls()
-                break  # Exit early if we reach the function call limit
+        # -*- Check function call limit
+        if len(self.function_call_stack) >= self.function_call_limit:
+            self.deactivate_function_calls()
 
         return function_call_results
 
@@ -1,13 +1,12 @@
 import json
 from textwrap import dedent
-from typing import Optional, List, Dict, Any, Iterator
+from typing import Optional, List, Dict, Any, Iterator, Union
 
 from phi.llm.base import LLM
 from phi.llm.message import Message
-from phi.tools.function import FunctionCall
+from phi.utils.clients import get_shared_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
-from phi.utils.tools import get_function_call_for_tool_call
 
 try:
     from cohere import Client as CohereClient
@@ -30,6 +29,8 @@ except ImportError:
 class CohereChat(LLM):
     name: str = "cohere"
     model: str = "command-r"
+    # Tool results are sent back as user messages
+    tool_message_role: str = "user"
     # -*- Request parameters
     temperature: Optional[float] = None
     max_tokens: Optional[int] = None
@@ -43,8 +44,12 @@ class CohereChat(LLM):
     # -*- Client parameters
     api_key: Optional[str] = None
     client_params: Optional[Dict[str, Any]] = None
+    # If True, reuse a process-wide client (and its connection pool) for this configuration.
+    use_shared_client: bool = True
     # -*- Provide the Cohere client manually
     cohere_client: Optional[CohereClient] = None
+    # Results of the last tool calls, sent with the next request
+    _tool_results: Optional[List[ChatRequestToolResultsItem]] = None
 
     @property
     def client(self) -> CohereClient:
@@ -54,6 +59,10 @@ class CohereChat(LLM):
         _client_params: Dict[str, Any] = {}
         if self.api_key:
             _client_params["api_key"] = self.api_key
+        if self.client_params:
+            _client_params.update(self.client_params)
+        if self.use_shared_client:
+            return get_shared_client(provider="cohere", factory=CohereClient, client_params=_client_params)
         return CohereClient(**_client_params)
 
     @property
@@ -180,11 +189,8 @@ class CohereChat(LLM):
         logger.debug(f"Chat message: {chat_message}")
         return self.client.chat_stream(message=chat_message or "", model=self.model, **api_kwargs)
 
-    def response(self, messages: List[Message], tool_results: Optional[List[ChatRequestToolResultsItem]] = None) -> str:
-        logger.debug("---------- Cohere Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+    def get_assistant_message(self, messages: List[Message]) -> Message:
+        tool_results, self._tool_results = self._tool_results, None
 
         response_timer = Timer()
         response_timer.start()
@@ -222,68 +228,13 @@ class CohereChat(LLM):
             self.metrics["response_times"] = []
         self.metrics["response_times"].append(response_timer.elapsed)
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Run function call
-        if assistant_message.tool_calls is not None and self.run_tools:
-            final_response = ""
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    final_response += f" - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    final_response += "Running:"
-                    for _f in function_calls_to_run:
-                        final_response += f"\n - {_f.get_call_str()}"
-                    final_response += "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run, role="user")
-
-            # Making sure the length of tool calls and function call results are the same to avoid unexpected behavior
-            if response_tool_calls is not None and 0 < len(function_call_results) == len(response_tool_calls):
-                # Constructs a list named tool_results, where each element is a dictionary that contains details of tool calls and their outputs.
-                # It pairs each tool call in response_tool_calls with its corresponding result in function_call_results.
-                tool_results = [
-                    ChatRequestToolResultsItem(
-                        call=tool_call, outputs=[tool_call.parameters, {"result": fn_result.content}]
-                    )
-                    for tool_call, fn_result in zip(response_tool_calls, function_call_results)
-                ]
-                messages.append(Message(role="user", content="Tool result"))
-                # logger.debug(f"Tool results: {tool_results}")
-
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages, tool_results=tool_results)
-            return final_response
-        logger.debug("---------- Cohere Response End ----------")
-        # -*- Return content if no function calls are present
-        if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
-
-    def response_stream(
-        self, messages: List[Message], tool_results: Optional[List[ChatRequestToolResultsItem]] = None
-    ) -> Any:
-        logger.debug("---------- Cohere Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        return assistant_message
+
+    def get_assistant_message_stream(self, messages: List[Message]) -> Iterator[Union[str, Message]]:
+        tool_results, self._tool_results = self._tool_results, None
 
         assistant_message_content = ""
         tool_calls: List[Dict[str, Any]] = []
-        response_tool_calls: List[CohereToolCall] = []
         response_timer = Timer()
         response_timer.start()
         for response in self.invoke_stream(messages=messages, tool_results=tool_results):
@@ -302,7 +253,6 @@ class CohereChat(LLM):
             # Detect if response is a tool call
             if isinstance(response, StreamedChatResponse_ToolCallsGeneration):
                 for tc in response.tool_calls:
-                    response_tool_calls.append(tc)
                     tool_calls.append(
                         {
                             "type": "function",
@@ -329,50 +279,27 @@ class CohereChat(LLM):
             self.metrics["response_times"] = []
         self.metrics["response_times"].append(response_timer.elapsed)
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function call
-        if assistant_message.tool_calls is not None and self.run_tools:
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    yield f"- Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    yield "Running:"
-                    for _f in function_calls_to_run:
-                        yield f"\n - {_f.get_call_str()}"
-                    yield "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run, role="user")
-
-            # Making sure the length of tool calls and function call results are the same to avoid unexpected behavior
-            if response_tool_calls is not None and 0 < len(function_call_results) == len(tool_calls):
-                # Constructs a list named tool_results, where each element is a dictionary that contains details of tool calls and their outputs.
-                # It pairs each tool call in response_tool_calls with its corresponding result in function_call_results.
-                tool_results = [
+        yield assistant_message
+
+    def add_function_call_results(
+        self, messages: List[Message], assistant_message: Message, function_call_results: List[Message]
+    ) -> None:
+        tool_calls = assistant_message.tool_calls or []
+        # Making sure the length of tool calls and function call results are the same to avoid unexpected behavior
+        if 0 < len(function_call_results) == len(tool_calls):
+            # Pair each tool call with its result, these are sent as tool_results in the next request
+            tool_results: List[ChatRequestToolResultsItem] = []
+            for tool_call, fn_result in zip(tool_calls, function_call_results):
+                _function = tool_call.get("function", {})
+                _parameters = json.loads(_function.get("arguments") or "{}")
+                tool_results.append(
                     ChatRequestToolResultsItem(
-                        call=tool_call, outputs=[tool_call.parameters, {"result": fn_result.content}]
+                        call=CohereToolCall(name=_function.get("name"), parameters=_parameters),
+                        outputs=[_parameters, {"result": fn_result.content}],
                     )
-                    for tool_call, fn_result in zip(response_tool_calls, function_call_results)
-                ]
-                messages.append(Message(role="user", content="Tool result"))
-                # logger.debug(f"Tool results: {tool_results}")
-
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages, tool_results=tool_results)
-        logger.debug("---------- Cohere Response End ----------")
+                )
+            self._tool_results = tool_results
+            messages.append(Message(role="user", content="Tool result"))
 
     def get_tool_call_prompt(self) -> Optional[str]:
         if self.functions is not None and len(self.functions) > 0:
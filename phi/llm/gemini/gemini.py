@@ -3,11 +3,10 @@ from typing import Optional, List, Iterator, Dict, Any, Union, Callable
 
 from phi.llm.base import LLM
 from phi.llm.message import Message
-from phi.tools.function import Function, FunctionCall
+from phi.tools.function import Function
 from phi.tools import Tool, Toolkit
 from phi.utils.log import logger
 from phi.utils.timer import Timer
-from phi.utils.tools import get_function_call_for_tool_call
 
 try:
     from vertexai.generative_models import (
@@ -138,12 +137,7 @@ class Gemini(LLM):
             stream=True,
         )
 
-    def response(self, messages: List[Message]) -> str:
-        logger.debug("---------- VertexAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
-
+    def get_assistant_message(self, messages: List[Message]) -> Message:
         response_timer = Timer()
         response_timer.start()
         response: GenerationResponse = self.invoke(messages=messages)
@@ -162,7 +156,7 @@ class Gemini(LLM):
 
         if len(response_parts) > 1:
             logger.warning("Multiple content parts are not yet supported.")
-            return "More than one response part found."
+            return Message(role="assistant", content="More than one response part found.")
 
         _part_dict = response_parts[0].to_dict()
         if "text" in _part_dict:
@@ -197,51 +191,9 @@ class Gemini(LLM):
         self.metrics["response_times"].append(response_timer.elapsed)
         # TODO: Add token usage to metrics
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function calls
-        if assistant_message.tool_calls is not None:
-            final_response = ""
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _tool_call_id = tool_call.get("id")
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(
-                        Message(role="tool", tool_call_id=_tool_call_id, content="Could not find function to call.")
-                    )
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="tool", tool_call_id=_tool_call_id, content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    final_response += f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    final_response += "\nRunning:"
-                    for _f in function_calls_to_run:
-                        final_response += f"\n - {_f.get_call_str()}"
-                    final_response += "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run)
-            if len(function_call_results) > 0:
-                messages.extend(function_call_results)
-            # -*- Get new response using result of tool call
-            final_response += self.response(messages=messages)
-            return final_response
-        logger.debug("---------- VertexAI Response End ----------")
-        return assistant_message.get_content_string()
-
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
-        logger.debug("---------- VertexAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        return assistant_message
 
+    def get_assistant_message_stream(self, messages: List[Message]) -> Iterator[Union[str, Message]]:
         response_role: Optional[str] = None
         response_function_calls: Optional[List[Dict[str, Any]]] = None
         assistant_message_content = ""
@@ -291,38 +243,4 @@ class Gemini(LLM):
         if response_function_calls is not None:
             assistant_message.tool_calls = response_function_calls
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function calls
-        if assistant_message.tool_calls is not None:
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _tool_call_id = tool_call.get("id")
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(
-                        Message(role="tool", tool_call_id=_tool_call_id, content="Could not find function to call.")
-                    )
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="tool", tool_call_id=_tool_call_id, content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    yield f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    yield "\nRunning:"
-                    for _f in function_calls_to_run:
-                        yield f"\n - {_f.get_call_str()}"
-                    yield "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run)
-            if len(function_call_results) > 0:
-                messages.extend(function_call_results)
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
-        logger.debug("---------- VertexAI Response End ----------")
+        yield assistant_message
@@ -3,10 +3,9 @@ from typing import Optional, List, Iterator, Dict, Any, Union
 
 from phi.llm.base import LLM
 from phi.llm.message import Message
-from phi.tools.function import FunctionCall
+from phi.utils.clients import get_shared_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
-from phi.utils.tools import get_function_call_for_tool_call
 
 try:
     from groq import Groq as GroqClient
@@ -42,6 +41,8 @@ class Groq(LLM):
     default_headers: Optional[Any] = None
     default_query: Optional[Any] = None
     client_params: Optional[Dict[str, Any]] = None
+    # If True, reuse a process-wide client (and its connection pool) for this configuration.
+    use_shared_client: bool = True
     # -*- Provide the Groq manually
     groq_client: Optional[GroqClient] = None
 
@@ -65,6 +66,8 @@ class Groq(LLM):
             _client_params["default_query"] = self.default_query
         if self.client_params:
             _client_params.update(self.client_params)
+        if self.use_shared_client:
+            return get_shared_client(provider="groq", factory=GroqClient, client_params=_client_params)
         return GroqClient(**_client_params)
 
     @property
@@ -161,12 +164,7 @@ class Groq(LLM):
             **self.api_kwargs,
         )
 
-    def response(self, messages: List[Message]) -> str:
-        logger.debug("---------- Groq Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
-
+    def get_assistant_message(self, messages: List[Message]) -> Message:
         response_timer = Timer()
         response_timer.start()
         response = self.invoke(messages=messages)
@@ -196,54 +194,9 @@ class Groq(LLM):
         if response.usage is not None:
             self.metrics.update(response.usage.model_dump())
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run tool calls
-        if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0:
-            final_response = ""
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _tool_call_id = tool_call.get("id")
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(
-                        Message(role="tool", tool_call_id=_tool_call_id, content="Could not find function to call.")
-                    )
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="tool", tool_call_id=_tool_call_id, content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    final_response += f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    final_response += "\nRunning:"
-                    for _f in function_calls_to_run:
-                        final_response += f"\n - {_f.get_call_str()}"
-                    final_response += "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run)
-            if len(function_call_results) > 0:
-                messages.extend(function_call_results)
-            # -*- Get new response using result of tool call
-            final_response += self.response(messages=messages)
-            return final_response
-        logger.debug("---------- Groq Response End ----------")
-        # -*- Return content if no function calls are present
-        if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
-
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
-        logger.debug("---------- Groq Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        return assistant_message
 
+    def get_assistant_message_stream(self, messages: List[Message]) -> Iterator[Union[str, Message]]:
         assistant_message_role = None
         assistant_message_content = ""
         assistant_message_tool_calls: Optional[List[Any]] = None
@@ -289,38 +242,4 @@ class Groq(LLM):
             self.metrics["response_times"] = []
         self.metrics["response_times"].append(response_timer.elapsed)
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run tool calls
-        if assistant_message.tool_calls is not None and len(assistant_message.tool_calls) > 0:
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _tool_call_id = tool_call.get("id")
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(
-                        Message(role="tool", tool_call_id=_tool_call_id, content="Could not find function to call.")
-                    )
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="tool", tool_call_id=_tool_call_id, content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    yield f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    yield "\nRunning:"
-                    for _f in function_calls_to_run:
-                        yield f"\n - {_f.get_call_str()}"
-                    yield "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run)
-            if len(function_call_results) > 0:
-                messages.extend(function_call_results)
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
-        logger.debug("---------- Groq Response End ----------")
+        yield assistant_message
@@ -1,4 +1,5 @@
 import json
+import logging
 from typing import Optional, Any, Dict, List, Union
 from pydantic import BaseModel, ConfigDict
 
@@ -57,14 +58,22 @@ class Message(BaseModel):
             Defaults to debug.
         """
         _logger = logger.debug
+        _level = logging.DEBUG
         if level == "debug":
             _logger = logger.debug
         elif level == "info":
             _logger = logger.info
+            _level = logging.INFO
         elif level == "warning":
             _logger = logger.warning
+            _level = logging.WARNING
         elif level == "error":
             _logger = logger.error
+            _level = logging.ERROR
+
+        # Skip formatting the message if it would not be logged
+        if not logger.isEnabledFor(_level):
+            return
 
         _logger(f"============== {self.role} ==============")
         if self.name:
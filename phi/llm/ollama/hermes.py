@@ -4,11 +4,10 @@ from typing import Optional, List, Iterator, Dict, Any, Mapping, Union
 
 from phi.llm.base import LLM
 from phi.llm.message import Message
-from phi.tools.function import FunctionCall
+from phi.utils.clients import get_shared_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.tools import (
-    get_function_call_for_tool_call,
     extract_tool_call_from_string,
     remove_tool_calls_from_string,
 )
@@ -23,12 +22,16 @@ except ImportError:
 class Hermes(LLM):
     name: str = "Hermes2Pro"
     model: str = "adrienbrault/nous-hermes2pro:Q8_0"
+    # Tool calls are parsed from the response text, so tool results are sent back as user messages
+    tool_message_role: str = "user"
     host: Optional[str] = None
     timeout: Optional[Any] = None
     format: Optional[str] = None
     options: Optional[Any] = None
     keep_alive: Optional[Union[float, str]] = None
     client_kwargs: Optional[Dict[str, Any]] = None
+    # If True, reuse a process-wide client (and its connection pool) for this configuration.
+    use_shared_client: bool = True
     ollama_client: Optional[OllamaClient] = None
     # Maximum number of function calls allowed across all iterations.
     function_call_limit: int = 5
@@ -47,6 +50,8 @@ class Hermes(LLM):
             _ollama_params["timeout"] = self.timeout
         if self.client_kwargs:
             _ollama_params.update(self.client_kwargs)
+        if self.use_shared_client:
+            return get_shared_client(provider="ollama", factory=OllamaClient, client_params=_ollama_params)
         return OllamaClient(**_ollama_params)
 
     @property
@@ -106,12 +111,7 @@ class Hermes(LLM):
         # This is triggered when the function call limit is reached.
         self.format = ""
 
-    def response(self, messages: List[Message]) -> str:
-        logger.debug("---------- Hermes Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
-
+    def get_assistant_message(self, messages: List[Message]) -> Message:
         response_timer = Timer()
         response_timer.start()
         response: Mapping[str, Any] = self.invoke(messages=messages)
@@ -179,71 +179,9 @@ class Hermes(LLM):
             self.metrics["response_times"] = []
         self.metrics["response_times"].append(response_timer.elapsed)
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function call
-        if assistant_message.tool_calls is not None and self.run_tools:
-            # Remove the tool call from the response content
-            final_response = remove_tool_calls_from_string(assistant_message.get_content_string())
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    final_response += f" - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    final_response += "Running:"
-                    for _f in function_calls_to_run:
-                        final_response += f"\n - {_f.get_call_str()}"
-                    final_response += "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run, role="user")
-            if len(function_call_results) > 0:
-                fc_responses = []
-                for _fc_message in function_call_results:
-                    fc_responses.append(
-                        json.dumps({"name": _fc_message.tool_call_name, "content": _fc_message.content})
-                    )
-
-                tool_response_message_content = "<tool_response>\n" + "\n".join(fc_responses) + "\n</tool_response>"
-                messages.append(Message(role="user", content=tool_response_message_content))
-
-                for _fc_message in function_call_results:
-                    _fc_message.content = (
-                        "<tool_response>\n"
-                        + json.dumps({"name": _fc_message.tool_call_name, "content": _fc_message.content})
-                        + "\n</tool_response>"
-                    )
-                    messages.append(_fc_message)
-                # Reconfigure messages so the LLM is reminded of the original task
-                if self.add_user_message_after_tool_call:
-                    messages = self.add_original_user_message(messages)
-
-            # -*- Yield new response using results of tool calls
-            final_response += self.response(messages=messages)
-            return final_response
-        logger.debug("---------- Hermes Response End ----------")
-        # -*- Return content if no function calls are present
-        if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
-
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
-        logger.debug("---------- Hermes Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        return assistant_message
 
+    def get_assistant_message_stream(self, messages: List[Message]) -> Iterator[Union[str, Message]]:
         assistant_message_content = ""
         tool_calls_counter = 0
         response_is_tool_call = False
@@ -354,50 +292,25 @@ class Hermes(LLM):
             self.metrics["response_times"] = []
         self.metrics["response_times"].append(response_timer.elapsed)
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function call
-        if assistant_message.tool_calls is not None and self.run_tools:
-            function_calls_to_run: List[FunctionCall] = []
-            for tool_call in assistant_message.tool_calls:
-                _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                if _function_call is None:
-                    messages.append(Message(role="user", content="Could not find function to call."))
-                    continue
-                if _function_call.error is not None:
-                    messages.append(Message(role="user", content=_function_call.error))
-                    continue
-                function_calls_to_run.append(_function_call)
-
-            if self.show_tool_calls:
-                if len(function_calls_to_run) == 1:
-                    yield f"- Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                elif len(function_calls_to_run) > 1:
-                    yield "Running:"
-                    for _f in function_calls_to_run:
-                        yield f"\n - {_f.get_call_str()}"
-                    yield "\n\n"
-
-            function_call_results = self.run_function_calls(function_calls_to_run, role="user")
-            # Add results of the function calls to the messages
-            if len(function_call_results) > 0:
-                fc_responses = []
-                for _fc_message in function_call_results:
-                    fc_responses.append(
-                        json.dumps({"name": _fc_message.tool_call_name, "content": _fc_message.content})
-                    )
-
-                tool_response_message_content = "<tool_response>\n" + "\n".join(fc_responses) + "\n</tool_response>"
-                messages.append(Message(role="user", content=tool_response_message_content))
-                # Reconfigure messages so the LLM is reminded of the original task
-                if self.add_user_message_after_tool_call:
-                    messages = self.add_original_user_message(messages)
-
-            # -*- Yield new response using results of tool calls
-            yield from self.response_stream(messages=messages)
-        logger.debug("---------- Hermes Response End ----------")
+        yield assistant_message
+
+    def get_response_before_tool_calls(self, assistant_message: Message) -> str:
+        # Show the content of the response without the tool calls
+        return remove_tool_calls_from_string(assistant_message.get_content_string())
+
+    def add_function_call_results(
+        self, messages: List[Message], assistant_message: Message, function_call_results: List[Message]
+    ) -> None:
+        if len(function_call_results) > 0:
+            fc_responses = []
+            for _fc_message in function_call_results:
+                fc_responses.append(json.dumps({"name": _fc_message.tool_call_name, "content": _fc_message.content}))
+
+            tool_response_message_content = "<tool_response>\n" + "\n".join(fc_responses) + "\n</tool_response>"
+            messages.append(Message(role="user", content=tool_response_message_content))
+            # Reconfigure messages so the LLM is reminded of the original task
+            if self.add_user_message_after_tool_call:
+                self.add_original_user_message(messages)
 
     def add_original_user_message(self, messages: List[Message]) -> List[Message]:
         # Add the original user message to the messages to remind the LLM of the original task
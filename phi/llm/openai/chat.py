@@ -4,10 +4,11 @@ from typing import Optional, List, Iterator, Dict, Any, Union, Tuple
 from phi.llm.base import LLM
 from phi.llm.message import Message
 from phi.tools.function import FunctionCall
+from phi.utils.clients import get_shared_client, get_shared_async_client
+from phi.utils.clients import get_shared_http_client, get_shared_async_http_client
 from phi.utils.log import logger
 from phi.utils.timer import Timer
 from phi.utils.functions import get_function_call
-from phi.utils.tools import get_function_call_for_tool_call
 
 try:
     from openai import OpenAI as OpenAIClient, AsyncOpenAI as AsyncOpenAIClient
@@ -58,6 +59,9 @@ class OpenAIChat(LLM):
     default_query: Optional[Any] = None
     http_client: Optional[httpx.Client] = None
     client_params: Optional[Dict[str, Any]] = None
+    # If True, reuse a process-wide client (and its connection pool) for this configuration.
+    # Set to False to create a new client for every request.
+    use_shared_client: bool = True
     # -*- Provide the OpenAI client manually
     client: Optional[OpenAIClient] = None
     async_client: Optional[AsyncOpenAIClient] = None
@@ -88,8 +92,12 @@ class OpenAIChat(LLM):
             _client_params["default_query"] = self.default_query
         if self.http_client:
             _client_params["http_client"] = self.http_client
+        elif self.use_shared_client:
+            _client_params["http_client"] = get_shared_http_client(provider="openai")
         if self.client_params:
             _client_params.update(self.client_params)
+        if self.use_shared_client:
+            return get_shared_client(provider="openai", factory=OpenAIClient, client_params=_client_params)
         return OpenAIClient(**_client_params)
 
     def get_async_client(self) -> AsyncOpenAIClient:
@@ -113,12 +121,16 @@ class OpenAIChat(LLM):
             _client_params["default_query"] = self.default_query
         if self.http_client:
             _client_params["http_client"] = self.http_client
+        elif self.use_shared_client:
+            _client_params["http_client"] = get_shared_async_http_client(provider="openai")
         else:
             _client_params["http_client"] = httpx.AsyncClient(
                 limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
             )
         if self.client_params:
             _client_params.update(self.client_params)
+        if self.use_shared_client:
+            return get_shared_async_client(provider="openai", factory=AsyncOpenAIClient, client_params=_client_params)
         return AsyncOpenAIClient(**_client_params)
 
     @property
@@ -278,12 +290,79 @@ class OpenAIChat(LLM):
             return _function_call_message, _function_call
         return Message(role="function", content="Function name is None."), None
 
-    def response(self, messages: List[Message]) -> str:
-        logger.debug("---------- OpenAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+    async def arun_function(self, function_call: Dict[str, Any]) -> Tuple[Message, Optional[FunctionCall]]:
+        _function_name = function_call.get("name")
+        _function_arguments_str = function_call.get("arguments")
+        if _function_name is not None:
+            # Get function call
+            _function_call = get_function_call(
+                name=_function_name,
+                arguments=_function_arguments_str,
+                functions=self.functions,
+            )
+            if _function_call is None:
+                return Message(role="function", content="Could not find function to call."), None
+            if _function_call.error is not None:
+                return Message(role="function", content=_function_call.error), _function_call
+
+            if self.function_call_stack is None:
+                self.function_call_stack = []
 
+            # -*- Check function call limit
+            if len(self.function_call_stack) > self.function_call_limit:
+                self.tool_choice = "none"
+                return Message(
+                    role="function",
+                    content=f"Function call limit ({self.function_call_limit}) exceeded.",
+                ), _function_call
+
+            # -*- Run function call
+            self.function_call_stack.append(_function_call)
+            _function_call_timer = Timer()
+            _function_call_timer.start()
+            await _function_call.aexecute()
+            _function_call_timer.stop()
+            _function_call_message = Message(
+                role="function",
+                name=_function_call.function.name,
+                content=_function_call.result,
+                metrics={"time": _function_call_timer.elapsed},
+            )
+            if "function_call_times" not in self.metrics:
+                self.metrics["function_call_times"] = {}
+            if _function_call.function.name not in self.metrics["function_call_times"]:
+                self.metrics["function_call_times"][_function_call.function.name] = []
+            self.metrics["function_call_times"][_function_call.function.name].append(_function_call_timer.elapsed)
+            return _function_call_message, _function_call
+        return Message(role="function", content="Function name is None."), None
+
+    def should_run_tools(self, assistant_message: Message) -> bool:
+        if self.run_tools and assistant_message.function_call is not None:
+            return True
+        return super().should_run_tools(assistant_message)
+
+    def run_tool_calls(self, assistant_message: Message, messages: List[Message]) -> Iterator[str]:
+        if assistant_message.function_call is not None:
+            function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
+            messages.append(function_call_message)
+            if self.show_tool_calls and function_call is not None:
+                yield f"\n - Running: {function_call.get_call_str()}\n\n"
+            return
+        yield from super().run_tool_calls(assistant_message, messages)
+
+    async def arun_tool_calls(self, assistant_message: Message, messages: List[Message]) -> Any:
+        if assistant_message.function_call is not None:
+            function_call_message, function_call = await self.arun_function(
+                function_call=assistant_message.function_call
+            )
+            messages.append(function_call_message)
+            if self.show_tool_calls and function_call is not None:
+                yield f"\n - Running: {function_call.get_call_str()}\n\n"
+            return
+        async for tool_calls_str in super().arun_tool_calls(assistant_message, messages):
+            yield tool_calls_str
+
+    def get_assistant_message(self, messages: List[Message]) -> Message:
         response_timer = Timer()
         response_timer.start()
         response: ChatCompletion = self.invoke(messages=messages)
@@ -340,75 +419,9 @@ class OpenAIChat(LLM):
             else:
                 self.metrics["total_tokens"] += total_tokens
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function call
-        need_to_run_functions = assistant_message.function_call is not None or assistant_message.tool_calls is not None
-        if need_to_run_functions and self.run_tools:
-            if assistant_message.function_call is not None:
-                function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
-                messages.append(function_call_message)
-                # -*- Get new response using result of function call
-                final_response = ""
-                if self.show_tool_calls and function_call is not None:
-                    final_response += f"\n - Running: {function_call.get_call_str()}\n\n"
-                final_response += self.response(messages=messages)
-                return final_response
-            elif assistant_message.tool_calls is not None:
-                final_response = ""
-                function_calls_to_run: List[FunctionCall] = []
-                for tool_call in assistant_message.tool_calls:
-                    _tool_call_id = tool_call.get("id")
-                    _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                    if _function_call is None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content="Could not find function to call.",
-                            )
-                        )
-                        continue
-                    if _function_call.error is not None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content=_function_call.error,
-                            )
-                        )
-                        continue
-                    function_calls_to_run.append(_function_call)
-
-                if self.show_tool_calls:
-                    if len(function_calls_to_run) == 1:
-                        final_response += f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                    elif len(function_calls_to_run) > 1:
-                        final_response += "\nRunning:"
-                        for _f in function_calls_to_run:
-                            final_response += f"\n - {_f.get_call_str()}"
-                        final_response += "\n\n"
-
-                function_call_results = self.run_function_calls(function_calls_to_run)
-                if len(function_call_results) > 0:
-                    messages.extend(function_call_results)
-                # -*- Get new response using result of tool call
-                final_response += self.response(messages=messages)
-                return final_response
-        logger.debug("---------- OpenAI Response End ----------")
-        # -*- Return content if no function calls are present
-        if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
-
-    async def aresponse(self, messages: List[Message]) -> str:
-        logger.debug("---------- OpenAI Async Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        return assistant_message
 
+    async def aget_assistant_message(self, messages: List[Message]) -> Message:
         response_timer = Timer()
         response_timer.start()
         response: ChatCompletion = await self.ainvoke(messages=messages)
@@ -465,68 +478,7 @@ class OpenAIChat(LLM):
             else:
                 self.metrics["total_tokens"] += total_tokens
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function call
-        need_to_run_functions = assistant_message.function_call is not None or assistant_message.tool_calls is not None
-        if need_to_run_functions and self.run_tools:
-            if assistant_message.function_call is not None:
-                function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
-                messages.append(function_call_message)
-                # -*- Get new response using result of function call
-                final_response = ""
-                if self.show_tool_calls and function_call is not None:
-                    final_response += f"\n - Running: {function_call.get_call_str()}\n\n"
-                final_response += self.response(messages=messages)
-                return final_response
-            elif assistant_message.tool_calls is not None:
-                final_response = ""
-                function_calls_to_run: List[FunctionCall] = []
-                for tool_call in assistant_message.tool_calls:
-                    _tool_call_id = tool_call.get("id")
-                    _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                    if _function_call is None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content="Could not find function to call.",
-                            )
-                        )
-                        continue
-                    if _function_call.error is not None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content=_function_call.error,
-                            )
-                        )
-                        continue
-                    function_calls_to_run.append(_function_call)
-
-                if self.show_tool_calls:
-                    if len(function_calls_to_run) == 1:
-                        final_response += f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                    elif len(function_calls_to_run) > 1:
-                        final_response += "\nRunning:"
-                        for _f in function_calls_to_run:
-                            final_response += f"\n - {_f.get_call_str()}"
-                        final_response += "\n\n"
-
-                function_call_results = self.run_function_calls(function_calls_to_run)
-                if len(function_call_results) > 0:
-                    messages.extend(function_call_results)
-                # -*- Get new response using result of tool call
-                final_response += await self.aresponse(messages=messages)
-                return final_response
-        logger.debug("---------- OpenAI Async Response End ----------")
-        # -*- Return content if no function calls are present
-        if assistant_message.content is not None:
-            return assistant_message.get_content_string()
-        return "Something went wrong, please try again."
+        return assistant_message
 
     def generate(self, messages: List[Message]) -> Dict:
         logger.debug("---------- OpenAI Response Start ----------")
@@ -599,12 +551,7 @@ class OpenAIChat(LLM):
         logger.debug("---------- OpenAI Response End ----------")
         return response_message_dict
 
-    def response_stream(self, messages: List[Message]) -> Iterator[str]:
-        logger.debug("---------- OpenAI Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
-
+    def get_assistant_message_stream(self, messages: List[Message]) -> Iterator[Union[str, Message]]:
         assistant_message_content = ""
         assistant_message_function_name = ""
         assistant_message_function_arguments_str = ""
@@ -752,72 +699,9 @@ class OpenAIChat(LLM):
         else:
             self.metrics["total_tokens"] += total_tokens
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function call
-        need_to_run_functions = assistant_message.function_call is not None or assistant_message.tool_calls is not None
-        if need_to_run_functions and self.run_tools:
-            if assistant_message.function_call is not None:
-                function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
-                messages.append(function_call_message)
-                if self.show_tool_calls and function_call is not None:
-                    yield f"\n - Running: {function_call.get_call_str()}\n\n"
-                # -*- Yield new response using result of function call
-                yield from self.response_stream(messages=messages)
-            elif assistant_message.tool_calls is not None:
-                function_calls_to_run: List[FunctionCall] = []
-                for tool_call in assistant_message.tool_calls:
-                    _tool_call_id = tool_call.get("id")
-                    _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                    if _function_call is None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content="Could not find function to call.",
-                            )
-                        )
-                        continue
-                    if _function_call.error is not None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content=_function_call.error,
-                            )
-                        )
-                        continue
-                    function_calls_to_run.append(_function_call)
-
-                if self.show_tool_calls:
-                    if len(function_calls_to_run) == 1:
-                        yield f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                    elif len(function_calls_to_run) > 1:
-                        yield "\nRunning:"
-                        for _f in function_calls_to_run:
-                            yield f"\n - {_f.get_call_str()}"
-                        yield "\n\n"
-
-                function_call_results = self.run_function_calls(function_calls_to_run)
-                if len(function_call_results) > 0:
-                    messages.extend(function_call_results)
-                    # Code to show function call results
-                    # for f in function_call_results:
-                    #     yield "\n"
-                    #     yield f.get_content_string()
-                    #     yield "\n"
-                # -*- Yield new response using results of tool calls
-                yield from self.response_stream(messages=messages)
-        logger.debug("---------- OpenAI Response End ----------")
-
-    async def aresponse_stream(self, messages: List[Message]) -> Any:
-        logger.debug("---------- OpenAI Async Response Start ----------")
-        # -*- Log messages for debugging
-        for m in messages:
-            m.log()
+        yield assistant_message
 
+    async def aget_assistant_message_stream(self, messages: List[Message]) -> Any:
         assistant_message_content = ""
         assistant_message_function_name = ""
         assistant_message_function_arguments_str = ""
@@ -945,71 +829,7 @@ class OpenAIChat(LLM):
         else:
             self.metrics["total_tokens"] += total_tokens
 
-        # -*- Add assistant message to messages
-        messages.append(assistant_message)
-        assistant_message.log()
-
-        # -*- Parse and run function call
-        need_to_run_functions = assistant_message.function_call is not None or assistant_message.tool_calls is not None
-        if need_to_run_functions and self.run_tools:
-            if assistant_message.function_call is not None:
-                function_call_message, function_call = self.run_function(function_call=assistant_message.function_call)
-                messages.append(function_call_message)
-                if self.show_tool_calls and function_call is not None:
-                    yield f"\n - Running: {function_call.get_call_str()}\n\n"
-                # -*- Yield new response using result of function call
-                fc_stream = self.aresponse_stream(messages=messages)
-                async for fc in fc_stream:
-                    yield fc
-                # yield from self.response_stream(messages=messages)
-            elif assistant_message.tool_calls is not None:
-                function_calls_to_run: List[FunctionCall] = []
-                for tool_call in assistant_message.tool_calls:
-                    _tool_call_id = tool_call.get("id")
-                    _function_call = get_function_call_for_tool_call(tool_call, self.functions)
-                    if _function_call is None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content="Could not find function to call.",
-                            )
-                        )
-                        continue
-                    if _function_call.error is not None:
-                        messages.append(
-                            Message(
-                                role="tool",
-                                tool_call_id=_tool_call_id,
-                                content=_function_call.error,
-                            )
-                        )
-                        continue
-                    function_calls_to_run.append(_function_call)
-
-                if self.show_tool_calls:
-                    if len(function_calls_to_run) == 1:
-                        yield f"\n - Running: {function_calls_to_run[0].get_call_str()}\n\n"
-                    elif len(function_calls_to_run) > 1:
-                        yield "\nRunning:"
-                        for _f in function_calls_to_run:
-                            yield f"\n - {_f.get_call_str()}"
-                        yield "\n\n"
-
-                function_call_results = self.run_function_calls(function_calls_to_run)
-                if len(function_call_results) > 0:
-                    messages.extend(function_call_results)
-                    # Code to show function call results
-                    # for f in function_call_results:
-                    #     yield "\n"
-                    #     yield f.get_content_string()
-                    #     yield "\n"
-                # -*- Yield new response using results of tool calls
-                fc_stream = self.aresponse_stream(messages=messages)
-                async for fc in fc_stream:
-                    yield fc
-                # yield from self.response_stream(messages=messages)
-        logger.debug("---------- OpenAI Async Response End ----------")
+        yield assistant_message
 
     def generate_stream(self, messages: List[Message]) -> Iterator[Dict]:
         logger.debug("---------- OpenAI Response Start ----------")
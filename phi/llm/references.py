@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Dict, Any
 from pydantic import BaseModel
 
 
@@ -11,3 +11,5 @@ class References(BaseModel):
     references: Optional[str] = None
     # Performance in seconds.
     time: Optional[float] = None
+    # The limit, number of results and time in seconds of each search, for a hybrid search.
+    retrieval: Optional[Dict[str, Dict[str, Any]]] = None
@@ -1,14 +1,17 @@
 from enum import Enum
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr
 
+from phi.embedder import Embedder
 from phi.llm.message import Message
 from phi.llm.references import References
 from phi.memory.db import MemoryDb
 from phi.memory.memory import Memory
+from phi.memory.row import MemoryRow
 from phi.memory.manager import MemoryManager
 from phi.memory.classifier import MemoryClassifier
+from phi.memory.worker import MemoryUpdateWorker, get_memory_worker
 from phi.utils.log import logger
 
 
@@ -32,16 +35,43 @@ class AssistantMemory(BaseModel):
     user_id: Optional[str] = None
     retrieval: MemoryRetrieval = MemoryRetrieval.last_n
     memories: Optional[List[Memory]] = None
+    # Number of memories to load. With semantic retrieval, the number of memories most similar to the user message,
+    # defaults to 10
     num_memories: Optional[int] = None
+    # Embeds the memories and the user message for semantic retrieval when the db does not search memories itself.
+    # Defaults to OpenAIEmbedder with an in-memory cache, so each memory is only embedded once.
+    embedder: Optional[Embedder] = None
+    # Maximum number of tokens of the memories added to the system prompt, the first memories loaded are kept
+    memory_token_limit: Optional[int] = None
+    # Counts the tokens of a memory for memory_token_limit, defaults to about 4 characters per token.
+    # Use phi.document.chunking.tokenizer.get_tiktoken_length() to count tokens with tiktoken.
+    token_length_function: Optional[Callable[[str], int]] = None
     classifier: Optional[MemoryClassifier] = None
     manager: Optional[MemoryManager] = None
     updating: bool = False
+    # Updates the memories on background threads, see update_memory_in_background().
+    # Defaults to the worker shared by all assistants, which is flushed at exit.
+    worker: Optional[MemoryUpdateWorker] = None
+
+    # Number of chat_history, llm_messages and references already saved to storage.
+    # Used by storage that appends messages to save only the new entries.
+    _num_saved: Dict[str, int] = PrivateAttr(default_factory=dict)
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     def to_dict(self) -> Dict[str, Any]:
         _memory_dict = self.model_dump(
-            exclude_none=True, exclude={"db", "updating", "memories", "classifier", "manager"}
+            exclude_none=True,
+            exclude={
+                "db",
+                "updating",
+                "memories",
+                "embedder",
+                "token_length_function",
+                "classifier",
+                "manager",
+                "worker",
+            },
         )
         if self.memories:
             _memory_dict["memories"] = [memory.to_dict() for memory in self.memories]
@@ -67,6 +97,40 @@ class AssistantMemory(BaseModel):
         """Adds references to the references list."""
         self.references.append(references)
 
+    def get_unsaved_entries(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Returns the (kind, entry) pairs added to chat_history, llm_messages and references
+        since the last call to mark_entries_saved().
+        """
+        unsaved_entries: List[Tuple[str, Dict[str, Any]]] = []
+        for kind, entries in (
+            ("chat_history", self.chat_history),
+            ("llm_messages", self.llm_messages),
+            ("references", self.references),
+        ):
+            for entry in entries[self._num_saved.get(kind, 0) :]:
+                unsaved_entries.append((kind, entry.model_dump(exclude_none=True)))
+        return unsaved_entries
+
+    def load_saved_entries(self, kind: str, entries: List[Dict[str, Any]]) -> None:
+        """Replaces the saved entries of chat_history, llm_messages or references with entries read from storage.
+        Entries that have not been saved yet are kept at the end.
+        """
+        if kind == "references":
+            saved: List[Any] = [References(**e) for e in entries]
+        else:
+            saved = [Message(**e) for e in entries]
+        unsaved = getattr(self, kind)[self._num_saved.get(kind, 0) :]
+        setattr(self, kind, saved + unsaved)
+        self._num_saved[kind] = len(saved)
+
+    def mark_entries_saved(self) -> None:
+        """Marks all entries in chat_history, llm_messages and references as saved to storage."""
+        self._num_saved = {
+            "chat_history": len(self.chat_history),
+            "llm_messages": len(self.llm_messages),
+            "references": len(self.references),
+        }
+
     def get_chat_history(self) -> List[Dict[str, Any]]:
         """Returns the chat_history as a list of dictionaries.
 
@@ -141,8 +205,10 @@ class AssistantMemory(BaseModel):
             return tool_calls[:num_calls]
         return tool_calls
 
-    def load_memory(self) -> None:
-        """Load the memory from memory db for this user."""
+    def load_memory(self, query: Optional[str] = None) -> None:
+        """Load the memory from memory db for this user.
+        With semantic retrieval, loads the memories most similar to the query, and nothing without a query.
+        """
         if self.db is None:
             return
 
@@ -154,24 +220,85 @@ class AssistantMemory(BaseModel):
                     sort="asc" if self.retrieval == MemoryRetrieval.first_n else "desc",
                 )
             else:
-                raise NotImplementedError("Semantic retrieval not yet supported.")
+                if query is None:
+                    return
+                memory_rows = self.search_memories(query=query)
         except Exception as e:
             logger.debug(f"Error reading memory: {e}")
             return
 
-        # Clear the existing memories
-        self.memories = []
-
-        # No memories to load
-        if memory_rows is None or len(memory_rows) == 0:
-            return
-
-        for row in memory_rows:
+        # Replace the existing memories at once, they can be loaded on a background thread while a prompt is built
+        memories: List[Memory] = []
+        for row in memory_rows or []:
             try:
-                self.memories.append(Memory.model_validate(row.memory))
+                memories.append(Memory.model_validate(row.memory))
             except Exception as e:
                 logger.warning(f"Error loading memory: {e}")
                 continue
+        self.memories = memories
+
+    def get_embedder(self) -> Embedder:
+        if self.embedder is None:
+            from phi.embedder.cached import CachedEmbedder
+            from phi.embedder.openai import OpenAIEmbedder
+
+            self.embedder = CachedEmbedder(embedder=OpenAIEmbedder())
+        return self.embedder
+
+    def search_memories(self, query: str) -> List[MemoryRow]:
+        """Returns the num_memories memories of the user most similar to the query, most similar first.
+        Uses db.search_memories() when the db stores embeddings, otherwise reads all memories of the user
+        and ranks them by the cosine similarity of their embeddings with the query, logging a warning.
+        """
+        if self.db is None:
+            return []
+
+        limit = self.num_memories or 10
+        try:
+            return self.db.search_memories(query=query, user_id=self.user_id, limit=limit)
+        except NotImplementedError:
+            pass
+
+        memory_rows = self.db.read_memories(user_id=self.user_id)
+        logger.warning(
+            f"{self.db.__class__.__name__} does not search memories, reading and embedding all {len(memory_rows)} "
+            "memories of the user. Use PgMemoryDb with an embedder for semantic retrieval."
+        )
+        if len(memory_rows) <= 1:
+            return memory_rows
+
+        try:
+            import numpy as np
+        except ImportError:
+            raise ImportError("`numpy` not installed")
+
+        embedder = self.get_embedder()
+        texts = [row.get_memory_text() for row in memory_rows]
+        embeddings = np.asarray(embedder.get_embeddings(texts), dtype=np.float32)
+        query_embedding = np.asarray(embedder.get_embedding(query), dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1) * np.linalg.norm(query_embedding)
+        norms[norms == 0] = 1
+        similarities = embeddings @ query_embedding / norms
+        return [memory_rows[i] for i in np.argsort(-similarities, kind="stable")[:limit].tolist()]
+
+    def get_memories_within_limit(self) -> List[Memory]:
+        """Returns the memories for the system prompt: the first memories that fit in memory_token_limit"""
+        if self.memories is None or self.memory_token_limit is None:
+            return self.memories or []
+
+        token_length = self.token_length_function or (lambda text: len(text) // 4 + 1)
+        memories: List[Memory] = []
+        tokens = 0
+        for memory in self.memories:
+            tokens += token_length(f"- {memory.memory}")
+            if tokens > self.memory_token_limit:
+                break
+            memories.append(memory)
+        if len(memories) < len(self.memories):
+            logger.debug(
+                f"Added {len(memories)} of {len(self.memories)} memories within {self.memory_token_limit} tokens"
+            )
+        return memories
 
     def should_update_memory(self, input: str) -> bool:
         """Determines if a message should be added to the memory db."""
@@ -191,32 +318,68 @@ class AssistantMemory(BaseModel):
         if input is None or not isinstance(input, str):
             return "Invalid message content"
 
+        return self.update_memories(inputs=[input], force=force)
+
+    def update_memories(self, inputs: List[str], force: bool = False) -> str:
+        """Creates memories from a batch of messages and adds them to the memory db.
+        The messages are classified together, with one classifier call for the batch.
+        """
+
         if self.db is None:
             logger.warning("MemoryDb not provided.")
             return "Please provide a db to store memories"
 
-        self.updating = True
+        if len(inputs) == 0:
+            return "Memory update not required"
+        input = inputs[0] if len(inputs) == 1 else "\n\n".join(inputs)
 
-        # Check if this user message should be added to long term memory
-        should_update_memory = force or self.should_update_memory(input=input)
-        logger.debug(f"Update memory: {should_update_memory}")
+        # A background update and the update_memory tool do not update the memories at the same time
+        with self.get_worker().update_lock(self):
+            self.updating = True
+            try:
+                # Check if these user messages should be added to long term memory
+                should_update_memory = force or self.should_update_memory(input=input)
+                logger.debug(f"Update memory: {should_update_memory}")
+
+                if not should_update_memory:
+                    logger.debug("Memory update not required")
+                    return "Memory update not required"
+
+                if self.manager is None:
+                    self.manager = MemoryManager(user_id=self.user_id, db=self.db)
+
+                response = self.manager.run(input)
+                self.load_memory(query=input)
+                return response
+            finally:
+                self.updating = False
+
+    def update_memory_in_background(self, input: str) -> bool:
+        """Queues a message to update the memory with on the worker and returns without waiting for the update.
+        Returns False if the message was dropped because the queue is full.
+        """
+        if input is None or not isinstance(input, str) or self.db is None:
+            return False
 
-        if not should_update_memory:
-            logger.debug("Memory update not required")
-            return "Memory update not required"
+        return self.get_worker().submit(memory=self, input=input)
 
-        if self.manager is None:
-            self.manager = MemoryManager(user_id=self.user_id, db=self.db)
+    def get_worker(self) -> MemoryUpdateWorker:
+        if self.worker is None:
+            self.worker = get_memory_worker()
+        return self.worker
 
-        response = self.manager.run(input)
-        self.load_memory()
-        return response
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the memory updates queued on the worker are done. Returns False if the timeout expired first."""
+        if self.worker is None:
+            return True
+        return self.worker.flush(timeout=timeout)
 
     def get_memories_for_system_prompt(self) -> Optional[str]:
-        if self.memories is None or len(self.memories) == 0:
+        memories = self.get_memories_within_limit()
+        if len(memories) == 0:
             return None
         memory_str = "<memory_from_previous_interactions>\n"
-        memory_str += "\n".join([f"- {memory.memory}" for memory in self.memories])
+        memory_str += "\n".join([f"- {memory.memory}" for memory in memories])
         memory_str += "\n</memory_from_previous_interactions>"
 
         return memory_str
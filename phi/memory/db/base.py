@@ -21,6 +21,10 @@ class MemoryDb(ABC):
     ) -> List[MemoryRow]:
         raise NotImplementedError
 
+    def search_memories(self, query: str, user_id: Optional[str] = None, limit: int = 10) -> List[MemoryRow]:
+        """Returns the memories most similar to the query, for memory dbs that store embeddings of the memories"""
+        raise NotImplementedError
+
     @abstractmethod
     def upsert_memory(self, memory: MemoryRow) -> Optional[MemoryRow]:
         raise NotImplementedError
@@ -1,16 +1,17 @@
-from typing import Optional, List
+from typing import Any, Dict, Optional, List, Set
 
 try:
     from sqlalchemy.dialects import postgresql
     from sqlalchemy.engine import create_engine, Engine
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import Session, sessionmaker
-    from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, select, delete
+    from sqlalchemy.schema import MetaData, Table, Column, Index
+    from sqlalchemy.sql.expression import text, select, delete, update
     from sqlalchemy.types import DateTime, String
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
 
+from phi.embedder import Embedder
 from phi.memory.db import MemoryDb
 from phi.memory.row import MemoryRow
 from phi.utils.log import logger
@@ -23,6 +24,7 @@ class PgMemoryDb(MemoryDb):
         schema: Optional[str] = "ai",
         db_url: Optional[str] = None,
         db_engine: Optional[Engine] = None,
+        embedder: Optional[Embedder] = None,
     ):
         """
         This class provides a memory store backed by a postgres table.
@@ -36,6 +38,8 @@ class PgMemoryDb(MemoryDb):
             schema (Optional[str]): The schema to store the table in. Defaults to "ai".
             db_url (Optional[str]): The database URL to connect to. Defaults to None.
             db_engine (Optional[Engine]): The database engine to use. Defaults to None.
+            embedder (Optional[Embedder]): Embeds the memories on write into a pgvector column with an HNSW index,
+                for semantic retrieval with search_memories(). Needs the `pgvector` package. Defaults to None.
         """
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
@@ -48,30 +52,63 @@ class PgMemoryDb(MemoryDb):
         self.schema: Optional[str] = schema
         self.db_url: Optional[str] = db_url
         self.db_engine: Engine = _engine
+        self.embedder: Optional[Embedder] = embedder
         self.metadata: MetaData = MetaData(schema=self.schema)
         self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
         self.table: Table = self.get_table()
+        # Users whose memories written before the embedding column was added are embedded
+        self._embedded_users: Set[Optional[str]] = set()
 
     def get_table(self) -> Table:
-        return Table(
-            self.table_name,
-            self.metadata,
+        columns = [
             Column("id", String, primary_key=True),
             Column("user_id", String),
             Column("memory", postgresql.JSONB, server_default=text("'{}'::jsonb")),
             Column("created_at", DateTime(timezone=True), server_default=text("now()")),
             Column("updated_at", DateTime(timezone=True), onupdate=text("now()")),
-            extend_existing=True,
-        )
+        ]
+        if self.embedder is not None:
+            try:
+                from pgvector.sqlalchemy import Vector
+            except ImportError:
+                raise ImportError("`pgvector` not installed")
+            columns.append(Column("embedding", Vector(self.embedder.dimensions)))
+
+        table = Table(self.table_name, self.metadata, *columns, extend_existing=True)
+        if self.embedder is not None:
+            Index(
+                f"{self.table_name}_embedding_hnsw_index",
+                table.c.embedding,
+                postgresql_using="hnsw",
+                postgresql_ops={"embedding": "vector_cosine_ops"},
+            )
+        return table
 
     def create_table(self) -> None:
         if not self.table_exists():
-            if self.schema is not None:
-                with self.Session() as sess, sess.begin():
+            with self.Session() as sess, sess.begin():
+                if self.embedder is not None:
+                    logger.debug("Creating extension: vector")
+                    sess.execute(text("create extension if not exists vector;"))
+                if self.schema is not None:
                     logger.debug(f"Creating schema: {self.schema}")
                     sess.execute(text(f"create schema if not exists {self.schema};"))
             logger.debug(f"Creating table: {self.table_name}")
             self.table.create(self.db_engine)
+        elif self.embedder is not None:
+            # Add the embedding column and index to a table created without an embedder
+            table = f"{self.schema}.{self.table_name}" if self.schema is not None else self.table_name
+            with self.Session() as sess, sess.begin():
+                sess.execute(text("create extension if not exists vector;"))
+                sess.execute(
+                    text(f"alter table {table} add column if not exists embedding vector({self.embedder.dimensions});")
+                )
+            for index in self.table.indexes:
+                index.create(self.db_engine, checkfirst=True)
+
+    def get_columns(self) -> List[Column]:
+        """The columns of a MemoryRow, without the embedding"""
+        return [column for column in self.table.columns if column.name != "embedding"]
 
     def memory_exists(self, memory: MemoryRow) -> bool:
         columns = [self.table.c.id]
@@ -87,7 +124,7 @@ class PgMemoryDb(MemoryDb):
         memories: List[MemoryRow] = []
         with self.Session() as sess, sess.begin():
             try:
-                stmt = select(self.table)
+                stmt = select(*self.get_columns())
                 if user_id is not None:
                     stmt = stmt.where(self.table.c.user_id == user_id)
                 if limit is not None:
@@ -110,22 +147,19 @@ class PgMemoryDb(MemoryDb):
     def upsert_memory(self, memory: MemoryRow) -> None:
         """Create a new memory if it does not exist, otherwise update the existing memory"""
 
+        values: Dict[str, Any] = dict(id=memory.id, user_id=memory.user_id, memory=memory.memory)
+        if self.embedder is not None:
+            values["embedding"] = self.embedder.get_embedding(memory.get_memory_text())
+
         with self.Session() as sess, sess.begin():
             # Create an insert statement
-            stmt = postgresql.insert(self.table).values(
-                id=memory.id,
-                user_id=memory.user_id,
-                memory=memory.memory,
-            )
+            stmt = postgresql.insert(self.table).values(**values)
 
             # Define the upsert if the memory already exists
             # See: https://docs.sqlalchemy.org/en/20/dialects/postgresql.html#postgresql-insert-on-conflict
             stmt = stmt.on_conflict_do_update(
                 index_elements=["id"],
-                set_=dict(
-                    user_id=stmt.excluded.user_id,
-                    memory=stmt.excluded.memory,
-                ),
+                set_={key: stmt.excluded[key] for key in values if key != "id"},
             )
 
             try:
@@ -135,6 +169,45 @@ class PgMemoryDb(MemoryDb):
                 self.create_table()
                 sess.execute(stmt)
 
+    def search_memories(self, query: str, user_id: Optional[str] = None, limit: int = 10) -> List[MemoryRow]:
+        """Returns the memories of the user nearest to the query by cosine distance, using the HNSW index"""
+        if self.embedder is None:
+            raise NotImplementedError("PgMemoryDb needs an embedder for semantic retrieval")
+
+        if user_id not in self._embedded_users:
+            self.embed_memories(user_id=user_id)
+            self._embedded_users.add(user_id)
+
+        query_embedding = self.embedder.get_embedding(query)
+        with self.Session() as sess, sess.begin():
+            stmt = select(*self.get_columns()).where(self.table.c.embedding.is_not(None))
+            if user_id is not None:
+                stmt = stmt.where(self.table.c.user_id == user_id)
+            stmt = stmt.order_by(self.table.c.embedding.cosine_distance(query_embedding)).limit(limit)
+            return [MemoryRow.model_validate(row) for row in sess.execute(stmt).fetchall()]
+
+    def embed_memories(self, user_id: Optional[str] = None, batch_size: int = 100) -> int:
+        """Embeds the memories without an embedding, e.g. written before the table had an embedding column.
+        Returns the number of memories embedded.
+        """
+        if self.embedder is None:
+            return 0
+
+        self.create_table()
+        with self.Session() as sess, sess.begin():
+            stmt = select(*self.get_columns()).where(self.table.c.embedding.is_(None))
+            if user_id is not None:
+                stmt = stmt.where(self.table.c.user_id == user_id)
+            rows = [MemoryRow.model_validate(row) for row in sess.execute(stmt).fetchall()]
+            for i in range(0, len(rows), batch_size):
+                batch = rows[i : i + batch_size]
+                embeddings = self.embedder.get_embeddings([row.get_memory_text() for row in batch])
+                for row, embedding in zip(batch, embeddings):
+                    sess.execute(update(self.table).where(self.table.c.id == row.id).values(embedding=embedding))
+        if len(rows) > 0:
+            logger.debug(f"Embedded {len(rows)} memories")
+        return len(rows)
+
     def delete_memory(self, id: str) -> None:
         with self.Session() as sess, sess.begin():
             stmt = delete(self.table).where(self.table.c.id == id)
@@ -26,6 +26,10 @@ class MemoryRow(BaseModel):
     def to_dict(self) -> Dict[str, Any]:
         return self.serializable_dict()
 
+    def get_memory_text(self) -> str:
+        """The text of the memory, which is embedded for semantic retrieval"""
+        return str(self.memory.get("memory", ""))
+
     @model_validator(mode="after")
     def generate_id(self) -> "MemoryRow":
         if self.id is None:
@@ -0,0 +1,204 @@
+import atexit
+from contextlib import contextmanager
+from os import getenv
+from threading import Condition, Lock, Thread
+from time import monotonic
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Literal, Optional, Set, Tuple
+
+from phi.utils.log import logger
+
+if TYPE_CHECKING:
+    from phi.memory.assistant import AssistantMemory
+
+# Seconds to wait at exit for the memory updates still queued on the shared worker
+MEMORY_WORKER_FLUSH_TIMEOUT: float = float(getenv("PHI_MEMORY_WORKER_FLUSH_TIMEOUT", "30"))
+_memory_worker: Optional["MemoryUpdateWorker"] = None
+_memory_worker_lock = Lock()
+
+
+class MemoryUpdateWorker:
+    """Updates the memories of assistants on background threads, so a run returns as soon as the response is done.
+
+    The user messages of each AssistantMemory wait in a queue and are classified in batches of up to batch_size
+    messages, one classifier call per batch. A memory is only updated on one thread at a time, including updates
+    outside the worker, e.g. by the update_memory tool, see update_lock(). Messages sent while the update of
+    a memory runs are batched together. At most max_pending messages wait, when the queue is full:
+        - merge: the message is merged into the last message waiting for the same memory,
+          or the oldest message waiting is dropped if there is none.
+        - drop_oldest: the oldest message waiting is dropped.
+        - drop_newest: the message is dropped.
+    """
+
+    def __init__(
+        self,
+        max_pending: int = 1000,
+        batch_size: int = 5,
+        overflow: Literal["merge", "drop_oldest", "drop_newest"] = "merge",
+        num_threads: int = 1,
+    ):
+        if max_pending < 1 or batch_size < 1 or num_threads < 1:
+            raise ValueError("max_pending, batch_size and num_threads must be at least 1")
+
+        self.max_pending: int = max_pending
+        self.batch_size: int = batch_size
+        self.overflow: str = overflow
+        self.num_threads: int = num_threads
+
+        self.condition = Condition()
+        # Memories with messages waiting and their messages, by id of the memory, the longest waiting first
+        self.pending: Dict[int, Tuple["AssistantMemory", List[str]]] = {}
+        self.num_pending: int = 0
+        # Ids of the memories with a batch taken by a thread of the worker
+        self.claimed: Set[int] = set()
+        # Ids of the memories being updated, on the threads of the worker or on other threads
+        self.updating: Set[int] = set()
+        self.threads: List[Thread] = []
+        self.closed: bool = False
+        # Number of messages updated, merged into another message, dropped and failed
+        self.updated: int = 0
+        self.merged: int = 0
+        self.dropped: int = 0
+        self.failed: int = 0
+
+    def submit(self, memory: "AssistantMemory", input: str) -> bool:
+        """Queues a user message to update the memory with. Returns False if the message was dropped."""
+        key = id(memory)
+        with self.condition:
+            if self.closed:
+                logger.warning("Memory update worker is shut down, message dropped")
+                self.dropped += 1
+                return False
+
+            if self.num_pending >= self.max_pending:
+                if self.overflow == "merge" and key in self.pending:
+                    inputs = self.pending[key][1]
+                    inputs[-1] = f"{inputs[-1]}\n\n{input}"
+                    self.merged += 1
+                    return True
+                if self.overflow == "drop_newest":
+                    logger.warning(f"Memory update queue is full ({self.max_pending} messages), message dropped")
+                    self.dropped += 1
+                    return False
+                oldest_key = next(iter(self.pending))
+                oldest_inputs = self.pending[oldest_key][1]
+                oldest_inputs.pop(0)
+                if len(oldest_inputs) == 0:
+                    del self.pending[oldest_key]
+                self.num_pending -= 1
+                logger.warning(f"Memory update queue is full ({self.max_pending} messages), oldest message dropped")
+                self.dropped += 1
+
+            if key in self.pending:
+                self.pending[key][1].append(input)
+            else:
+                self.pending[key] = (memory, [input])
+            self.num_pending += 1
+            self.condition.notify_all()
+
+        self.start()
+        return True
+
+    def start(self) -> None:
+        with self.condition:
+            if len(self.threads) > 0:
+                return
+            self.threads = [
+                Thread(target=self.work, name=f"phi-memory-update-{i}", daemon=True) for i in range(self.num_threads)
+            ]
+        for thread in self.threads:
+            thread.start()
+
+    def get_next_key(self) -> Optional[int]:
+        """Returns the id of the memory waiting the longest that does not have a batch taken by another thread"""
+        for key in self.pending:
+            if key not in self.claimed:
+                return key
+        return None
+
+    @contextmanager
+    def update_lock(self, memory: "AssistantMemory") -> Iterator[None]:
+        """Waits until the memory is not being updated on another thread, and marks it as being updated"""
+        key = id(memory)
+        with self.condition:
+            while key in self.updating:
+                self.condition.wait()
+            self.updating.add(key)
+        try:
+            yield
+        finally:
+            with self.condition:
+                self.updating.discard(key)
+                self.condition.notify_all()
+
+    def work(self) -> None:
+        while True:
+            with self.condition:
+                key = self.get_next_key()
+                while key is None:
+                    if self.closed:
+                        return
+                    self.condition.wait()
+                    key = self.get_next_key()
+
+                memory, inputs = self.pending.pop(key)
+                batch = inputs[: self.batch_size]
+                if len(inputs) > len(batch):
+                    # The rest of the messages wait behind the other memories
+                    self.pending[key] = (memory, inputs[self.batch_size :])
+                self.num_pending -= len(batch)
+                self.claimed.add(key)
+
+            failed = False
+            try:
+                memory.update_memories(inputs=batch)
+            except Exception as e:
+                logger.warning(f"Error updating memory: {e}")
+                failed = True
+            finally:
+                with self.condition:
+                    self.claimed.discard(key)
+                    if failed:
+                        self.failed += len(batch)
+                    else:
+                        self.updated += len(batch)
+                    self.condition.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Waits until the messages queued are updated. Returns False if the timeout expired first."""
+        deadline = monotonic() + timeout if timeout is not None else None
+        with self.condition:
+            while len(self.pending) > 0 or len(self.claimed) > 0:
+                remaining = deadline - monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    logger.warning(f"Memory updates still running after {timeout}s: {self.num_pending} messages queued")
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def shutdown(self, timeout: Optional[float] = None) -> bool:
+        """Flushes the queue and stops the threads. Messages submitted afterwards are dropped."""
+        flushed = self.flush(timeout=timeout)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        logger.debug(
+            f"Memory update worker: {self.updated} messages updated, {self.merged} merged, "
+            f"{self.dropped} dropped, {self.failed} failed"
+        )
+        return flushed
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "MemoryUpdateWorker":
+        """Copies of a memory share its worker, the queue and threads can not be copied"""
+        return self
+
+
+def get_memory_worker() -> MemoryUpdateWorker:
+    """Returns the worker shared by the assistants, which is flushed at exit."""
+    global _memory_worker
+
+    if _memory_worker is None:
+        with _memory_worker_lock:
+            if _memory_worker is None:
+                _memory_worker = MemoryUpdateWorker()
+                atexit.register(_memory_worker.shutdown, timeout=MEMORY_WORKER_FLUSH_TIMEOUT)
+    return _memory_worker
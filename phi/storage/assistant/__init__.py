@@ -1 +1 @@
-from phi.storage.assistant.base import AssistantStorage
+from phi.storage.assistant.base import AssistantStorage, AsyncAssistantStorage
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import Optional, List
 
-from phi.assistant.run import AssistantRun
+from phi.assistant.run import AssistantRun, AssistantRunEntry
 
 
 class AssistantStorage(ABC):
+    # If True, chat_history, llm_messages and references are appended to a separate table
+    # instead of rewriting the memory column of the run on every upsert.
+    append_messages: bool = False
+
     @abstractmethod
     def create(self) -> None:
         raise NotImplementedError
@@ -25,6 +29,42 @@ class AssistantStorage(ABC):
     def upsert(self, row: AssistantRun) -> Optional[AssistantRun]:
         raise NotImplementedError
 
+    def append(self, row: AssistantRun, entries: List[AssistantRunEntry]) -> None:
+        """Upsert the run and append new entries to it. Used when append_messages is True."""
+        raise NotImplementedError
+
+    def read_entries(self, run_id: str, kind: str, last_n: Optional[int] = None) -> List[AssistantRunEntry]:
+        """Read the entries of a kind for a run, in the order they were appended.
+        If last_n is provided, only the last n entries are returned.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def delete(self) -> None:
         raise NotImplementedError
+
+
+class AsyncAssistantStorage(ABC):
+    """Assistant storage that can be used without blocking the event loop.
+    Assistant.arun() uses these methods when the storage implements them.
+    """
+
+    @abstractmethod
+    async def aread(self, run_id: str) -> Optional[AssistantRun]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def aget_all_run_ids(self, user_id: Optional[str] = None) -> List[str]:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def aupsert(self, row: AssistantRun) -> Optional[AssistantRun]:
+        raise NotImplementedError
+
+    async def aappend(self, row: AssistantRun, entries: List[AssistantRunEntry]) -> None:
+        """Async version of AssistantStorage.append()"""
+        raise NotImplementedError
+
+    async def aread_entries(self, run_id: str, kind: str, last_n: Optional[int] = None) -> List[AssistantRunEntry]:
+        """Async version of AssistantStorage.read_entries()"""
+        raise NotImplementedError
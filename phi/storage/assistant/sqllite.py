@@ -1,32 +1,37 @@
-from typing import Optional, Any, List
+import asyncio
+from typing import Optional, Any, Dict, List
 
 try:
     from sqlalchemy.dialects import sqlite
-    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine import create_engine, make_url, Engine
     from sqlalchemy.engine.row import Row
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncEngine, AsyncSession
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import Session, sessionmaker
-    from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import select
-    from sqlalchemy.types import String
+    from sqlalchemy.schema import MetaData, Table, Column, Index
+    from sqlalchemy.sql.expression import select, insert
+    from sqlalchemy.types import Integer, String
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
 
 from sqlite3 import OperationalError
 
-from phi.assistant.run import AssistantRun
-from phi.storage.assistant.base import AssistantStorage
+from phi.assistant.run import AssistantRun, AssistantRunEntry
+from phi.storage.assistant.base import AssistantStorage, AsyncAssistantStorage
 from phi.utils.dttm import current_datetime
 from phi.utils.log import logger
 
 
-class SqlAssistantStorage(AssistantStorage):
+class SqlAssistantStorage(AssistantStorage, AsyncAssistantStorage):
     def __init__(
         self,
         table_name: str,
         db_url: Optional[str] = None,
         db_file: Optional[str] = None,
         db_engine: Optional[Engine] = None,
+        append_messages: bool = False,
+        async_db_url: Optional[str] = None,
+        async_db_engine: Optional[AsyncEngine] = None,
     ):
         """
         This class provides assistant storage using a sqlite database.
@@ -41,6 +46,11 @@ class SqlAssistantStorage(AssistantStorage):
         :param db_url: The database URL to connect to.
         :param db_file: The database file to connect to.
         :param db_engine: The database engine to use.
+        :param append_messages: If True, append chat_history, llm_messages and references to the
+            "{table_name}_entries" table instead of rewriting the memory column on every run.
+        :param async_db_url: The database URL used by the async methods.
+            Defaults to the database file using the aiosqlite driver.
+        :param async_db_engine: The async database engine used by the async methods.
         """
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
@@ -61,9 +71,16 @@ class SqlAssistantStorage(AssistantStorage):
 
         # Database session
         self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
+        # Async database engine and session, created on first use
+        self.async_db_url: Optional[str] = async_db_url
+        self.async_db_engine: Optional[AsyncEngine] = async_db_engine
+        self._async_session: Optional[async_sessionmaker[AsyncSession]] = None
 
         # Database table for storage
         self.table: Table = self.get_table()
+        # Database table for the entries appended to each run
+        self.append_messages: bool = append_messages
+        self.entries_table: Optional[Table] = self.get_entries_table() if append_messages else None
 
     def get_table(self) -> Table:
         return Table(
@@ -97,6 +114,25 @@ class SqlAssistantStorage(AssistantStorage):
             sqlite_autoincrement=True,
         )
 
+    def get_entries_table(self) -> Table:
+        entries_table_name = f"{self.table_name}_entries"
+        return Table(
+            entries_table_name,
+            self.metadata,
+            # Sequence number of this entry
+            Column("seq", Integer, primary_key=True, autoincrement=True),
+            # ID of the run this entry belongs to
+            Column("run_id", String, nullable=False),
+            # Memory list this entry belongs to: chat_history, llm_messages or references
+            Column("kind", String, nullable=False),
+            # The entry
+            Column("data", sqlite.JSON),
+            # The timestamp of when this entry was created.
+            Column("created_at", sqlite.DATETIME, default=current_datetime),
+            Index(f"idx_{entries_table_name}_run_id_kind_seq", "run_id", "kind", "seq"),
+            extend_existing=True,
+        )
+
     def table_exists(self) -> bool:
         logger.debug(f"Checking if table exists: {self.table.name}")
         try:
@@ -109,6 +145,9 @@ class SqlAssistantStorage(AssistantStorage):
         if not self.table_exists():
             logger.debug(f"Creating table: {self.table.name}")
             self.table.create(self.db_engine)
+        if self.entries_table is not None:
+            logger.debug(f"Creating table if not exists: {self.entries_table.name}")
+            self.entries_table.create(self.db_engine, checkfirst=True)
 
     def _read(self, session: Session, run_id: str) -> Optional[Row[Any]]:
         stmt = select(self.table).where(self.table.c.run_id == run_id)
@@ -166,14 +205,26 @@ class SqlAssistantStorage(AssistantStorage):
             pass
         return conversations
 
-    def upsert(self, row: AssistantRun) -> Optional[AssistantRun]:
-        """
-        Create a new assistant run if it does not exist, otherwise update the existing conversation.
-        """
-        with self.Session() as sess:
-            # Create an insert statement
-            stmt = sqlite.insert(self.table).values(
-                run_id=row.run_id,
+    def _get_upsert_stmt(self, row: AssistantRun) -> Any:
+        # Create an insert statement
+        stmt = sqlite.insert(self.table).values(
+            run_id=row.run_id,
+            name=row.name,
+            run_name=row.run_name,
+            user_id=row.user_id,
+            llm=row.llm,
+            memory=row.memory,
+            assistant_data=row.assistant_data,
+            run_data=row.run_data,
+            user_data=row.user_data,
+            task_data=row.task_data,
+        )
+
+        # Define the upsert if the run_id already exists
+        # See: https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#insert-on-conflict-upsert
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["run_id"],
+            set_=dict(
                 name=row.name,
                 run_name=row.run_name,
                 user_id=row.user_id,
@@ -183,24 +234,16 @@ class SqlAssistantStorage(AssistantStorage):
                 run_data=row.run_data,
                 user_data=row.user_data,
                 task_data=row.task_data,
-            )
-
-            # Define the upsert if the run_id already exists
-            # See: https://docs.sqlalchemy.org/en/20/dialects/sqlite.html#insert-on-conflict-upsert
-            stmt = stmt.on_conflict_do_update(
-                index_elements=["run_id"],
-                set_=dict(
-                    name=row.name,
-                    run_name=row.run_name,
-                    user_id=row.user_id,
-                    llm=row.llm,
-                    memory=row.memory,
-                    assistant_data=row.assistant_data,
-                    run_data=row.run_data,
-                    user_data=row.user_data,
-                    task_data=row.task_data,
-                ),  # The updated value for each column
-            )
+            ),  # The updated value for each column
+        )
+        return stmt
+
+    def upsert(self, row: AssistantRun) -> Optional[AssistantRun]:
+        """
+        Create a new assistant run if it does not exist, otherwise update the existing conversation.
+        """
+        with self.Session() as sess:
+            stmt = self._get_upsert_stmt(row)
 
             try:
                 sess.execute(stmt)
@@ -221,7 +264,194 @@ class SqlAssistantStorage(AssistantStorage):
                 sess.rollback()
         return None
 
+    def _get_entries_values(self, entries: List[AssistantRunEntry]) -> List[Dict[str, Any]]:
+        return [{"run_id": entry.run_id, "kind": entry.kind, "data": entry.data} for entry in entries]
+
+    def _append(self, session: Session, row: AssistantRun, entries: List[AssistantRunEntry]) -> None:
+        session.execute(self._get_upsert_stmt(row))
+        if self.entries_table is not None and len(entries) > 0:
+            session.execute(insert(self.entries_table), self._get_entries_values(entries))
+
+    def append(self, row: AssistantRun, entries: List[AssistantRunEntry]) -> None:
+        """
+        Upsert the run and append the new entries in one transaction.
+        Unlike upsert(), the run is not read back from the database.
+        """
+
+        if self.entries_table is None:
+            raise ValueError("append_messages must be True to append entries")
+
+        try:
+            with self.Session() as sess, sess.begin():
+                self._append(session=sess, row=row, entries=entries)
+        except Exception as e:
+            logger.debug(f"Error during append, creating tables: {e}")
+            self.create()  # This will only create the tables if they don't exist
+            with self.Session() as sess, sess.begin():
+                self._append(session=sess, row=row, entries=entries)
+
+    def _get_read_entries_stmt(self, run_id: str, kind: str, last_n: Optional[int] = None) -> Any:
+        if self.entries_table is None:
+            raise ValueError("append_messages must be True to read entries")
+
+        stmt = select(self.entries_table).where(
+            self.entries_table.c.run_id == run_id, self.entries_table.c.kind == kind
+        )
+        if last_n is not None:
+            # Read the last n entries using the index on (run_id, kind, seq)
+            stmt = stmt.order_by(self.entries_table.c.seq.desc()).limit(last_n)
+        else:
+            stmt = stmt.order_by(self.entries_table.c.seq)
+        return stmt
+
+    def read_entries(self, run_id: str, kind: str, last_n: Optional[int] = None) -> List[AssistantRunEntry]:
+        stmt = self._get_read_entries_stmt(run_id=run_id, kind=kind, last_n=last_n)
+        try:
+            with self.Session() as sess:
+                rows = sess.execute(stmt).fetchall()
+        except Exception:
+            logger.debug(f"Table does not exist: {self.table_name}_entries")
+            return []
+
+        entries = [AssistantRunEntry.model_validate(row) for row in rows]
+        if last_n is not None:
+            entries.reverse()
+        return entries
+
+    def get_async_session(self) -> Optional[async_sessionmaker[AsyncSession]]:
+        """Returns the async session maker, creating the async engine on first use.
+        Returns None for in-memory databases, which are only visible to the sync engine.
+        """
+        if self._async_session is not None:
+            return self._async_session
+
+        if self.async_db_engine is None:
+            async_db_url = self.async_db_url
+            if async_db_url is None:
+                url = make_url(self.db_url) if self.db_url is not None else self.db_engine.url
+                if url.database is None or url.database in ("", ":memory:"):
+                    return None
+                async_db_url = url.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+            try:
+                self.async_db_engine = create_async_engine(async_db_url)
+            except Exception as e:
+                logger.warning(f"Could not create async engine, async methods will run in a thread: {e}")
+                return None
+        self._async_session = async_sessionmaker(bind=self.async_db_engine)
+        return self._async_session
+
+    async def _run_sync(self, func: Any, *args: Any) -> Any:
+        # In-memory databases live on the connection of the current thread, so they can not be used from a thread
+        if self.db_engine.url.database in (None, "", ":memory:"):
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+
+    async def aread(self, run_id: str) -> Optional[AssistantRun]:
+        async_session = self.get_async_session()
+        if async_session is None:
+            return await self._run_sync(self.read, run_id)
+
+        stmt = select(self.table).where(self.table.c.run_id == run_id)
+        try:
+            async with async_session() as sess:
+                existing_row = (await sess.execute(stmt)).first()
+        except Exception as e:
+            logger.debug(f"Error during read: {e}")
+            return None
+        return AssistantRun.model_validate(existing_row) if existing_row is not None else None
+
+    async def aget_all_run_ids(self, user_id: Optional[str] = None) -> List[str]:
+        async_session = self.get_async_session()
+        if async_session is None:
+            return await self._run_sync(self.get_all_run_ids, user_id)
+
+        run_ids: List[str] = []
+        try:
+            async with async_session() as sess:
+                # get all run_ids for this user
+                stmt = select(self.table.c.run_id)
+                if user_id is not None:
+                    stmt = stmt.where(self.table.c.user_id == user_id)
+                # order by created_at desc
+                stmt = stmt.order_by(self.table.c.created_at.desc())
+                # execute query
+                rows = (await sess.execute(stmt)).fetchall()
+                for row in rows:
+                    if row is not None and row.run_id is not None:
+                        run_ids.append(row.run_id)
+        except Exception:
+            logger.debug(f"Table does not exist: {self.table.name}")
+        return run_ids
+
+    async def aupsert(self, row: AssistantRun) -> Optional[AssistantRun]:
+        """
+        Async version of upsert()
+        """
+        async_session = self.get_async_session()
+        if async_session is None:
+            return await self._run_sync(self.upsert, row)
+
+        try:
+            async with async_session() as sess, sess.begin():
+                await sess.execute(self._get_upsert_stmt(row))
+        except Exception as e:
+            logger.debug(f"Error during upsert, creating tables: {e}")
+            await self._run_sync(self.create)  # This will only create the tables if they don't exist
+            try:
+                async with async_session() as sess, sess.begin():
+                    await sess.execute(self._get_upsert_stmt(row))
+            except Exception as e:
+                logger.warning(f"Error during upsert: {e}")
+                return None
+        return await self.aread(run_id=row.run_id)
+
+    async def _aappend(self, session: AsyncSession, row: AssistantRun, entries: List[AssistantRunEntry]) -> None:
+        await session.execute(self._get_upsert_stmt(row))
+        if self.entries_table is not None and len(entries) > 0:
+            await session.execute(insert(self.entries_table), self._get_entries_values(entries))
+
+    async def aappend(self, row: AssistantRun, entries: List[AssistantRunEntry]) -> None:
+        """
+        Async version of append()
+        """
+        if self.entries_table is None:
+            raise ValueError("append_messages must be True to append entries")
+
+        async_session = self.get_async_session()
+        if async_session is None:
+            return await self._run_sync(self.append, row, entries)
+
+        try:
+            async with async_session() as sess, sess.begin():
+                await self._aappend(session=sess, row=row, entries=entries)
+        except Exception as e:
+            logger.debug(f"Error during append, creating tables: {e}")
+            await self._run_sync(self.create)  # This will only create the tables if they don't exist
+            async with async_session() as sess, sess.begin():
+                await self._aappend(session=sess, row=row, entries=entries)
+
+    async def aread_entries(self, run_id: str, kind: str, last_n: Optional[int] = None) -> List[AssistantRunEntry]:
+        async_session = self.get_async_session()
+        if async_session is None:
+            return await self._run_sync(self.read_entries, run_id, kind, last_n)
+
+        stmt = self._get_read_entries_stmt(run_id=run_id, kind=kind, last_n=last_n)
+        try:
+            async with async_session() as sess:
+                rows = (await sess.execute(stmt)).fetchall()
+        except Exception:
+            logger.debug(f"Table does not exist: {self.table_name}_entries")
+            return []
+
+        entries = [AssistantRunEntry.model_validate(row) for row in rows]
+        if last_n is not None:
+            entries.reverse()
+        return entries
+
     def delete(self) -> None:
         if self.table_exists():
             logger.debug(f"Deleting table: {self.table_name}")
             self.table.drop(self.db_engine)
+        if self.entries_table is not None:
+            logger.debug(f"Deleting table if exists: {self.entries_table.name}")
+            self.entries_table.drop(self.db_engine, checkfirst=True)
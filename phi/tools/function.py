@@ -1,8 +1,49 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from inspect import isawaitable, iscoroutinefunction, unwrap
+from os import getenv
 from typing import Any, Dict, Optional, Callable, get_type_hints
 from pydantic import BaseModel, validate_call
 
 from phi.utils.log import logger
 
+# Maximum number of sync functions that can run at the same time when called from async code
+TOOL_EXECUTOR_MAX_WORKERS: int = int(getenv("PHI_TOOL_EXECUTOR_MAX_WORKERS", "32"))
+_tool_executor: Optional[ThreadPoolExecutor] = None
+_tool_executor_lock = threading.Lock()
+
+
+def get_tool_executor() -> ThreadPoolExecutor:
+    """Returns the bounded executor used to run sync functions without blocking the event loop."""
+    global _tool_executor
+
+    if _tool_executor is None:
+        with _tool_executor_lock:
+            if _tool_executor is None:
+                _tool_executor = ThreadPoolExecutor(
+                    max_workers=TOOL_EXECUTOR_MAX_WORKERS, thread_name_prefix="phi-tool-executor"
+                )
+    return _tool_executor
+
+
+def run_awaitable(result: Any) -> Any:
+    """Returns the result, running it to completion first if it is awaitable."""
+    if not isawaitable(result):
+        return result
+
+    async def _await() -> Any:
+        return await result
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_await())
+    # asyncio.run() cannot be called from a running event loop, so run the coroutine on a separate thread
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, _await()).result()
+
 
 class Function(BaseModel):
     """Model for Functions"""
@@ -23,6 +64,13 @@ class Function(BaseModel):
     def to_dict(self) -> Dict[str, Any]:
         return self.model_dump(exclude_none=True, include={"name", "description", "parameters"})
 
+    @property
+    def is_async(self) -> bool:
+        """True if the entrypoint is an `async def` function."""
+        if self.entrypoint is None:
+            return False
+        return iscoroutinefunction(self.entrypoint) or iscoroutinefunction(unwrap(self.entrypoint))
+
     @classmethod
     def from_callable(cls, c: Callable) -> "Function":
         from inspect import getdoc
@@ -125,8 +173,40 @@ class FunctionCall(BaseModel):
         call_str = f"{self.function.name}({', '.join([f'{k}={v}' for k, v in trimmed_arguments.items()])})"
         return call_str
 
+    async def aexecute(self) -> bool:
+        """Runs the function call without blocking the event loop.
+        Async entrypoints are awaited, sync entrypoints are run in the shared tool executor.
+
+        @return: True if the function call was successful, False otherwise.
+        """
+        if self.function.entrypoint is None:
+            return False
+
+        logger.debug(f"Running: {self.get_call_str()}")
+
+        try:
+            _entrypoint = (
+                self.function.entrypoint
+                if self.arguments is None
+                else partial(self.function.entrypoint, **self.arguments)
+            )
+            if self.function.is_async:
+                result = _entrypoint()
+            else:
+                result = await asyncio.get_running_loop().run_in_executor(get_tool_executor(), _entrypoint)
+            if isawaitable(result):
+                result = await result
+            self.result = result
+            return True
+        except Exception as e:
+            logger.warning(f"Could not run function {self.get_call_str()}")
+            logger.exception(e)
+            self.result = str(e)
+            return False
+
     def execute(self) -> bool:
         """Runs the function call.
+        If the entrypoint is a coroutine function, it is run to completion on an event loop.
 
         @return: True if the function call was successful, False otherwise.
         """
@@ -138,7 +218,7 @@ class FunctionCall(BaseModel):
         # Call the function with no arguments if none are provided.
         if self.arguments is None:
             try:
-                self.result = self.function.entrypoint()
+                self.result = run_awaitable(self.function.entrypoint())
                 return True
             except Exception as e:
                 logger.warning(f"Could not run function {self.get_call_str()}")
@@ -147,7 +227,7 @@ class FunctionCall(BaseModel):
                 return False
 
         try:
-            self.result = self.function.entrypoint(**self.arguments)
+            self.result = run_awaitable(self.function.entrypoint(**self.arguments))
             return True
         except Exception as e:
             logger.warning(f"Could not run function {self.get_call_str()}")
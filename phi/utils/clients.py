@@ -0,0 +1,184 @@
+"""Process-wide registry of API clients.
+
+Every SDK client owns its own connection pool, so creating a client per request means a new TCP + TLS handshake
+per request. LLMs and Embedders get their clients from this registry, which keeps one client per
+(provider, base_url, api_key, timeout, other client params) so connections are kept alive and reused.
+"""
+
+import asyncio
+import threading
+from os import getenv
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+import httpx
+
+from phi.utils.log import logger
+
+T = TypeVar("T")
+
+# Connection pool limits used by the shared httpx clients.
+# These can be configured using environment variables or by calling set_pool_limits().
+_max_connections: int = int(getenv("PHI_HTTP_MAX_CONNECTIONS", "1000"))
+_max_keepalive_connections: int = int(getenv("PHI_HTTP_MAX_KEEPALIVE_CONNECTIONS", "100"))
+_keepalive_expiry: float = float(getenv("PHI_HTTP_KEEPALIVE_EXPIRY", "60"))
+
+_lock = threading.Lock()
+_clients: Dict[Hashable, Any] = {}
+# Async clients are bound to the event loop they were created on.
+_async_clients: Dict[Hashable, Tuple[asyncio.AbstractEventLoop, Any]] = {}
+
+
+def set_pool_limits(
+    max_connections: Optional[int] = None,
+    max_keepalive_connections: Optional[int] = None,
+    keepalive_expiry: Optional[float] = None,
+) -> None:
+    """Set the connection pool limits for shared clients created after this call."""
+    global _max_connections, _max_keepalive_connections, _keepalive_expiry
+
+    if max_connections is not None:
+        _max_connections = max_connections
+    if max_keepalive_connections is not None:
+        _max_keepalive_connections = max_keepalive_connections
+    if keepalive_expiry is not None:
+        _keepalive_expiry = keepalive_expiry
+
+
+def get_pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=_max_connections,
+        max_keepalive_connections=_max_keepalive_connections,
+        keepalive_expiry=_keepalive_expiry,
+    )
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert client params to a hashable value that can be used in a registry key."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+    if isinstance(value, httpx.URL):
+        return str(value)
+    if isinstance(value, httpx.Limits):
+        return ("Limits", value.max_connections, value.max_keepalive_connections, value.keepalive_expiry)
+    # Other objects like custom http clients or token providers are keyed by their identity
+    return (type(value).__name__, id(value))
+
+
+def get_client_key(provider: str, client_params: Optional[Dict[str, Any]] = None) -> Hashable:
+    """Returns the registry key for a provider and its client params.
+
+    The key is (provider, base_url, api_key, timeout, other params) so that two LLMs with the same
+    configuration share a client, while different credentials or endpoints never do.
+    """
+    _params = dict(client_params or {})
+    base_url = _params.pop("base_url", None) or _params.pop("endpoint", None) or _params.pop("host", None)
+    api_key = _params.pop("api_key", None)
+    timeout = _params.pop("timeout", None)
+    return (provider, _freeze(base_url), _freeze(api_key), _freeze(timeout), _freeze(_params))
+
+
+def get_shared_client(provider: str, factory: Callable[..., T], client_params: Optional[Dict[str, Any]] = None) -> T:
+    """Returns a client for the provider, creating it using factory(**client_params) on first use."""
+    key = get_client_key(provider, client_params)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            logger.debug(f"Creating shared {provider} client")
+            client = factory(**(client_params or {}))
+            _clients[key] = client
+    return client
+
+
+def get_shared_async_client(
+    provider: str, factory: Callable[..., T], client_params: Optional[Dict[str, Any]] = None
+) -> T:
+    """Returns an async client for the provider and the running event loop.
+
+    Async connection pools cannot be shared across event loops, so one client is kept per loop.
+    Clients belonging to closed loops are replaced.
+    """
+    try:
+        loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+    except RuntimeError:
+        loop = None
+    if loop is None:
+        return factory(**(client_params or {}))
+
+    key = (get_client_key(provider, client_params), id(loop))
+    with _lock:
+        entry = _async_clients.get(key)
+        if entry is not None and entry[0] is loop and not loop.is_closed():
+            return entry[1]
+
+        # Drop clients for event loops that have been closed
+        for _key in [k for k, (_loop, _) in _async_clients.items() if _loop.is_closed()]:
+            del _async_clients[_key]
+
+        logger.debug(f"Creating shared async {provider} client")
+        client = factory(**(client_params or {}))
+        _async_clients[key] = (loop, client)
+    return client
+
+
+def get_shared_http_client(provider: str = "httpx", timeout: Optional[Any] = None) -> httpx.Client:
+    """Returns a shared httpx.Client with keep-alive connection pooling."""
+    _params: Dict[str, Any] = {"limits": get_pool_limits()}
+    if timeout is not None:
+        _params["timeout"] = timeout
+    return get_shared_client(provider=f"{provider}:http", factory=httpx.Client, client_params=_params)
+
+
+def get_shared_async_http_client(provider: str = "httpx", timeout: Optional[Any] = None) -> httpx.AsyncClient:
+    """Returns a shared httpx.AsyncClient with keep-alive connection pooling for the running event loop."""
+    _params: Dict[str, Any] = {"limits": get_pool_limits()}
+    if timeout is not None:
+        _params["timeout"] = timeout
+    return get_shared_async_client(provider=f"{provider}:http", factory=httpx.AsyncClient, client_params=_params)
+
+
+def clear_shared_clients() -> None:
+    """Closes and removes all shared clients. Useful in tests and on shutdown.
+
+    Async clients can only be closed on their event loop, so they are removed without closing their connections.
+    Use aclear_shared_clients() from async code to close them.
+    """
+    with _lock:
+        for client in _clients.values():
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.debug(f"Error closing client: {e}")
+        _clients.clear()
+        _async_clients.clear()
+
+
+async def aclear_shared_clients() -> None:
+    """Closes and removes all shared clients, awaiting the async clients of the running event loop.
+    Async clients of other event loops are removed without closing their connections.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        async_clients = [client for _loop, client in _async_clients.values() if _loop is loop]
+        _async_clients.clear()
+
+    for client in async_clients:
+        # httpx.AsyncClient has aclose(), the async SDK clients like AsyncOpenAI have an async close()
+        close = getattr(client, "aclose", None) or getattr(client, "close", None)
+        if callable(close):
+            try:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.debug(f"Error closing async client: {e}")
+    clear_shared_clients()
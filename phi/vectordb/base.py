@@ -1,12 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List
+from hashlib import md5
+from typing import List, Optional, Set
 
 from phi.document import Document
+from phi.embedder import Embedder
+from phi.vectordb.filters import Filters
 
 
 class VectorDb(ABC):
     """Base class for managing Vector Databases"""
 
+    # Embeds documents on insert and upsert, and queries on search
+    embedder: Embedder
+
     @abstractmethod
     def create(self) -> None:
         raise NotImplementedError
@@ -19,6 +25,36 @@ class VectorDb(ABC):
     def name_exists(self, name: str) -> bool:
         raise NotImplementedError
 
+    def existing_hashes(self, hashes: List[str]) -> Set[str]:
+        """Returns the content hashes that already exist in the vector db, using one query per batch of hashes."""
+        raise NotImplementedError
+
+    def delete_by_content_hash(self, hashes: List[str]) -> int:
+        """Deletes the documents with these content hashes, returns the number of documents deleted.
+        Used by knowledge bases to remove the chunks of sources that changed or were removed.
+        """
+        raise NotImplementedError
+
+    def embed_documents(self, documents: List[Document]) -> None:
+        """Embeds the documents without an embedding,
+        documents embedded before the insert (e.g. by an ingestion pipeline) are not embedded again.
+        """
+        to_embed = [document for document in documents if document.embedding is None]
+        if len(to_embed) > 0:
+            self.embedder.embed_documents(to_embed)
+
+    def filter_existing_documents(self, documents: List[Document]) -> List[Document]:
+        """Returns the documents that do not exist in the vector db yet."""
+        if len(documents) == 0:
+            return documents
+
+        hashes = [get_content_hash(document) for document in documents]
+        try:
+            existing = self.existing_hashes(list(set(hashes)))
+        except NotImplementedError:
+            return [document for document in documents if not self.doc_exists(document)]
+        return [document for document, content_hash in zip(documents, hashes) if content_hash not in existing]
+
     @abstractmethod
     def insert(self, documents: List[Document]) -> None:
         raise NotImplementedError
@@ -31,7 +67,28 @@ class VectorDb(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    def search(self, query: str, limit: int = 5) -> List[Document]:
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
+        """Returns the documents nearest to the query, matching the filters if given.
+        Embeddings are only read and returned when return_embeddings is True, as most callers only need the content.
+        """
+        raise NotImplementedError
+
+    def keyword_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
+        """Returns the documents that best match the words in the query, using the full-text search of the vector db.
+        Used with search() for hybrid retrieval.
+        """
         raise NotImplementedError
 
     @abstractmethod
@@ -49,3 +106,9 @@ class VectorDb(ABC):
     @abstractmethod
     def clear(self) -> bool:
         raise NotImplementedError
+
+
+def get_content_hash(document: Document) -> str:
+    """Returns the md5 of the document content, as stored by the vector dbs."""
+    cleaned_content = document.content.replace("\x00", "\ufffd")
+    return md5(cleaned_content.encode()).hexdigest()
@@ -0,0 +1,105 @@
+from typing import Optional, List, Dict, Any, Union
+
+from pydantic import BaseModel
+
+# Filter keys refer to meta_data keys, except these keys which refer to the document columns
+DOCUMENT_KEYS = ("id", "name")
+
+
+class Eq(BaseModel):
+    """key == value"""
+
+    key: str
+    value: Union[str, int, float, bool]
+
+
+class In(BaseModel):
+    """key is one of values"""
+
+    key: str
+    values: List[Union[str, int, float, bool]]
+
+
+class Range(BaseModel):
+    """gt < key < lt, or gte <= key <= lte. Numbers and ISO 8601 dates (as strings) can be compared."""
+
+    key: str
+    gt: Optional[Union[int, float, str]] = None
+    gte: Optional[Union[int, float, str]] = None
+    lt: Optional[Union[int, float, str]] = None
+    lte: Optional[Union[int, float, str]] = None
+
+    def get_bounds(self) -> List[tuple]:
+        """Returns the (operator, value) pairs that are set, operator is one of ">", ">=", "<", "<="."""
+        bounds = [(">", self.gt), (">=", self.gte), ("<", self.lt), ("<=", self.lte)]
+        return [(op, value) for op, value in bounds if value is not None]
+
+
+class And(BaseModel):
+    """All filters match"""
+
+    filters: List["FilterExpr"]
+
+
+class Or(BaseModel):
+    """Any filter matches"""
+
+    filters: List["FilterExpr"]
+
+
+FilterExpr = Union[Eq, In, Range, And, Or]
+And.model_rebuild()
+Or.model_rebuild()
+
+# Filters accepted by VectorDb.search: a filter expression, or a dict of meta_data keys and values,
+# where a list value means the key is one of the values.
+Filters = Union[FilterExpr, Dict[str, Any]]
+
+
+def to_filter_expr(filters: Filters) -> FilterExpr:
+    """Converts a dict of filters to a filter expression."""
+    if not isinstance(filters, dict):
+        return filters
+
+    expressions: List[FilterExpr] = []
+    for key, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            expressions.append(In(key=key, values=list(value)))
+        else:
+            expressions.append(Eq(key=key, value=value))
+    return expressions[0] if len(expressions) == 1 else And(filters=expressions)
+
+
+def matches(filters: Filters, document: Dict[str, Any]) -> bool:
+    """Evaluates filters against a document dict with id, name and meta_data keys.
+    Used by vector dbs that filter in Python.
+    """
+    expr = to_filter_expr(filters)
+    if isinstance(expr, And):
+        return all(matches(f, document) for f in expr.filters)
+    if isinstance(expr, Or):
+        return any(matches(f, document) for f in expr.filters)
+
+    if expr.key in DOCUMENT_KEYS:
+        value = document.get(expr.key)
+    else:
+        value = (document.get("meta_data") or {}).get(expr.key)
+    if isinstance(expr, Eq):
+        return value == expr.value
+    if isinstance(expr, In):
+        return value in expr.values
+    if value is None:
+        return False
+    try:
+        for op, bound in expr.get_bounds():
+            if op == ">" and not value > bound:
+                return False
+            if op == ">=" and not value >= bound:
+                return False
+            if op == "<" and not value < bound:
+                return False
+            if op == "<=" and not value <= bound:
+                return False
+    except TypeError:
+        return False
+    return True
@@ -1,6 +1,7 @@
-from hashlib import md5
-from typing import List, Optional
 import json
+from hashlib import md5
+from math import sqrt
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 try:
     import lancedb
@@ -13,10 +14,22 @@ from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
+from phi.vectordb.filters import Filters, Eq, In, And, Or, to_filter_expr
 from phi.utils.log import logger
 
 
 class LanceDb(VectorDb):
+    """Stores documents in a LanceDB table with a column for each field: the vector, the id (content hash of the
+    document), name, content, meta_data, extra_meta_data, usage (as json) and content_hash.
+
+    meta_data is a struct column with a typed field for each key of meta_data_fields, the other meta_data keys,
+    and values that do not have the type of their field, are stored as json in extra_meta_data.
+    Searches can filter on the name and the meta_data_fields, the filters are compiled to a where clause.
+
+    The table is opened, or created with the dimensions of the embedder, the first time it is used,
+    so creating a LanceDb does not change the table or call the embedder.
+    """
+
     def __init__(
         self,
         embedder: Embedder = OpenAIEmbedder(),
@@ -25,6 +38,16 @@ class LanceDb(VectorDb):
         uri: Optional[str] = "/tmp/lancedb",
         table_name: Optional[str] = "phi",
         nprobes: Optional[int] = 20,
+        # Number of IVF partitions and PQ sub-vectors of the vector index created by optimize(),
+        # defaults to sqrt(rows) partitions and dimensions / 16 sub-vectors
+        num_partitions: Optional[int] = None,
+        num_sub_vectors: Optional[int] = None,
+        # optimize() only creates the vector index once the table has this many rows, smaller tables are searched
+        # exactly
+        index_min_rows: int = 10_000,
+        # meta_data keys stored in a typed field of the meta_data column each, e.g. {"page": int, "source": str}.
+        # The types are str, int, float, bool or a pyarrow DataType.
+        meta_data_fields: Optional[Dict[str, Any]] = None,
         **kwargs,
     ):
         # Embedder for embedding the document contents
@@ -38,48 +61,91 @@ class LanceDb(VectorDb):
         self.uri = uri
         self.client = lancedb.connect(self.uri)
         self.nprobes = nprobes
+        self.num_partitions: Optional[int] = num_partitions
+        self.num_sub_vectors: Optional[int] = num_sub_vectors
+        self.index_min_rows: int = index_min_rows
+        self.meta_data_types: Dict[str, pa.DataType] = {
+            key: to_arrow_type(field_type) for key, field_type in (meta_data_fields or {}).items()
+        }
 
+        self._vector_col = "vector"
+        self._id = "id"
+        self._table: Optional[lancedb.db.LanceTable] = None
         if connection:
             if not isinstance(connection, lancedb.db.LanceTable):
                 raise ValueError(
                     "connection should be an instance of lancedb.db.LanceTable, ",
                     f"got {type(connection)}",
                 )
-            self.connection = connection
-            self.table_name = self.connection.name
-            self._vector_col = self.connection.schema.names[0]
-            self._id = self.tbl.schema.names[1]  # type: ignore
-
+            self._table = connection
+            self.table_name = connection.name
         else:
             self.table_name = table_name
-            self.connection = self._init_table()
 
         # Lancedb kwargs
         self.kwargs = kwargs
 
-    def create(self) -> lancedb.db.LanceTable:
-        return self._init_table()
+    @property
+    def connection(self) -> lancedb.db.LanceTable:
+        """The lancedb table, opened or created on first use"""
+        if self._table is None:
+            self._table = self.create()
+        return self._table
 
-    def _init_table(self) -> lancedb.db.LanceTable:
-        self._id = "id"
-        self._vector_col = "vector"
-        schema = pa.schema(
+    def get_schema(self) -> pa.Schema:
+        fields = [
+            pa.field(self._vector_col, pa.list_(pa.float32(), self.dimensions)),
+            pa.field(self._id, pa.string()),
+            pa.field("name", pa.string()),
+            pa.field("content", pa.string()),
+        ]
+        if len(self.meta_data_types) > 0:
+            meta_data_type = pa.struct([pa.field(key, value_type) for key, value_type in self.meta_data_types.items()])
+            fields.append(pa.field("meta_data", meta_data_type))
+        fields.extend(
             [
-                pa.field(
-                    self._vector_col,
-                    pa.list_(
-                        pa.float32(),
-                        len(self.embedder.get_embedding("test")),  # type: ignore
-                    ),
-                ),
-                pa.field(self._id, pa.string()),
-                pa.field("payload", pa.string()),
+                pa.field("extra_meta_data", pa.string()),
+                pa.field("usage", pa.string()),
+                pa.field("content_hash", pa.string()),
             ]
         )
+        return pa.schema(fields)
+
+    def create(self) -> lancedb.db.LanceTable:
+        """Opens the table, or creates it if it does not exist"""
+        if self._table is not None:
+            return self._table
+
+        if self.exists():
+            logger.debug(f"Opening table: {self.table_name}")
+            table = self.client.open_table(self.table_name)
+            if "payload" in table.schema.names:
+                # Earlier versions stored the documents in a json payload column and overwrote the table
+                # each time a LanceDb was created, so its rows are not kept
+                logger.warning(f"Table {self.table_name} was created by an earlier version of LanceDb, recreating it")
+            else:
+                schema = self.get_schema()
+                if table.schema.names != schema.names or (
+                    "meta_data" in schema.names
+                    and table.schema.field("meta_data").type != schema.field("meta_data").type
+                ):
+                    raise ValueError(
+                        f"Table {self.table_name} has the columns {table.schema}, expected {schema}. "
+                        "It was created with other meta_data_fields, load the documents to a new table_name, "
+                        "or call delete() to drop the table"
+                    )
+                dimensions = table.schema.field(self._vector_col).type.list_size
+                if dimensions != self.dimensions:
+                    raise ValueError(
+                        f"Table {self.table_name} has vectors of {dimensions} dimensions, "
+                        f"the embedder has {self.dimensions}"
+                    )
+                self._table = table
+                return table
 
         logger.info(f"Creating table: {self.table_name}")
-        tbl = self.client.create_table(self.table_name, schema=schema, mode="overwrite")
-        return tbl
+        self._table = self.client.create_table(self.table_name, schema=self.get_schema(), mode="overwrite")
+        return self._table
 
     def doc_exists(self, document: Document) -> bool:
         """
@@ -88,37 +154,103 @@ class LanceDb(VectorDb):
         Args:
             document (Document): Document to validate
         """
-        if self.client:
-            cleaned_content = document.content.replace("\x00", "\ufffd")
-            doc_id = md5(cleaned_content.encode()).hexdigest()
-            result = self.connection.search().where(f"{self._id}='{doc_id}'").to_arrow()
-            return len(result) > 0
-        return False
+        cleaned_content = document.content.replace("\x00", "\ufffd")
+        return len(self.existing_hashes([md5(cleaned_content.encode()).hexdigest()])) > 0
+
+    def existing_hashes(self, hashes: List[str], batch_size: int = 1000) -> Set[str]:
+        """
+        Returns the content hashes that exist in the table, using one filtered scan per batch of hashes,
+        which uses the scalar index on content_hash once optimize() has created it
+
+        Args:
+            hashes (List[str]): Content hashes to check
+            batch_size (int): Number of hashes per scan
+        """
+        existing: Set[str] = set()
+        if not self.exists():
+            return existing
+        for i in range(0, len(hashes), batch_size):
+            batch = hashes[i : i + batch_size]
+            result = (
+                self.connection.search()
+                .where(f"content_hash IN ({to_sql_list(batch)})")
+                .select(["content_hash"])
+                .limit(len(batch))
+                .to_arrow()
+            )
+            existing.update(result["content_hash"].to_pylist())
+        return existing
+
+    def name_exists(self, name: str) -> bool:
+        """
+        Validate if a document with this name exists or not
+
+        Args:
+            name (str): Name to check
+        """
+        if not self.exists():
+            return False
+        result = self.connection.search().where(f"name = {to_sql_value(name)}").select(["name"]).limit(1).to_arrow()
+        return result.num_rows > 0
+
+    def delete_by_content_hash(self, hashes: List[str], batch_size: int = 1000) -> int:
+        """
+        Deletes the rows with these content hashes, one delete per batch of hashes
+
+        Args:
+            hashes (List[str]): Content hashes to delete
+            batch_size (int): Number of hashes per delete
+        """
+        if not self.exists():
+            return 0
+        count = self.connection.count_rows()
+        for i in range(0, len(hashes), batch_size):
+            self.connection.delete(f"content_hash IN ({to_sql_list(hashes[i : i + batch_size])})")
+        return count - self.connection.count_rows()
 
     def insert(self, documents: List[Document]) -> None:
         logger.debug(f"Inserting {len(documents)} documents")
-        data = []
+        self.embed_documents(documents)
+        columns: Dict[str, List[Any]] = {name: [] for name in self.get_schema().names}
         for document in documents:
-            document.embed(embedder=self.embedder)
             cleaned_content = document.content.replace("\x00", "\ufffd")
-            doc_id = str(md5(cleaned_content.encode()).hexdigest())
-            payload = {
-                "name": document.name,
-                "meta_data": document.meta_data,
-                "content": cleaned_content,
-                "usage": document.usage,
-            }
-            data.append(
-                {
-                    "id": doc_id,
-                    "vector": document.embedding,
-                    "payload": json.dumps(payload),
-                }
-            )
-            logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+            content_hash = md5(cleaned_content.encode()).hexdigest()
+            columns[self._vector_col].append(document.embedding)
+            columns[self._id].append(content_hash)
+            columns["name"].append(document.name)
+            columns["content"].append(cleaned_content)
+            meta_data, extra_meta_data = self.split_meta_data(document.meta_data)
+            if "meta_data" in columns:
+                columns["meta_data"].append(meta_data)
+            columns["extra_meta_data"].append(json.dumps(extra_meta_data) if len(extra_meta_data) > 0 else None)
+            columns["usage"].append(json.dumps(document.usage) if document.usage is not None else None)
+            columns["content_hash"].append(content_hash)
+
+        self.connection.add(pa.Table.from_pydict(columns, schema=self.get_schema()))
+        logger.debug(f"Inserted {len(documents)} documents")
 
-        self.connection.add(data)
-        logger.debug(f"Upsert {len(data)} documents")
+    def split_meta_data(self, meta_data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Returns the values of the meta_data_fields, and the other keys and the values that do not have the type
+        of their field, which are stored as json
+        """
+        fields: Dict[str, Any] = {key: None for key in self.meta_data_types}
+        extra_meta_data: Dict[str, Any] = {}
+        for key, value in meta_data.items():
+            value_type = self.meta_data_types.get(key)
+            if value_type is not None and value is not None and has_arrow_type(value, value_type):
+                fields[key] = value
+            else:
+                extra_meta_data[key] = value
+        return fields, extra_meta_data
+
+    def get_meta_data(self, rows: Dict[str, List[Any]], i: int) -> Dict[str, Any]:
+        """Returns the meta_data of row i of a batch, from the fields of the meta_data column and extra_meta_data"""
+        meta_data: Dict[str, Any] = {}
+        if "meta_data" in rows and rows["meta_data"][i]:
+            meta_data.update((key, value) for key, value in rows["meta_data"][i].items() if value is not None)
+        if rows["extra_meta_data"][i]:
+            meta_data.update(json.loads(rows["extra_meta_data"][i]))
+        return meta_data
 
     def upsert(self, documents: List[Document]) -> None:
         """
@@ -130,65 +262,184 @@ class LanceDb(VectorDb):
         logger.debug("Redirecting the request to insert")
         self.insert(documents)
 
-    def search(self, query: str, limit: int = 5) -> List[Document]:
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
+        """Filters on the name and the meta_data_fields are compiled to a where clause applied before the vector search,
+        other filters raise a ValueError
+        """
+        if not self.exists():
+            return []
         query_embedding = self.embedder.get_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
 
-        results = (
-            self.connection.search(
-                query=query_embedding,
-                vector_column_name=self._vector_col,
-            )
+        where = get_where_clause(filters, self.meta_data_types) if filters is not None else None
+        search = (
+            self.connection.search(query=query_embedding, vector_column_name=self._vector_col)
+            .metric(self.get_metric())
             .limit(limit)
             .nprobes(self.nprobes)
-            .to_pandas()
         )
+        if where is not None:
+            search = search.where(where, prefilter=True)
+        columns = ["name", "content", "extra_meta_data", "usage"]
+        if len(self.meta_data_types) > 0:
+            columns.append("meta_data")
+        if return_embeddings:
+            columns.append(self._vector_col)
+        results = search.select(columns).to_arrow()
 
-        # Build search results
+        # Build search results from the columns of each batch
         search_results: List[Document] = []
-
         try:
-            for _, item in results.iterrows():
-                payload = json.loads(item["payload"])
-                search_results.append(
-                    Document(
-                        name=payload["name"],
-                        meta_data=payload["meta_data"],
-                        content=payload["content"],
-                        embedder=self.embedder,
-                        embedding=item["vector"],
-                        usage=payload["usage"],
+            for batch in results.to_batches():
+                rows = batch.to_pydict()
+                for i in range(batch.num_rows):
+                    search_results.append(
+                        Document(
+                            name=rows["name"][i],
+                            meta_data=self.get_meta_data(rows, i),
+                            content=rows["content"][i],
+                            embedder=self.embedder,
+                            embedding=rows[self._vector_col][i] if return_embeddings else None,
+                            usage=json.loads(rows["usage"][i]) if rows["usage"][i] else None,
+                        )
                     )
-                )
-
         except Exception as e:
             logger.error(f"Error building search results: {e}")
 
         return search_results
 
+    def get_metric(self) -> str:
+        if self.distance == Distance.l2:
+            return "L2"
+        if self.distance == Distance.max_inner_product:
+            return "dot"
+        return "cosine"
+
     def delete(self) -> None:
         if self.exists():
             logger.debug(f"Deleting collection: {self.table_name}")
-            self.client.drop(self.table_name)
+            self.client.drop_table(self.table_name)
+        self._table = None
 
     def exists(self) -> bool:
-        if self.client:
-            if self.table_name in self.client.table_names():
-                return True
-        return False
+        if self._table is not None:
+            return True
+        return self.table_name in self.client.table_names()
 
     def get_count(self) -> int:
         if self.exists():
-            return self.client.table(self.table_name).count_rows()
+            return self.connection.count_rows()
         return 0
 
     def optimize(self) -> None:
-        pass
+        """Creates a scalar index on content_hash, used to find existing documents, and an IVF_PQ vector index
+        once the table has index_min_rows rows. The indexes are replaced, so they include the rows added since.
+        """
+        if not self.exists():
+            return
+
+        logger.debug("==== Optimizing Vector DB ====")
+        logger.debug("Creating scalar index on content_hash")
+        self.connection.create_scalar_index("content_hash", replace=True)
+
+        count = self.get_count()
+        if count < self.index_min_rows:
+            logger.debug(f"Skipping vector index, {count} rows is below index_min_rows: {self.index_min_rows}")
+            return
+
+        num_partitions = self.num_partitions or max(1, int(sqrt(count)))
+        num_sub_vectors = self.num_sub_vectors or get_num_sub_vectors(self.dimensions)
+        logger.debug(
+            f"Creating IVF_PQ index with {num_partitions} partitions, {num_sub_vectors} sub-vectors "
+            f"and distance metric: {self.get_metric()}"
+        )
+        self.connection.create_index(
+            metric=self.get_metric(),
+            num_partitions=num_partitions,
+            num_sub_vectors=num_sub_vectors,
+            vector_column_name=self._vector_col,
+            replace=True,
+        )
+        logger.debug("==== Optimized Vector DB ====")
 
     def clear(self) -> bool:
+        if self.exists():
+            self.connection.delete("true")
+        return True
+
+
+def to_sql_value(value: Any) -> str:
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def to_sql_list(values: List[Any]) -> str:
+    return ", ".join(to_sql_value(value) for value in values)
+
+
+def to_arrow_type(field_type: Any) -> pa.DataType:
+    """Returns the arrow type of a meta_data field: str, int, float, bool or a pyarrow DataType"""
+    if isinstance(field_type, pa.DataType):
+        return field_type
+    arrow_types = {str: pa.string(), int: pa.int64(), float: pa.float64(), bool: pa.bool_()}
+    if field_type not in arrow_types:
+        raise ValueError(f"Unsupported meta_data field type: {field_type}, use str, int, float, bool or a pyarrow type")
+    return arrow_types[field_type]
+
+
+def has_arrow_type(value: Any, value_type: pa.DataType) -> bool:
+    """Returns True if the value can be stored in a field of this type"""
+    if isinstance(value, bool) and not pa.types.is_boolean(value_type):
+        return False
+    try:
+        pa.scalar(value, type=value_type)
+    except (pa.ArrowException, TypeError, ValueError, OverflowError):
         return False
+    return True
 
-    def name_exists(self, name: str) -> bool:
-        raise NotImplementedError
+
+def get_column(key: str, meta_data_keys: Iterable[str]) -> str:
+    """Returns the column of a filter key: the name, or the field of a meta_data key in the meta_data column"""
+    if key == "name":
+        return "name"
+    if key == "id":
+        raise ValueError("LanceDb can not filter on the document id, the id column is the content hash")
+    if key not in meta_data_keys:
+        raise ValueError(f"LanceDb can only filter on the meta_data_fields, add {key} to meta_data_fields")
+    return f"meta_data.{key}" if key.isidentifier() else "meta_data.`" + key.replace("`", "``") + "`"
+
+
+def get_where_clause(filters: Filters, meta_data_keys: Iterable[str] = ()) -> str:
+    """Compiles filters on the name and the meta_data_fields to a where clause"""
+    expr = to_filter_expr(filters)
+    if isinstance(expr, (And, Or)):
+        if len(expr.filters) == 0:
+            return "true" if isinstance(expr, And) else "false"
+        clauses = [get_where_clause(f, meta_data_keys) for f in expr.filters]
+        return "(" + (" AND " if isinstance(expr, And) else " OR ").join(clauses) + ")"
+    column = get_column(expr.key, meta_data_keys)
+    if isinstance(expr, Eq):
+        return f"{column} = {to_sql_value(expr.value)}"
+    if isinstance(expr, In):
+        return f"{column} IN ({to_sql_list(expr.values)})" if len(expr.values) > 0 else "false"
+    bounds = [f"{column} {op} {to_sql_value(value)}" for op, value in expr.get_bounds()]
+    return "(" + " AND ".join(bounds) + ")" if len(bounds) > 0 else f"{column} IS NOT NULL"
+
+
+def get_num_sub_vectors(dimensions: int) -> int:
+    """Returns dimensions / 16 sub-vectors, or the closest smaller divisor of dimensions"""
+    for num_sub_vectors in range(max(1, dimensions // 16), 0, -1):
+        if dimensions % num_sub_vectors == 0:
+            return num_sub_vectors
+    return 1
@@ -0,0 +1,2 @@
+from phi.vectordb.numpydb.index import Ivfflat
+from phi.vectordb.numpydb.numpydb import NumpyDb
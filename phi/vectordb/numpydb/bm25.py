@@ -0,0 +1,61 @@
+import re
+from math import log
+from typing import Dict, List
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("`numpy` not installed")
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words, numbers and identifiers. "ERR-4012" becomes ["err", "4012"]."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class BM25Index:
+    """An in-memory inverted index that scores rows with Okapi BM25."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1: float = k1
+        self.b: float = b
+        # Rows and term frequencies of each term
+        self.postings: Dict[str, Dict[int, int]] = {}
+        self.lengths: List[int] = []
+        self.total_length: int = 0
+
+    @property
+    def num_rows(self) -> int:
+        return len(self.lengths)
+
+    def add(self, row: int, text: str) -> None:
+        """Indexes the text of a row. Rows must be added in order."""
+        if row != self.num_rows:
+            raise ValueError(f"Expected row {self.num_rows}, got {row}")
+        tokens = tokenize(text)
+        for token in tokens:
+            postings = self.postings.setdefault(token, {})
+            postings[row] = postings.get(row, 0) + 1
+        self.lengths.append(len(tokens))
+        self.total_length += len(tokens)
+
+    def get_scores(self, query: str) -> np.ndarray:
+        """Returns the BM25 score of every row, 0 for rows without any query term."""
+        scores = np.zeros(self.num_rows, dtype=np.float32)
+        if self.num_rows == 0:
+            return scores
+
+        lengths = np.asarray(self.lengths, dtype=np.float32)
+        average_length = self.total_length / self.num_rows or 1
+        for token in set(tokenize(query)):
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+            idf = log(1 + (self.num_rows - len(postings) + 0.5) / (len(postings) + 0.5))
+            rows = np.fromiter(postings.keys(), dtype=np.int64, count=len(postings))
+            frequencies = np.fromiter(postings.values(), dtype=np.float32, count=len(postings))
+            norm = self.k1 * (1 - self.b + self.b * lengths[rows] / average_length)
+            scores[rows] += idf * frequencies * (self.k1 + 1) / (frequencies + norm)
+        return scores
@@ -0,0 +1,197 @@
+import json
+import os
+from math import sqrt
+from pathlib import Path
+from typing import Callable, List, Optional
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("`numpy` not installed")
+
+from pydantic import BaseModel
+
+from phi.vectordb.distance import Distance
+from phi.utils.log import logger
+
+
+class Ivfflat(BaseModel):
+    lists: int = 100
+    probes: int = 10
+    dynamic_lists: bool = True
+    # Number of rows sampled to train the list centroids
+    sample_size: int = 50_000
+    # Number of k-means iterations
+    max_iterations: int = 10
+    seed: int = 0
+
+    def get_num_lists(self, num_rows: int) -> int:
+        """Same rule as the pgvector ivfflat index: rows / 1000 up to 1M rows, sqrt(rows) after."""
+        num_lists = self.lists
+        if self.dynamic_lists:
+            num_lists = int(num_rows / 1000) if num_rows <= 1_000_000 else int(sqrt(num_rows))
+        return max(1, min(num_lists, num_rows))
+
+
+class IvfIndex:
+    """An inverted file index: rows are grouped in lists by their nearest centroid,
+    and a search only scores the rows in the lists nearest to the query.
+
+    Files are stored next to the collection:
+        - ivf_centroids.npy: One centroid per list.
+        - ivf_rows.npy: Row numbers grouped by list, memory-mapped on load.
+        - ivf_offsets.npy: Where each list starts in ivf_rows.npy.
+        - ivf.json: The number of rows in ivf_rows.npy. Rows added after the index was built
+            are assigned to lists in memory, and again when the index is loaded.
+    """
+
+    def __init__(self, path: Path, distance: Distance):
+        self.path: Path = path
+        self.distance: Distance = distance
+        self.centroids: Optional[np.ndarray] = None
+        self.rows: Optional[np.ndarray] = None
+        self.offsets: Optional[np.ndarray] = None
+        # Number of rows in self.rows
+        self.num_indexed: int = 0
+        # Rows added since the index was built, per list
+        self.added: List[List[int]] = []
+
+    @property
+    def centroids_file(self) -> Path:
+        return self.path.joinpath("ivf_centroids.npy")
+
+    @property
+    def rows_file(self) -> Path:
+        return self.path.joinpath("ivf_rows.npy")
+
+    @property
+    def offsets_file(self) -> Path:
+        return self.path.joinpath("ivf_offsets.npy")
+
+    @property
+    def index_file(self) -> Path:
+        return self.path.joinpath("ivf.json")
+
+    @property
+    def num_lists(self) -> int:
+        return 0 if self.centroids is None else self.centroids.shape[0]
+
+    def exists(self) -> bool:
+        return self.index_file.exists()
+
+    def is_built(self) -> bool:
+        return self.centroids is not None
+
+    def assign(self, vectors: np.ndarray) -> np.ndarray:
+        """Returns the nearest list of each vector."""
+        assert self.centroids is not None
+        return np.argmax(self.get_centroid_scores(vectors), axis=1)
+
+    def get_centroid_scores(self, vectors: np.ndarray) -> np.ndarray:
+        """Returns a score per vector and centroid, higher is closer."""
+        assert self.centroids is not None
+        scores = vectors @ self.centroids.T
+        if self.distance == Distance.l2:
+            scores = 2 * scores - np.einsum("ij,ij->i", self.centroids, self.centroids)
+        return scores
+
+    def build(
+        self,
+        get_vectors: Callable[[np.ndarray], np.ndarray],
+        live_rows: np.ndarray,
+        config: Ivfflat,
+        chunk_size: int = 8192,
+    ) -> None:
+        """Trains the centroids with k-means on a sample of the rows, then assigns every row to a list.
+
+        Args:
+            get_vectors (Callable): Returns the float32 vectors of an array of row numbers.
+            live_rows (np.ndarray): The row numbers to index.
+            config (Ivfflat): The index configuration.
+            chunk_size (int): Number of rows assigned at a time.
+        """
+        if len(live_rows) == 0:
+            self.delete()
+            return
+
+        num_lists = config.get_num_lists(len(live_rows))
+        rng = np.random.default_rng(config.seed)
+        sample_rows = live_rows
+        if len(live_rows) > max(config.sample_size, num_lists):
+            sample_rows = np.sort(rng.choice(live_rows, size=max(config.sample_size, num_lists), replace=False))
+        sample = get_vectors(sample_rows)
+        logger.debug(f"Training {num_lists} lists on {len(sample)} rows")
+
+        self.centroids = sample[rng.choice(len(sample), size=num_lists, replace=False)].copy()
+        for _ in range(config.max_iterations):
+            assignments = self.assign(sample)
+            counts = np.bincount(assignments, minlength=num_lists)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, assignments, sample)
+            non_empty = counts > 0
+            self.centroids[non_empty] = sums[non_empty] / counts[non_empty, None]
+            if self.distance == Distance.cosine:
+                norms = np.linalg.norm(self.centroids, axis=1, keepdims=True)
+                self.centroids /= np.where(norms == 0, 1, norms)
+
+        assignments = np.empty(len(live_rows), dtype=np.int64)
+        for start in range(0, len(live_rows), chunk_size):
+            end = min(start + chunk_size, len(live_rows))
+            assignments[start:end] = self.assign(get_vectors(live_rows[start:end]))
+        order = np.argsort(assignments, kind="stable")
+        self.rows = live_rows[order].astype(np.int64)
+        self.offsets = np.zeros(num_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assignments, minlength=num_lists), out=self.offsets[1:])
+        self.num_indexed = int(live_rows.max()) + 1
+        self.added = [[] for _ in range(num_lists)]
+        self.save()
+
+    def add(self, rows: np.ndarray, vectors: np.ndarray) -> None:
+        """Assigns rows added after the index was built to their nearest lists."""
+        for row, list_number in zip(rows.tolist(), self.assign(vectors).tolist()):
+            self.added[list_number].append(row)
+
+    def get_candidates(self, query: np.ndarray, probes: int) -> np.ndarray:
+        """Returns the sorted row numbers in the probes lists nearest to the query."""
+        assert self.centroids is not None and self.rows is not None and self.offsets is not None
+        probes = min(probes, self.num_lists)
+        scores = self.get_centroid_scores(query[None, :])[0]
+        nearest = np.argpartition(-scores, probes - 1)[:probes]
+        parts = [self.rows[self.offsets[i] : self.offsets[i + 1]] for i in nearest]
+        parts.extend(np.asarray(self.added[i], dtype=np.int64) for i in nearest if len(self.added[i]) > 0)
+        return np.sort(np.concatenate(parts))
+
+    def save(self) -> None:
+        assert self.centroids is not None and self.rows is not None and self.offsets is not None
+        for file, array in (
+            (self.centroids_file, self.centroids),
+            (self.rows_file, self.rows),
+            (self.offsets_file, self.offsets),
+        ):
+            tmp_file = file.with_suffix(".tmp.npy")
+            np.save(tmp_file, array)
+            os.replace(tmp_file, file)
+        self.index_file.write_text(json.dumps({"lists": self.num_lists, "num_indexed": self.num_indexed}))
+        self.rows = np.load(self.rows_file, mmap_mode="r")
+
+    def load(self, get_vectors: Callable[[np.ndarray], np.ndarray], count: int, chunk_size: int = 8192) -> None:
+        """Loads the index and assigns the rows added after it was built."""
+        index = json.loads(self.index_file.read_text())
+        self.centroids = np.load(self.centroids_file)
+        self.rows = np.load(self.rows_file, mmap_mode="r")
+        self.offsets = np.load(self.offsets_file)
+        self.num_indexed = min(index["num_indexed"], count)
+        self.added = [[] for _ in range(self.num_lists)]
+        for start in range(self.num_indexed, count, chunk_size):
+            rows = np.arange(start, min(start + chunk_size, count))
+            self.add(rows, get_vectors(rows))
+
+    def delete(self) -> None:
+        for file in (self.index_file, self.centroids_file, self.rows_file, self.offsets_file):
+            if file.exists():
+                file.unlink()
+        self.centroids = None
+        self.rows = None
+        self.offsets = None
+        self.num_indexed = 0
+        self.added = []
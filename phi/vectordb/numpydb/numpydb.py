@@ -0,0 +1,683 @@
+import json
+import os
+import shutil
+from hashlib import md5
+from pathlib import Path
+from threading import RLock
+from typing import Optional, List, Dict, Any, Set, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    raise ImportError("`numpy` not installed")
+
+from phi.document import Document
+from phi.embedder import Embedder
+from phi.vectordb.base import VectorDb
+from phi.vectordb.distance import Distance
+from phi.vectordb.filters import Filters, matches, to_filter_expr
+from phi.vectordb.numpydb.bm25 import BM25Index
+from phi.vectordb.numpydb.index import Ivfflat, IvfIndex
+from phi.utils.log import logger
+
+# Number of rows scored at a time, bounds the memory used to convert float16/int8 rows to float32
+SEARCH_CHUNK_SIZE = 8192
+MIN_CAPACITY = 1024
+
+
+class NumpyDb(VectorDb):
+    def __init__(
+        self,
+        collection: str,
+        path: str = "tmp/numpydb",
+        embedder: Optional[Embedder] = None,
+        distance: Distance = Distance.cosine,
+        dtype: str = "float32",
+        index: Optional[Ivfflat] = None,
+    ):
+        """
+        This class provides an embedded vector db that stores embeddings in a memory-mapped .npy matrix
+        and documents in a sidecar JSON lines file. It needs no service and no dependency other than numpy.
+
+        Files are stored in {path}/{collection}/:
+            - embeddings.npy: The embedding matrix, one row per document.
+            - scales.npy: Per-row scales when dtype is int8.
+            - tombstones.npy: Rows deleted since the last compaction.
+            - documents.jsonl: The documents, one line per row.
+            - collection.json: Dimensions, dtype, distance and row count.
+            - ivf_*.npy, ivf.json: The IVF index, when one is configured and built by optimize().
+
+        Args:
+            collection (str): The name of the collection.
+            path (str): The directory to store collections in. Defaults to "tmp/numpydb".
+            embedder (Optional[Embedder]): The embedder to use. Defaults to OpenAIEmbedder.
+            distance (Distance): The distance metric. Defaults to Distance.cosine.
+            dtype (str): How embeddings are stored: "float32", "float16" (half the size) or
+                "int8" (a quarter of the size, scaled per row). Defaults to "float32".
+            index (Optional[Ivfflat]): An IVF index to build in optimize(). Searches then score only the rows
+                in the index.probes lists nearest to the query. Defaults to None, which scores every row.
+        """
+        if dtype not in ("float32", "float16", "int8"):
+            raise ValueError(f"Unsupported dtype: {dtype}, use float32, float16 or int8")
+
+        # Collection attributes
+        self.collection: str = collection
+        self.path: Path = Path(path).joinpath(collection)
+
+        # Embedder for embedding the document contents
+        _embedder = embedder
+        if _embedder is None:
+            from phi.embedder.openai import OpenAIEmbedder
+
+            _embedder = OpenAIEmbedder()
+        self.embedder: Embedder = _embedder
+        self.dimensions: int = self.embedder.dimensions
+
+        # Distance metric
+        self.distance: Distance = distance
+        # Storage type of the embedding matrix
+        self.dtype: str = dtype
+        # Approximate nearest neighbour index
+        self.index: Optional[Ivfflat] = index
+
+        self._lock = RLock()
+        self._loaded: bool = False
+        self._count: int = 0
+        self._embeddings: Optional[np.memmap] = None
+        self._scales: Optional[np.memmap] = None
+        self._tombstones: Optional[np.memmap] = None
+        # Squared norm of each row, used for l2 distance
+        self._norms: np.ndarray = np.zeros(0, dtype=np.float32)
+        # Columns kept in memory for lookups and filters, the content is read from documents.jsonl when returned
+        self._ids: List[str] = []
+        self._names: List[Optional[str]] = []
+        self._content_hashes: List[str] = []
+        self._meta_data: List[Dict[str, Any]] = []
+        self._offsets: List[int] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._hash_counts: Dict[str, int] = {}
+        self._ivf: IvfIndex = IvfIndex(path=self.path, distance=distance)
+        # Keyword index, built on the first keyword search
+        self._bm25: Optional[BM25Index] = None
+
+    @property
+    def embeddings_file(self) -> Path:
+        return self.path.joinpath("embeddings.npy")
+
+    @property
+    def scales_file(self) -> Path:
+        return self.path.joinpath("scales.npy")
+
+    @property
+    def tombstones_file(self) -> Path:
+        return self.path.joinpath("tombstones.npy")
+
+    @property
+    def documents_file(self) -> Path:
+        return self.path.joinpath("documents.jsonl")
+
+    @property
+    def collection_file(self) -> Path:
+        return self.path.joinpath("collection.json")
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self._embeddings is None else self._embeddings.shape[0]
+
+    def exists(self) -> bool:
+        return self.collection_file.exists()
+
+    def create(self) -> None:
+        with self._lock:
+            if not self.exists():
+                logger.debug(f"Creating collection: {self.collection}")
+                self.path.mkdir(parents=True, exist_ok=True)
+                self.documents_file.touch()
+                self._allocate(MIN_CAPACITY)
+                self._write_collection_file()
+            self._load()
+
+    def _write_collection_file(self) -> None:
+        collection = {
+            "dimensions": self.dimensions,
+            "dtype": self.dtype,
+            "distance": self.distance.value,
+            "count": self._count,
+        }
+        tmp_file = self.collection_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(collection))
+        os.replace(tmp_file, self.collection_file)
+
+    def _allocate(self, capacity: int) -> None:
+        """Creates the memory-mapped files with room for capacity rows, keeping the existing rows."""
+        files: List[Tuple[Path, Tuple[int, ...], Any, Optional[np.ndarray]]] = [
+            (self.embeddings_file, (capacity, self.dimensions), self.dtype, self._embeddings),
+            (self.tombstones_file, (capacity,), np.bool_, self._tombstones),
+        ]
+        if self.dtype == "int8":
+            files.append((self.scales_file, (capacity,), np.float32, self._scales))
+
+        arrays = []
+        for file, shape, dtype, current in files:
+            tmp_file = file.with_suffix(".tmp.npy")
+            array = np.lib.format.open_memmap(tmp_file, mode="w+", dtype=dtype, shape=shape)
+            if current is not None and self._count > 0:
+                array[: self._count] = current[: self._count]
+            array.flush()
+            del array
+            os.replace(tmp_file, file)
+            arrays.append(np.load(file, mmap_mode="r+"))
+
+        self._embeddings = arrays[0]
+        self._tombstones = arrays[1]
+        self._scales = arrays[2] if self.dtype == "int8" else None
+        norms = np.zeros(capacity, dtype=np.float32)
+        norms[: self._count] = self._norms[: self._count]
+        self._norms = norms
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+
+        collection = json.loads(self.collection_file.read_text())
+        if collection["dimensions"] != self.dimensions or collection["dtype"] != self.dtype:
+            raise ValueError(
+                f"Collection {self.collection} stores {collection['dimensions']} {collection['dtype']} dimensions, "
+                f"got {self.dimensions} {self.dtype}"
+            )
+        self._embeddings = np.load(self.embeddings_file, mmap_mode="r+")
+        self._tombstones = np.load(self.tombstones_file, mmap_mode="r+")
+        self._scales = np.load(self.scales_file, mmap_mode="r+") if self.dtype == "int8" else None
+        count = min(collection["count"], self.capacity)
+
+        # Read the document columns, ignoring rows written after the last saved count
+        offset = 0
+        with self.documents_file.open("rb") as f:
+            for line in f:
+                if len(self._ids) >= count:
+                    break
+                row = json.loads(line)
+                self._add_columns(row, offset)
+                offset += len(line)
+        if self.documents_file.stat().st_size > offset:
+            with self.documents_file.open("r+b") as f:
+                f.truncate(offset)
+        self._count = len(self._ids)
+
+        self._norms = np.zeros(self.capacity, dtype=np.float32)
+        for start in range(0, self._count, SEARCH_CHUNK_SIZE):
+            end = min(start + SEARCH_CHUNK_SIZE, self._count)
+            vectors = self._get_vectors(start, end)
+            self._norms[start:end] = np.einsum("ij,ij->i", vectors, vectors)
+        if self._ivf.exists():
+            self._ivf.load(get_vectors=self._get_row_vectors, count=self._count)
+        self._loaded = True
+        logger.debug(f"Loaded {self._count} rows from {self.path}")
+
+    def _add_columns(self, row: Dict[str, Any], offset: int) -> None:
+        row_number = len(self._ids)
+        self._ids.append(row["id"])
+        self._names.append(row.get("name"))
+        self._content_hashes.append(row["content_hash"])
+        self._meta_data.append(row.get("meta_data") or {})
+        self._offsets.append(offset)
+        if self._tombstones is not None and not self._tombstones[row_number]:
+            self._id_to_row[row["id"]] = row_number
+            self._hash_counts[row["content_hash"]] = self._hash_counts.get(row["content_hash"], 0) + 1
+
+    def _get_vectors(self, start: int, end: int) -> np.ndarray:
+        """Returns rows start:end as float32."""
+        assert self._embeddings is not None
+        vectors = self._embeddings[start:end].astype(np.float32)
+        if self._scales is not None:
+            vectors *= self._scales[start:end, None]
+        return vectors
+
+    def _get_row_vectors(self, rows: np.ndarray) -> np.ndarray:
+        """Returns the rows with these row numbers as float32."""
+        assert self._embeddings is not None
+        vectors = self._embeddings[rows].astype(np.float32)
+        if self._scales is not None:
+            vectors *= self._scales[rows, None]
+        return vectors
+
+    def _get_row(self, document: Document) -> Dict[str, Any]:
+        cleaned_content = document.content.replace("\x00", "�")
+        content_hash = md5(cleaned_content.encode()).hexdigest()
+        return {
+            "id": document.id or content_hash,
+            "name": document.name,
+            "meta_data": document.meta_data,
+            "content": cleaned_content,
+            "usage": document.usage,
+            "content_hash": content_hash,
+        }
+
+    def doc_exists(self, document: Document) -> bool:
+        """
+        Validating if the document exists or not
+
+        Args:
+            document (Document): Document to validate
+        """
+        return len(self.existing_hashes([self._get_row(document)["content_hash"]])) > 0
+
+    def existing_hashes(self, hashes: List[str]) -> Set[str]:
+        """
+        Returns the content hashes of the documents in the collection
+
+        Args:
+            hashes (List[str]): Content hashes to check
+        """
+        self.create()
+        return {content_hash for content_hash in hashes if self._hash_counts.get(content_hash, 0) > 0}
+
+    def name_exists(self, name: str) -> bool:
+        """
+        Validate if a document with this name exists or not
+
+        Args:
+            name (str): Name to check
+        """
+        self.create()
+        assert self._tombstones is not None
+        with self._lock:
+            return any(row_name == name and not self._tombstones[row] for row, row_name in enumerate(self._names))
+
+    def insert(self, documents: List[Document], batch_size: int = 10_000) -> None:
+        """
+        Append documents to the collection.
+
+        Args:
+            documents (List[Document]): List of documents to insert
+            batch_size (int): Number of documents embedded and written at a time
+        """
+        self.create()
+        for i in range(0, len(documents), batch_size):
+            batch = documents[i : i + batch_size]
+            self.embed_documents(batch)
+            self._append(batch)
+            logger.debug(f"Inserted {len(batch)} documents")
+
+    def upsert_available(self) -> bool:
+        return True
+
+    def upsert(self, documents: List[Document], batch_size: int = 10_000) -> None:
+        """
+        Insert documents, replacing the documents with the same id.
+
+        Args:
+            documents (List[Document]): List of documents to upsert
+            batch_size (int): Number of documents embedded and written at a time
+        """
+        self.create()
+        for i in range(0, len(documents), batch_size):
+            batch = documents[i : i + batch_size]
+            self.embed_documents(batch)
+            with self._lock:
+                self._delete_rows(
+                    [self._id_to_row[row["id"]] for row in map(self._get_row, batch) if row["id"] in self._id_to_row]
+                )
+                self._append(batch)
+            logger.debug(f"Upserted {len(batch)} documents")
+
+    def _append(self, documents: List[Document]) -> None:
+        vectors = np.asarray([document.embedding for document in documents], dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != self.dimensions:
+            raise ValueError(f"Expected embeddings with {self.dimensions} dimensions, got {vectors.shape}")
+        if self.distance == Distance.cosine:
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors /= np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            start = self._count
+            end = start + len(documents)
+            if end > self.capacity:
+                self._allocate(max(MIN_CAPACITY, 2 * end))
+            assert self._embeddings is not None and self._tombstones is not None
+
+            # Write the documents, then the embeddings, then the count, so a crash never exposes a partial row
+            rows = [self._get_row(document) for document in documents]
+            offset = self.documents_file.stat().st_size
+            offsets = []
+            with self.documents_file.open("ab") as f:
+                for row in rows:
+                    line = json.dumps(row, ensure_ascii=False).encode() + b"\n"
+                    f.write(line)
+                    offsets.append(offset)
+                    offset += len(line)
+
+            if self._scales is not None:
+                scales = np.abs(vectors).max(axis=1) / 127
+                scales[scales == 0] = 1
+                self._embeddings[start:end] = np.round(vectors / scales[:, None]).astype(np.int8)
+                self._scales[start:end] = scales
+                self._scales.flush()
+            else:
+                self._embeddings[start:end] = vectors
+            self._tombstones[start:end] = False
+            self._embeddings.flush()
+            self._tombstones.flush()
+            stored = self._get_vectors(start, end)
+            self._norms[start:end] = np.einsum("ij,ij->i", stored, stored)
+            if self._ivf.is_built():
+                self._ivf.add(np.arange(start, end), stored)
+            if self._bm25 is not None:
+                for row_number, row in enumerate(rows, start=start):
+                    self._bm25.add(row_number, row["content"])
+
+            for row, row_offset in zip(rows, offsets):
+                self._add_columns(row, row_offset)
+            self._count = end
+            self._write_collection_file()
+
+    def _delete_rows(self, rows: List[int]) -> None:
+        if len(rows) == 0:
+            return
+        assert self._tombstones is not None
+        with self._lock:
+            for row in rows:
+                if self._tombstones[row]:
+                    continue
+                self._tombstones[row] = True
+                # A row inserted later with the same id keeps the id
+                if self._id_to_row.get(self._ids[row]) == row:
+                    del self._id_to_row[self._ids[row]]
+                self._hash_counts[self._content_hashes[row]] -= 1
+            self._tombstones.flush()
+
+    def delete_by_id(self, ids: List[str]) -> int:
+        """Marks the documents with these ids as deleted. Space is reclaimed by optimize().
+        Returns the number of documents deleted.
+        """
+        self.create()
+        with self._lock:
+            rows = [self._id_to_row[_id] for _id in ids if _id in self._id_to_row]
+            self._delete_rows(rows)
+        return len(rows)
+
+    def delete_by_name(self, name: str) -> int:
+        """Marks the documents with this name as deleted. Space is reclaimed by optimize().
+        Returns the number of documents deleted.
+        """
+        self.create()
+        with self._lock:
+            rows = [row for row in self._id_to_row.values() if self._names[row] == name]
+            self._delete_rows(rows)
+        return len(rows)
+
+    def delete_by_content_hash(self, hashes: List[str]) -> int:
+        """Marks the documents with these content hashes as deleted. Space is reclaimed by optimize().
+        Returns the number of documents deleted.
+        """
+        self.create()
+        assert self._tombstones is not None
+        hash_set = set(hashes)
+        with self._lock:
+            # Rows are scanned rather than ids, as documents inserted with the id of another document keep both rows
+            rows = [
+                row
+                for row, content_hash in enumerate(self._content_hashes)
+                if content_hash in hash_set and not self._tombstones[row]
+            ]
+            self._delete_rows(rows)
+        return len(rows)
+
+    def get_filter_mask(self, filters: Filters, count: int) -> np.ndarray:
+        """Returns a boolean mask of the first count rows matching the filters.
+        The keys "id" and "name" match those columns, other keys match values in meta_data.
+        """
+        expr = to_filter_expr(filters)
+        return np.fromiter(
+            (
+                matches(expr, {"id": _id, "name": name, "meta_data": meta_data})
+                for _id, name, meta_data in zip(self._ids[:count], self._names[:count], self._meta_data[:count])
+            ),
+            dtype=bool,
+            count=count,
+        )
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
+        query_embedding = self.embedder.get_embedding(query)
+        if query_embedding is None:
+            logger.error(f"Error getting embedding for Query: {query}")
+            return []
+        return self.search_by_embedding(
+            query_embedding, limit=limit, filters=filters, return_embeddings=return_embeddings
+        )
+
+    def search_by_embedding(
+        self,
+        query_embedding: List[float],
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
+        self.create()
+        with self._lock:
+            count = self._count
+            if count == 0:
+                return []
+            query = np.asarray(query_embedding, dtype=np.float32)
+            rows: Optional[np.ndarray] = None
+            if self._ivf.is_built():
+                probes = self.index.probes if self.index is not None else Ivfflat().probes
+                rows = self._ivf.get_candidates(query, probes=probes)
+                if len(rows) == 0:
+                    return []
+            scores = self.get_scores(query, count, rows=rows)
+            assert self._tombstones is not None
+            scores[self._tombstones[:count] if rows is None else self._tombstones[rows]] = -np.inf
+            if filters:
+                mask = self.get_filter_mask(filters, count)
+                scores[~mask if rows is None else ~mask[rows]] = -np.inf
+
+            return self._get_top_documents(scores, limit, rows=rows, return_embeddings=return_embeddings)
+
+    def keyword_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
+        """Returns the documents that best match the words in the query, ranked with BM25.
+        The inverted index is built from documents.jsonl on the first keyword search and then kept in memory.
+        """
+        self.create()
+        with self._lock:
+            count = self._count
+            if count == 0:
+                return []
+            scores = self._get_bm25_index().get_scores(query)
+            assert self._tombstones is not None
+            scores[scores <= 0] = -np.inf
+            scores[self._tombstones[:count]] = -np.inf
+            if filters:
+                scores[~self.get_filter_mask(filters, count)] = -np.inf
+            return self._get_top_documents(scores, limit, return_embeddings=return_embeddings)
+
+    def _get_bm25_index(self) -> BM25Index:
+        if self._bm25 is None:
+            logger.debug(f"Building keyword index on {self._count} rows")
+            bm25 = BM25Index()
+            with self.documents_file.open("rb") as f:
+                for row_number, line in enumerate(f):
+                    if row_number >= self._count:
+                        break
+                    bm25.add(row_number, json.loads(line)["content"])
+            self._bm25 = bm25
+        return self._bm25
+
+    def _get_top_documents(
+        self, scores: np.ndarray, limit: int, rows: Optional[np.ndarray] = None, return_embeddings: bool = False
+    ) -> List[Document]:
+        """Returns the documents with the highest finite scores. scores[i] is the score of rows[i] if rows is given."""
+        # Top k without sorting all rows
+        k = min(limit, len(scores))
+        if k <= 0:
+            return []
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        top = top[np.isfinite(scores[top])]
+        if rows is not None:
+            top = rows[top]
+        return [self._get_document(int(row), return_embeddings=return_embeddings) for row in top]
+
+    def get_scores(self, query: np.ndarray, count: int, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Returns a score per row, higher is closer. Scores the first count rows, or only these rows if given."""
+        if self.distance == Distance.cosine:
+            query_norm = np.linalg.norm(query)
+            query = query / (query_norm if query_norm > 0 else 1)
+
+        assert self._embeddings is not None
+        if rows is not None:
+            scores = np.empty(len(rows), dtype=np.float32)
+            for start in range(0, len(rows), SEARCH_CHUNK_SIZE):
+                chunk = rows[start : start + SEARCH_CHUNK_SIZE]
+                scores[start : start + len(chunk)] = self._get_row_vectors(chunk) @ query
+            if self.distance == Distance.l2:
+                scores = 2 * scores - self._norms[rows]
+            return scores
+
+        scores = np.empty(count, dtype=np.float32)
+        for start in range(0, count, SEARCH_CHUNK_SIZE):
+            end = min(start + SEARCH_CHUNK_SIZE, count)
+            if self.dtype == "float32":
+                scores[start:end] = self._embeddings[start:end] @ query
+            else:
+                # Scale the dot products instead of the rows, one multiply per row instead of per value
+                scores[start:end] = self._embeddings[start:end].astype(np.float32) @ query
+                if self._scales is not None:
+                    scores[start:end] *= self._scales[start:end]
+
+        if self.distance == Distance.l2:
+            # |x - q|^2 = |x|^2 - 2 x.q + |q|^2, the last term is the same for all rows
+            scores = 2 * scores - self._norms[:count]
+        return scores
+
+    def _get_document(self, row: int, return_embeddings: bool = False) -> Document:
+        with self.documents_file.open("rb") as f:
+            f.seek(self._offsets[row])
+            data = json.loads(f.readline())
+        return Document(
+            id=data["id"],
+            name=data.get("name"),
+            meta_data=data.get("meta_data") or {},
+            content=data["content"],
+            embedder=self.embedder,
+            embedding=self._get_vectors(row, row + 1)[0].tolist() if return_embeddings else None,
+            usage=data.get("usage"),
+        )
+
+    def get_count(self) -> int:
+        if not self.exists():
+            return 0
+        self.create()
+        return len(self._id_to_row)
+
+    def optimize(self) -> None:
+        """Compacts the collection and builds the index, if one is configured."""
+        if not self.exists():
+            return
+        self.create()
+        with self._lock:
+            compacted = self.compact()
+            if self.index is not None and (compacted or not self._ivf.is_built()):
+                self.build_index()
+
+    def build_index(self) -> None:
+        """Builds the IVF index over the rows in the collection, replacing the existing index."""
+        self.create()
+        with self._lock:
+            assert self._tombstones is not None
+            live = np.flatnonzero(~self._tombstones[: self._count])
+            logger.debug(f"Building IVF index on {len(live)} rows")
+            self._ivf.build(get_vectors=self._get_row_vectors, live_rows=live, config=self.index or Ivfflat())
+
+    def compact(self) -> bool:
+        """Removes the rows of deleted documents. Returns True if rows were removed.
+        Row numbers change, so an existing index is deleted.
+        """
+        self.create()
+        with self._lock:
+            assert self._tombstones is not None
+            live = np.flatnonzero(~self._tombstones[: self._count])
+            if len(live) == self._count:
+                return False
+
+            self._ivf.delete()
+            self._bm25 = None
+            logger.debug(f"Compacting {self.collection}: {self._count} -> {len(live)} rows")
+            embeddings = self._embeddings
+            scales = self._scales
+            norms = self._norms
+            offsets = self._offsets
+            tmp_documents_file = self.documents_file.with_suffix(".tmp")
+            with self.documents_file.open("rb") as src, tmp_documents_file.open("wb") as dst:
+                for row in live:
+                    src.seek(offsets[row])
+                    dst.write(src.readline())
+
+            # Rebuild the files and columns from the live rows
+            self._reset_columns()
+            self._embeddings = None
+            self._tombstones = None
+            self._scales = None
+            self._allocate(max(MIN_CAPACITY, 2 * len(live)))
+            assert self._embeddings is not None
+            for start in range(0, len(live), SEARCH_CHUNK_SIZE):
+                rows = live[start : start + SEARCH_CHUNK_SIZE]
+                self._embeddings[start : start + len(rows)] = embeddings[rows]  # type: ignore
+                if self._scales is not None and scales is not None:
+                    self._scales[start : start + len(rows)] = scales[rows]
+            self._norms[: len(live)] = norms[live]
+            self._embeddings.flush()
+            if self._scales is not None:
+                self._scales.flush()
+            del embeddings, scales
+
+            os.replace(tmp_documents_file, self.documents_file)
+            offset = 0
+            with self.documents_file.open("rb") as f:
+                for line in f:
+                    self._add_columns(json.loads(line), offset)
+                    offset += len(line)
+            self._count = len(live)
+            self._write_collection_file()
+            return True
+
+    def _reset_columns(self) -> None:
+        self._count = 0
+        self._ids = []
+        self._names = []
+        self._content_hashes = []
+        self._meta_data = []
+        self._offsets = []
+        self._id_to_row = {}
+        self._hash_counts = {}
+
+    def delete(self) -> None:
+        with self._lock:
+            if self.path.exists():
+                logger.debug(f"Deleting collection: {self.collection}")
+                shutil.rmtree(self.path)
+            self._embeddings = None
+            self._tombstones = None
+            self._scales = None
+            self._norms = np.zeros(0, dtype=np.float32)
+            self._ivf.delete()
+            self._bm25 = None
+            self._reset_columns()
+            self._loaded = False
+
+    def clear(self) -> bool:
+        self.delete()
+        self.create()
+        return True
@@ -0,0 +1,93 @@
+import json
+from io import StringIO
+from typing import Any, Dict, List
+
+try:
+    from sqlalchemy.engine import Engine
+    from sqlalchemy.schema import Table
+except ImportError:
+    raise ImportError("`sqlalchemy` not installed")
+
+from phi.utils.log import logger
+
+
+def copy_rows(engine: Engine, table: Table, rows: List[Dict[str, Any]]) -> None:
+    """Writes rows to a pgvector table with COPY ... FROM STDIN in one transaction.
+
+    Uses the binary format with psycopg (v3), so embeddings are sent as float4 arrays instead of text,
+    and the text format with other drivers. Unlike INSERT, COPY fails if a row violates a unique constraint.
+    """
+    if len(rows) == 0:
+        return
+
+    columns = list(rows[0].keys())
+    table_name = engine.dialect.identifier_preparer.format_table(table)
+    column_names = ", ".join(engine.dialect.identifier_preparer.quote(c) for c in columns)
+
+    raw_connection = engine.raw_connection()
+    try:
+        if engine.dialect.driver == "psycopg":
+            _copy_binary(raw_connection.dbapi_connection, table, table_name, column_names, columns, rows)
+        else:
+            _copy_text(raw_connection.cursor(), table_name, column_names, columns, rows)
+        raw_connection.commit()
+    except Exception:
+        raw_connection.rollback()
+        raise
+    finally:
+        raw_connection.close()
+    logger.debug(f"Copied {len(rows)} rows to {table_name}")
+
+
+def _copy_binary(
+    connection: Any, table: Table, table_name: str, column_names: str, columns: List[str], rows: List[Dict[str, Any]]
+) -> None:
+    import numpy as np
+    from pgvector.psycopg import register_vector
+    from psycopg.types.json import Jsonb
+
+    register_vector(connection)
+    types = [_get_pg_type_name(table, c) for c in columns]
+    with connection.cursor() as cursor:
+        with cursor.copy(f"COPY {table_name} ({column_names}) FROM STDIN (FORMAT BINARY)") as copy:
+            copy.set_types(types)
+            for row in rows:
+                values = []
+                for column, pg_type in zip(columns, types):
+                    value = row[column]
+                    if value is not None and pg_type == "vector":
+                        value = np.asarray(value, dtype=np.float32)
+                    elif value is not None and pg_type == "jsonb":
+                        value = Jsonb(value)
+                    values.append(value)
+                copy.write_row(values)
+
+
+def _copy_text(cursor: Any, table_name: str, column_names: str, columns: List[str], rows: List[Dict[str, Any]]) -> None:
+    buffer = StringIO()
+    for row in rows:
+        buffer.write("\t".join(_to_copy_text(row[column]) for column in columns))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table_name} ({column_names}) FROM STDIN", buffer)
+
+
+def _get_pg_type_name(table: Table, column: str) -> str:
+    column_type = table.c[column].type
+    if column_type.__class__.__name__ == "Vector":
+        return "vector"
+    if column_type.__class__.__name__ == "JSONB":
+        return "jsonb"
+    return "text"
+
+
+def _to_copy_text(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if isinstance(value, dict):
+        value = json.dumps(value)
+    elif isinstance(value, (list, tuple)):
+        value = "[" + ",".join(str(float(v)) for v in value) + "]"
+    else:
+        value = str(value)
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
@@ -0,0 +1,62 @@
+from typing import Any, List
+
+try:
+    from sqlalchemy.schema import Table
+    from sqlalchemy.sql.expression import and_, or_, case, func, ColumnElement
+except ImportError:
+    raise ImportError("`sqlalchemy` not installed")
+
+from phi.vectordb.filters import Filters, Eq, In, Range, And, Or, to_filter_expr
+
+# Columns that are never filtered as columns, keys with these names filter meta_data
+NON_FILTER_COLUMNS = ("meta_data", "embedding", "usage")
+
+
+def get_filter_clause(table: Table, filters: Filters) -> ColumnElement:
+    """Compiles filters to a WHERE clause on a pgvector table.
+
+    Keys that name a table column (like "name") filter the column. Other keys filter meta_data:
+    equality uses the JSONB containment operator `@>`, which can use a GIN index on meta_data,
+    and ranges compare `meta_data ->> key` cast to float for numbers, or as text for strings like ISO dates.
+    The cast is only applied to JSON numbers, rows where the key holds another type do not match a numeric range.
+    """
+    expr = to_filter_expr(filters)
+    if isinstance(expr, And):
+        return and_(*[get_filter_clause(table, f) for f in expr.filters])
+    if isinstance(expr, Or):
+        return or_(*[get_filter_clause(table, f) for f in expr.filters])
+
+    if expr.key in table.c and expr.key not in NON_FILTER_COLUMNS:
+        column = table.c[expr.key]
+        if isinstance(expr, Eq):
+            return column == expr.value
+        if isinstance(expr, In):
+            return column.in_(expr.values)
+        return and_(*_get_range_clauses(column, expr))
+
+    meta_data = table.c.meta_data
+    if isinstance(expr, Eq):
+        return meta_data.contains({expr.key: expr.value})
+    if isinstance(expr, In):
+        return or_(*[meta_data.contains({expr.key: value}) for value in expr.values])
+    bounds = expr.get_bounds()
+    element = meta_data[expr.key]
+    if len(bounds) > 0 and all(isinstance(value, str) for _, value in bounds):
+        return and_(*_get_range_clauses(element.as_string(), expr))
+    # CASE evaluates the type check before the cast, a condition next to it in an AND may run after the cast
+    number = case((func.jsonb_typeof(element) == "number", element.as_float()))
+    return and_(*_get_range_clauses(number, expr))
+
+
+def _get_range_clauses(column: Any, expr: Range) -> List[ColumnElement]:
+    clauses = []
+    for op, value in expr.get_bounds():
+        if op == ">":
+            clauses.append(column > value)
+        elif op == ">=":
+            clauses.append(column >= value)
+        elif op == "<":
+            clauses.append(column < value)
+        elif op == "<=":
+            clauses.append(column <= value)
+    return clauses
@@ -1,13 +1,13 @@
-from typing import Optional, List, Union
+from typing import Optional, List, Union, Dict, Any, Set, cast
 from hashlib import md5
 
 try:
     from sqlalchemy.dialects import postgresql
-    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine import create_engine, CursorResult, Engine
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import Session, sessionmaker
-    from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, func, select
+    from sqlalchemy.schema import MetaData, Table, Column, Index
+    from sqlalchemy.sql.expression import text, func, select, any_, bindparam
     from sqlalchemy.types import DateTime, String
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
@@ -21,6 +21,9 @@ from phi.document import Document
 from phi.embedder import Embedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
+from phi.vectordb.filters import Filters
+from phi.vectordb.pgvector.bulk import copy_rows
+from phi.vectordb.pgvector.filters import get_filter_clause
 from phi.vectordb.pgvector.index import Ivfflat, HNSW
 from phi.utils.log import logger
 
@@ -35,6 +38,8 @@ class PgVector(VectorDb):
         embedder: Optional[Embedder] = None,
         distance: Distance = Distance.cosine,
         index: Optional[Union[Ivfflat, HNSW]] = HNSW(),
+        use_copy: bool = False,
+        meta_data_index: bool = True,
     ):
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
@@ -67,6 +72,12 @@ class PgVector(VectorDb):
         # Index for the collection
         self.index: Optional[Union[Ivfflat, HNSW]] = index
 
+        # Write inserts with COPY ... FROM STDIN, the fastest path for fresh loads
+        self.use_copy: bool = use_copy
+
+        # Create a GIN index on meta_data, used by equality filters on meta_data keys
+        self.meta_data_index: bool = meta_data_index
+
         # Database session
         self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
 
@@ -74,7 +85,7 @@ class PgVector(VectorDb):
         self.table: Table = self.get_table()
 
     def get_table(self) -> Table:
-        return Table(
+        table = Table(
             self.collection,
             self.metadata,
             Column("name", String),
@@ -87,6 +98,9 @@ class PgVector(VectorDb):
             Column("content_hash", String),
             extend_existing=True,
         )
+        if self.meta_data_index:
+            Index(f"{self.collection}_meta_data_gin_index", table.c.meta_data, postgresql_using="gin")
+        return table
 
     def table_exists(self) -> bool:
         logger.debug(f"Checking if table exists: {self.table.name}")
@@ -123,6 +137,41 @@ class PgVector(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
+    def existing_hashes(self, hashes: List[str]) -> Set[str]:
+        """
+        Returns the content hashes that exist in the table, using one query for all hashes
+
+        Args:
+            hashes (List[str]): Content hashes to check
+        """
+        if len(hashes) == 0:
+            return set()
+        with self.Session() as sess, sess.begin():
+            stmt = select(self.table.c.content_hash).where(
+                self.table.c.content_hash == any_(bindparam("hashes", value=hashes, type_=postgresql.ARRAY(String)))
+            )
+            return {row.content_hash for row in sess.execute(stmt)}
+
+    def delete_by_content_hash(self, hashes: List[str], batch_size: int = 1000) -> int:
+        """
+        Deletes the rows with these content hashes, using one statement per batch of hashes
+
+        Args:
+            hashes (List[str]): Content hashes to delete
+            batch_size (int): Number of hashes per statement
+        """
+        from sqlalchemy import delete
+
+        deleted = 0
+        with self.Session() as sess, sess.begin():
+            for i in range(0, len(hashes), batch_size):
+                stmt = delete(self.table).where(
+                    self.table.c.content_hash
+                    == any_(bindparam("hashes", value=hashes[i : i + batch_size], type_=postgresql.ARRAY(String)))
+                )
+                deleted += cast(CursorResult, sess.execute(stmt)).rowcount
+        return deleted
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -136,68 +185,76 @@ class PgVector(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
-    def insert(self, documents: List[Document], batch_size: int = 10) -> None:
-        with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                stmt = postgresql.insert(self.table).values(
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=md5(cleaned_content.encode()).hexdigest(),
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+    def get_row(self, document: Document) -> Dict[str, Any]:
+        cleaned_content = document.content.replace("\x00", "\ufffd")
+        return dict(
+            name=document.name,
+            meta_data=document.meta_data,
+            content=cleaned_content,
+            embedding=document.embedding,
+            usage=document.usage,
+            content_hash=md5(cleaned_content.encode()).hexdigest(),
+        )
 
-                # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.debug(f"Committed {counter} documents")
-                    counter = 0
+    def insert(self, documents: List[Document], batch_size: int = 500) -> None:
+        """
+        Insert documents into the database.
 
-            # Commit any remaining documents
-            if counter > 0:
-                sess.commit()
-                logger.debug(f"Committed {counter} documents")
+        Args:
+            documents (List[Document]): List of documents to insert
+            batch_size (int): Number of documents embedded and written per statement and commit
+        """
+        with self.Session() as sess:
+            for i in range(0, len(documents), batch_size):
+                batch = documents[i : i + batch_size]
+                self.embed_documents(batch)
+                rows = [self.get_row(document) for document in batch]
+                if self.use_copy:
+                    copy_rows(engine=self.db_engine, table=self.table, rows=rows)
+                else:
+                    sess.execute(postgresql.insert(self.table).values(rows))
+                    sess.commit()
+                logger.debug(f"Committed {len(rows)} documents")
 
-    def upsert(self, documents: List[Document]) -> None:
+    def upsert(self, documents: List[Document], batch_size: int = 500) -> None:
         """
         Upsert documents into the database.
 
         Args:
             documents (List[Document]): List of documents to upsert
+            batch_size (int): Number of documents embedded and written per statement and commit
         """
         with self.Session() as sess:
-            with sess.begin():
-                for document in documents:
-                    document.embed(embedder=self.embedder)
-                    cleaned_content = document.content.replace("\x00", "\ufffd")
-                    stmt = postgresql.insert(self.table).values(
-                        name=document.name,
-                        meta_data=document.meta_data,
-                        content=cleaned_content,
-                        embedding=document.embedding,
-                        usage=document.usage,
-                        content_hash=md5(cleaned_content.encode()).hexdigest(),
-                    )
-                    stmt = stmt.on_conflict_do_update(
-                        index_elements=["name", "content_hash"],
-                        set_=dict(
-                            meta_data=document.meta_data,
-                            content=stmt.excluded.content,
-                            embedding=stmt.excluded.embedding,
-                            usage=stmt.excluded.usage,
-                        ),
-                    )
-                    sess.execute(stmt)
-                    logger.debug(f"Upserted document: {document.name} ({document.meta_data})")
+            for i in range(0, len(documents), batch_size):
+                batch = documents[i : i + batch_size]
+                self.embed_documents(batch)
+                # Keep the last document for each (name, content_hash),
+                # a multi-row statement can not write the same row twice
+                rows: Dict[Any, Dict[str, Any]] = {}
+                for document in batch:
+                    row = self.get_row(document)
+                    rows[(row["name"], row["content_hash"])] = row
+                stmt = postgresql.insert(self.table).values(list(rows.values()))
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["name", "content_hash"],
+                    set_=dict(
+                        meta_data=stmt.excluded.meta_data,
+                        content=stmt.excluded.content,
+                        embedding=stmt.excluded.embedding,
+                        usage=stmt.excluded.usage,
+                    ),
+                )
+                sess.execute(stmt)
+                sess.commit()
+                logger.debug(f"Upserted {len(rows)} documents")
 
-    def search(self, query: str, limit: int = 5) -> List[Document]:
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
         query_embedding = self.embedder.get_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
@@ -207,11 +264,15 @@ class PgVector(VectorDb):
             self.table.c.name,
             self.table.c.meta_data,
             self.table.c.content,
-            self.table.c.embedding,
             self.table.c.usage,
         ]
+        if return_embeddings:
+            columns.append(self.table.c.embedding)
 
         stmt = select(*columns)
+        if filters is not None:
+            stmt = stmt.where(get_filter_clause(self.table, filters))
+
         if self.distance == Distance.l2:
             stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
         if self.distance == Distance.cosine:
@@ -241,7 +302,7 @@ class PgVector(VectorDb):
                     meta_data=neighbor.meta_data,
                     content=neighbor.content,
                     embedder=self.embedder,
-                    embedding=neighbor.embedding,
+                    embedding=neighbor.embedding if return_embeddings else None,
                     usage=neighbor.usage,
                 )
             )
@@ -269,6 +330,11 @@ class PgVector(VectorDb):
         from math import sqrt
 
         logger.debug("==== Optimizing Vector DB ====")
+        # Create the meta_data index on tables created before it was enabled
+        for index in self.table.indexes:
+            logger.debug(f"Creating index: {index.name}")
+            index.create(self.db_engine, checkfirst=True)
+
         if self.index is None:
             return
 
@@ -1,13 +1,13 @@
-from typing import Optional, List, Union, Dict, Any
+from typing import Optional, List, Union, Dict, Any, Set, cast
 from hashlib import md5
 
 try:
     from sqlalchemy.dialects import postgresql
-    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine import create_engine, CursorResult, Engine
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import Session, sessionmaker
-    from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, func, select
+    from sqlalchemy.schema import MetaData, Table, Column, Index
+    from sqlalchemy.sql.expression import text, func, select, any_, bindparam
     from sqlalchemy.types import DateTime, String
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
@@ -21,6 +21,9 @@ from phi.document import Document
 from phi.embedder import Embedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
+from phi.vectordb.filters import Filters
+from phi.vectordb.pgvector.bulk import copy_rows
+from phi.vectordb.pgvector.filters import get_filter_clause
 from phi.vectordb.pgvector.index import Ivfflat, HNSW
 from phi.utils.log import logger
 
@@ -35,6 +38,10 @@ class PgVector2(VectorDb):
         embedder: Optional[Embedder] = None,
         distance: Distance = Distance.cosine,
         index: Optional[Union[Ivfflat, HNSW]] = HNSW(),
+        use_copy: bool = False,
+        text_search_config: str = "english",
+        text_search_index: bool = False,
+        meta_data_index: bool = True,
     ):
         _engine: Optional[Engine] = db_engine
         if _engine is None and db_url is not None:
@@ -67,6 +74,17 @@ class PgVector2(VectorDb):
         # Index for the collection
         self.index: Optional[Union[Ivfflat, HNSW]] = index
 
+        # Write inserts with COPY ... FROM STDIN, the fastest path for fresh loads.
+        # Unlike INSERT, COPY fails if a document with the same id already exists.
+        self.use_copy: bool = use_copy
+
+        # Postgres text search configuration used by keyword_search()
+        self.text_search_config: str = text_search_config
+        # Create a GIN index on the content tsvector, so keyword_search() does not scan the table
+        self.text_search_index: bool = text_search_index
+        # Create a GIN index on meta_data, used by equality filters on meta_data keys
+        self.meta_data_index: bool = meta_data_index
+
         # Database session
         self.Session: sessionmaker[Session] = sessionmaker(bind=self.db_engine)
 
@@ -74,7 +92,7 @@ class PgVector2(VectorDb):
         self.table: Table = self.get_table()
 
     def get_table(self) -> Table:
-        return Table(
+        table = Table(
             self.collection,
             self.metadata,
             Column("id", String, primary_key=True),
@@ -88,6 +106,18 @@ class PgVector2(VectorDb):
             Column("content_hash", String),
             extend_existing=True,
         )
+        if self.meta_data_index:
+            Index(f"{self.collection}_meta_data_gin_index", table.c.meta_data, postgresql_using="gin")
+        if self.text_search_index:
+            Index(
+                f"{self.collection}_content_fts_index",
+                self.get_text_search_vector(table),
+                postgresql_using="gin",
+            )
+        return table
+
+    def get_text_search_vector(self, table: Table) -> Any:
+        return func.to_tsvector(text(f"'{self.text_search_config}'::regconfig"), table.c.content)
 
     def table_exists(self) -> bool:
         logger.debug(f"Checking if table exists: {self.table.name}")
@@ -124,6 +154,41 @@ class PgVector2(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
+    def existing_hashes(self, hashes: List[str]) -> Set[str]:
+        """
+        Returns the content hashes that exist in the table, using one query for all hashes
+
+        Args:
+            hashes (List[str]): Content hashes to check
+        """
+        if len(hashes) == 0:
+            return set()
+        with self.Session() as sess, sess.begin():
+            stmt = select(self.table.c.content_hash).where(
+                self.table.c.content_hash == any_(bindparam("hashes", value=hashes, type_=postgresql.ARRAY(String)))
+            )
+            return {row.content_hash for row in sess.execute(stmt)}
+
+    def delete_by_content_hash(self, hashes: List[str], batch_size: int = 1000) -> int:
+        """
+        Deletes the rows with these content hashes, using one statement per batch of hashes
+
+        Args:
+            hashes (List[str]): Content hashes to delete
+            batch_size (int): Number of hashes per statement
+        """
+        from sqlalchemy import delete
+
+        deleted = 0
+        with self.Session() as sess, sess.begin():
+            for i in range(0, len(hashes), batch_size):
+                stmt = delete(self.table).where(
+                    self.table.c.content_hash
+                    == any_(bindparam("hashes", value=hashes[i : i + batch_size], type_=postgresql.ARRAY(String)))
+                )
+                deleted += cast(CursorResult, sess.execute(stmt)).rowcount
+        return deleted
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -150,65 +215,64 @@ class PgVector2(VectorDb):
                 result = sess.execute(stmt).first()
                 return result is not None
 
-    def insert(self, documents: List[Document], batch_size: int = 10) -> None:
-        with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-                stmt = postgresql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=content_hash,
-                )
-                sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Inserted document: {document.name} ({document.meta_data})")
+    def get_row(self, document: Document) -> Dict[str, Any]:
+        cleaned_content = document.content.replace("\x00", "\ufffd")
+        content_hash = md5(cleaned_content.encode()).hexdigest()
+        return dict(
+            id=document.id or content_hash,
+            name=document.name,
+            meta_data=document.meta_data,
+            content=cleaned_content,
+            embedding=document.embedding,
+            usage=document.usage,
+            content_hash=content_hash,
+        )
 
-                # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.info(f"Committed {counter} documents")
-                    counter = 0
+    def get_rows(self, documents: List[Document]) -> List[Dict[str, Any]]:
+        # Keep the last document for each id, a multi-row statement can not write the same row twice
+        rows: Dict[str, Dict[str, Any]] = {}
+        for document in documents:
+            row = self.get_row(document)
+            rows[row["id"]] = row
+        return list(rows.values())
 
-            # Commit any remaining documents
-            if counter > 0:
-                sess.commit()
-                logger.info(f"Committed {counter} documents")
+    def insert(self, documents: List[Document], batch_size: int = 500) -> None:
+        """
+        Insert documents into the database.
+
+        Args:
+            documents (List[Document]): List of documents to insert
+            batch_size (int): Number of documents embedded and written per statement and commit
+        """
+        with self.Session() as sess:
+            for i in range(0, len(documents), batch_size):
+                batch = documents[i : i + batch_size]
+                self.embed_documents(batch)
+                rows = self.get_rows(batch)
+                if self.use_copy:
+                    copy_rows(engine=self.db_engine, table=self.table, rows=rows)
+                else:
+                    sess.execute(postgresql.insert(self.table).values(rows))
+                    sess.commit()
+                logger.info(f"Committed {len(rows)} documents")
 
     def upsert_available(self) -> bool:
         return True
 
-    def upsert(self, documents: List[Document], batch_size: int = 20) -> None:
+    def upsert(self, documents: List[Document], batch_size: int = 500) -> None:
         """
         Upsert documents into the database.
 
         Args:
             documents (List[Document]): List of documents to upsert
-            batch_size (int): Batch size for upserting documents
+            batch_size (int): Number of documents embedded and written per statement and commit
         """
         with self.Session() as sess:
-            counter = 0
-            for document in documents:
-                document.embed(embedder=self.embedder)
-                cleaned_content = document.content.replace("\x00", "\ufffd")
-                content_hash = md5(cleaned_content.encode()).hexdigest()
-                _id = document.id or content_hash
-                stmt = postgresql.insert(self.table).values(
-                    id=_id,
-                    name=document.name,
-                    meta_data=document.meta_data,
-                    content=cleaned_content,
-                    embedding=document.embedding,
-                    usage=document.usage,
-                    content_hash=content_hash,
-                )
+            for i in range(0, len(documents), batch_size):
+                batch = documents[i : i + batch_size]
+                self.embed_documents(batch)
+                rows = self.get_rows(batch)
+                stmt = postgresql.insert(self.table).values(rows)
                 # Update row when id matches but 'content_hash' is different
                 stmt = stmt.on_conflict_do_update(
                     index_elements=["id"],
@@ -222,21 +286,16 @@ class PgVector2(VectorDb):
                     ),
                 )
                 sess.execute(stmt)
-                counter += 1
-                logger.debug(f"Upserted document: {document.id} | {document.name} | {document.meta_data}")
-
-                # Commit every `batch_size` documents
-                if counter >= batch_size:
-                    sess.commit()
-                    logger.info(f"Committed {counter} documents")
-                    counter = 0
-
-            # Commit any remaining documents
-            if counter > 0:
                 sess.commit()
-                logger.info(f"Committed {counter} documents")
+                logger.info(f"Committed {len(rows)} documents")
 
-    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
         query_embedding = self.embedder.get_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
@@ -246,16 +305,15 @@ class PgVector2(VectorDb):
             self.table.c.name,
             self.table.c.meta_data,
             self.table.c.content,
-            self.table.c.embedding,
             self.table.c.usage,
         ]
+        if return_embeddings:
+            columns.append(self.table.c.embedding)
 
         stmt = select(*columns)
 
         if filters is not None:
-            for key, value in filters.items():
-                if hasattr(self.table.c, key):
-                    stmt = stmt.where(getattr(self.table.c, key) == value)
+            stmt = stmt.where(get_filter_clause(self.table, filters))
 
         if self.distance == Distance.l2:
             stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
@@ -292,13 +350,62 @@ class PgVector2(VectorDb):
                     meta_data=neighbor.meta_data,
                     content=neighbor.content,
                     embedder=self.embedder,
-                    embedding=neighbor.embedding,
+                    embedding=neighbor.embedding if return_embeddings else None,
                     usage=neighbor.usage,
                 )
             )
 
         return search_results
 
+    def keyword_search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
+        """Full-text search on the content, ranked with ts_rank_cd.
+        The query is parsed with websearch_to_tsquery, so it supports "quoted phrases", OR and -exclusions.
+        """
+        columns = [
+            self.table.c.name,
+            self.table.c.meta_data,
+            self.table.c.content,
+            self.table.c.usage,
+        ]
+        if return_embeddings:
+            columns.append(self.table.c.embedding)
+
+        text_search_vector = self.get_text_search_vector(self.table)
+        text_search_query = func.websearch_to_tsquery(text(f"'{self.text_search_config}'::regconfig"), query)
+        stmt = select(*columns).where(text_search_vector.bool_op("@@")(text_search_query))
+
+        if filters is not None:
+            stmt = stmt.where(get_filter_clause(self.table, filters))
+
+        stmt = stmt.order_by(func.ts_rank_cd(text_search_vector, text_search_query).desc()).limit(limit=limit)
+        logger.debug(f"Query: {stmt}")
+
+        try:
+            with self.Session() as sess:
+                with sess.begin():
+                    neighbors = sess.execute(stmt).fetchall() or []
+        except Exception as e:
+            logger.error(f"Error searching for documents: {e}")
+            return []
+
+        return [
+            Document(
+                name=neighbor.name,
+                meta_data=neighbor.meta_data,
+                content=neighbor.content,
+                embedder=self.embedder,
+                embedding=neighbor.embedding if return_embeddings else None,
+                usage=neighbor.usage,
+            )
+            for neighbor in neighbors
+        ]
+
     def delete(self) -> None:
         if self.table_exists():
             logger.debug(f"Deleting table: {self.collection}")
@@ -320,6 +427,11 @@ class PgVector2(VectorDb):
         from math import sqrt
 
         logger.debug("==== Optimizing Vector DB ====")
+        # Create the meta_data and text search indexes on tables created before they were enabled
+        for index in self.table.indexes:
+            logger.debug(f"Creating index: {index.name}")
+            index.create(self.db_engine, checkfirst=True)
+
         if self.index is None:
             return
 
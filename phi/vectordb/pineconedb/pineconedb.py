@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Union, List
+from typing import Optional, Dict, Union, List, Set, Any
 
 try:
     from pinecone import Pinecone
@@ -11,6 +11,7 @@ except ImportError:
 from phi.document import Document
 from phi.embedder import Embedder
 from phi.vectordb.base import VectorDb
+from phi.vectordb.filters import Filters, Eq, In, And, Or, to_filter_expr
 from phi.utils.log import logger
 from pinecone.core.client.api.manage_indexes_api import ManageIndexesApi
 from pinecone.models import ServerlessSpec, PodSpec
@@ -167,6 +168,26 @@ class PineconeDB(VectorDb):
         response = self.index.fetch(ids=[document.id])
         return len(response.vectors) > 0
 
+    def filter_existing_documents(self, documents: List[Document], batch_size: int = 1000) -> List[Document]:
+        """Returns the documents that are not in the index yet, using one fetch request per batch of ids.
+
+        Pinecone stores documents by id, so documents without an id are always returned.
+
+        Args:
+            documents (List[Document]): The documents to check.
+            batch_size (int, optional): The number of ids per fetch request. Defaults to 1000.
+
+        Returns:
+            List[Document]: The documents that do not exist in the index.
+
+        """
+        ids = list({document.id for document in documents if document.id is not None})
+        existing_ids: Set[str] = set()
+        for i in range(0, len(ids), batch_size):
+            response = self.index.fetch(ids=ids[i : i + batch_size])
+            existing_ids.update(response.vectors.keys())
+        return [document for document in documents if document.id is None or document.id not in existing_ids]
+
     def name_exists(self, name: str) -> bool:
         """Check if an index with the given name exists.
 
@@ -201,8 +222,8 @@ class PineconeDB(VectorDb):
         """
 
         vectors = []
+        self.embed_documents(documents)
         for document in documents:
-            document.embed(embedder=self.embedder)
             document.meta_data["text"] = document.content
             vectors.append(
                 Vector(
@@ -245,6 +266,8 @@ class PineconeDB(VectorDb):
         self,
         query: str,
         limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
         namespace: Optional[str] = None,
         filter: Optional[Dict[str, Union[str, float, int, bool, List, dict]]] = None,
         include_values: Optional[bool] = None,
@@ -254,6 +277,8 @@ class PineconeDB(VectorDb):
         Args:
             query (str): The query to search for.
             limit (int, optional): The maximum number of results to return. Defaults to 5.
+            filters (Optional[Filters], optional): Filters on metadata keys, combined with filter. Defaults to None.
+            return_embeddings (bool, optional): Include values when include_values is not set. Defaults to False.
             namespace (Optional[str], optional): The namespace to search in. Defaults to None.
             filter (Optional[Dict[str, Union[str, float, int, bool, List, dict]]], optional): The filter for the search. Defaults to None.
             include_values (Optional[bool], optional): Whether to include values in the search results. Defaults to None.
@@ -269,12 +294,16 @@ class PineconeDB(VectorDb):
             logger.error(f"Error getting embedding for Query: {query}")
             return []
 
+        if filters is not None:
+            compiled_filter = self.get_filter(filters)
+            filter = compiled_filter if filter is None else {"$and": [filter, compiled_filter]}
+
         response = self.index.query(
             vector=query_embedding,
             top_k=limit,
             namespace=namespace,
             filter=filter,
-            include_values=include_values,
+            include_values=include_values if include_values is not None else return_embeddings,
             include_metadata=True,
         )
         return [
@@ -287,6 +316,28 @@ class PineconeDB(VectorDb):
             for result in response.matches
         ]
 
+    def get_filter(self, filters: Filters) -> Dict[str, Any]:
+        """Compiles filters to a Pinecone metadata filter. Pinecone only compares numbers in ranges.
+
+        Args:
+            filters (Filters): The filters to compile.
+
+        Returns:
+            Dict[str, Any]: The Pinecone filter.
+
+        """
+        expr = to_filter_expr(filters)
+        if isinstance(expr, And):
+            return {"$and": [self.get_filter(f) for f in expr.filters]}
+        if isinstance(expr, Or):
+            return {"$or": [self.get_filter(f) for f in expr.filters]}
+        if isinstance(expr, Eq):
+            return {expr.key: {"$eq": expr.value}}
+        if isinstance(expr, In):
+            return {expr.key: {"$in": expr.values}}
+        operators = {">": "$gt", ">=": "$gte", "<": "$lt", "<=": "$lte"}
+        return {expr.key: {operators[op]: value for op, value in expr.get_bounds()}}
+
     def optimize(self) -> None:
         """Optimize the index.
 
@@ -1,5 +1,5 @@
 from hashlib import md5
-from typing import List, Optional
+from typing import List, Optional, Set, Any
 
 try:
     from qdrant_client import QdrantClient  # noqa: F401
@@ -14,6 +14,7 @@ from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
+from phi.vectordb.filters import Filters, Eq, In, And, Or, DOCUMENT_KEYS, to_filter_expr
 from phi.utils.log import logger
 
 
@@ -117,6 +118,46 @@ class Qdrant(VectorDb):
             return len(collection_points) > 0
         return False
 
+    def existing_hashes(self, hashes: List[str], batch_size: int = 1000) -> Set[str]:
+        """
+        Returns the content hashes that exist in the collection, using one retrieve request per batch of hashes
+
+        Args:
+            hashes (List[str]): Content hashes to check
+            batch_size (int): Number of hashes per request
+        """
+        existing: Set[str] = set()
+        if self.client:
+            for i in range(0, len(hashes), batch_size):
+                points = self.client.retrieve(
+                    collection_name=self.collection,
+                    ids=hashes[i : i + batch_size],  # type: ignore
+                    with_payload=False,
+                    with_vectors=False,
+                )
+                # Qdrant returns the md5 ids formatted as UUIDs
+                existing.update(str(point.id).replace("-", "") for point in points)
+        return existing
+
+    def delete_by_content_hash(self, hashes: List[str], batch_size: int = 1000) -> int:
+        """
+        Deletes the points with these content hashes, which are the ids of the points, one request per batch of hashes
+
+        Args:
+            hashes (List[str]): Content hashes to delete
+            batch_size (int): Number of hashes per request
+        """
+        deleted = 0
+        for i in range(0, len(hashes), batch_size):
+            batch = hashes[i : i + batch_size]
+            # Only the points that exist are counted, deleting a missing id is not an error
+            deleted += len(self.existing_hashes(batch))
+            self.client.delete(
+                collection_name=self.collection,
+                points_selector=models.PointIdsList(points=batch),  # type: ignore
+            )
+        return deleted
+
     def name_exists(self, name: str) -> bool:
         """
         Validates if a document with the given name exists in the collection.
@@ -141,8 +182,8 @@ class Qdrant(VectorDb):
     def insert(self, documents: List[Document], batch_size: int = 10) -> None:
         logger.debug(f"Inserting {len(documents)} documents")
         points = []
+        self.embed_documents(documents)
         for document in documents:
-            document.embed(embedder=self.embedder)
             cleaned_content = document.content.replace("\x00", "\ufffd")
             doc_id = md5(cleaned_content.encode()).hexdigest()
             points.append(
@@ -172,7 +213,40 @@ class Qdrant(VectorDb):
         logger.debug("Redirecting the request to insert")
         self.insert(documents)
 
-    def search(self, query: str, limit: int = 5) -> List[Document]:
+    def get_filter(self, filters: Filters) -> models.Filter:
+        """Compiles filters to a Qdrant filter on the name and meta_data payload fields."""
+        expr = to_filter_expr(filters)
+        if isinstance(expr, And):
+            return models.Filter(must=[self.get_filter(f) for f in expr.filters])
+        if isinstance(expr, Or):
+            return models.Filter(should=[self.get_filter(f) for f in expr.filters])
+
+        key = expr.key if expr.key in DOCUMENT_KEYS else f"meta_data.{expr.key}"
+        condition: Any
+        if isinstance(expr, Eq):
+            if isinstance(expr.value, float):
+                condition = models.FieldCondition(key=key, range=models.Range(gte=expr.value, lte=expr.value))
+            else:
+                condition = models.FieldCondition(key=key, match=models.MatchValue(value=expr.value))
+        elif isinstance(expr, In):
+            condition = models.FieldCondition(key=key, match=models.MatchAny(any=expr.values))  # type: ignore
+        elif any(isinstance(value, str) for _, value in expr.get_bounds()):
+            condition = models.FieldCondition(
+                key=key, range=models.DatetimeRange(gt=expr.gt, gte=expr.gte, lt=expr.lt, lte=expr.lte)
+            )
+        else:
+            condition = models.FieldCondition(
+                key=key, range=models.Range(gt=expr.gt, gte=expr.gte, lt=expr.lt, lte=expr.lte)  # type: ignore
+            )
+        return models.Filter(must=[condition])
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
         query_embedding = self.embedder.get_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
@@ -181,9 +255,10 @@ class Qdrant(VectorDb):
         results = self.client.search(
             collection_name=self.collection,
             query_vector=query_embedding,
-            with_vectors=True,
+            with_vectors=return_embeddings,
             with_payload=True,
             limit=limit,
+            query_filter=self.get_filter(filters) if filters is not None else None,
         )
 
         # Build search results
@@ -197,7 +272,7 @@ class Qdrant(VectorDb):
                     meta_data=result.payload["meta_data"],
                     content=result.payload["content"],
                     embedder=self.embedder,
-                    embedding=result.vector,
+                    embedding=result.vector if return_embeddings else None,
                     usage=result.payload["usage"],
                 )
             )
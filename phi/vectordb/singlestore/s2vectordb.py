@@ -1,14 +1,14 @@
 import json
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Any, Set, cast
 from hashlib import md5
 
 try:
     from sqlalchemy.dialects import mysql
-    from sqlalchemy.engine import create_engine, Engine
+    from sqlalchemy.engine import create_engine, CursorResult, Engine
     from sqlalchemy.inspection import inspect
     from sqlalchemy.orm import Session, sessionmaker
     from sqlalchemy.schema import MetaData, Table, Column
-    from sqlalchemy.sql.expression import text, func, select
+    from sqlalchemy.sql.expression import text, func, select, and_, or_, ColumnElement
     from sqlalchemy.types import DateTime
 except ImportError:
     raise ImportError("`sqlalchemy` not installed")
@@ -19,6 +19,7 @@ from phi.embedder import Embedder
 from phi.embedder.openai import OpenAIEmbedder
 from phi.vectordb.base import VectorDb
 from phi.vectordb.distance import Distance
+from phi.vectordb.filters import Filters, Eq, In, And, Or, DOCUMENT_KEYS, to_filter_expr
 from phi.utils.log import logger
 
 
@@ -98,6 +99,38 @@ class S2VectorDb(VectorDb):
             result = sess.execute(stmt).first()
             return result is not None
 
+    def existing_hashes(self, hashes: List[str], batch_size: int = 1000) -> Set[str]:
+        """
+        Returns the content hashes that exist in the table, using one query per batch of hashes
+
+        Args:
+            hashes (List[str]): Content hashes to check
+            batch_size (int): Number of hashes per query
+        """
+        existing: Set[str] = set()
+        with self.Session.begin() as sess:
+            for i in range(0, len(hashes), batch_size):
+                stmt = select(self.table.c.content_hash).where(
+                    self.table.c.content_hash.in_(hashes[i : i + batch_size])
+                )
+                existing.update(row.content_hash for row in sess.execute(stmt))
+        return existing
+
+    def delete_by_content_hash(self, hashes: List[str], batch_size: int = 1000) -> int:
+        """
+        Deletes the rows with these content hashes, using one statement per batch of hashes
+
+        Args:
+            hashes (List[str]): Content hashes to delete
+            batch_size (int): Number of hashes per statement
+        """
+        deleted = 0
+        with self.Session.begin() as sess:
+            for i in range(0, len(hashes), batch_size):
+                stmt = self.table.delete().where(self.table.c.content_hash.in_(hashes[i : i + batch_size]))
+                deleted += cast(CursorResult, sess.execute(stmt)).rowcount
+        return deleted
+
     def name_exists(self, name: str) -> bool:
         """
         Validate if a row with this name exists or not
@@ -123,10 +156,10 @@ class S2VectorDb(VectorDb):
             return result is not None
 
     def insert(self, documents: List[Document], batch_size: int = 10) -> None:
+        self.embed_documents(documents)
         with self.Session.begin() as sess:
             counter = 0
             for document in documents:
-                document.embed(embedder=self.embedder)
                 cleaned_content = document.content.replace("\x00", "\ufffd")
                 content_hash = md5(cleaned_content.encode()).hexdigest()
                 _id = document.id or content_hash
@@ -164,10 +197,10 @@ class S2VectorDb(VectorDb):
             documents (List[Document]): List of documents to upsert
             batch_size (int): Batch size for upserting documents
         """
+        self.embed_documents(documents)
         with self.Session.begin() as sess:
             counter = 0
             for document in documents:
-                document.embed(embedder=self.embedder)
                 cleaned_content = document.content.replace("\x00", "\ufffd")
                 content_hash = md5(cleaned_content.encode()).hexdigest()
                 _id = document.id or content_hash
@@ -194,28 +227,78 @@ class S2VectorDb(VectorDb):
             sess.commit()
             logger.debug(f"Committed {counter} documents")
 
-    def search(self, query: str, limit: int = 5, filters: Optional[Dict[str, Any]] = None) -> List[Document]:
+    def get_filter_clause(self, filters: Filters) -> ColumnElement:
+        """Compiles filters to a WHERE clause. Keys that name a table column (like "name") filter the column,
+        other keys extract the value from the meta_data JSON with JSON_EXTRACT_STRING or JSON_EXTRACT_DOUBLE.
+        """
+        expr = to_filter_expr(filters)
+        if isinstance(expr, And):
+            return and_(*[self.get_filter_clause(f) for f in expr.filters])
+        if isinstance(expr, Or):
+            return or_(*[self.get_filter_clause(f) for f in expr.filters])
+
+        values: List[Any]
+        if isinstance(expr, Eq):
+            values = [expr.value]
+        elif isinstance(expr, In):
+            values = expr.values
+        else:
+            values = [value for _, value in expr.get_bounds()]
+
+        column: Any
+        if expr.key in DOCUMENT_KEYS or (expr.key in self.table.c and expr.key not in ("meta_data", "embedding")):
+            column = self.table.c[expr.key]
+        elif all(isinstance(value, bool) for value in values):
+            # JSON booleans are compared as JSON text, true or false
+            column = func.json_extract_json(self.table.c.meta_data, expr.key)
+            values = [json.dumps(value) for value in values]
+        elif all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values):
+            column = func.json_extract_double(self.table.c.meta_data, expr.key)
+        else:
+            column = func.json_extract_string(self.table.c.meta_data, expr.key)
+
+        if isinstance(expr, Eq):
+            return column == values[0]
+        if isinstance(expr, In):
+            return column.in_(values)
+        clauses = []
+        for op, value in expr.get_bounds():
+            if op == ">":
+                clauses.append(column > value)
+            elif op == ">=":
+                clauses.append(column >= value)
+            elif op == "<":
+                clauses.append(column < value)
+            elif op == "<=":
+                clauses.append(column <= value)
+        return and_(*clauses)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 5,
+        filters: Optional[Filters] = None,
+        return_embeddings: bool = False,
+    ) -> List[Document]:
         query_embedding = self.embedder.get_embedding(query)
         if query_embedding is None:
             logger.error(f"Error getting embedding for Query: {query}")
             return []
 
-        columns = [
+        columns: List[Any] = [
             self.table.c.name,
             self.table.c.meta_data,
             self.table.c.content,
-            func.json_array_unpack(self.table.c.embedding).label(
-                "embedding"
-            ),  # Unpack embedding here # self.table.c.embedding,
             self.table.c.usage,
         ]
+        if return_embeddings:
+            # Unpack embedding here # self.table.c.embedding,
+            columns.append(func.json_array_unpack(self.table.c.embedding).label("embedding"))
 
         stmt = select(*columns)
 
         if filters is not None:
-            for key, value in filters.items():
-                if hasattr(self.table.c, key):
-                    stmt = stmt.where(getattr(self.table.c, key) == value)
+            stmt = stmt.where(self.get_filter_clause(filters))
 
         if self.distance == Distance.l2:
             stmt = stmt.order_by(self.table.c.embedding.max_inner_product(query_embedding))
@@ -251,7 +334,7 @@ class S2VectorDb(VectorDb):
             meta_data_dict = json.loads(neighbor.meta_data) if neighbor.meta_data else {}
             usage_dict = json.loads(neighbor.usage) if neighbor.usage else {}
             # Convert the embedding mysql.TEXT back into a list
-            embedding_list = json.loads(neighbor.embedding) if neighbor.embedding else []
+            embedding_list = json.loads(neighbor.embedding) if return_embeddings and neighbor.embedding else None
 
             search_results.append(
                 Document(
@@ -0,0 +1,17 @@
+from copy import deepcopy
+
+from phi.assistant import Assistant
+from phi.memory.assistant import AssistantMemory
+
+
+def test_assistant_default_memory():
+    assistant = Assistant()
+    assert isinstance(assistant.memory, AssistantMemory)
+    assert Assistant().memory is not assistant.memory
+
+
+def test_memory_deepcopy_shares_worker():
+    memory = AssistantMemory()
+    worker = memory.get_worker()
+    assert deepcopy(memory).worker is worker
+    assert deepcopy(Assistant(memory=memory)).memory.worker is worker
@@ -0,0 +1,96 @@
+import sqlite3
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+from phi.document import Document
+from phi.document.reader.text import TextReader
+from phi.embedder.base import Embedder
+from phi.knowledge.text import TextKnowledgeBase
+from phi.vectordb.base import VectorDb, get_content_hash
+
+
+class ZeroEmbedder(Embedder):
+    dimensions: int = 2
+
+    def get_embedding_and_usage(self, text: str) -> Tuple[List[float], Optional[Dict]]:
+        return [0.0, 0.0], None
+
+
+class SqliteDb(VectorDb):
+    """Stores the documents in a table with the id as primary key, like PgVector"""
+
+    def __init__(self) -> None:
+        self.embedder = ZeroEmbedder()
+        self.connection = sqlite3.connect(":memory:", check_same_thread=False)
+
+    def create(self) -> None:
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS documents (id TEXT PRIMARY KEY, content TEXT, content_hash TEXT)"
+        )
+
+    def doc_exists(self, document: Document) -> bool:
+        return len(self.existing_hashes([get_content_hash(document)])) > 0
+
+    def name_exists(self, name: str) -> bool:
+        return False
+
+    def existing_hashes(self, hashes: List[str]) -> Set[str]:
+        placeholders = ", ".join("?" * len(hashes))
+        query = f"SELECT content_hash FROM documents WHERE content_hash IN ({placeholders})"
+        return {row[0] for row in self.connection.execute(query, hashes)}
+
+    def delete_by_content_hash(self, hashes: List[str]) -> int:
+        placeholders = ", ".join("?" * len(hashes))
+        return self.connection.execute(f"DELETE FROM documents WHERE content_hash IN ({placeholders})", hashes).rowcount
+
+    def insert(self, documents: List[Document]) -> None:
+        self.connection.executemany(
+            "INSERT INTO documents VALUES (?, ?, ?)",
+            [(document.id, document.content, get_content_hash(document)) for document in documents],
+        )
+
+    def upsert(self, documents: List[Document]) -> None:
+        raise NotImplementedError
+
+    def search(self, query, limit=5, filters=None, return_embeddings=False) -> List[Document]:
+        raise NotImplementedError
+
+    def delete(self) -> None:
+        self.connection.execute("DROP TABLE IF EXISTS documents")
+
+    def exists(self) -> bool:
+        return True
+
+    def optimize(self) -> None:
+        pass
+
+    def clear(self) -> bool:
+        self.connection.execute("DELETE FROM documents")
+        return True
+
+    def get_rows(self) -> Dict[str, str]:
+        return dict(self.connection.execute("SELECT id, content FROM documents"))
+
+
+def test_load_changed_source_with_primary_key(tmp_path: Path):
+    docs = tmp_path / "docs"
+    docs.mkdir()
+    (docs / "a.txt").write_text("first version " * 10)
+    (docs / "b.txt").write_text("unchanged " * 10)
+    db = SqliteDb()
+    knowledge_base = TextKnowledgeBase(
+        path=docs,
+        vector_db=db,
+        reader=TextReader(chunk_size=50),
+        manifest_file=tmp_path / "manifest.json",
+    )
+    knowledge_base.load(recreate=True)
+    assert len(db.get_rows()) == 6
+
+    # The new chunks of a.txt reuse the ids a_1, a_2, ... of its previous chunks
+    (docs / "a.txt").write_text("second version " * 5)
+    knowledge_base.load()
+    rows = db.get_rows()
+    expected = {document.id: document.content for document in TextReader(chunk_size=50).read(docs / "a.txt")}
+    assert {id: content for id, content in rows.items() if id.startswith("a_")} == expected
+    assert len([id for id in rows if id.startswith("b_")]) == 3